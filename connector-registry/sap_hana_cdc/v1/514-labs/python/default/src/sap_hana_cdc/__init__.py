@@ -8,18 +8,24 @@ __version__ = "0.1.0"
 from .connector import SAPHanaCDCConnector
 from .infrastructure import SAPHanaCDCInfrastructure
 from .reader import SAPHanaCDCReader
-from .config import SAPHanaCDCConfig
-from .models import ChangeEvent, BatchChange, PruneResult, TableStatus, TriggerType, ClientTableStatus
+from .config import SAPHanaCDCConfig, TableFilter
+from .models import ChangeEvent, BatchChange, PruneResult, TableStatus, TriggerType, ClientTableStatus, TriggerDrift, ChunkHash, ChunkDiff, ValueKind, ValueColumn
 
 __all__ = [
     "SAPHanaCDCConnector",
     "SAPHanaCDCInfrastructure",
     "SAPHanaCDCReader",
     "SAPHanaCDCConfig",
+    "TableFilter",
     "ChangeEvent",
     "BatchChange",
     "PruneResult",
     "TableStatus",
     "TriggerType",
     "ClientTableStatus",
+    "TriggerDrift",
+    "ChunkHash",
+    "ChunkDiff",
+    "ValueKind",
+    "ValueColumn",
 ]
@@ -1,4 +1,5 @@
 
+import re
 from typing import List
 from hdbcli import dbapi
 
@@ -9,10 +10,63 @@ class SAPHanaCDCBase:
 
     CDC_CLIENT_STATUS_TABLE = "CDC_CLIENT_STATUS"
     CDC_CHANGES_TABLE = "CDC_CHANGES"
+    CDC_FETCH_PROCEDURE = "CDC_FETCH_CHANGES"
+    CDC_CHUNK_HASHES_TABLE = "CDC_CHUNK_HASHES"
+    # Identifiers in a row condition: "QUOTED" or unquoted names
+    STRING_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'")
+    IDENTIFIER_PATTERN = re.compile(r'"([^"]+)"|\b([A-Za-z_][A-Za-z0-9_$#]*)\b')
 
 
     def __init__(self, connection: dbapi.Connection, config: SAPHanaCDCConfig):
         self.connection: dbapi.Connection = connection
         self.config: SAPHanaCDCConfig = config
         self.full_client_status_table_name = f"{self.config.cdc_schema}.{self.CDC_CLIENT_STATUS_TABLE}"
-        self.full_changes_table_name = f"{self.config.cdc_schema}.{self.CDC_CHANGES_TABLE}"
\ No newline at end of file
+        self.full_changes_table_name = f"{self.config.cdc_schema}.{self.CDC_CHANGES_TABLE}"
+        self.full_fetch_procedure_name = f"{self.config.cdc_schema}.{self.CDC_FETCH_PROCEDURE}"
+        self.full_chunk_hashes_table_name = f"{self.config.cdc_schema}.{self.CDC_CHUNK_HASHES_TABLE}"
+
+    def _get_table_columns(self, cursor: dbapi.Cursor, table_name: str) -> List[str]:
+        """Get all column names of a source table, in table order."""
+        cursor.execute("""
+            SELECT COLUMN_NAME
+            FROM TABLE_COLUMNS 
+            WHERE SCHEMA_NAME = ? AND TABLE_NAME = ?
+            ORDER BY POSITION
+        """, (self.config.source_schema, table_name))
+        return [row[0] for row in cursor.fetchall()]
+
+    def get_captured_columns(self, table_name: str) -> List[str]:
+        """Get the columns of a source table that are captured and loaded, in table order.
+
+        With a column allow-list configured for the table these are the listed
+        columns and the primary key columns, otherwise all columns.
+        """
+        allowed_columns = self.config.get_table_filter(table_name).columns
+        with self.connection.cursor() as cursor:
+            columns = self._get_table_columns(cursor, table_name)
+            if allowed_columns is None:
+                return columns
+            kept = set(allowed_columns) | set(self._get_primary_key_columns(cursor, table_name))
+        return [column for column in columns if column in kept]
+
+    def _get_primary_key_columns(self, cursor: dbapi.Cursor, table_name: str) -> List[str]:
+        """Get the primary key columns of a source table, in key order (none for views)."""
+        cursor.execute("""
+            SELECT COLUMN_NAME
+            FROM CONSTRAINTS
+            WHERE SCHEMA_NAME = ? AND TABLE_NAME = ? AND IS_PRIMARY_KEY = 'TRUE'
+            ORDER BY POSITION
+        """, (self.config.source_schema, table_name))
+        return [row[0] for row in cursor.fetchall()]
+
+    def get_filter_columns(self, table_name: str) -> List[str]:
+        """Get the columns of a source table its configured row condition refers to."""
+        where = self.config.get_table_filter(table_name).where
+        if not where:
+            return []
+        # String literals aside, quoted identifiers are taken as written and
+        # unquoted ones are upper case in SAP HANA
+        condition = self.STRING_LITERAL_PATTERN.sub("''", where)
+        names = {quoted or unquoted.upper() for quoted, unquoted in self.IDENTIFIER_PATTERN.findall(condition)}
+        with self.connection.cursor() as cursor:
+            return [column for column in self._get_table_columns(cursor, table_name) if column in names]
@@ -0,0 +1,200 @@
+"""SQL for syncing tables and views by chunk checksums.
+
+Objects without CDC triggers (views, and tables listed in
+``hash_sync_tables``) are compared with their last sync chunk by chunk. Each
+row gets a key hash (SHA-256 of its primary key, or of the whole row without
+one) and a row hash. Rows are ordered by key hash, and a row whose key hash
+falls under a threshold starts a new chunk, so a chunk's boundaries only
+depend on the rows in it: inserting or deleting a row changes its own chunk
+and leaves the others alone. A chunk is identified by its smallest key hash
+and summarized by its row count and the sums of two 32-bit slices of its row
+hashes, all computed in SAP HANA.
+
+Tables are reconciled with their replica the same way, by key range: the rows
+whose key hashes share a prefix form a range, summarized by its row count and
+the sums of two slices of row hashes the replica can compute too. Those hash
+the key hash and the values of the table's other columns, as the canonical
+text of their ValueKind: SAP HANA and the replica render numbers, dates and
+timestamps differently, and the replica stores SAP's initial values ('', 0)
+as NULL or the other way round.
+"""
+
+import re
+from typing import Iterable, List, Optional, Sequence
+
+from .models import ValueColumn, ValueKind
+
+# Expected chunk sizes are bounded by the key hash prefix the threshold is compared with
+_BOUNDARY_HEX_DIGITS = 6
+_HEX_DIGITS = "0123456789ABCDEF"
+# Columns concatenated per hash; a row hash of more columns hashes the group hashes
+HASH_COLUMN_GROUP_SIZE = 16
+# Start of the two 8 hex digit slices of the row hashes a checksum sums
+ROW_HASH_SLICES = (1, 9)
+_HEX_PREFIX = re.compile(r"^[0-9A-F]{1,16}$")
+
+KEY_HASH_COLUMN = "_CDC_KEY"
+ROW_HASH_COLUMN = "_CDC_ROW"
+CHUNK_COLUMN = "_CDC_CHUNK"
+CHUNK_ID_COLUMN = "_CDC_CHUNK_ID"
+
+
+def _quote(column: str) -> str:
+    return '"' + column.replace('"', '""') + '"'
+
+
+def _hash_of(values: Sequence[str]) -> str:
+    """Hex SHA-256 of some text expressions; NULL hashes differently from an empty value."""
+    group_hashes = []
+    for start in range(0, len(values), HASH_COLUMN_GROUP_SIZE):
+        text = " || CHAR(31) || ".join(
+            f"IFNULL({value}, CHAR(30))" for value in values[start:start + HASH_COLUMN_GROUP_SIZE]
+        )
+        group_hashes.append(f"BINTOHEX(HASH_SHA256(TO_BINARY({text})))")
+    if len(group_hashes) == 1:
+        return group_hashes[0]
+    return f"BINTOHEX(HASH_SHA256(TO_BINARY({' || '.join(group_hashes)})))"
+
+
+def hash_expression(columns: List[str]) -> str:
+    """Hex SHA-256 of a row's columns."""
+    return _hash_of([f"TO_NVARCHAR({_quote(column)})" for column in columns])
+
+
+def canonical_value(column: ValueColumn) -> str:
+    """Canonical text of a column's values (see ValueKind), NULL for SAP's initial values."""
+    name = _quote(column.name)
+    if column.kind == ValueKind.TEXT:
+        return f"NULLIF(TO_NVARCHAR({name}), '')"
+    if column.kind == ValueKind.INTEGER:
+        return f"TO_NVARCHAR(NULLIF({name}, 0))"
+    if column.kind == ValueKind.DECIMAL:
+        return f"TO_NVARCHAR(TO_DECIMAL(NULLIF({name}, 0), 38, {int(column.scale)}))"
+    if column.kind == ValueKind.DATE:
+        return f"NULLIF(TO_NVARCHAR({name}, 'YYYY-MM-DD'), '0000-00-00')"
+    if column.kind == ValueKind.TIMESTAMP:
+        return f"TO_NVARCHAR({name}, 'YYYY-MM-DD HH24:MI:SS')"
+    if column.kind == ValueKind.BOOLEAN:
+        return f"CASE WHEN {name} = TRUE THEN '1' WHEN {name} = FALSE THEN '0' END"
+    raise ValueError(f"Unknown value kind of column {column.name}: {column.kind}")
+
+
+def _hex_to_bigint(expression: str, start: int, length: int = 8) -> str:
+    """Integer value of `length` hex digits of a hex string, from 1-based `start`."""
+    return "(" + " + ".join(
+        f"(LOCATE('{_HEX_DIGITS}', SUBSTRING({expression}, {start + i}, 1)) - 1) * {16 ** (length - 1 - i)}"
+        for i in range(length)
+    ) + ")"
+
+
+def boundary_threshold(chunk_size: int) -> str:
+    """Key hash prefix under which a row starts a chunk, for chunks of about chunk_size rows."""
+    limit = 16 ** _BOUNDARY_HEX_DIGITS
+    return f"{max(1, limit // max(1, chunk_size)):0{_BOUNDARY_HEX_DIGITS}X}"
+
+
+def _chunked_rows_sql(
+    full_table_name: str, columns: List[str], key_columns: List[str], where: Optional[str]
+) -> str:
+    """Rows with their key hash, row hash and chunk number; takes the boundary threshold as parameter."""
+    row_hash = hash_expression(columns)
+    key_hash = row_hash if key_columns == columns else hash_expression(key_columns)
+    select_list = ", ".join(_quote(column) for column in columns)
+    return f"""
+        SELECT R.*, SUM(CASE WHEN SUBSTRING({KEY_HASH_COLUMN}, 1, {_BOUNDARY_HEX_DIGITS}) < ? THEN 1 ELSE 0 END)
+            OVER (ORDER BY {KEY_HASH_COLUMN}) AS {CHUNK_COLUMN}
+        FROM (
+            SELECT {select_list}, {key_hash} AS {KEY_HASH_COLUMN}, {row_hash} AS {ROW_HASH_COLUMN}
+            FROM {full_table_name}
+            {f"WHERE {where}" if where else ""}
+        ) R
+    """
+
+
+def chunk_hashes_sql(
+    full_table_name: str, columns: List[str], key_columns: List[str], where: Optional[str] = None
+) -> str:
+    """Query of the chunks' ids, row counts and row hash sums, by chunk id.
+
+    Parameters: the boundary threshold.
+    """
+    return f"""
+        SELECT MIN({KEY_HASH_COLUMN}), COUNT(*),
+               SUM({_hex_to_bigint(ROW_HASH_COLUMN, ROW_HASH_SLICES[0])}),
+               SUM({_hex_to_bigint(ROW_HASH_COLUMN, ROW_HASH_SLICES[1])})
+        FROM ({_chunked_rows_sql(full_table_name, columns, key_columns, where)}) C
+        GROUP BY {CHUNK_COLUMN}
+        ORDER BY 1
+    """
+
+
+def chunk_rows_sql(
+    full_table_name: str, columns: List[str], key_columns: List[str], chunk_count: int, where: Optional[str] = None
+) -> str:
+    """Query of the rows of some chunks, each with its chunk id.
+
+    Parameters: the boundary threshold, the chunk ids, the page size and offset.
+    """
+    select_list = ", ".join(_quote(column) for column in columns)
+    placeholders = ", ".join("?" for _ in range(chunk_count))
+    return f"""
+        SELECT {select_list}, {CHUNK_ID_COLUMN}
+        FROM (
+            SELECT C.*, MIN({KEY_HASH_COLUMN}) OVER (PARTITION BY {CHUNK_COLUMN}) AS {CHUNK_ID_COLUMN}
+            FROM ({_chunked_rows_sql(full_table_name, columns, key_columns, where)}) C
+        )
+        WHERE {CHUNK_ID_COLUMN} IN ({placeholders})
+        ORDER BY {KEY_HASH_COLUMN}
+        LIMIT ? OFFSET ?
+    """
+
+
+def _key_prefix_condition(key_hash: str, prefixes: Iterable[str]) -> str:
+    """Condition on a key hash starting with one of some hex prefixes of the same length."""
+    prefixes = sorted(set(prefixes))
+    if not prefixes:
+        return "1 = 0"
+    if not all(_HEX_PREFIX.match(prefix) for prefix in prefixes) or len({len(p) for p in prefixes}) > 1:
+        raise ValueError(f"Key ranges must be uppercase hex prefixes of the same length: {prefixes}")
+    values = ", ".join(f"'{prefix}'" for prefix in prefixes)
+    return f"SUBSTRING({key_hash}, 1, {len(prefixes[0])}) IN ({values})"
+
+
+def key_range_condition(key_columns: List[str], prefixes: Iterable[str]) -> str:
+    """Condition on the rows of some key ranges, for reading them again."""
+    return _key_prefix_condition(hash_expression(key_columns), prefixes)
+
+
+def key_range_hashes_sql(
+    full_table_name: str,
+    key_columns: List[str],
+    prefix_length: int,
+    parent_prefixes: Optional[Iterable[str]] = None,
+    where: Optional[str] = None,
+    value_columns: Sequence[ValueColumn] = (),
+) -> str:
+    """Query of the row counts and row hash sums of a table's key ranges.
+
+    Ranges are the key hash prefixes of prefix_length hex digits, only within
+    the shorter parent_prefixes if given. A row hash covers the key hash and
+    the canonical text of value_columns.
+    """
+    prefix = f"SUBSTRING({KEY_HASH_COLUMN}, 1, {prefix_length})"
+    value_list = "".join(f", {_quote(column.name)}" for column in value_columns)
+    row_hash = _hash_of([KEY_HASH_COLUMN, *(canonical_value(column) for column in value_columns)])
+    return f"""
+        SELECT {prefix}, COUNT(*),
+               SUM({_hex_to_bigint(ROW_HASH_COLUMN, ROW_HASH_SLICES[0])}),
+               SUM({_hex_to_bigint(ROW_HASH_COLUMN, ROW_HASH_SLICES[1])})
+        FROM (
+            SELECT {KEY_HASH_COLUMN}, {row_hash} AS {ROW_HASH_COLUMN}
+            FROM (
+                SELECT {hash_expression(key_columns)} AS {KEY_HASH_COLUMN}{value_list}
+                FROM {full_table_name}
+                {f"WHERE {where}" if where else ""}
+            ) K
+            {f"WHERE {_key_prefix_condition(KEY_HASH_COLUMN, parent_prefixes)}" if parent_prefixes is not None else ""}
+        ) R
+        GROUP BY {prefix}
+        ORDER BY 1
+    """
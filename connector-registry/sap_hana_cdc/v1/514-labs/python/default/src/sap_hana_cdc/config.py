@@ -1,7 +1,18 @@
 """Configuration models for SAP HANA CDC connector."""
+import json
 import os
 from dataclasses import dataclass, field
-from typing import List
+from typing import Dict, List, Optional
+
+
+@dataclass
+class TableFilter:
+    """Columns and rows of a source table that are captured and loaded."""
+    # Column allow-list; primary key columns are always included. None keeps every column
+    columns: Optional[List[str]] = None
+    # SQL condition on the table's columns, e.g. "MANDT = '100'". None keeps every row
+    where: Optional[str] = None
+
 
 @dataclass
 class SAPHanaCDCConfig:
@@ -15,16 +26,42 @@ class SAPHanaCDCConfig:
     tables: List[str] = field(default_factory=lambda: [])
     source_schema: str = "SAPHANADB"
     cdc_schema: str = "SAPHANADB"
+    # Fetch changes and advance the checkpoint in one call to a stored procedure
+    use_fetch_procedure: bool = False
+    # Group commit: write checkpoints every N batches or T seconds (0 disables a trigger)
+    checkpoint_every_batches: int = 1
+    checkpoint_interval_seconds: float = 0.0
+    # Column allow-lists and row conditions by table name
+    table_filters: Dict[str, TableFilter] = field(default_factory=dict)
+    # Tables synced by comparing chunk checksums instead of triggers (views always are)
+    hash_sync_tables: List[str] = field(default_factory=list)
 
     def __post_init__(self):
         # Trim all values of tables and remove empties
         if self.tables:
             self.tables = [t.strip() for t in self.tables if t.strip()]
+        if self.hash_sync_tables:
+            self.hash_sync_tables = [t.strip() for t in self.hash_sync_tables if t.strip()]
 
 
+    def get_table_filter(self, table_name: str) -> TableFilter:
+        """Filter of a table, one keeping every column and row if none is configured."""
+        return self.table_filters.get(table_name) or TableFilter()
+
+    @staticmethod
+    def load_table_filters(path: str) -> Dict[str, TableFilter]:
+        """Read table filters from a JSON file: {"EKKO": {"columns": [...], "where": "..."}}."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return {
+            table_name: TableFilter(columns=table.get("columns"), where=table.get("where"))
+            for table_name, table in data.items()
+        }
+
     @staticmethod
     def from_env(prefix: str = "SAP_HANA_") -> "SAPHanaCDCConfig":
         port_str = os.getenv(f"{prefix}PORT", "30015")
+        table_filters_file = os.getenv(f"{prefix}TABLE_FILTERS_FILE", "")
         return SAPHanaCDCConfig(
             host=os.getenv(f"{prefix}HOST", "localhost"),
             port=int(port_str),
@@ -34,6 +71,11 @@ class SAPHanaCDCConfig:
             tables=os.getenv(f"{prefix}TABLES", "").split(","),
             source_schema=os.getenv(f"{prefix}SOURCE_SCHEMA", "SAPHANADB"),
             cdc_schema=os.getenv(f"{prefix}CDC_SCHEMA", "SAPHANADB"),
+            use_fetch_procedure=os.getenv(f"{prefix}USE_FETCH_PROCEDURE", "false").strip().lower() in ("1", "true", "yes"),
+            checkpoint_every_batches=int(os.getenv(f"{prefix}CHECKPOINT_EVERY_BATCHES", "1")),
+            checkpoint_interval_seconds=float(os.getenv(f"{prefix}CHECKPOINT_INTERVAL_SECONDS", "0")),
+            table_filters=SAPHanaCDCConfig.load_table_filters(table_filters_file) if table_filters_file else {},
+            hash_sync_tables=os.getenv(f"{prefix}HASH_SYNC_TABLES", "").split(","),
         )
 
     def __str__(self) -> str:
@@ -47,5 +89,10 @@ class SAPHanaCDCConfig:
             f"  tables={self.tables!r},\n"
             f"  source_schema={self.source_schema!r},\n"
             f"  cdc_schema={self.cdc_schema!r},\n"
+            f"  use_fetch_procedure={self.use_fetch_procedure!r},\n"
+            f"  checkpoint_every_batches={self.checkpoint_every_batches!r},\n"
+            f"  checkpoint_interval_seconds={self.checkpoint_interval_seconds!r},\n"
+            f"  table_filters={self.table_filters!r},\n"
+            f"  hash_sync_tables={self.hash_sync_tables!r},\n"
             f")"
         )
\ No newline at end of file
@@ -2,11 +2,13 @@
 
 import logging
 from hdbcli import dbapi
-from typing import List, Optional, Dict, Set, Any, Callable
+from typing import Collection, List, Optional, Dict, Sequence, Set, Any, Callable
 from datetime import datetime
 
 from .config import SAPHanaCDCConfig
-from .models import BatchChange, ClientTableStatus, PruneResult, TableStatus
+from .models import (
+    BatchChange, ChunkDiff, ChunkHash, ClientTableStatus, PruneResult, TableStatus, TriggerDrift, ValueColumn
+)
 from .infrastructure import SAPHanaCDCInfrastructure
 from .reader import SAPHanaCDCReader
 
@@ -80,16 +82,60 @@ class SAPHanaCDCConnector:
         """
         return self.reader.get_changes(limit)
     
+    def get_changes_and_checkpoint(self, previous_batch: Optional[BatchChange], limit: int = 1000) -> BatchChange:
+        """Checkpoint a processed batch and get the next batch of changes.
+
+        With ``use_fetch_procedure`` enabled both steps run in one call to the
+        ``CDC_FETCH_CHANGES`` procedure; otherwise this is update_client_status
+        followed by get_changes.
+        """
+        if self.config.use_fetch_procedure:
+            return self.reader.fetch_changes_and_checkpoint(previous_batch, limit)
+        if previous_batch:
+            self.reader.update_client_status(previous_batch)
+        return self.reader.get_changes(limit)
+
     def reset_cdc_status(self) -> None:
         """Reset CDC status for all tables."""
+        self.reader.discard_pending_checkpoint()
         self.infrastructure.reset_cdc_status()
+        self.reader.invalidate_watermarks()
+
+    def set_table_status_active(self, table_name: str) -> None:
+        """Mark a table as ACTIVE once its initial load has completed.
+
+        The reader's cached watermarks are invalidated so the next call to
+        get_changes picks up the newly active table.
+        """
+        self.reader.flush_checkpoint()
+        self.infrastructure.set_table_status_active(table_name)
+        self.reader.invalidate_watermarks()
     
-    def update_client_status(self, batch: BatchChange) -> None:
+    def update_client_status(self, batch: BatchChange, failed_tables: Optional[Collection[str]] = None) -> None:
         """Update client processing status.
         
-        This method requires regular database privileges.
+        This method requires regular database privileges. With group commit
+        configured, the status table may only be written by a later call or by
+        flush_checkpoint. Tables in ``failed_tables`` are not checkpointed and
+        are skipped by get_changes until their backoff expires.
+        """
+        self.reader.update_client_status(batch, failed_tables)
+
+    def mark_read(self, batch: BatchChange) -> None:
+        """Continue the next get_changes after a batch without checkpointing it.
+
+        For changes that are buffered before delivery; the batch's tables must
+        be passed to update_client_status once they are delivered or failed.
         """
-        self.reader.update_client_status(batch)
+        self.reader.mark_read(batch)
+
+    def flush_checkpoint(self) -> None:
+        """Write any checkpoint still pending a group commit to the status table."""
+        self.reader.flush_checkpoint()
+
+    def flush_checkpoint_if_due(self) -> None:
+        """Write the checkpoint pending a group commit if its batch count or interval is reached."""
+        self.reader.flush_checkpoint_if_due()
     
     def get_current_monitored_tables(self) -> Dict[str, Set[str]]:
         """Get currently monitored tables and their enabled change types.
@@ -98,7 +144,7 @@ class SAPHanaCDCConnector:
         """
         return self.reader.get_current_monitored_tables()
     
-    def get_all_table_rows(self, table_name: str, page_size: int = 1000, offset: int = 0):
+    def get_all_table_rows(self, table_name: str, page_size: int = 1000, offset: int = 0, where: Optional[str] = None):
         """Get all rows from a given table with transparent pagination.
         
         This method requires regular database privileges.
@@ -110,7 +156,29 @@ class SAPHanaCDCConnector:
         Yields:
             Dict[str, Any]: Dictionary representing a single row with column names as keys
         """
-        return self.reader.get_all_table_rows(table_name, page_size, offset)
+        return self.reader.get_all_table_rows(table_name, page_size, offset, where)
+
+    def get_max_change_id(self) -> int:
+        """Get the highest CHANGE_ID captured so far.
+
+        Rows read from a source table after this call are at least as recent as
+        every change up to this CHANGE_ID.
+        """
+        return self.reader.get_max_change_id()
+
+    def detect_trigger_drift(self, table_names: Optional[List[str]] = None) -> List[TriggerDrift]:
+        """Find monitored tables whose columns changed since their CDC triggers were created.
+
+        This method requires elevated database privileges.
+        """
+        return self.infrastructure.detect_trigger_drift(table_names)
+
+    def refresh_table_triggers(self, table_name: str) -> None:
+        """Recreate a table's CDC triggers so they capture its current columns.
+
+        This method requires elevated database privileges.
+        """
+        self.infrastructure.refresh_table_triggers(table_name)
     
     def get_client_status(self) -> List[ClientTableStatus]:
         return self.reader.get_client_status()
@@ -126,6 +194,76 @@ class SAPHanaCDCConnector:
         """
         return self.infrastructure._is_view(object_name)
 
+    def is_hash_synced(self, object_name: str) -> bool:
+        """Check if an object is synced by chunk checksums instead of triggers (views and hash_sync_tables)."""
+        return object_name in self.config.hash_sync_tables or self.is_view(object_name)
+
+    def get_chunk_diff(self, table_name: str, chunk_size: int = 10000) -> ChunkDiff:
+        """Compare the current chunk checksums of a table or view with the stored ones.
+
+        This method requires regular database privileges.
+
+        Args:
+            table_name: Name of the table or view
+            chunk_size: Expected number of rows per chunk
+
+        Returns:
+            ChunkDiff with the chunks that are new or changed and the ids of removed chunks
+        """
+        stored = {chunk.chunk_id: chunk for chunk in self.reader.get_stored_chunk_hashes(table_name)}
+        current = self.reader.get_chunk_hashes(table_name, chunk_size)
+        current_ids = {chunk.chunk_id for chunk in current}
+        return ChunkDiff(
+            current=current,
+            changed=[chunk for chunk in current if stored.get(chunk.chunk_id) != chunk],
+            removed=[chunk_id for chunk_id in stored if chunk_id not in current_ids],
+            first_sync=not stored,
+        )
+
+    def get_chunk_rows(
+        self, table_name: str, chunk_ids: List[str], chunk_size: int = 10000, page_size: int = 10000, offset: int = 0
+    ):
+        """Get a page of the rows of some chunks of a table or view, as (chunk id, row) tuples."""
+        return self.reader.get_chunk_rows(table_name, chunk_ids, chunk_size, page_size, offset)
+
+    def store_chunk_hashes(self, table_name: str, chunks: List[ChunkHash]) -> None:
+        """Record the chunk checksums a table or view was synced to."""
+        self.reader.store_chunk_hashes(table_name, chunks)
+
+    def get_primary_key_columns(self, table_name: str) -> List[str]:
+        """Get the primary key columns of a table, in key order."""
+        return self.reader.get_primary_key_columns(table_name)
+
+    def get_key_range_hashes(
+        self,
+        table_name: str,
+        prefix_length: int,
+        parent_prefixes: Optional[List[str]] = None,
+        value_columns: Sequence[ValueColumn] = (),
+    ) -> List[ChunkHash]:
+        """Get the row counts and checksums of a table's key ranges, for reconciling it with a replica.
+
+        A key range holds the rows whose primary key hash starts with a prefix
+        of prefix_length hex digits (see sap_hana_cdc.chunk_hashes).
+
+        Args:
+            table_name: Name of the table
+            prefix_length: Hex digits of the key hash prefix identifying a range
+            parent_prefixes: Only the ranges within these shorter prefixes, all if None
+            value_columns: Non-key columns whose values the checksums cover, as
+                the canonical text of their kind, the way the replica stores them
+
+        Returns:
+            List[ChunkHash]: Non-empty ranges in prefix order, with the prefix as chunk id
+        """
+        return self.reader.get_key_range_hashes(table_name, prefix_length, parent_prefixes, value_columns)
+
+    def get_key_range_rows(
+        self, table_name: str, prefixes: List[str], page_size: int = 10000, offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Get a page of the rows of some key ranges of a table."""
+        return self.reader.get_key_range_rows(table_name, prefixes, page_size, offset)
+
     def cleanup_cdc_infrastructure(self) -> None:
         """Remove all CDC infrastructure.
         
@@ -144,6 +282,9 @@ class SAPHanaCDCConnector:
             Dict containing:
             - total_entries: Total number of entries in the CDC change table
             - lag_seconds: Lag in seconds (max insert timestamp - last client update)
+            - max_change_id: Highest CHANGE_ID in the change table
+            - change_id_lag: Number of change IDs the least advanced active table is behind
+            - pending_changes: Number of changes of active tables the client hasn't read
         """
         return self.reader.get_status(client_id)
     
@@ -13,7 +13,7 @@ from hdbcli import dbapi
 
 from .base import SAPHanaCDCBase
 from .config import SAPHanaCDCConfig
-from .models import TriggerType, TableStatus
+from .models import TriggerDrift, TriggerType, TableStatus
 
 
 logger = logging.getLogger(__name__)
@@ -29,6 +29,9 @@ class SAPHanaCDCInfrastructure(SAPHanaCDCBase):
     - Managing CDC infrastructure lifecycle
     """
     TRIGGER_NAME_SUFFIX = "_CDC_TRIGGER"
+    # Captured columns in the trigger bodies, e.g. :new_row."EBELN"; columns
+    # selected AS themselves only feed the row condition
+    TRIGGER_COLUMN_PATTERN = re.compile(r':(?:new|old)_row\."((?:[^"]|"")+)"(?! AS )')
 
     def __init__(self, connection: dbapi.Connection, config: SAPHanaCDCConfig):
         super().__init__(connection, config)
@@ -36,8 +39,12 @@ class SAPHanaCDCInfrastructure(SAPHanaCDCBase):
     def setup_cdc_infrastructure(self) -> None:
         """Set up complete CDC infrastructure for the given configuration."""
         self.create_change_table()
+        self.create_change_table_index()
         self.create_client_status_table()
+        self.create_chunk_hashes_table()
         self.initialize_client_status_table()
+        if self.config.use_fetch_procedure:
+            self.create_fetch_procedure()
         # Setup triggers for monitored tables
         self.setup_table_triggers()
         
@@ -61,6 +68,28 @@ class SAPHanaCDCInfrastructure(SAPHanaCDCBase):
         
         self._ensure_table_exists(self.CDC_CHANGES_TABLE, table_definition)
     
+    def create_change_table_index(self) -> None:
+        """Create the index backing the reader's per-table CHANGE_ID range scans."""
+        index_name = f"{self.CDC_CHANGES_TABLE}_TABLE_IDX"
+        full_index_name = f"{self.config.cdc_schema}.{index_name}"
+
+        with self.connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT COUNT(*)
+                FROM INDEXES
+                WHERE SCHEMA_NAME = ? AND INDEX_NAME = ?
+            """, (self.config.cdc_schema, index_name))
+            result = cursor.fetchone()
+            if result and result[0] > 0:
+                logger.info(f"Index {full_index_name} already exists")
+                return
+
+            cursor.execute(f"""
+                CREATE INDEX {full_index_name}
+                ON {self.full_changes_table_name} (TABLE_SCHEMA, TABLE_NAME, CHANGE_ID)
+            """)
+            logger.info(f"Created index {full_index_name}")
+
     def create_client_status_table(self) -> None:
         """Create the client status table for tracking table processing status."""
         table_definition = f"""
@@ -77,6 +106,80 @@ class SAPHanaCDCInfrastructure(SAPHanaCDCBase):
         """
         self._ensure_table_exists(self.CDC_CLIENT_STATUS_TABLE, table_definition)
 
+    def create_chunk_hashes_table(self) -> None:
+        """Create the table of chunk checksums of the objects synced without triggers."""
+        table_definition = f"""
+            CREATE TABLE <TABLENAME> (
+                CLIENT_ID VARCHAR(128) NOT NULL,
+                SCHEMA_NAME VARCHAR(128) NOT NULL,
+                TABLE_NAME VARCHAR(128) NOT NULL,
+                CHUNK_ID VARCHAR(64) NOT NULL,
+                ROW_COUNT BIGINT NOT NULL,
+                CHECKSUM VARCHAR(64) NOT NULL,
+                PRIMARY KEY (CLIENT_ID, SCHEMA_NAME, TABLE_NAME, CHUNK_ID)
+            )
+        """
+        self._ensure_table_exists(self.CDC_CHUNK_HASHES_TABLE, table_definition)
+
+    def create_fetch_procedure(self) -> None:
+        """Create the procedure that checkpoints a batch and returns the next one.
+
+        ``CDC_FETCH_CHANGES(client_id, schema_name, checkpoint, watermarks, limit)``
+        first applies the checkpoint, a JSON array of ``{"table_name": ..., "change_id": ...}``
+        objects (or NULL), to the client status table and commits it. It then returns
+        up to ``limit`` changes past the watermarks, an array of the same shape
+        listing the tables to read, so a sync cycle needs a single call instead of
+        a query, one UPDATE per table and a commit. The watermarks come from the
+        reader, so changes it read ahead and tables in backoff are honored.
+        """
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"""
+                CREATE OR REPLACE PROCEDURE {self.full_fetch_procedure_name} (
+                    IN in_client_id NVARCHAR(128),
+                    IN in_schema_name NVARCHAR(128),
+                    IN in_checkpoint NCLOB,
+                    IN in_watermarks NCLOB,
+                    IN in_limit INTEGER
+                )
+                LANGUAGE SQLSCRIPT
+                SQL SECURITY INVOKER
+                AS
+                BEGIN
+                    IF :in_checkpoint IS NOT NULL THEN
+                        MERGE INTO {self.full_client_status_table_name} AS st
+                        USING (
+                            SELECT TABLE_NAME, MAX(CHANGE_ID) AS CHANGE_ID
+                            FROM JSON_TABLE(:in_checkpoint, '$[*]' COLUMNS (
+                                TABLE_NAME NVARCHAR(128) PATH '$.table_name',
+                                CHANGE_ID BIGINT PATH '$.change_id'
+                            ))
+                            GROUP BY TABLE_NAME
+                        ) AS cp
+                        ON st.CLIENT_ID = :in_client_id
+                            AND st.SCHEMA_NAME = :in_schema_name
+                            AND st.TABLE_NAME = cp.TABLE_NAME
+                        WHEN MATCHED THEN UPDATE SET
+                            LAST_PROCESSED_CHANGE_ID = cp.CHANGE_ID,
+                            UPDATED_AT = CURRENT_TIMESTAMP;
+                        COMMIT;
+                    END IF;
+
+                    SELECT ct.CHANGE_ID, ct.TABLE_SCHEMA, ct.TABLE_NAME, ct.TRIGGER_TYPE,
+                           ct.CHANGE_TIMESTAMP, ct.TRANSACTION_ID, ct.OLD_VALUES, ct.NEW_VALUES
+                    FROM {self.full_changes_table_name} ct
+                    INNER JOIN JSON_TABLE(:in_watermarks, '$[*]' COLUMNS (
+                        TABLE_NAME NVARCHAR(128) PATH '$.table_name',
+                        CHANGE_ID BIGINT PATH '$.change_id'
+                    )) AS wm
+                        ON ct.TABLE_NAME = wm.TABLE_NAME
+                    WHERE ct.TABLE_SCHEMA = :in_schema_name
+                        AND ct.CHANGE_ID > wm.CHANGE_ID
+                    ORDER BY ct.CHANGE_ID ASC
+                    LIMIT :in_limit;
+                END
+            """)
+            logger.info(f"Created procedure {self.full_fetch_procedure_name}")
+
     def initialize_client_status_table(self) -> None:
         """Initialize the client status table."""
         with self.connection.cursor() as cursor:
@@ -173,9 +276,19 @@ class SAPHanaCDCInfrastructure(SAPHanaCDCBase):
             # Remove triggers for all tables
             for table_name in monitored_tables:
                 self._cleanup_table_cdc(cursor, table_name)
+
+            try:
+                cursor.execute(f"DROP PROCEDURE {self.full_fetch_procedure_name}")
+                logger.info(f"Dropped procedure {self.full_fetch_procedure_name}")
+            except Exception as e:
+                logger.debug(f"Could not drop procedure {self.full_fetch_procedure_name}: {e}")
             
             # Drop status table
-            tables_to_drop = [self.full_client_status_table_name, self.full_changes_table_name]
+            tables_to_drop = [
+                self.full_client_status_table_name,
+                self.full_changes_table_name,
+                self.full_chunk_hashes_table_name,
+            ]
             for table_name in tables_to_drop:
                 try:
                     cursor.execute(f"DROP TABLE {table_name}")
@@ -218,11 +331,13 @@ class SAPHanaCDCInfrastructure(SAPHanaCDCBase):
                 return False
 
     def _filter_tables_only(self, object_names: List[str]) -> List[str]:
-        """Filter to include only tables, excluding views."""
+        """Filter to include only tables, excluding views and tables synced by chunk checksums."""
         tables = []
         for name in object_names:
             if self._is_view(name):
                 logger.info(f"Skipping trigger creation for view: {name}")
+            elif name in self.config.hash_sync_tables:
+                logger.info(f"Skipping trigger creation for table synced by checksums: {name}")
             else:
                 tables.append(name)
         return tables
@@ -264,12 +379,14 @@ class SAPHanaCDCInfrastructure(SAPHanaCDCBase):
             raise
   
     
-    def _create_trigger(self, cursor: dbapi.Cursor, table_name: str, trigger_type: TriggerType) -> bool:
-        """Create a trigger for a table."""
+    def _create_trigger(
+        self, cursor: dbapi.Cursor, table_name: str, trigger_type: TriggerType, replace: bool = False
+    ) -> bool:
+        """Create a trigger for a table, or replace the existing one with replace=True."""
         trigger_name = self._get_trigger_name(table_name, trigger_type)
         
         # Check if trigger already exists
-        if self._check_trigger_exists(cursor, table_name, trigger_type):
+        if not replace and self._check_trigger_exists(cursor, table_name, trigger_type):
             return False
         
         change_table = self.full_changes_table_name
@@ -287,14 +404,7 @@ class SAPHanaCDCInfrastructure(SAPHanaCDCBase):
             else:  # UPDATE
                 referencing_clause = "REFERENCING OLD ROW AS old_row, NEW ROW AS new_row"
 
-            trigger_sql = f"""
-                CREATE TRIGGER {trigger_name}
-                AFTER {trigger_type.value} ON {quoted_schema_name}.{quoted_table_name}
-                {referencing_clause}
-                FOR EACH ROW
-                BEGIN
-                    DECLARE old_json NCLOB;
-                    DECLARE new_json NCLOB;
+            capture_sql = f"""
                     {self._create_select_stmt(table_name, "old_row", "old_json") if trigger_type != TriggerType.INSERT else ""}
                     {self._create_select_stmt(table_name, "new_row", "new_json") if trigger_type != TriggerType.DELETE else ""}
 
@@ -308,6 +418,35 @@ class SAPHanaCDCInfrastructure(SAPHanaCDCBase):
                         :old_json,
                         :new_json
                     );
+            """
+            where = self.config.get_table_filter(table_name).where
+            if where:
+                row_vars = {
+                    TriggerType.INSERT: ["new_row"],
+                    TriggerType.UPDATE: ["old_row", "new_row"],
+                    TriggerType.DELETE: ["old_row"],
+                }[trigger_type]
+                # Only rows matching the table's condition are captured; an
+                # update is captured if the row matched before or after it
+                capture_sql = f"""
+                    DECLARE in_scope INTEGER;
+                    SELECT COUNT(*) INTO in_scope FROM (
+                        {self._create_row_select(table_name, row_vars)}
+                    ) WHERE {where};
+                    IF :in_scope > 0 THEN
+                        {capture_sql}
+                    END IF;
+                """
+
+            trigger_sql = f"""
+                CREATE {"OR REPLACE " if replace else ""}TRIGGER {trigger_name}
+                AFTER {trigger_type.value} ON {quoted_schema_name}.{quoted_table_name}
+                {referencing_clause}
+                FOR EACH ROW
+                BEGIN
+                    DECLARE old_json NCLOB;
+                    DECLARE new_json NCLOB;
+                    {capture_sql}
                 END
             """
             cursor.execute(trigger_sql)
@@ -320,18 +459,7 @@ class SAPHanaCDCInfrastructure(SAPHanaCDCBase):
     
     def _create_select_stmt(self, table_name: str, source_var: str, dest_var: str) -> str:
         """Create a SELECT statement for a table."""
-        # Get column information directly from the database
-        query = """
-            SELECT COLUMN_NAME
-            FROM TABLE_COLUMNS 
-            WHERE SCHEMA_NAME = ? AND TABLE_NAME = ?
-            ORDER BY POSITION
-        """
-        
-        with self.connection.cursor() as cursor:
-            cursor.execute(query, (self.config.source_schema, table_name))
-            columns = [row[0] for row in cursor.fetchall()]
-        
+        columns = self.get_captured_columns(table_name)
         if not columns:
             raise ValueError(f"No columns found for table {table_name}")
 
@@ -340,7 +468,91 @@ class SAPHanaCDCInfrastructure(SAPHanaCDCBase):
                 SELECT {select_columns} INTO {dest_var} FROM DUMMY FOR JSON;
         """
         return query
-    
+
+    def _create_row_select(self, table_name: str, row_vars: List[str]) -> str:
+        """Select the columns the table's row condition refers to from trigger row variables.
+
+        The condition is evaluated over this select, so it is written in terms
+        of the table's columns like any WHERE clause.
+        """
+        columns = self.get_filter_columns(table_name) or self.get_captured_columns(table_name)[:1]
+        return " UNION ALL ".join(
+            "SELECT " + ", ".join(f':{row_var}."{col}" AS "{col}"' for col in columns) + " FROM DUMMY"
+            for row_var in row_vars
+        )
+
+    def get_trigger_columns(self, table_name: str) -> Optional[List[str]]:
+        """Get the columns a table's CDC triggers capture, read from their definitions.
+
+        Returns:
+            Column names in capture order, or None if the table has no CDC trigger
+        """
+        with self.connection.cursor() as cursor:
+            for trigger_type in TriggerType:
+                cursor.execute("""
+                    SELECT DEFINITION
+                    FROM TRIGGERS
+                    WHERE SCHEMA_NAME = ? AND TRIGGER_NAME = ?
+                """, (self.config.source_schema, self._get_trigger_name(table_name, trigger_type)))
+                row = cursor.fetchone()
+                if row and row[0]:
+                    columns = [
+                        column.replace('""', '"')
+                        for column in self.TRIGGER_COLUMN_PATTERN.findall(str(row[0]))
+                    ]
+                    # The UPDATE trigger lists every column twice (old and new row)
+                    return list(dict.fromkeys(columns))
+        return None
+
+    def detect_trigger_drift(self, table_names: Optional[List[str]] = None) -> List[TriggerDrift]:
+        """Find monitored tables whose columns changed since their triggers were created.
+
+        A trigger captures the column list of its table at creation time, so
+        columns added later are missing from the captured rows. Columns left
+        out by the table's column allow-list don't count.
+
+        Args:
+            table_names: Tables to check; all monitored tables if None
+
+        Returns:
+            A TriggerDrift for each table whose columns differ from its triggers'
+        """
+        monitored_tables = self.get_monitored_tables()
+        if table_names is not None:
+            monitored_tables = [table for table in monitored_tables if table in set(table_names)]
+
+        drifts = []
+        for table_name in monitored_tables:
+            trigger_columns = self.get_trigger_columns(table_name)
+            if trigger_columns is None:
+                continue
+            table_columns = self.get_captured_columns(table_name)
+            drift = TriggerDrift(
+                table_name=table_name,
+                added_columns=[column for column in table_columns if column not in trigger_columns],
+                removed_columns=[column for column in trigger_columns if column not in table_columns],
+            )
+            if drift.has_drift:
+                logger.info(
+                    f"CDC triggers of {table_name} are out of date: added {drift.added_columns}, "
+                    f"removed {drift.removed_columns}"
+                )
+                drifts.append(drift)
+        return drifts
+
+    def refresh_table_triggers(self, table_name: str) -> None:
+        """Recreate a table's CDC triggers with its current columns.
+
+        The triggers are replaced in place (CREATE OR REPLACE), so no change
+        goes uncaptured while they are updated. The table's CDC status is left
+        as it is.
+        """
+        with self.connection.cursor() as cursor:
+            for trigger_type in TriggerType:
+                self._create_trigger(cursor, table_name, trigger_type, replace=True)
+        self.connection.commit()
+        logger.info(f"Refreshed CDC triggers of {table_name}")
+
     def _get_trigger_name(self, table_name: str, trigger_type: TriggerType) -> str:
         """Get the name of a trigger for a table."""
         # Sanitize table_name to be a valid trigger name (alphanumeric and underscores only)
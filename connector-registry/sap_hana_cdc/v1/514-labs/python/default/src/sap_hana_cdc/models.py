@@ -17,6 +17,19 @@ class TableStatus(StrEnum):
     NEW = auto()
     ACTIVE = auto()
 
+@dataclass
+class TriggerDrift:
+    """Difference between the columns a table's CDC triggers capture and the table's columns."""
+    table_name: str
+    # Columns of the table the triggers don't capture yet
+    added_columns: List[str] = field(default_factory=list)
+    # Columns the triggers capture that the table no longer has
+    removed_columns: List[str] = field(default_factory=list)
+
+    @property
+    def has_drift(self) -> bool:
+        return bool(self.added_columns or self.removed_columns)
+
 @dataclass
 class ClientTableStatus:
     schema_name: str
@@ -130,6 +143,65 @@ class BatchChange:
         return f"BatchChange(changes={len(self.changes)})"
 
 
+@dataclass
+class ChunkHash:
+    """Checksum of a chunk of a table's or view's rows.
+
+    Chunks are bounded by the rows whose key hash falls under a threshold, so
+    inserting or deleting a row only changes the chunk it falls in.
+    """
+    # Smallest key hash in the chunk
+    chunk_id: str
+    row_count: int
+    checksum: str
+
+
+class ValueKind(StrEnum):
+    """Canonical text a column's values are hashed as when reconciling a table."""
+    # Text; '' hashes as NULL
+    TEXT = auto()
+    # Integer digits; 0 hashes as NULL
+    INTEGER = auto()
+    # Digits at the column's scale; 0 hashes as NULL
+    DECIMAL = auto()
+    # YYYY-MM-DD
+    DATE = auto()
+    # YYYY-MM-DD HH:MM:SS, fractions of seconds left out
+    TIMESTAMP = auto()
+    # 1 or 0
+    BOOLEAN = auto()
+
+
+@dataclass(frozen=True)
+class ValueColumn:
+    """A non-key column whose values are part of a table's key range checksums."""
+    name: str
+    kind: ValueKind
+    # Digits after the decimal point of DECIMAL values
+    scale: int = 0
+
+
+@dataclass
+class ChunkDiff:
+    """Chunks of a table or view that changed since their checksums were stored."""
+    # Chunks as they are now
+    current: List[ChunkHash] = field(default_factory=list)
+    # Current chunks that are new or whose rows changed
+    changed: List[ChunkHash] = field(default_factory=list)
+    # Stored chunk ids that no longer exist
+    removed: List[str] = field(default_factory=list)
+    # No checksums were stored before, e.g. after a full load
+    first_sync: bool = False
+
+    @property
+    def unchanged(self) -> List[ChunkHash]:
+        changed_ids = {chunk.chunk_id for chunk in self.changed}
+        return [chunk for chunk in self.current if chunk.chunk_id not in changed_ids]
+
+    def is_empty(self) -> bool:
+        return not (self.changed or self.removed)
+
+
 @dataclass
 class PruneResult:
     """Represents the result of a database pruning operation."""
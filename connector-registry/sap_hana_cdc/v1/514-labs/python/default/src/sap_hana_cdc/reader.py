@@ -6,8 +6,9 @@ Requires regular database privileges (no elevated access needed).
 
 import json
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set, Any, Iterator
+from typing import Collection, Dict, List, Optional, Sequence, Set, Any, Iterator, Tuple
 
 from hdbcli import dbapi
 from tenacity import (
@@ -18,8 +19,17 @@ from tenacity import (
 )
 
 from .config import SAPHanaCDCConfig
-from .models import BatchChange, ChangeEvent, ClientTableStatus, TableStatus, TriggerType, PruneResult
+from .models import (
+    BatchChange, ChangeEvent, ChunkHash, ClientTableStatus, TableStatus, TriggerType, PruneResult, ValueColumn
+)
 from .base import SAPHanaCDCBase
+from .chunk_hashes import (
+    boundary_threshold,
+    chunk_hashes_sql,
+    chunk_rows_sql,
+    key_range_condition,
+    key_range_hashes_sql,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +46,44 @@ class SAPHanaCDCReader(SAPHanaCDCBase):
     - Pruning old CDC entries
     """
     
+    # A single CHANGE_ID range scan is used for the tables whose watermarks lie
+    # within this many batches of the highest one. Tables further behind (e.g.
+    # quiet tables, whose watermarks only move when they change) get an index
+    # range scan each, so the global scan doesn't re-read what the leading
+    # tables have already processed.
+    GLOBAL_SCAN_MAX_SPREAD_BATCHES = 10
+    # At most this many tables get their own range scan in a poll; with more
+    # tables behind, one global scan from the lowest watermark is used instead,
+    # so the query and its parameters don't grow with the number of tables.
+    MAX_PER_TABLE_SCANS = 16
+
+    # Tables whose changes could not be delivered are left out of polls for
+    # TABLE_BACKOFF_BASE_SECONDS * 2^(failures - 1), capped at TABLE_BACKOFF_MAX_SECONDS.
+    TABLE_BACKOFF_BASE_SECONDS = 30
+    TABLE_BACKOFF_MAX_SECONDS = 900
+
+    CHANGE_COLUMNS = (
+        "CHANGE_ID, TABLE_SCHEMA, TABLE_NAME, TRIGGER_TYPE, "
+        "CHANGE_TIMESTAMP, TRANSACTION_ID, OLD_VALUES, NEW_VALUES"
+    )
+
+    def __init__(self, connection: dbapi.Connection, config: SAPHanaCDCConfig):
+        super().__init__(connection, config)
+        # Last processed CHANGE_ID per active table, loaded lazily from the status table
+        self._watermarks: Optional[Dict[str, int]] = None
+        # Result of the last MAX(CHANGE_ID) probe of the change table
+        self.last_probed_change_id: Optional[int] = None
+        # (MAX(CHANGE_ID), COUNT(*)) of the change table when a poll last found nothing pending
+        self._drained_at: Optional[Tuple[int, int]] = None
+        # Per-table checkpoint not yet written to the status table (group commit)
+        self._pending_checkpoint: Dict[str, int] = {}
+        self._pending_batches = 0
+        self._last_checkpoint_at = time.monotonic()
+        # Per-table CHANGE_ID read past by mark_read but not yet checkpointed
+        self._read_through: Dict[str, int] = {}
+        # Per-table (consecutive failures, monotonic time until which it is skipped)
+        self._table_backoff: Dict[str, Tuple[int, float]] = {}
+
     def _get_change_table_name(self) -> str:
         """Get the full name of the CDC changes table."""
         return self.full_changes_table_name
@@ -43,7 +91,75 @@ class SAPHanaCDCReader(SAPHanaCDCBase):
     def _get_client_status_table_name(self) -> str:
         """Get the full name of the CDC client status table."""
         return self.full_client_status_table_name
-    
+
+    def invalidate_watermarks(self) -> None:
+        """Drop the cached watermarks so they are reloaded on the next poll.
+
+        Must be called whenever a table changes state in the status table
+        (e.g. NEW -> ACTIVE, or a status reset).
+        """
+        self._watermarks = None
+        self._drained_at = None
+
+    def _probe_high_water(self, cursor: dbapi.Cursor) -> Optional[int]:
+        """Get the highest CHANGE_ID in the change table.
+
+        MAX over the identity primary key is answered from the index, so this is a
+        constant-time check regardless of the change table's size.
+        """
+        cursor.execute(f"SELECT MAX(CHANGE_ID) FROM {self.full_changes_table_name}")
+        result = cursor.fetchone()
+        high_water = result[0] if result and result[0] is not None else None
+        self.last_probed_change_id = high_water
+        return high_water
+
+    def _probe_change_table(self, cursor: dbapi.Cursor) -> Tuple[Optional[int], int]:
+        """Get the highest CHANGE_ID in the change table and its number of rows.
+
+        CHANGE_IDs are assigned when a trigger fires, not at commit, so a change
+        that commits late can appear below the highest CHANGE_ID; it still
+        raises the row count. Both are answered without scanning the table.
+        """
+        cursor.execute(f"SELECT MAX(CHANGE_ID), COUNT(*) FROM {self.full_changes_table_name}")
+        result = cursor.fetchone()
+        high_water = result[0] if result and result[0] is not None else None
+        self.last_probed_change_id = high_water
+        return high_water, int(result[1] or 0) if result else 0
+
+    def get_max_change_id(self) -> int:
+        """Get the highest CHANGE_ID captured so far, 0 if the change table is empty."""
+        with self.connection.cursor() as cursor:
+            return self._probe_high_water(cursor) or 0
+
+    def discard_pending_checkpoint(self) -> None:
+        """Forget checkpoints that have not been written yet (e.g. before a status reset)."""
+        self._pending_checkpoint = {}
+        self._pending_batches = 0
+        self._read_through = {}
+
+    def _get_watermarks(self, cursor: dbapi.Cursor) -> Dict[str, int]:
+        """Get the per-table watermarks, loading them from the status table once.
+
+        Checkpoints still pending a group commit, and changes read ahead with
+        mark_read, are newer than the stored values and take precedence.
+        """
+        if self._watermarks is None:
+            cursor.execute(f"""
+                SELECT TABLE_NAME, LAST_PROCESSED_CHANGE_ID
+                FROM {self.full_client_status_table_name}
+                WHERE CLIENT_ID = ? AND SCHEMA_NAME = ? AND STATUS = ?
+            """, (self.config.client_id, self.config.source_schema, TableStatus.ACTIVE.value))
+            self._watermarks = {
+                row[0]: max(
+                    int(row[1] or 0),
+                    self._pending_checkpoint.get(row[0], 0),
+                    self._read_through.get(row[0], 0),
+                )
+                for row in cursor.fetchall()
+            }
+            logger.debug(f"Loaded watermarks for {len(self._watermarks)} active tables")
+        return self._watermarks
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=30),
@@ -51,7 +167,19 @@ class SAPHanaCDCReader(SAPHanaCDCBase):
         reraise=True,
     )
     def get_changes(self, limit: int = 1000) -> BatchChange:
-        """Get changes from the CDC table using the last processed change ID from status table.
+        """Get changes from the CDC table that are newer than each table's watermark.
+
+        Watermarks are kept in memory and only read from the status table when they
+        have been invalidated, so a poll only touches the change table. The changes
+        are read with a single ``CHANGE_ID > watermark`` range scan filtered
+        client-side, plus one range scan for each of the (few) tables whose
+        watermark is far behind the others.
+
+        Every poll first probes MAX(CHANGE_ID) and COUNT(*). When neither changed
+        since the last poll that came back empty, the change query is skipped entirely.
+
+        Tables that recently failed to load (see update_client_status) are left out
+        until their backoff expires.
 
         Args:
             limit: Maximum number of changes to retrieve
@@ -59,60 +187,183 @@ class SAPHanaCDCReader(SAPHanaCDCBase):
         Returns:
             BatchChange: Object containing the retrieved changes
         """
-        table_status_table = self.full_client_status_table_name
         client_id = self.config.client_id
-        
+
         try:
             with self.connection.cursor() as cursor:
-                change_table = self.full_changes_table_name
-                    
-                # Build query to get changes after the last processed change ID
-                query = f"""
-                    SELECT 
-                        ct.CHANGE_ID,
-                        ct.TABLE_SCHEMA,
-                        ct.TABLE_NAME,
-                        ct.TRIGGER_TYPE,
-                        ct.CHANGE_TIMESTAMP,
-                        ct.TRANSACTION_ID,
-                        ct.OLD_VALUES,
-                        ct.NEW_VALUES
-                    FROM {change_table} ct
-                    INNER JOIN {table_status_table} tst
-                        ON ct.TABLE_SCHEMA = tst.SCHEMA_NAME 
-                        AND ct.TABLE_NAME = tst.TABLE_NAME 
-                        AND tst.CLIENT_ID = ?
-                        AND tst.STATUS = ?
-                        AND (
-                            tst.LAST_PROCESSED_CHANGE_ID = 0 OR ct.CHANGE_ID > tst.LAST_PROCESSED_CHANGE_ID
-                        )
-                    ORDER BY CHANGE_TIMESTAMP ASC 
-                    LIMIT ?
-                """
+                watermarks = self._get_watermarks(cursor)
+                if not watermarks:
+                    logger.info(f"No active tables for client {client_id}")
+                    return BatchChange(changes=[])
 
-                cursor.execute(query, (client_id, TableStatus.ACTIVE.value, limit))
-                changes = []
-                for row in cursor.fetchall():
-                    change = ChangeEvent(
-                        event_id=str(row[0]),
-                        event_timestamp=row[4],
-                        trigger_type=TriggerType[row[3].upper()],
-                        transaction_id=str(row[5]),
-                        schema_name=row[1],
-                        table_name=row[2],
-                        full_table_name=f"{row[1]}.{row[2]}",
-                        old_values=self._parse_json(row[6]) if row[6] else None,
-                        new_values=self._parse_json(row[7]) if row[7] else None,
-                    )
-                    changes.append(change)
+                backing_off = self._tables_in_backoff()
+                if backing_off:
+                    watermarks = {t: w for t, w in watermarks.items() if t not in backing_off}
+                    logger.info(f"Skipping tables in backoff: {sorted(backing_off)}")
+                    if not watermarks:
+                        return BatchChange(changes=[])
+
+                high_water, row_count = self._probe_change_table(cursor)
+                if high_water is None or self._drained_at == (high_water, row_count):
+                    logger.debug(f"No new changes since CHANGE_ID {high_water} for client {client_id}")
+                    return BatchChange(changes=[])
+
+                cutoff = max(watermarks.values()) - limit * self.GLOBAL_SCAN_MAX_SPREAD_BATCHES
+                lagging = {t: w for t, w in watermarks.items() if w < cutoff}
+                if not lagging or len(lagging) > self.MAX_PER_TABLE_SCANS:
+                    rows = self._fetch_changes_global(cursor, watermarks, limit)
+                else:
+                    leading = {t: w for t, w in watermarks.items() if t not in lagging}
+                    # Both reads are in CHANGE_ID order, so the first rows of the
+                    # merge hold a prefix of every table's pending changes
+                    rows = sorted(
+                        self._fetch_changes_per_table(cursor, lagging, limit)
+                        + self._fetch_changes_global(cursor, leading, limit),
+                        key=lambda row: row[0],
+                    )[:limit]
+
+                changes = [self._to_change_event(row) for row in rows]
+
+                # Tables in backoff were not read, so they may still have pending changes
+                if not changes and not backing_off:
+                    self._drained_at = (high_water, row_count)
 
                 logger.info(f"Retrieved {len(changes)} changes for client {client_id}")
                 return BatchChange(changes=changes)
-                
+
         except Exception as e:
             logger.error(f"Error getting changes for client {client_id}: {e}")
             raise
-    
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=30),
+        retry=retry_if_exception_type((dbapi.Error,)),
+        reraise=True,
+    )
+    def fetch_changes_and_checkpoint(self, previous_batch: Optional[BatchChange], limit: int = 1000) -> BatchChange:
+        """Checkpoint a processed batch and get the next one in a single round trip.
+
+        Calls the ``CDC_FETCH_CHANGES`` procedure installed by
+        ``SAPHanaCDCInfrastructure.create_fetch_procedure``, which commits the
+        checkpoint of ``previous_batch`` (together with any checkpoint pending a
+        group commit) and returns the changes past the in-memory watermarks, like
+        get_changes: tables in backoff are left out. Applying a checkpoint is
+        idempotent, so the call is safe to retry.
+
+        Args:
+            previous_batch: Batch that has been fully processed, or None
+            limit: Maximum number of changes to retrieve
+
+        Returns:
+            BatchChange: Object containing the retrieved changes
+        """
+        client_id = self.config.client_id
+        table_max_change_id = dict(self._pending_checkpoint)
+        if previous_batch:
+            for table_name, change_id in self._max_change_id_per_table(previous_batch).items():
+                table_max_change_id[table_name] = max(table_max_change_id.get(table_name, 0), change_id)
+        checkpoint = json.dumps([
+            {"table_name": table_name, "change_id": change_id}
+            for table_name, change_id in table_max_change_id.items()
+        ]) if table_max_change_id else None
+
+        try:
+            with self.connection.cursor() as cursor:
+                watermarks = self._get_watermarks(cursor)
+                backing_off = self._tables_in_backoff()
+                if backing_off:
+                    logger.info(f"Skipping tables in backoff: {sorted(backing_off)}")
+                read_from = json.dumps([
+                    {"table_name": table_name, "change_id": max(watermark, table_max_change_id.get(table_name, 0))}
+                    for table_name, watermark in watermarks.items()
+                    if table_name not in backing_off
+                ])
+                cursor.execute(
+                    f"CALL {self.full_fetch_procedure_name}(?, ?, ?, ?, ?)",
+                    (client_id, self.config.source_schema, checkpoint, read_from, limit),
+                )
+                rows = cursor.fetchall()
+
+            self._advance_watermarks(table_max_change_id)
+            if table_max_change_id:
+                self._mark_checkpointed()
+
+            changes = [self._to_change_event(row) for row in rows]
+            logger.info(f"Retrieved {len(changes)} changes for client {client_id}")
+            return BatchChange(changes=changes)
+
+        except Exception as e:
+            logger.error(f"Error fetching changes for client {client_id}: {e}")
+            raise
+
+    def _to_change_event(self, row: tuple) -> ChangeEvent:
+        """Build a ChangeEvent from a row in CHANGE_COLUMNS order."""
+        return ChangeEvent(
+            event_id=str(row[0]),
+            event_timestamp=row[4],
+            trigger_type=TriggerType[row[3].upper()],
+            transaction_id=str(row[5]),
+            schema_name=row[1],
+            table_name=row[2],
+            full_table_name=f"{row[1]}.{row[2]}",
+            old_values=self._parse_json(row[6]) if row[6] else None,
+            new_values=self._parse_json(row[7]) if row[7] else None,
+        )
+
+    def _fetch_changes_global(
+        self, cursor: dbapi.Cursor, watermarks: Dict[str, int], limit: int
+    ) -> List[tuple]:
+        """Read changes with a single CHANGE_ID range scan from the lowest watermark.
+
+        Rows of tables that are not active, or that are at or below their table's
+        watermark, are dropped client-side. If a whole page is dropped the scan
+        continues from the end of that page.
+        """
+        query = f"""
+            SELECT {self.CHANGE_COLUMNS}
+            FROM {self.full_changes_table_name}
+            WHERE TABLE_SCHEMA = ? AND CHANGE_ID > ?
+            ORDER BY CHANGE_ID ASC
+            LIMIT ?
+        """
+        scan_from = min(watermarks.values())
+        rows: List[tuple] = []
+        while True:
+            cursor.execute(query, (self.config.source_schema, scan_from, limit))
+            page = cursor.fetchall()
+            for row in page:
+                watermark = watermarks.get(row[2])
+                if watermark is not None and row[0] > watermark:
+                    rows.append(row)
+            if page:
+                scan_from = max(scan_from, page[-1][0])
+            if rows or len(page) < limit:
+                return rows
+
+    def _fetch_changes_per_table(
+        self, cursor: dbapi.Cursor, watermarks: Dict[str, int], limit: int
+    ) -> List[tuple]:
+        """Read changes with one ``TABLE_NAME = ? AND CHANGE_ID > ?`` range scan per table."""
+        branches = []
+        params: List[Any] = []
+        for table_name, watermark in watermarks.items():
+            branches.append(f"""
+                (SELECT {self.CHANGE_COLUMNS}
+                FROM {self.full_changes_table_name}
+                WHERE TABLE_SCHEMA = ? AND TABLE_NAME = ? AND CHANGE_ID > ?
+                ORDER BY CHANGE_ID ASC
+                LIMIT ?)""")
+            params.extend([self.config.source_schema, table_name, watermark, limit])
+
+        query = f"""
+            SELECT * FROM ({" UNION ALL ".join(branches)})
+            ORDER BY CHANGE_ID ASC
+            LIMIT ?
+        """
+        params.append(limit)
+        cursor.execute(query, tuple(params))
+        return cursor.fetchall()
 
     def get_client_status(self) -> List[ClientTableStatus]:
         """Get the client's processing status.
@@ -143,64 +394,175 @@ class SAPHanaCDCReader(SAPHanaCDCBase):
             logger.error(f"Error getting client status for {client_id}: {e}")
             raise
 
+    def update_client_status(self, batch: BatchChange, failed_tables: Optional[Collection[str]] = None) -> None:
+        """Checkpoint a processed batch.
+
+        The in-memory watermarks advance immediately, so the next get_changes never
+        re-reads the batch. The status table is written according to the group commit
+        settings: after every ``checkpoint_every_batches`` batches or once
+        ``checkpoint_interval_seconds`` have passed since the last write, whichever
+        comes first. With the defaults every batch is written.
+
+        Tables listed in ``failed_tables`` are not checkpointed and keep their
+        watermark, so only their changes are read again, once their backoff expires.
+        Failed tables that were read ahead with mark_read go back to their last
+        checkpoint.
+
+        Args:
+            batch: BatchChange object containing the changes to process
+            failed_tables: Names of tables whose changes could not be delivered
+        """
+        failed = set(failed_tables or ())
+        table_max_change_id = {
+            table_name: max_change_id
+            for table_name, max_change_id in self._max_change_id_per_table(batch).items()
+            if table_name not in failed
+        }
+        for table_name, max_change_id in table_max_change_id.items():
+            self._pending_checkpoint[table_name] = max(self._pending_checkpoint.get(table_name, 0), max_change_id)
+        self._pending_batches += 1
+        self._advance_watermarks(table_max_change_id)
+        self._record_table_results(table_max_change_id, failed)
+        for table_name in table_max_change_id:
+            self._read_through.pop(table_name, None)
+        if any(self._read_through.pop(table_name, None) is not None for table_name in list(failed)):
+            # Their in-memory watermarks are past the changes that failed; reload them
+            self.invalidate_watermarks()
+
+        self.flush_checkpoint_if_due()
+
+    def mark_read(self, batch: BatchChange) -> None:
+        """Move the in-memory watermarks past a batch without checkpointing it.
+
+        For callers that hold changes back (e.g. buffer them) before delivering
+        them: the next get_changes continues after the batch, while the status
+        table still points before it. Every table in the batch must later be
+        passed to update_client_status, either checkpointed or as failed. Until
+        then a watermark reload keeps the read position, and a restart reads
+        the changes again from the last checkpoint.
+
+        Args:
+            batch: BatchChange returned by get_changes
+        """
+        table_max_change_id = self._max_change_id_per_table(batch)
+        for table_name, max_change_id in table_max_change_id.items():
+            self._read_through[table_name] = max(self._read_through.get(table_name, 0), max_change_id)
+        self._advance_watermarks(table_max_change_id)
+
+    def _record_table_results(self, succeeded: Collection[str], failed: Collection[str]) -> None:
+        """Reset the backoff of tables that were delivered and extend it for those that failed."""
+        for table_name in succeeded:
+            self._table_backoff.pop(table_name, None)
+        now = time.monotonic()
+        for table_name in failed:
+            failures = self._table_backoff.get(table_name, (0, 0.0))[0] + 1
+            delay = min(self.TABLE_BACKOFF_BASE_SECONDS * 2 ** (failures - 1), self.TABLE_BACKOFF_MAX_SECONDS)
+            self._table_backoff[table_name] = (failures, now + delay)
+            logger.warning(f"Table {table_name} failed {failures} time(s) in a row, retrying in {delay}s")
+
+    def _tables_in_backoff(self) -> Set[str]:
+        now = time.monotonic()
+        return {table_name for table_name, (_, until) in self._table_backoff.items() if until > now}
+
+    def _checkpoint_due(self) -> bool:
+        """Whether the pending checkpoint should be written to the status table."""
+        every_batches = self.config.checkpoint_every_batches
+        interval_seconds = self.config.checkpoint_interval_seconds
+        if every_batches <= 0 and interval_seconds <= 0:
+            return True
+        if every_batches > 0 and self._pending_batches >= every_batches:
+            return True
+        return interval_seconds > 0 and time.monotonic() - self._last_checkpoint_at >= interval_seconds
+
+    def flush_checkpoint_if_due(self) -> None:
+        """Write the pending checkpoint if the group commit settings call for it.
+
+        update_client_status does this after every batch; pollers also call it
+        when a run ends, so a checkpoint held back by ``checkpoint_interval_seconds``
+        is written even when no further batches arrive.
+        """
+        if self._pending_checkpoint and self._checkpoint_due():
+            self.flush_checkpoint()
+
+    def _mark_checkpointed(self) -> None:
+        self._pending_checkpoint = {}
+        self._pending_batches = 0
+        self._last_checkpoint_at = time.monotonic()
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=30),
         retry=retry_if_exception_type((dbapi.Error,)),
         reraise=True,
     )
-    def update_client_status(self, batch: BatchChange) -> None:
-        """Update the client's processing status based on a ChangeEvent.
+    def flush_checkpoint(self) -> None:
+        """Write the pending checkpoint to the status table in a single batched statement."""
+        if not self._pending_checkpoint:
+            return
 
-        Args:
-            batch: BatchChange object containing the changes to process
-        """
         status_table = self.full_client_status_table_name
         client_id = self.config.client_id
         schema_name = self.config.source_schema
 
         try:
-            table_max_change_id = {}
-            for change in batch.changes:
-                table_max_change_id[change.table_name] = max(table_max_change_id.get(change.table_name, 0), int(change.event_id))
-            
-            # Prepare the data for upsert (insert or update)
             with self.connection.cursor() as cursor:
-                # Use MERGE statement for SAP HANA
-                for table_name, max_change_id in table_max_change_id.items():
-                    update_sql = f"""
-                        UPDATE {status_table}
-                        SET LAST_PROCESSED_CHANGE_ID = ?, UPDATED_AT = CURRENT_TIMESTAMP
-                        WHERE CLIENT_ID = ? AND SCHEMA_NAME = ? AND TABLE_NAME = ?
-                    """
-                
-                    cursor.execute(update_sql, (
-                        max_change_id,
-                        client_id,
-                        schema_name,
-                        table_name
-                    ))
-
+                cursor.executemany(f"""
+                    UPDATE {status_table}
+                    SET LAST_PROCESSED_CHANGE_ID = ?, UPDATED_AT = CURRENT_TIMESTAMP
+                    WHERE CLIENT_ID = ? AND SCHEMA_NAME = ? AND TABLE_NAME = ?
+                """, [
+                    (max_change_id, client_id, schema_name, table_name)
+                    for table_name, max_change_id in self._pending_checkpoint.items()
+                ])
                 self.connection.commit()
-                logger.info(f"Updated client status for {client_id}")
+
+            logger.info(f"Updated client status for {client_id} ({len(self._pending_checkpoint)} tables)")
+            self._mark_checkpointed()
 
         except Exception as e:
             logger.error(f"Error updating client status for {client_id}: {e}")
             raise
 
+    @staticmethod
+    def _max_change_id_per_table(batch: BatchChange) -> Dict[str, int]:
+        """Get the highest CHANGE_ID of each table in a batch."""
+        table_max_change_id: Dict[str, int] = {}
+        for change in batch.changes:
+            table_max_change_id[change.table_name] = max(table_max_change_id.get(change.table_name, 0), int(change.event_id))
+        return table_max_change_id
+
+    def _advance_watermarks(self, table_max_change_id: Dict[str, int]) -> None:
+        """Advance the in-memory watermarks after a batch has been checkpointed.
+
+        Tables with changes in the batch move to their highest checkpointed CHANGE_ID.
+        Tables without changes in the batch stay where they are, even when the
+        change table was scanned past them: CHANGE_IDs are assigned when a
+        trigger fires, not at commit, so a change with a lower CHANGE_ID can
+        still become visible after a higher one was read.
+        """
+        if self._watermarks is None:
+            return
+        for table_name, max_change_id in table_max_change_id.items():
+            if table_name in self._watermarks:
+                self._watermarks[table_name] = max(self._watermarks[table_name], max_change_id)
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=30),
         retry=retry_if_exception_type((dbapi.Error,)),
         reraise=True,
     )
-    def get_all_table_rows(self, table_name: str, page_size: int = 1000, offset: int = 0) -> List[Dict[str, Any]]:
+    def get_all_table_rows(
+        self, table_name: str, page_size: int = 1000, offset: int = 0, where: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
         """Get a page of rows from a given table.
 
         Args:
             table_name: Name of the table to read from
             page_size: Number of rows to fetch per page (default: 1000)
             offset: Number of rows to skip (default: 0)
+            where: Optional SQL condition the rows must match, e.g. '"ZZREGION" IS NOT NULL'.
+                The table's configured row condition applies as well.
 
         Returns:
             List[Dict[str, Any]]: List of dictionaries representing rows with column names as keys
@@ -209,27 +571,25 @@ class SAPHanaCDCReader(SAPHanaCDCBase):
         full_table_name = f"{schema_name}.{table_name}"
         
         try:
-            # First, get the column information
-            with self.connection.cursor() as cursor:
-                cursor.execute("""
-                    SELECT COLUMN_NAME, DATA_TYPE_NAME
-                    FROM TABLE_COLUMNS 
-                    WHERE SCHEMA_NAME = ? AND TABLE_NAME = ?
-                    ORDER BY POSITION
-                """, (schema_name, table_name))
-                
-                columns_info = cursor.fetchall()
-                if not columns_info:
-                    logger.warning(f"Table {full_table_name} not found or has no columns")
-                    return []
-                
-                column_names = [col[0] for col in columns_info]
-                logger.info(f"Reading page of rows from {full_table_name} (offset: {offset}, page_size: {page_size})")
+            # First, get the column information; only the configured columns are read
+            column_names = self.get_captured_columns(table_name)
+            if not column_names:
+                logger.warning(f"Table {full_table_name} not found or has no columns")
+                return []
+            logger.info(f"Reading page of rows from {full_table_name} (offset: {offset}, page_size: {page_size})")
+
+            conditions = [
+                condition
+                for condition in (self.config.get_table_filter(table_name).where, where)
+                if condition
+            ]
+            select_list = ", ".join(f'"{column}"' for column in column_names)
             
             # Get the requested page of rows
             with self.connection.cursor() as cursor:
                 query = f"""
-                    SELECT * FROM {full_table_name}
+                    SELECT {select_list} FROM {full_table_name}
+                    {"WHERE " + " AND ".join(f"({condition})" for condition in conditions) if conditions else ""}
                     ORDER BY 1
                     LIMIT ? OFFSET ?
                 """
@@ -255,6 +615,152 @@ class SAPHanaCDCReader(SAPHanaCDCBase):
 
 
 
+    def _chunk_columns(self, table_name: str) -> Tuple[List[str], List[str]]:
+        """Get the columns read for chunking a table or view, and the columns identifying a row."""
+        columns = self.get_captured_columns(table_name)
+        with self.connection.cursor() as cursor:
+            key_columns = self._get_primary_key_columns(cursor, table_name)
+        # Rows of views (and tables without a primary key) are identified by all their columns
+        return columns, key_columns or columns
+
+    def get_chunk_hashes(self, table_name: str, chunk_size: int = 10000) -> List[ChunkHash]:
+        """Get the current chunk checksums of a table or view, computed in SAP HANA.
+
+        Args:
+            table_name: Name of the table or view
+            chunk_size: Expected number of rows per chunk
+
+        Returns:
+            List[ChunkHash]: Chunks in chunk id order
+        """
+        columns, key_columns = self._chunk_columns(table_name)
+        if not columns:
+            logger.warning(f"Object {self.config.source_schema}.{table_name} not found or has no columns")
+            return []
+        query = chunk_hashes_sql(
+            f"{self.config.source_schema}.{table_name}",
+            columns,
+            key_columns,
+            self.config.get_table_filter(table_name).where,
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(query, (boundary_threshold(chunk_size),))
+            return [
+                ChunkHash(chunk_id=row[0], row_count=int(row[1]), checksum=f"{int(row[2]):x}-{int(row[3]):x}")
+                for row in cursor.fetchall()
+            ]
+
+    def get_chunk_rows(
+        self, table_name: str, chunk_ids: List[str], chunk_size: int = 10000, page_size: int = 10000, offset: int = 0
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Get a page of the rows of some chunks of a table or view.
+
+        Args:
+            table_name: Name of the table or view
+            chunk_ids: Ids of the chunks to read
+            chunk_size: Expected number of rows per chunk, as passed to get_chunk_hashes
+            page_size: Number of rows to fetch per page
+            offset: Number of rows to skip
+
+        Returns:
+            List of (chunk id, row) tuples, rows as dictionaries with column names as keys
+        """
+        if not chunk_ids:
+            return []
+        columns, key_columns = self._chunk_columns(table_name)
+        query = chunk_rows_sql(
+            f"{self.config.source_schema}.{table_name}",
+            columns,
+            key_columns,
+            len(chunk_ids),
+            self.config.get_table_filter(table_name).where,
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(query, (boundary_threshold(chunk_size), *chunk_ids, page_size, offset))
+            return [(row[-1], dict(zip(columns, row[:-1]))) for row in cursor.fetchall()]
+
+    def get_primary_key_columns(self, table_name: str) -> List[str]:
+        """Get the primary key columns of a table, in key order."""
+        with self.connection.cursor() as cursor:
+            return self._get_primary_key_columns(cursor, table_name)
+
+    def get_key_range_hashes(
+        self,
+        table_name: str,
+        prefix_length: int,
+        parent_prefixes: Optional[List[str]] = None,
+        value_columns: Sequence[ValueColumn] = (),
+    ) -> List[ChunkHash]:
+        """Get the row counts and checksums of a table's key ranges, computed in SAP HANA.
+
+        Args:
+            table_name: Name of the table
+            prefix_length: Hex digits of the key hash prefix identifying a range
+            parent_prefixes: Only the ranges within these shorter prefixes, all if None
+            value_columns: Non-key columns whose values the checksums cover
+
+        Returns:
+            List[ChunkHash]: Non-empty ranges in prefix order, with the prefix as chunk id
+        """
+        key_columns = self.get_primary_key_columns(table_name)
+        if not key_columns:
+            logger.warning(f"Table {self.config.source_schema}.{table_name} has no primary key")
+            return []
+        query = key_range_hashes_sql(
+            f"{self.config.source_schema}.{table_name}",
+            key_columns,
+            prefix_length,
+            parent_prefixes,
+            self.config.get_table_filter(table_name).where,
+            value_columns,
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(query)
+            return [
+                ChunkHash(chunk_id=row[0], row_count=int(row[1]), checksum=f"{int(row[2]):x}-{int(row[3]):x}")
+                for row in cursor.fetchall()
+            ]
+
+    def get_key_range_rows(
+        self, table_name: str, prefixes: List[str], page_size: int = 10000, offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Get a page of the rows of some key ranges of a table, as get_all_table_rows."""
+        if not prefixes:
+            return []
+        condition = key_range_condition(self.get_primary_key_columns(table_name), prefixes)
+        return self.get_all_table_rows(table_name, page_size, offset, where=condition)
+
+    def get_stored_chunk_hashes(self, table_name: str) -> List[ChunkHash]:
+        """Get the chunk checksums stored at the last sync of a table or view."""
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT CHUNK_ID, ROW_COUNT, CHECKSUM
+                FROM {self.full_chunk_hashes_table_name}
+                WHERE CLIENT_ID = ? AND SCHEMA_NAME = ? AND TABLE_NAME = ?
+                ORDER BY CHUNK_ID
+            """, (self.config.client_id, self.config.source_schema, table_name))
+            return [
+                ChunkHash(chunk_id=row[0], row_count=int(row[1]), checksum=row[2])
+                for row in cursor.fetchall()
+            ]
+
+    def store_chunk_hashes(self, table_name: str, chunks: List[ChunkHash]) -> None:
+        """Replace the stored chunk checksums of a table or view."""
+        key = (self.config.client_id, self.config.source_schema, table_name)
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"""
+                DELETE FROM {self.full_chunk_hashes_table_name}
+                WHERE CLIENT_ID = ? AND SCHEMA_NAME = ? AND TABLE_NAME = ?
+            """, key)
+            if chunks:
+                cursor.executemany(f"""
+                    INSERT INTO {self.full_chunk_hashes_table_name}
+                        (CLIENT_ID, SCHEMA_NAME, TABLE_NAME, CHUNK_ID, ROW_COUNT, CHECKSUM)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, [(*key, chunk.chunk_id, chunk.row_count, chunk.checksum) for chunk in chunks])
+        self.connection.commit()
+        logger.debug(f"Stored {len(chunks)} chunk checksums of {table_name}")
+
     def _parse_json(self, json_str: str) -> Dict[str, Any]:
         """Parse JSON string to dictionary."""
         try:
@@ -275,6 +781,10 @@ class SAPHanaCDCReader(SAPHanaCDCBase):
             - lag_seconds: Lag in seconds (max insert timestamp - last client update)
             - max_timestamp: ISO format timestamp of the latest change
             - last_client_update: ISO format timestamp of the last client update
+            - max_change_id: Highest CHANGE_ID in the change table
+            - last_processed_change_id: Lowest CHANGE_ID checkpointed for the client's active tables
+            - change_id_lag: Number of change IDs the least advanced active table is behind
+            - pending_changes: Number of changes of active tables the client hasn't read
         """
         change_table = self._get_change_table_name()
         status_table = self._get_client_status_table_name()
@@ -299,6 +809,29 @@ class SAPHanaCDCReader(SAPHanaCDCBase):
                 
                 client_status_result = cursor.fetchone()
                 last_client_update = client_status_result[0] if client_status_result else None
+
+                max_change_id = self._probe_high_water(cursor)
+
+                # The least advanced active table bounds what the client has read;
+                # tables being loaded or no longer monitored don't hold it back
+                cursor.execute(f"""
+                    SELECT MIN(LAST_PROCESSED_CHANGE_ID)
+                    FROM {status_table}
+                    WHERE CLIENT_ID = ? AND STATUS = ?
+                """, (client_id, TableStatus.ACTIVE.value))
+                processed_result = cursor.fetchone()
+                last_processed_change_id = processed_result[0] if processed_result and processed_result[0] is not None else 0
+
+                # Quiet tables keep old checkpoints, so count the unread changes too
+                cursor.execute(f"""
+                    SELECT COUNT(*)
+                    FROM {change_table} C
+                    INNER JOIN {status_table} S
+                        ON S.SCHEMA_NAME = C.TABLE_SCHEMA AND S.TABLE_NAME = C.TABLE_NAME
+                    WHERE S.CLIENT_ID = ? AND S.STATUS = ? AND C.CHANGE_ID > S.LAST_PROCESSED_CHANGE_ID
+                """, (client_id, TableStatus.ACTIVE.value))
+                pending_result = cursor.fetchone()
+                pending_changes = pending_result[0] if pending_result and pending_result[0] is not None else 0
                 
                 # Calculate lag in seconds
                 lag_seconds = None
@@ -323,7 +856,11 @@ class SAPHanaCDCReader(SAPHanaCDCBase):
                     "total_entries": total_entries,
                     "lag_seconds": int(lag_seconds) if lag_seconds is not None else 0,
                     "max_timestamp": max_timestamp.isoformat() if max_timestamp else None,
-                    "last_client_update": last_client_update.isoformat() if last_client_update else None
+                    "last_client_update": last_client_update.isoformat() if last_client_update else None,
+                    "max_change_id": max_change_id,
+                    "last_processed_change_id": last_processed_change_id,
+                    "change_id_lag": max(0, (max_change_id or 0) - last_processed_change_id),
+                    "pending_changes": pending_changes,
                 }
                 
         except Exception as e:
@@ -4,7 +4,7 @@ import os
 import pytest
 from unittest.mock import patch
 
-from sap_hana_cdc.config import SAPHanaCDCConfig
+from sap_hana_cdc.config import SAPHanaCDCConfig, TableFilter
 
 
 class TestSAPHanaCDCConfig:
@@ -44,6 +44,9 @@ class TestSAPHanaCDCConfig:
         assert config.tables == []
         assert config.source_schema == "SAPHANADB"
         assert config.cdc_schema == "SAPHANADB"
+        assert config.use_fetch_procedure is False
+        assert config.checkpoint_every_batches == 1
+        assert config.checkpoint_interval_seconds == 0.0
 
     def test_config_tables_trimming(self) -> None:
         """Test that table names are trimmed and empty values removed."""
@@ -65,6 +68,9 @@ class TestSAPHanaCDCConfig:
             "SAP_HANA_TABLES": "TABLE1,TABLE2,TABLE3",
             "SAP_HANA_SOURCE_SCHEMA": "ENV_SOURCE",
             "SAP_HANA_CDC_SCHEMA": "ENV_CDC",
+            "SAP_HANA_USE_FETCH_PROCEDURE": "true",
+            "SAP_HANA_CHECKPOINT_EVERY_BATCHES": "5",
+            "SAP_HANA_CHECKPOINT_INTERVAL_SECONDS": "30",
         }
 
         with patch.dict(os.environ, env_vars, clear=False):
@@ -78,6 +84,23 @@ class TestSAPHanaCDCConfig:
         assert config.tables == ["TABLE1", "TABLE2", "TABLE3"]
         assert config.source_schema == "ENV_SOURCE"
         assert config.cdc_schema == "ENV_CDC"
+        assert config.use_fetch_procedure is True
+        assert config.checkpoint_every_batches == 5
+        assert config.checkpoint_interval_seconds == 30.0
+
+    def test_config_table_filters_from_file(self, tmp_path) -> None:
+        """Test table filters are read from the JSON file given in the environment."""
+        filters_file = tmp_path / "filters.json"
+        filters_file.write_text(
+            '{"EKKO": {"columns": ["BUKRS", "LIFNR"], "where": "MANDT = \'100\'"}, "EKPO": {}}'
+        )
+
+        with patch.dict(os.environ, {"SAP_HANA_TABLE_FILTERS_FILE": str(filters_file)}, clear=True):
+            config = SAPHanaCDCConfig.from_env(prefix="SAP_HANA_")
+
+        assert config.get_table_filter("EKKO") == TableFilter(columns=["BUKRS", "LIFNR"], where="MANDT = '100'")
+        assert config.get_table_filter("EKPO") == TableFilter()
+        assert config.get_table_filter("MARA") == TableFilter()
 
     def test_config_from_env_with_defaults(self) -> None:
         """Test config from env with missing variables uses defaults."""
@@ -8,7 +8,7 @@ from sap_hana_cdc.connector import SAPHanaCDCConnector
 from sap_hana_cdc.infrastructure import SAPHanaCDCInfrastructure
 from sap_hana_cdc.reader import SAPHanaCDCReader
 from sap_hana_cdc.config import SAPHanaCDCConfig
-from sap_hana_cdc.models import BatchChange, ClientTableStatus
+from sap_hana_cdc.models import BatchChange, ChunkHash, ClientTableStatus
 
 
 class TestSAPHanaCDCConnector:
@@ -78,6 +78,49 @@ class TestSAPHanaCDCConnector:
         reader.get_changes.assert_called_once_with(100)
         assert changes == sample_batch
 
+    def test_get_changes_and_checkpoint_uses_procedure(
+        self,
+        mock_connection: Mock,
+        sample_config: SAPHanaCDCConfig,
+        sample_batch: BatchChange,
+        mocker,
+    ) -> None:
+        """Test that the fetch procedure is used when enabled."""
+        sample_config.use_fetch_procedure = True
+        infrastructure = SAPHanaCDCInfrastructure(mock_connection, sample_config)
+        reader = SAPHanaCDCReader(mock_connection, sample_config)
+
+        mocker.patch.object(reader, "fetch_changes_and_checkpoint", return_value=sample_batch)
+        mocker.patch.object(reader, "update_client_status")
+
+        connector = SAPHanaCDCConnector(infrastructure, reader, sample_config)
+        changes = connector.get_changes_and_checkpoint(sample_batch, limit=100)
+
+        reader.fetch_changes_and_checkpoint.assert_called_once_with(sample_batch, 100)
+        reader.update_client_status.assert_not_called()
+        assert changes == sample_batch
+
+    def test_get_changes_and_checkpoint_without_procedure(
+        self,
+        mock_connection: Mock,
+        sample_config: SAPHanaCDCConfig,
+        sample_batch: BatchChange,
+        mocker,
+    ) -> None:
+        """Test that the checkpoint and the fetch run as separate statements by default."""
+        infrastructure = SAPHanaCDCInfrastructure(mock_connection, sample_config)
+        reader = SAPHanaCDCReader(mock_connection, sample_config)
+
+        mocker.patch.object(reader, "get_changes", return_value=sample_batch)
+        mocker.patch.object(reader, "update_client_status")
+
+        connector = SAPHanaCDCConnector(infrastructure, reader, sample_config)
+        changes = connector.get_changes_and_checkpoint(sample_batch, limit=100)
+
+        reader.update_client_status.assert_called_once_with(sample_batch)
+        reader.get_changes.assert_called_once_with(100)
+        assert changes == sample_batch
+
     def test_reset_cdc_status(
         self,
         mock_connection: Mock,
@@ -111,7 +154,7 @@ class TestSAPHanaCDCConnector:
         connector = SAPHanaCDCConnector(infrastructure, reader, sample_config)
         connector.update_client_status(sample_batch)
 
-        reader.update_client_status.assert_called_once_with(sample_batch)
+        reader.update_client_status.assert_called_once_with(sample_batch, None)
 
     def test_get_current_monitored_tables(
         self,
@@ -152,7 +195,7 @@ class TestSAPHanaCDCConnector:
         connector = SAPHanaCDCConnector(infrastructure, reader, sample_config)
         rows = connector.get_all_table_rows("TABLE1", page_size=100, offset=0)
 
-        reader.get_all_table_rows.assert_called_once_with("TABLE1", 100, 0)
+        reader.get_all_table_rows.assert_called_once_with("TABLE1", 100, 0, None)
         assert rows == expected_rows
 
     def test_get_client_status(
@@ -234,6 +277,31 @@ class TestSAPHanaCDCConnector:
         reader.get_status.assert_called_once_with("test_client")
         assert status == expected_status
 
+    def test_get_chunk_diff(
+        self,
+        mock_connection: Mock,
+        sample_config: SAPHanaCDCConfig,
+        mocker,
+    ) -> None:
+        """Test chunks are compared with the checksums stored at the last sync."""
+        infrastructure = SAPHanaCDCInfrastructure(mock_connection, sample_config)
+        reader = SAPHanaCDCReader(mock_connection, sample_config)
+        mocker.patch.object(reader, "get_stored_chunk_hashes", return_value=[
+            ChunkHash("00a1", 10, "1-2"), ChunkHash("3f00", 12, "3-4"), ChunkHash("9b20", 8, "5-6"),
+        ])
+        mocker.patch.object(reader, "get_chunk_hashes", return_value=[
+            ChunkHash("00a1", 10, "1-2"), ChunkHash("3f00", 13, "3-5"), ChunkHash("c410", 4, "7-8"),
+        ])
+
+        connector = SAPHanaCDCConnector(infrastructure, reader, sample_config)
+        diff = connector.get_chunk_diff("ZV_ORDERS", chunk_size=10)
+
+        reader.get_chunk_hashes.assert_called_once_with("ZV_ORDERS", 10)
+        assert [chunk.chunk_id for chunk in diff.changed] == ["3f00", "c410"]
+        assert diff.removed == ["9b20"]
+        assert diff.unchanged == [ChunkHash("00a1", 10, "1-2")]
+        assert not diff.first_sync
+
     def test_prune(
         self,
         mock_connection: Mock,
@@ -0,0 +1,106 @@
+"""Tests for SAP HANA CDC infrastructure management."""
+
+from unittest.mock import Mock
+
+from sap_hana_cdc.infrastructure import SAPHanaCDCInfrastructure
+from sap_hana_cdc.models import TriggerDrift, TriggerType
+from sap_hana_cdc.config import SAPHanaCDCConfig, TableFilter
+
+
+INSERT_TRIGGER_DEFINITION = """
+    BEGIN
+        SELECT :new_row."MANDT", :new_row."EBELN" INTO new_json FROM DUMMY FOR JSON;
+    END
+"""
+
+
+class TestTriggerDrift:
+    """Test detection and refresh of CDC triggers whose table columns changed."""
+
+    def test_get_trigger_columns(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test that the captured columns are parsed from the trigger definition."""
+        cursor = simple_mock_connection.cursor.return_value
+        cursor.fetchone.return_value = (INSERT_TRIGGER_DEFINITION,)
+
+        infrastructure = SAPHanaCDCInfrastructure(simple_mock_connection, sample_config)
+
+        assert infrastructure.get_trigger_columns("EKKO") == ["MANDT", "EBELN"]
+
+    def test_get_trigger_columns_without_trigger(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test that a table without CDC triggers has no captured columns."""
+        infrastructure = SAPHanaCDCInfrastructure(simple_mock_connection, sample_config)
+
+        assert infrastructure.get_trigger_columns("EKKO") is None
+
+    def test_detect_trigger_drift(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test that only tables whose columns differ from their triggers are reported."""
+        cursor = simple_mock_connection.cursor.return_value
+        cursor.fetchone.return_value = (INSERT_TRIGGER_DEFINITION,)
+        cursor.fetchall.side_effect = [
+            [("EKKO",), ("EKPO",)],
+            [("MANDT",), ("EBELN",), ("ZZREGION",)],
+            [("MANDT",), ("EBELN",)],
+        ]
+
+        infrastructure = SAPHanaCDCInfrastructure(simple_mock_connection, sample_config)
+
+        assert infrastructure.detect_trigger_drift() == [
+            TriggerDrift(table_name="EKKO", added_columns=["ZZREGION"])
+        ]
+
+    def test_refresh_table_triggers(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test that the triggers are replaced in place with the current columns."""
+        cursor = simple_mock_connection.cursor.return_value
+        cursor.fetchall.return_value = [("MANDT",), ("EBELN",), ("ZZREGION",)]
+
+        infrastructure = SAPHanaCDCInfrastructure(simple_mock_connection, sample_config)
+        infrastructure.refresh_table_triggers("EKKO")
+
+        statements = [
+            call[0][0] for call in cursor.execute.call_args_list if "TRIGGER" in call[0][0]
+        ]
+        assert len(statements) == 3
+        assert all("CREATE OR REPLACE TRIGGER" in statement for statement in statements)
+        assert all('_row."ZZREGION"' in statement for statement in statements)
+        simple_mock_connection.commit.assert_called_once()
+
+
+class TestTableFilters:
+    """Test triggers only capture the configured columns and rows."""
+
+    def test_trigger_with_column_allow_list_and_row_condition(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test the trigger captures allowed and key columns of matching rows only."""
+        sample_config.table_filters = {
+            "EKKO": TableFilter(columns=["BUKRS"], where="MANDT = '100' AND BUKRS IN ('1000')"),
+        }
+        cursor = simple_mock_connection.cursor.return_value
+        table_columns = [("MANDT",), ("EBELN",), ("BUKRS",), ("LIFNR",)]
+        key_columns = [("MANDT",), ("EBELN",)]
+        cursor.fetchall.side_effect = [
+            table_columns, key_columns, table_columns, key_columns, table_columns,
+        ]
+
+        infrastructure = SAPHanaCDCInfrastructure(simple_mock_connection, sample_config)
+        infrastructure._create_trigger(cursor, "EKKO", TriggerType.UPDATE, replace=True)
+
+        trigger_sql = cursor.execute.call_args_list[-1][0][0]
+        assert (
+            'SELECT :old_row."MANDT" AS "MANDT", :old_row."BUKRS" AS "BUKRS" FROM DUMMY UNION ALL '
+            'SELECT :new_row."MANDT" AS "MANDT", :new_row."BUKRS" AS "BUKRS" FROM DUMMY'
+        ) in trigger_sql
+        assert "WHERE MANDT = '100' AND BUKRS IN ('1000');" in trigger_sql
+        assert "IF :in_scope > 0 THEN" in trigger_sql
+        assert '"LIFNR"' not in trigger_sql
+        assert infrastructure.TRIGGER_COLUMN_PATTERN.findall(trigger_sql) == [
+            "MANDT", "EBELN", "BUKRS", "MANDT", "EBELN", "BUKRS",
+        ]
@@ -9,11 +9,14 @@ from sap_hana_cdc.reader import SAPHanaCDCReader
 from sap_hana_cdc.models import (
     BatchChange,
     ChangeEvent,
+    ChunkHash,
     TriggerType,
     TableStatus,
     ClientTableStatus,
+    ValueColumn,
+    ValueKind,
 )
-from sap_hana_cdc.config import SAPHanaCDCConfig
+from sap_hana_cdc.config import SAPHanaCDCConfig, TableFilter
 
 
 class TestSAPHanaCDCReader:
@@ -33,19 +36,23 @@ class TestSAPHanaCDCReader:
     ) -> None:
         """Test getting changes when results exist."""
         cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (100, 1)
         timestamp = datetime(2024, 1, 1, 12, 0, 0)
 
-        cursor.fetchall.return_value = [
-            (
-                1,
-                "TEST_SCHEMA",
-                "TABLE1",
-                "INSERT",
-                timestamp,
-                "txn_1",
-                None,
-                json.dumps([{"id": 1, "name": "test"}]),
-            ),
+        cursor.fetchall.side_effect = [
+            [("TABLE1", 0)],
+            [
+                (
+                    1,
+                    "TEST_SCHEMA",
+                    "TABLE1",
+                    "INSERT",
+                    timestamp,
+                    "txn_1",
+                    None,
+                    json.dumps([{"id": 1, "name": "test"}]),
+                ),
+            ],
         ]
 
         reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
@@ -74,7 +81,8 @@ class TestSAPHanaCDCReader:
     ) -> None:
         """Test that get_changes respects the limit parameter."""
         cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
-        cursor.fetchall.return_value = []
+        cursor.fetchone.return_value = (100, 1)
+        cursor.fetchall.side_effect = [[("TABLE1", 0)], []]
 
         reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
         reader.get_changes(limit=50)
@@ -82,6 +90,312 @@ class TestSAPHanaCDCReader:
         call_args = cursor.execute.call_args
         assert call_args[0][1][2] == 50
 
+    def test_get_changes_does_not_join_status_table(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test that the poll query is a plain CHANGE_ID range scan."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (100, 1)
+        cursor.fetchall.side_effect = [[("TABLE1", 5), ("TABLE2", 7)], []]
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        reader.get_changes(limit=100)
+
+        sql, params = cursor.execute.call_args[0]
+        assert "JOIN" not in sql
+        assert "CHANGE_ID > ?" in sql
+        assert params == ("TEST_SCHEMA", 5, 100)
+
+    def test_get_changes_loads_watermarks_once(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test that watermarks are read from the status table only once."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (100, 1)
+        cursor.fetchall.side_effect = [[("TABLE1", 0)], [], []]
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        reader.get_changes(limit=100)
+        reader.get_changes(limit=100)
+
+        status_queries = [
+            c for c in cursor.execute.call_args_list if "CDC_CLIENT_STATUS" in c[0][0]
+        ]
+        assert len(status_queries) == 1
+
+    def test_get_changes_filters_rows_below_table_watermark(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test that the global scan drops rows already processed or of inactive tables."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (100, 1)
+        timestamp = datetime(2024, 1, 1, 12, 0, 0)
+        cursor.fetchall.side_effect = [
+            [("TABLE1", 10), ("TABLE2", 20)],
+            [
+                (11, "TEST_SCHEMA", "TABLE1", "INSERT", timestamp, "txn_1", None, None),
+                (15, "TEST_SCHEMA", "TABLE2", "INSERT", timestamp, "txn_2", None, None),
+                (16, "TEST_SCHEMA", "NEW_TABLE", "INSERT", timestamp, "txn_3", None, None),
+                (21, "TEST_SCHEMA", "TABLE2", "INSERT", timestamp, "txn_4", None, None),
+            ],
+        ]
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        batch = reader.get_changes(limit=100)
+
+        assert [c.event_id for c in batch.changes] == ["11", "21"]
+
+    def test_get_changes_uses_per_table_scans_for_distant_watermarks(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test that a table far behind gets its own range scan, the rest one global scan."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (1_000_100, 1)
+        timestamp = datetime(2024, 1, 1, 12, 0, 0)
+        cursor.fetchall.side_effect = [
+            [("TABLE1", 0), ("TABLE2", 1_000_000), ("TABLE3", 999_990)],
+            [(5, "TEST_SCHEMA", "TABLE1", "INSERT", timestamp, "txn_1", None, None)],
+            [
+                (999_995, "TEST_SCHEMA", "TABLE3", "INSERT", timestamp, "txn_2", None, None),
+                (1_000_001, "TEST_SCHEMA", "TABLE2", "INSERT", timestamp, "txn_3", None, None),
+            ],
+        ]
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        batch = reader.get_changes(limit=100)
+
+        (per_table_sql, per_table_params), (global_sql, global_params) = [
+            c[0] for c in cursor.execute.call_args_list[-2:]
+        ]
+        assert "TABLE_NAME = ?" in per_table_sql
+        assert "TABLE_NAME = ?" not in global_sql
+        assert per_table_params == ("TEST_SCHEMA", "TABLE1", 0, 100, 100)
+        assert global_params == ("TEST_SCHEMA", 999_990, 100)
+        assert [c.event_id for c in batch.changes] == ["5", "999995", "1000001"]
+
+    def test_get_changes_falls_back_to_global_scan_for_many_distant_tables(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test that more tables far behind than MAX_PER_TABLE_SCANS use a single global scan."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (1_000_100, 1)
+        lagging = [(f"TABLE{i}", i) for i in range(SAPHanaCDCReader.MAX_PER_TABLE_SCANS + 1)]
+        cursor.fetchall.side_effect = [lagging + [("LEADER", 1_000_000)], []]
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        reader.get_changes(limit=100)
+
+        sql, params = cursor.execute.call_args[0]
+        assert "UNION ALL" not in sql
+        assert params == ("TEST_SCHEMA", 0, 100)
+
+    def test_update_client_status_advances_watermarks(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test that a checkpoint moves the in-memory watermarks forward."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (100, 1)
+        timestamp = datetime(2024, 1, 1, 12, 0, 0)
+        cursor.fetchall.side_effect = [
+            [("TABLE1", 10), ("TABLE2", 10)],
+            [(12, "TEST_SCHEMA", "TABLE1", "INSERT", timestamp, "txn_1", None, None)],
+            [],
+        ]
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        batch = reader.get_changes(limit=100)
+        reader.update_client_status(batch)
+        reader.get_changes(limit=100)
+
+        assert reader._watermarks == {"TABLE1": 12, "TABLE2": 10}
+        assert cursor.execute.call_args[0][1] == ("TEST_SCHEMA", 10, 100)
+
+    def test_change_committed_late_is_not_skipped(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test a table's change that commits after a higher CHANGE_ID was read is still read."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.side_effect = [(12, 1), (12, 2)]
+        timestamp = datetime(2024, 1, 1, 12, 0, 0)
+        cursor.fetchall.side_effect = [
+            [("TABLE1", 10), ("TABLE2", 10)],
+            [(12, "TEST_SCHEMA", "TABLE1", "INSERT", timestamp, "txn_2", None, None)],
+            # TABLE2's change 11 was assigned before 12 but committed after it was read
+            [
+                (11, "TEST_SCHEMA", "TABLE2", "INSERT", timestamp, "txn_1", None, None),
+                (12, "TEST_SCHEMA", "TABLE1", "INSERT", timestamp, "txn_2", None, None),
+            ],
+        ]
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        reader.update_client_status(reader.get_changes(limit=100))
+        batch = reader.get_changes(limit=100)
+
+        assert [(c.table_name, c.event_id) for c in batch.changes] == [("TABLE2", "11")]
+
+    def test_get_changes_skips_query_when_probe_unchanged(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test that an idle poll only runs the MAX(CHANGE_ID) probe."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (42, 1)
+        cursor.fetchall.side_effect = [[("TABLE1", 0)], []]
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        reader.get_changes(limit=100)
+        cursor.execute.reset_mock()
+        batch = reader.get_changes(limit=100)
+
+        assert batch.is_empty()
+        assert cursor.execute.call_count == 1
+        assert "MAX(CHANGE_ID), COUNT(*)" in cursor.execute.call_args[0][0]
+        assert reader.last_probed_change_id == 42
+
+    def test_get_changes_queries_again_after_late_commit(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test a change committed below the probed MAX(CHANGE_ID) is read without waiting for a newer one."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        timestamp = datetime(2024, 1, 1, 12, 0, 0)
+        cursor.fetchone.side_effect = [(42, 5), (42, 6)]
+        cursor.fetchall.side_effect = [
+            [("TABLE1", 0)],
+            [],
+            [(40, "TEST_SCHEMA", "TABLE1", "INSERT", timestamp, "txn_1", None, None)],
+        ]
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        reader.get_changes(limit=100)
+        batch = reader.get_changes(limit=100)
+
+        assert [c.event_id for c in batch.changes] == ["40"]
+
+    def test_get_changes_queries_again_after_new_change(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test that a higher probe value triggers the change query."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        timestamp = datetime(2024, 1, 1, 12, 0, 0)
+        cursor.fetchone.side_effect = [(42, 1), (43, 2)]
+        cursor.fetchall.side_effect = [
+            [("TABLE1", 0)],
+            [],
+            [(43, "TEST_SCHEMA", "TABLE1", "INSERT", timestamp, "txn_1", None, None)],
+        ]
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        reader.get_changes(limit=100)
+        batch = reader.get_changes(limit=100)
+
+        assert [c.event_id for c in batch.changes] == ["43"]
+
+    def test_get_changes_empty_change_table(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test that an empty change table is detected by the probe alone."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (None, 0)
+        cursor.fetchall.side_effect = [[("TABLE1", 0)]]
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        batch = reader.get_changes(limit=100)
+
+        assert batch.is_empty()
+        assert cursor.execute.call_count == 2
+
+    def test_invalidate_watermarks_reloads_status(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test that invalidated watermarks are reloaded on the next poll."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (100, 1)
+        cursor.fetchall.side_effect = [[("TABLE1", 0)], [], [("TABLE1", 0), ("TABLE2", 0)], []]
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        reader.get_changes(limit=100)
+        reader.invalidate_watermarks()
+        reader.get_changes(limit=100)
+
+        assert set(reader._watermarks) == {"TABLE1", "TABLE2"}
+
+    def test_fetch_changes_and_checkpoint_sends_checkpoint(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test that the previous batch's checkpoint is passed to the procedure."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        timestamp = datetime(2024, 1, 1, 12, 0, 0)
+        cursor.fetchall.side_effect = [
+            [("TABLE1", 9), ("TABLE2", 5), ("TABLE3", 20)],
+            [(13, "TEST_SCHEMA", "TABLE1", "UPDATE", timestamp, "txn_2", None, None)],
+        ]
+        previous = BatchChange(changes=[
+            ChangeEvent(
+                event_id=event_id,
+                event_timestamp=timestamp,
+                trigger_type=TriggerType.INSERT,
+                transaction_id="txn_1",
+                schema_name="TEST_SCHEMA",
+                table_name=table_name,
+                full_table_name=f"TEST_SCHEMA.{table_name}",
+            )
+            for event_id, table_name in [("10", "TABLE1"), ("12", "TABLE1"), ("11", "TABLE2")]
+        ])
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        batch = reader.fetch_changes_and_checkpoint(previous, limit=50)
+
+        query, params = cursor.execute.call_args[0]
+        assert cursor.execute.call_count == 2
+        assert query.startswith("CALL CDC_SCHEMA.CDC_FETCH_CHANGES(")
+        assert params[0] == sample_config.client_id
+        assert params[1] == "TEST_SCHEMA"
+        assert json.loads(params[2]) == [
+            {"table_name": "TABLE1", "change_id": 12},
+            {"table_name": "TABLE2", "change_id": 11},
+        ]
+        assert json.loads(params[3]) == [
+            {"table_name": "TABLE1", "change_id": 12},
+            {"table_name": "TABLE2", "change_id": 11},
+            {"table_name": "TABLE3", "change_id": 20},
+        ]
+        assert params[4] == 50
+        assert [c.event_id for c in batch.changes] == ["13"]
+        simple_mock_connection.commit.assert_not_called()
+
+    def test_fetch_changes_and_checkpoint_without_previous_batch(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test that the first call passes a NULL checkpoint."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchall.side_effect = [[("TABLE1", 0)], []]
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        batch = reader.fetch_changes_and_checkpoint(None, limit=100)
+
+        assert batch.is_empty()
+        assert cursor.execute.call_args[0][1][2] is None
+
+    def test_fetch_changes_and_checkpoint_skips_tables_in_backoff(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test that the procedure reads from the in-memory watermarks, without tables in backoff."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        timestamp = datetime(2024, 1, 1, 12, 0, 0)
+        failed_change = (12, "TEST_SCHEMA", "TABLE2", "INSERT", timestamp, "txn_2", None, None)
+        cursor.fetchall.side_effect = [
+            [("TABLE1", 10), ("TABLE2", 10)],
+            [failed_change],
+            [],
+        ]
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        batch = reader.fetch_changes_and_checkpoint(None, limit=100)
+        reader.update_client_status(batch, failed_tables={"TABLE2"})
+        reader.fetch_changes_and_checkpoint(None, limit=100)
+
+        read_from = json.loads(cursor.execute.call_args[0][1][3])
+        assert [entry["table_name"] for entry in read_from] == ["TABLE1"]
+
     def test_get_client_status(
         self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
     ) -> None:
@@ -113,7 +427,7 @@ class TestSAPHanaCDCReader:
         reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
         reader.update_client_status(sample_batch)
 
-        assert cursor.execute.called
+        assert cursor.executemany.call_count == 1
         assert simple_mock_connection.commit.called
 
     def test_update_client_status_with_multiple_tables(
@@ -149,8 +463,219 @@ class TestSAPHanaCDCReader:
         reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
         reader.update_client_status(batch)
 
-        assert cursor.execute.call_count >= 2
-        assert simple_mock_connection.commit.called
+        cursor.execute.assert_not_called()
+        assert cursor.executemany.call_count == 1
+        assert sorted(cursor.executemany.call_args[0][1]) == [
+            (1, sample_config.client_id, "TEST_SCHEMA", "TABLE1"),
+            (2, sample_config.client_id, "TEST_SCHEMA", "TABLE2"),
+        ]
+        assert simple_mock_connection.commit.call_count == 1
+
+    def test_update_client_status_group_commit_by_batch_count(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test that checkpoints are written once every N batches."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        sample_config.checkpoint_every_batches = 3
+        timestamp = datetime(2024, 1, 1, 12, 0, 0)
+
+        def batch_for(event_id: int) -> BatchChange:
+            return BatchChange(changes=[ChangeEvent(
+                event_id=str(event_id),
+                event_timestamp=timestamp,
+                trigger_type=TriggerType.INSERT,
+                transaction_id="txn_1",
+                schema_name="TEST_SCHEMA",
+                table_name="TABLE1",
+                full_table_name="TEST_SCHEMA.TABLE1",
+            )])
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        reader.update_client_status(batch_for(1))
+        reader.update_client_status(batch_for(2))
+
+        cursor.executemany.assert_not_called()
+        simple_mock_connection.commit.assert_not_called()
+
+        reader.update_client_status(batch_for(3))
+
+        assert cursor.executemany.call_args[0][1] == [(3, sample_config.client_id, "TEST_SCHEMA", "TABLE1")]
+        assert simple_mock_connection.commit.call_count == 1
+
+    def test_update_client_status_group_commit_by_interval(
+        self,
+        simple_mock_connection: Mock,
+        sample_config: SAPHanaCDCConfig,
+        sample_batch: BatchChange,
+        mocker,
+    ) -> None:
+        """Test that checkpoints are written once the interval has passed."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        sample_config.checkpoint_every_batches = 0
+        sample_config.checkpoint_interval_seconds = 30
+        clock = mocker.patch("sap_hana_cdc.reader.time.monotonic", return_value=1000.0)
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        clock.return_value = 1010.0
+        reader.update_client_status(sample_batch)
+        cursor.executemany.assert_not_called()
+
+        clock.return_value = 1031.0
+        reader.update_client_status(sample_batch)
+        assert cursor.executemany.call_count == 1
+
+    def test_flush_checkpoint_if_due_on_idle_poll(
+        self,
+        simple_mock_connection: Mock,
+        sample_config: SAPHanaCDCConfig,
+        sample_batch: BatchChange,
+        mocker,
+    ) -> None:
+        """Test that a held-back checkpoint is written once due without another batch."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        sample_config.checkpoint_every_batches = 0
+        sample_config.checkpoint_interval_seconds = 30
+        clock = mocker.patch("sap_hana_cdc.reader.time.monotonic", return_value=1000.0)
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        reader.update_client_status(sample_batch)
+        reader.flush_checkpoint_if_due()
+        cursor.executemany.assert_not_called()
+
+        clock.return_value = 1031.0
+        reader.flush_checkpoint_if_due()
+        assert cursor.executemany.call_count == 1
+
+        reader.flush_checkpoint_if_due()
+        assert cursor.executemany.call_count == 1
+
+    def test_update_client_status_skips_failed_tables(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test that failed tables are neither checkpointed nor advanced."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (100, 1)
+        timestamp = datetime(2024, 1, 1, 12, 0, 0)
+        cursor.fetchall.side_effect = [
+            [("TABLE1", 10), ("TABLE2", 10), ("TABLE3", 10)],
+            [
+                (11, "TEST_SCHEMA", "TABLE1", "INSERT", timestamp, "txn_1", None, None),
+                (12, "TEST_SCHEMA", "TABLE2", "INSERT", timestamp, "txn_2", None, None),
+            ],
+        ]
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        batch = reader.get_changes(limit=100)
+        reader.update_client_status(batch, failed_tables={"TABLE2"})
+
+        assert cursor.executemany.call_args[0][1] == [(11, sample_config.client_id, "TEST_SCHEMA", "TABLE1")]
+        assert reader._watermarks == {"TABLE1": 11, "TABLE2": 10, "TABLE3": 10}
+
+    def test_get_changes_skips_tables_in_backoff(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig, mocker
+    ) -> None:
+        """Test that a failed table is left out of polls until its backoff expires."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (100, 1)
+        clock = mocker.patch("sap_hana_cdc.reader.time.monotonic", return_value=1000.0)
+        timestamp = datetime(2024, 1, 1, 12, 0, 0)
+        failed_change = (12, "TEST_SCHEMA", "TABLE2", "INSERT", timestamp, "txn_2", None, None)
+        cursor.fetchall.side_effect = [
+            [("TABLE1", 10), ("TABLE2", 10)],
+            [failed_change],
+            [],
+            [failed_change],
+        ]
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        reader.update_client_status(reader.get_changes(limit=100), failed_tables={"TABLE2"})
+
+        clock.return_value = 1000.0 + SAPHanaCDCReader.TABLE_BACKOFF_BASE_SECONDS - 1
+        assert reader.get_changes(limit=100).is_empty()
+        assert reader._drained_at is None
+
+        clock.return_value = 1000.0 + SAPHanaCDCReader.TABLE_BACKOFF_BASE_SECONDS
+        batch = reader.get_changes(limit=100)
+        assert [c.event_id for c in batch.changes] == ["12"]
+
+    def test_pending_checkpoint_survives_watermark_reload(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test that reloaded watermarks include checkpoints not yet written."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        sample_config.checkpoint_every_batches = 10
+        cursor.fetchone.return_value = (100, 1)
+        timestamp = datetime(2024, 1, 1, 12, 0, 0)
+        cursor.fetchall.side_effect = [
+            [("TABLE1", 10)],
+            [(12, "TEST_SCHEMA", "TABLE1", "INSERT", timestamp, "txn_1", None, None)],
+            [("TABLE1", 10)],
+            [],
+        ]
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        reader.update_client_status(reader.get_changes(limit=100))
+        reader.invalidate_watermarks()
+        reader.get_changes(limit=100)
+
+        assert reader._watermarks == {"TABLE1": 12}
+        cursor.executemany.assert_not_called()
+
+        reader.flush_checkpoint()
+        assert cursor.executemany.call_args[0][1] == [(12, sample_config.client_id, "TEST_SCHEMA", "TABLE1")]
+
+    def test_mark_read_advances_without_checkpoint(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test that a batch marked as read is neither re-read nor checkpointed."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (100, 1)
+        timestamp = datetime(2024, 1, 1, 12, 0, 0)
+        cursor.fetchall.side_effect = [
+            [("TABLE1", 10), ("TABLE2", 10)],
+            [(12, "TEST_SCHEMA", "TABLE1", "INSERT", timestamp, "txn_1", None, None)],
+            # Reload after invalidation: the status table is still at 10
+            [("TABLE1", 10), ("TABLE2", 10)],
+            [],
+        ]
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        batch = reader.get_changes(limit=100)
+        reader.mark_read(batch)
+        reader.invalidate_watermarks()
+        reader.get_changes(limit=100)
+
+        assert reader._watermarks == {"TABLE1": 12, "TABLE2": 10}
+        cursor.executemany.assert_not_called()
+
+        reader.update_client_status(batch)
+        assert cursor.executemany.call_args[0][1] == [(12, sample_config.client_id, "TEST_SCHEMA", "TABLE1")]
+        assert reader._read_through == {}
+
+    def test_update_client_status_rewinds_failed_tables_read_ahead(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test that a failed table read ahead with mark_read goes back to its checkpoint."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (100, 1)
+        timestamp = datetime(2024, 1, 1, 12, 0, 0)
+        cursor.fetchall.side_effect = [
+            [("TABLE1", 10), ("TABLE2", 10)],
+            [
+                (11, "TEST_SCHEMA", "TABLE1", "INSERT", timestamp, "txn_1", None, None),
+                (12, "TEST_SCHEMA", "TABLE2", "INSERT", timestamp, "txn_2", None, None),
+            ],
+            [("TABLE1", 11), ("TABLE2", 10)],
+            [],
+        ]
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        batch = reader.get_changes(limit=100)
+        reader.mark_read(batch)
+        reader.update_client_status(batch, failed_tables={"TABLE2"})
+        reader.get_changes(limit=100)
+
+        assert reader._watermarks == {"TABLE1": 11, "TABLE2": 10}
 
     def test_get_all_table_rows(
         self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
@@ -200,6 +725,83 @@ class TestSAPHanaCDCReader:
         assert len(rows) == 2
         assert cursor.execute.call_args_list[1][0][1] == (2, 10)
 
+    def test_get_all_table_rows_with_table_filter(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test only the allowed and key columns of matching rows are read."""
+        sample_config.table_filters = {
+            "EKKO": TableFilter(columns=["BUKRS"], where="MANDT = '100'"),
+        }
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchall.side_effect = [
+            [("MANDT",), ("EBELN",), ("BUKRS",), ("LIFNR",)],
+            [("MANDT",), ("EBELN",)],
+            [("100", "4500000001", "1000")],
+        ]
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        rows = reader.get_all_table_rows("EKKO", where='"BUKRS" IS NOT NULL')
+
+        query = cursor.execute.call_args_list[2][0][0]
+        assert 'SELECT "MANDT", "EBELN", "BUKRS" FROM' in query
+        assert """WHERE (MANDT = '100') AND ("BUKRS" IS NOT NULL)""" in query
+        assert rows == [{"MANDT": "100", "EBELN": "4500000001", "BUKRS": "1000"}]
+
+    def test_get_chunk_rows(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test rows of changed chunks are read with their chunk ids, keyed by their primary key."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchall.side_effect = [
+            [("MANDT",), ("EBELN",), ("NETWR",)],
+            [("MANDT",), ("EBELN",)],
+            [("100", "4500000001", 10, "3f00"), ("100", "4500000007", 20, "c410")],
+        ]
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        rows = reader.get_chunk_rows("EKKO", ["3f00", "c410"], chunk_size=256, page_size=100)
+
+        assert rows == [
+            ("3f00", {"MANDT": "100", "EBELN": "4500000001", "NETWR": 10}),
+            ("c410", {"MANDT": "100", "EBELN": "4500000007", "NETWR": 20}),
+        ]
+        assert cursor.execute.call_args[0][1] == ("010000", "3f00", "c410", 100, 0)
+
+    def test_get_key_range_hashes(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test key ranges are summarized by row count and row hash sums, within the parent ranges."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchall.side_effect = [
+            [("MANDT",), ("EBELN",)],
+            [("3F0", 12, 4096, 255), ("3F7", 3, 17, 1)],
+        ]
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        ranges = reader.get_key_range_hashes("EKKO", 3, ["3F"])
+
+        assert ranges == [
+            ChunkHash(chunk_id="3F0", row_count=12, checksum="1000-ff"),
+            ChunkHash(chunk_id="3F7", row_count=3, checksum="11-1"),
+        ]
+        query = cursor.execute.call_args[0][0]
+        assert "GROUP BY SUBSTRING(_CDC_KEY, 1, 3)" in query
+        assert "WHERE SUBSTRING(_CDC_KEY, 1, 2) IN ('3F')" in query
+
+    def test_get_key_range_hashes_with_values(
+        self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
+    ) -> None:
+        """Test the value columns are read and hashed with the key."""
+        cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchall.side_effect = [[("EBELN",)], []]
+
+        reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
+        reader.get_key_range_hashes("EKKO", 2, value_columns=[ValueColumn("NETWR", ValueKind.DECIMAL, 2)])
+
+        query = cursor.execute.call_args[0][0]
+        assert 'AS _CDC_KEY, "NETWR"' in query
+        assert "TO_DECIMAL(NULLIF(\"NETWR\", 0), 38, 2)" in query
+
     def test_parse_json_valid(
         self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
     ) -> None:
@@ -239,6 +841,9 @@ class TestSAPHanaCDCReader:
             (100,),
             (max_timestamp,),
             (last_update,),
+            (500,),
+            (450,),
+            (7,),
         ]
 
         reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
@@ -248,6 +853,13 @@ class TestSAPHanaCDCReader:
         assert status["max_timestamp"] == max_timestamp.isoformat()
         assert status["last_client_update"] == last_update.isoformat()
         assert isinstance(status["lag_seconds"], int)
+        assert status["max_change_id"] == 500
+        assert status["last_processed_change_id"] == 450
+        assert status["change_id_lag"] == 50
+        assert status["pending_changes"] == 7
+        processed_sql, processed_params = cursor.execute.call_args_list[4][0]
+        assert "MIN(LAST_PROCESSED_CHANGE_ID)" in processed_sql
+        assert processed_params == ("test_client", TableStatus.ACTIVE.value)
 
     def test_get_status_no_changes(
         self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
@@ -258,6 +870,9 @@ class TestSAPHanaCDCReader:
             (0,),
             (None,),
             (None,),
+            (None,),
+            (None,),
+            (0,),
         ]
 
         reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
@@ -267,6 +882,9 @@ class TestSAPHanaCDCReader:
         assert status["max_timestamp"] is None
         assert status["last_client_update"] is None
         assert status["lag_seconds"] == 0
+        assert status["max_change_id"] is None
+        assert status["change_id_lag"] == 0
+        assert status["pending_changes"] == 0
 
     def test_prune(
         self, simple_mock_connection: Mock, sample_config: SAPHanaCDCConfig
@@ -376,19 +994,23 @@ class TestReaderFailures:
     ) -> None:
         """Test get_changes handles malformed JSON gracefully."""
         cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (100, 1)
         timestamp = datetime(2024, 1, 1, 12, 0, 0)
 
-        cursor.fetchall.return_value = [
-            (
-                1,
-                "TEST_SCHEMA",
-                "TABLE1",
-                "INSERT",
-                timestamp,
-                "txn_1",
-                None,
-                "not valid json {[}",
-            ),
+        cursor.fetchall.side_effect = [
+            [("TABLE1", 0)],
+            [
+                (
+                    1,
+                    "TEST_SCHEMA",
+                    "TABLE1",
+                    "INSERT",
+                    timestamp,
+                    "txn_1",
+                    None,
+                    "not valid json {[}",
+                ),
+            ],
         ]
 
         reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
@@ -419,7 +1041,7 @@ class TestReaderFailures:
     ) -> None:
         """Test update_client_status handles database errors."""
         cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
-        cursor.execute.side_effect = Exception("Update failed")
+        cursor.executemany.side_effect = Exception("Update failed")
 
         reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
 
@@ -501,19 +1123,23 @@ class TestReaderFailures:
     ) -> None:
         """Test get_changes handles invalid trigger type."""
         cursor = simple_mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (100, 1)
         timestamp = datetime(2024, 1, 1, 12, 0, 0)
 
-        cursor.fetchall.return_value = [
-            (
-                1,
-                "TEST_SCHEMA",
-                "TABLE1",
-                "INVALID_TYPE",
-                timestamp,
-                "txn_1",
-                None,
-                json.dumps([{"id": 1}]),
-            ),
+        cursor.fetchall.side_effect = [
+            [("TABLE1", 0)],
+            [
+                (
+                    1,
+                    "TEST_SCHEMA",
+                    "TABLE1",
+                    "INVALID_TYPE",
+                    timestamp,
+                    "txn_1",
+                    None,
+                    json.dumps([{"id": 1}]),
+                ),
+            ],
         ]
 
         reader = SAPHanaCDCReader(simple_mock_connection, sample_config)
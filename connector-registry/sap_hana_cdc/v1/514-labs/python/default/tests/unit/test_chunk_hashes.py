@@ -0,0 +1,97 @@
+"""Unit tests for the chunk checksum SQL."""
+import pytest
+
+from sap_hana_cdc import ValueColumn, ValueKind
+from sap_hana_cdc.chunk_hashes import (
+    boundary_threshold,
+    canonical_value,
+    chunk_hashes_sql,
+    chunk_rows_sql,
+    hash_expression,
+    key_range_condition,
+    key_range_hashes_sql,
+)
+
+
+@pytest.mark.unit
+class TestChunkHashes:
+    """Test the SQL comparing tables and views by chunk checksums."""
+
+    def test_boundary_threshold(self):
+        assert boundary_threshold(16 ** 6) == "000001"
+        assert boundary_threshold(256) == "010000"
+        assert boundary_threshold(10 ** 9) == "000001"
+
+    def test_hash_expression_groups_columns(self):
+        single = hash_expression(["MANDT", "EBELN"])
+        grouped = hash_expression([f"COL{i}" for i in range(20)])
+
+        assert single == (
+            'BINTOHEX(HASH_SHA256(TO_BINARY(IFNULL(TO_NVARCHAR("MANDT"), CHAR(30)) || CHAR(31) || '
+            'IFNULL(TO_NVARCHAR("EBELN"), CHAR(30)))))'
+        )
+        assert grouped.count("HASH_SHA256") == 3
+
+    def test_key_hash_is_row_hash_without_primary_key(self):
+        with_key = chunk_hashes_sql("SAPHANADB.EKKO", ["MANDT", "EBELN", "NETWR"], ["MANDT", "EBELN"])
+        without_key = chunk_hashes_sql("SAPHANADB.ZV_ORDERS", ["EBELN", "NETWR"], ["EBELN", "NETWR"])
+
+        assert with_key.count("HASH_SHA256") == 2
+        assert without_key.count("HASH_SHA256") == 2
+        assert "GROUP BY _CDC_CHUNK" in with_key
+
+    def test_chunk_rows_sql(self):
+        query = chunk_rows_sql("SAPHANADB.EKKO", ["MANDT", "EBELN"], ["MANDT", "EBELN"], 3, "MANDT = '100'")
+
+        assert 'SELECT "MANDT", "EBELN", _CDC_CHUNK_ID' in query
+        assert "WHERE _CDC_CHUNK_ID IN (?, ?, ?)" in query
+        assert "WHERE MANDT = '100'" in query
+        assert query.count("?") == 6
+
+    def test_key_range_hashes_sql(self):
+        top = key_range_hashes_sql("SAPHANADB.EKKO", ["MANDT", "EBELN"], 2, where="MANDT = '100'")
+        narrowed = key_range_hashes_sql("SAPHANADB.EKKO", ["MANDT", "EBELN"], 3, ["0A", "3F"])
+
+        assert "WHERE MANDT = '100'" in top
+        assert "IN (" not in top
+        assert "WHERE SUBSTRING(_CDC_KEY, 1, 2) IN ('0A', '3F')" in narrowed
+        assert "GROUP BY SUBSTRING(_CDC_KEY, 1, 3)" in narrowed
+
+    def test_key_range_hashes_cover_values(self):
+        """Test row hashes cover the key hash and the canonical text of the value columns."""
+        query = key_range_hashes_sql(
+            "SAPHANADB.EKKO", ["EBELN"], 2,
+            value_columns=[ValueColumn("BUKRS", ValueKind.TEXT), ValueColumn("NETWR", ValueKind.DECIMAL, 2)],
+        )
+
+        assert 'SELECT BINTOHEX(HASH_SHA256(TO_BINARY(IFNULL(TO_NVARCHAR("EBELN"), CHAR(30))))) AS _CDC_KEY, "BUKRS", "NETWR"' in query
+        assert (
+            "BINTOHEX(HASH_SHA256(TO_BINARY(IFNULL(_CDC_KEY, CHAR(30)) || CHAR(31) || "
+            "IFNULL(NULLIF(TO_NVARCHAR(\"BUKRS\"), ''), CHAR(30)) || CHAR(31) || "
+            "IFNULL(TO_NVARCHAR(TO_DECIMAL(NULLIF(\"NETWR\", 0), 38, 2)), CHAR(30))))) AS _CDC_ROW"
+        ) in query
+        assert "SUBSTRING(_CDC_ROW, 1, 1)" in query and "SUBSTRING(_CDC_ROW, 9, 1)" in query
+
+    def test_canonical_value(self):
+        """Test values render as the same text the replica renders, initial values as NULL."""
+        assert canonical_value(ValueColumn("MENGE", ValueKind.INTEGER)) == 'TO_NVARCHAR(NULLIF("MENGE", 0))'
+        assert canonical_value(ValueColumn("BEDAT", ValueKind.DATE)) == (
+            "NULLIF(TO_NVARCHAR(\"BEDAT\", 'YYYY-MM-DD'), '0000-00-00')"
+        )
+        assert canonical_value(ValueColumn("CHANGED_AT", ValueKind.TIMESTAMP)) == (
+            "TO_NVARCHAR(\"CHANGED_AT\", 'YYYY-MM-DD HH24:MI:SS')"
+        )
+        assert canonical_value(ValueColumn("LOEKZ", ValueKind.BOOLEAN)) == (
+            "CASE WHEN \"LOEKZ\" = TRUE THEN '1' WHEN \"LOEKZ\" = FALSE THEN '0' END"
+        )
+
+    def test_key_range_condition(self):
+        condition = key_range_condition(["MANDT", "EBELN"], ["3F0", "0A1"])
+
+        assert condition.startswith("SUBSTRING(BINTOHEX(HASH_SHA256(")
+        assert condition.endswith(", 1, 3) IN ('0A1', '3F0')")
+        assert key_range_condition(["EBELN"], []) == "1 = 0"
+        with pytest.raises(ValueError):
+            key_range_condition(["EBELN"], ["0A", "3F0"])
+        with pytest.raises(ValueError):
+            key_range_condition(["EBELN"], ["0A') OR ('1"])
@@ -12,6 +12,7 @@ class QvdConfig:
     include_files: Optional[List[str]] = None  # Whitelist (without .qvd extension)
     exclude_files: Optional[List[str]] = None  # Blacklist (without .qvd extension)
     batch_size: int = 10000              # Rows per insert
+    columnar_insert: bool = False        # Insert column-wise instead of via OlapTable.insert
     schedule: str = "@daily"             # Workflow schedule
 
     # S3 credentials (optional, can also use AWS profile or IAM role)
@@ -52,6 +53,7 @@ class QvdConfig:
             include_files=include_files,
             exclude_files=exclude_files,
             batch_size=int(os.getenv(f"{prefix}BATCH_SIZE", "10000")),
+            columnar_insert=os.getenv(f"{prefix}COLUMNAR_INSERT", "false").lower() in ("1", "true", "yes"),
             schedule=os.getenv(f"{prefix}SCHEDULE", "@daily"),
             aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
             aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
@@ -292,7 +292,7 @@ class ClickHouseFileTracker:
         # Insert into ClickHouse
         try:
             from moose_lib import InsertOptions
-            self.tracking_model.insert([record], options=InsertOptions(skip_duplicates=False))
+            self.tracking_model.insert([record], options=InsertOptions())
             print(f"  Tracking: {status} - {file_path}")
         except Exception as e:
             print(f"Warning: Failed to insert tracking record: {e}")
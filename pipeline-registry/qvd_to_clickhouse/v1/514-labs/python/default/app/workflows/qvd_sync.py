@@ -55,7 +55,9 @@ def sync_qvd_files_task(ctx: TaskContext[None]) -> None:
     # Initialize components
     reader = QvdReader(storage_options=storage_options)
     tracker = ClickHouseFileTracker(batch_size=config.batch_size)
-    inserter = QvdBatchInserter(batch_size=config.batch_size)
+    inserter = QvdBatchInserter(
+        batch_size=config.batch_size, columnar_insert=config.columnar_insert
+    )
 
     # List all QVD files
     print("Listing QVD files...")
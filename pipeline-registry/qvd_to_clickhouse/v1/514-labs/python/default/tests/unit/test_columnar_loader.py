@@ -0,0 +1,56 @@
+import unittest
+from typing import Optional
+from unittest.mock import MagicMock
+
+from pydantic import BaseModel, Field
+
+from app.workflows.lib.columnar_loader import ColumnarLoader
+
+
+class QvdItem(BaseModel):
+    key_item: str = Field(alias="%KEY_Item")
+    latest_purchase_price: Optional[float] = Field(default=None, alias="Latest Purchase Price")
+
+
+def _olap_table(column_types):
+    """Mock OlapTable whose client reports the given ClickHouse column types."""
+    context = MagicMock()
+    context.column_types = [MagicMock() for _ in column_types]
+    for column_type, name in zip(context.column_types, column_types):
+        column_type.name = name
+    olap_table = MagicMock(model_type=QvdItem)
+    olap_table._get_memoized_client.return_value.create_insert_context.return_value = context
+    return olap_table, context
+
+
+class TestColumnarLoaderLayout(unittest.TestCase):
+    """Test the columnar layout is only built when ClickHouse types match the model."""
+
+    def test_matching_type_families(self):
+        """Test wrappers and sizes don't matter, only the type family."""
+        olap_table, context = _olap_table(["LowCardinality(String)", "Nullable(Float32)"])
+
+        layout = ColumnarLoader()._build_layout(olap_table, "qvd_item")
+
+        self.assertIsNotNone(layout)
+        self.assertEqual(layout.column_names, ["%KEY_Item", "Latest Purchase Price"])
+        self.assertEqual(layout.field_names, ["key_item", "latest_purchase_price"])
+        self.assertIs(layout.insert_context, context)
+
+    def test_mismatched_type_family(self):
+        """Test a column whose ClickHouse type family differs from the model's isn't loaded."""
+        cases = [
+            ["String", "Nullable(Decimal(10, 2))"],
+            ["Date", "Float64"],
+        ]
+
+        for column_types in cases:
+            olap_table, _ = _olap_table(column_types)
+            self.assertIsNone(
+                ColumnarLoader()._build_layout(olap_table, "qvd_item"),
+                f"Built a layout for {column_types}",
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -35,6 +35,10 @@ class QueryResult(BaseModel):
     lag_seconds: int
     max_timestamp: Optional[str] = None
     last_client_update: Optional[str] = None
+    max_change_id: Optional[int] = None
+    last_processed_change_id: Optional[int] = None
+    change_id_lag: Optional[int] = None
+    pending_changes: Optional[int] = None
     
 def run(client: MooseClient, params: QueryParams):
     """Get CDC status for a specific client.
@@ -12,3 +12,9 @@ with corresponding OlapTable instances for ClickHouse storage.
 """
 
 # Models will be generated here by init_cdc.py --generate-models
+
+TABLE_MODULES = {}
+
+
+def load_all():
+    """Import every table module, registering all OlapTables with Moose."""
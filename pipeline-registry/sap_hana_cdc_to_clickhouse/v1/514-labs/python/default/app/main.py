@@ -1,6 +1,24 @@
 # This file was auto-generated by the framework. You can add data models or change the existing ones
-from app.ingest.cdc import *
+import sys
+
+import app.ingest.cdc as cdc_models
 import app.apis.cdc_status as cdc_status_api
 #from app.workflows.generator import ingest_workflow, ingest_task
 from app.workflows import cdc
-# from app.workflows.cdc_status import cdc_status_workflow, cdc_status_task
\ No newline at end of file
+from app.workflows import hash_sync
+from app.workflows import reconcile
+# from app.workflows.cdc_status import cdc_status_workflow, cdc_status_task
+
+
+def _collecting_infra_map() -> bool:
+    """Whether Moose imports this module to collect the infrastructure map, rather than to run it."""
+    serializer = "moose_lib.dmv2_serializer"
+    main_spec = getattr(sys.modules.get("__main__"), "__spec__", None)
+    return serializer in sys.modules or getattr(main_spec, "name", None) == serializer
+
+
+# Only the infrastructure map needs every table and view. Workflows and APIs
+# import a table's module the first time they use it, through the registry.
+if _collecting_infra_map():
+    cdc_models.load_all()
+    import app.views.cdc
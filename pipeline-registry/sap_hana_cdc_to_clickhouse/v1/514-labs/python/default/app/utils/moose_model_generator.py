@@ -5,25 +5,27 @@ This module provides functionality to generate Moose models and pipelines
 from TableMetadata objects extracted from database introspection.
 """
 
-from typing import List, Dict, Optional, Set
+from typing import Any, List, Dict, Optional, Set, Tuple
 from dataclasses import dataclass
 import logging
+import re
 from pathlib import Path
 
 from .sap_hana_introspection import TableMetadata, FieldMetadata
+from .table_layout import TableLayout, apply_overrides, derive_table_layout, quote_column
 from .sap_hana_validators import (
     # Datetime types
     SapDate, SapTime, SapSecondDate, SapTimestamp,
     
     # Numeric types
     SapTinyInt, SapSmallInt, SapInteger, SapBigInt,
-    SapSmallDecimal, SapDecimal, SapReal, SapDouble,
+    SapSmallDecimal, SapDecimal, SapFixedDecimal, SapReal, SapDouble,
     
     # Boolean type
     SapBoolean,
     
     # Character string types
-    SapVarchar, SapNvarchar, SapAlphanum, SapShortText,
+    SapVarchar, SapNvarchar, SapAlphanum, SapNumc, SapShortText, sap_numc,
     
     # Binary types
     SapVarbinary,
@@ -43,6 +45,27 @@ from .sap_hana_validators import (
 
 logger = logging.getLogger(__name__)
 
+# Columns added to every generated model and filled by the CDC inserter:
+# the SAP HANA CHANGE_ID of the row (0 for initial load rows), and 1 for rows
+# written for a DELETE. Tables with a primary key use them as the
+# ReplacingMergeTree version and delete marker.
+CDC_VERSION_COLUMN = '_version'
+CDC_IS_DELETED_COLUMN = '_is_deleted'
+# Objects synced by chunk checksums (views, and tables without triggers) also
+# get the id of the chunk each row was loaded with, so a changed chunk's rows
+# can be replaced (see sap_hana_cdc.chunk_hashes)
+CDC_CHUNK_COLUMN = '_chunk'
+
+
+# The current-state aggregates are aliased to the columns they aggregate;
+# without it, argMaxState(NETWR, _version) would read the maxState alias _version
+_COLUMN_NAMES_OVER_ALIASES = 'SETTINGS prefer_column_name_to_alias = 1'
+
+
+def current_state_table_name(table_name: str) -> str:
+    """AggregatingMergeTree table holding the current state of a table's rows, see generate_views."""
+    return f'{table_name}_current_state'
+
 
 @dataclass
 class MooseModelConfig:
@@ -61,6 +84,49 @@ class MooseModelConfig:
     # Field nullability options
     force_all_fields_nullable: bool = False
     
+    # ClickHouse physical schema options
+    # DECIMAL(p, s) columns become Decimal(p, s) instead of a clamped Decimal(10, 0)
+    exact_decimal_types: bool = True
+    # Character columns up to this length (SAP codes such as MANDT, BUKRS or
+    # WAERS) are stored as LowCardinality(String); 0 turns it off
+    low_cardinality_max_length: int = 5
+    # TIMESTAMP columns become DateTime64 with this precision; None keeps DateTime
+    timestamp_precision: Optional[int] = 6
+    # NOT NULL character and numeric columns become non-nullable, defaulting to
+    # SAP's initial value ('' or 0). Other NOT NULL columns stay nullable, as
+    # SAP's initial dates and times ('00000000') are read as NULL.
+    use_sap_initial_values: bool = True
+    # ABAP NUMC columns (digit-only text SAP HANA stores as NVARCHAR), by SAP
+    # HANA table name; they are checked and zero-padded to their length
+    numc_columns: Dict[str, List[str]] = None
+
+    # CDC options
+    include_cdc_columns: bool = True
+    # Recent inserts a non-replicated table remembers to drop retried inserts
+    # with the same deduplication token (0 leaves the server default, off)
+    insert_deduplication_window: int = 1000
+    # Tables synced by chunk checksums instead of triggers; views always are
+    hash_sync_tables: Set[str] = None
+
+    # Table layout options (see app.utils.table_layout)
+    # Derive partition keys and skipping indexes from the SAP HANA metadata
+    derive_table_layouts: bool = True
+    # Tables with fewer rows than this aren't partitioned
+    partition_min_rows: int = 10_000_000
+    # Derive a projection with a second sort order for partitioned tables
+    derive_projections: bool = False
+    # Per-table layout overrides, as read by load_table_layout_overrides
+    table_layout_overrides: Dict[str, Dict[str, Any]] = None
+
+    # Package the per-table model modules are imported from; they are written
+    # to a 'tables' directory next to the registry module
+    tables_package: str = 'app.ingest.tables'
+
+    # View options
+    # Aggregate views over the current-state views, by SAP HANA table name:
+    # [{"name": ..., "group_by": [columns], "measures": {alias: expression}}]
+    aggregate_views: Dict[str, List[Dict[str, Any]]] = None
+    
     def __post_init__(self):
         if self.timestamp_field_names is None:
             self.timestamp_field_names = {
@@ -68,6 +134,18 @@ class MooseModelConfig:
                 'created_time', 'updated_time', 'ts', 'datetime'
             }
         
+        if self.table_layout_overrides is None:
+            self.table_layout_overrides = {}
+
+        if self.hash_sync_tables is None:
+            self.hash_sync_tables = set()
+
+        if self.numc_columns is None:
+            self.numc_columns = {}
+        
+        if self.aggregate_views is None:
+            self.aggregate_views = {}
+        
         if self.primary_key_field_names is None:
             self.primary_key_field_names = {
                 'id', 'primary_key', 'pk', 'key'
@@ -187,6 +265,29 @@ class MooseModelGenerator:
         'DEFAULT': 'str'
     }
     
+    # SAP HANA character types that may be stored as LowCardinality(String)
+    LOW_CARDINALITY_TYPES = {'VARCHAR', 'NVARCHAR', 'CHAR', 'NCHAR', 'ALPHANUM'}
+    
+    # SAP initial value of NOT NULL columns, by SAP HANA type
+    SAP_INITIAL_VALUES = {
+        'VARCHAR': '""',
+        'NVARCHAR': '""',
+        'CHAR': '""',
+        'NCHAR': '""',
+        'ALPHANUM': '""',
+        'SHORTTEXT': '""',
+        'TINYINT': '0',
+        'SMALLINT': '0',
+        'INTEGER': '0',
+        'BIGINT': '0',
+        'SMALLDECIMAL': '0',
+        'DECIMAL': '0',
+        'NUMERIC': '0',
+        'REAL': '0.0',
+        'FLOAT': '0.0',
+        'DOUBLE': '0.0',
+    }
+    
     def __init__(self, config: Optional[MooseModelConfig] = None):
         """
         Initialize the Moose model generator.
@@ -195,42 +296,97 @@ class MooseModelGenerator:
             config: Configuration for model generation. If None, uses defaults.
         """
         self.config = config or MooseModelConfig()
+        # ORDER BY fields by table name, for the tables of one generation run
+        self._order_by_fields: Dict[str, List[str]] = {}
     
     def generate_models(self, tables: List[TableMetadata], output_path: str) -> None:
         """
         Generate Moose models and pipelines for a list of tables.
         
+        Each table's model and OlapTable are written to a module of their own
+        in a ``tables`` package next to ``output_path``, which must be
+        importable as ``config.tables_package``. ``output_path`` becomes a
+        registry that imports a table's module the first time the table is
+        used, so processes only build the models of the tables they touch.
+        
         Args:
             tables: List of TableMetadata objects
-            output_path: Path to write the generated Python file
+            output_path: Path to write the generated registry module
         """
         if not tables:
             logger.warning("No tables provided for model generation")
             return
         
+        output_file = Path(output_path)
+        tables_dir = output_file.parent / 'tables'
+        tables_dir.mkdir(parents=True, exist_ok=True)
+        
+        registry_code, module_codes = self._generate_modules(tables)
+        
+        # The package only holds generated modules; drop those of removed tables
+        for stale_module in tables_dir.glob('*.py'):
+            if stale_module.name != '__init__.py' and stale_module.stem not in module_codes:
+                stale_module.unlink()
+        (tables_dir / '__init__.py').write_text('"""Generated per-table Moose models, see the registry module."""\n', encoding='utf-8')
+        for module_name, code in module_codes.items():
+            with open(tables_dir / f'{module_name}.py', 'w', encoding='utf-8') as f:
+                f.write(code)
+        
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(registry_code)
+        
+        logger.info(f"Generated Moose models for {len(tables)} tables at {output_path} and {tables_dir}")
+    
+    def generate_views(self, tables: List[TableMetadata], output_path: str) -> None:
+        """
+        Generate current-state and aggregate views for a list of tables.
+        
+        Each table with a primary key gets an AggregatingMergeTree table holding
+        the latest version of every row as ``argMaxState(column, _version)``,
+        filled by a materialized view on the table and by a backfill when it is
+        created, and a ``<table>_current`` view finalizing it. Objects synced by
+        chunk checksums get a ``FINAL`` view instead: their chunks are replaced
+        with lightweight deletes, which materialized views don't see.
+        
+        The views read the OlapTables of the models module, which must be
+        generated from the same tables.
+        
+        Args:
+            tables: List of TableMetadata objects
+            output_path: Path to write the generated Python file
+        """
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
-        # Generate the Python code
-        code = self._generate_python_code(tables)
+        code = self._generate_views_code(tables)
         
-        # Write to file
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(code)
         
-        logger.info(f"Generated Moose models for {len(tables)} tables at {output_path}")
+        logger.info(f"Generated views for {len(tables)} tables at {output_path}")
     
-    def _generate_python_code(self, tables: List[TableMetadata]) -> str:
-        """Generate the complete Python code for all models and pipelines."""
+    def _generate_modules(self, tables: List[TableMetadata]) -> Tuple[str, Dict[str, str]]:
+        """Generate the registry module and the module of each table, by module name."""
+        self._order_by_fields = {}
+        layouts = {table.table_name: self._get_table_layout(table) for table in tables}
+        module_codes = {
+            self._to_snake_case(table.table_name): self._generate_table_module_code(table, layouts[table.table_name])
+            for table in tables
+        }
+        return self._generate_registry_code(tables, layouts), module_codes
+    
+    def _generate_table_module_code(self, table: TableMetadata, layout: TableLayout) -> str:
+        """Generate the module holding one table's model and OlapTable."""
         lines = [
             '"""',
-            'Generated Moose models and pipelines.',
+            f'Generated Moose model and pipeline for SAP HANA table {table.table_name}.',
             'This file was automatically generated from database metadata.',
             '"""',
             '',
-            'from typing import Optional',
+            'from typing import Annotated, Optional',
             'from datetime import datetime',
-            'from moose_lib import BaseModel, Key, Field, OlapTable, OlapConfig',
+            'from pydantic import ConfigDict',
+            'from moose_lib import BaseModel, Key, Field, OlapTable, OlapConfig, ReplacingMergeTreeEngine, ClickhousePrecision',
             '',
         ]
         
@@ -244,13 +400,13 @@ class MooseModelGenerator:
                 '    ',
                 '    # Numeric types',
                 '    SapTinyInt, SapSmallInt, SapInteger, SapBigInt,',
-                '    SapSmallDecimal, SapDecimal, SapReal, SapDouble,',
+                '    SapSmallDecimal, SapDecimal, SapFixedDecimal, SapReal, SapDouble,',
                 '    ',
                 '    # Boolean type',
                 '    SapBoolean,',
                 '    ',
                 '    # Character string types',
-                '    SapVarchar, SapNvarchar, SapAlphanum, SapShortText,',
+                '    SapVarchar, SapNvarchar, SapAlphanum, SapNumc, SapShortText, sap_numc,',
                 '    ',
                 '    # Binary types',
                 '    SapVarbinary,',
@@ -267,18 +423,56 @@ class MooseModelGenerator:
                 '',
             ])
         
-        # Generate models
-        for table in tables:
-            model_code = self._generate_model_code(table)
-            lines.extend(model_code)
-            lines.append('')  # Add blank line between models
-        
-        # Generate OlapTable instances
+        lines.extend(self._generate_model_code(table))
+        lines.append('')
+        lines.extend(self._generate_olap_table_code(table, layout))
+        return '\n'.join(lines) + '\n'
+    
+    def _generate_registry_code(self, tables: List[TableMetadata], layouts: Dict[str, TableLayout]) -> str:
+        """Generate the registry module resolving table and model names to the table modules."""
+        package = self.config.tables_package
+        lines = [
+            '"""',
+            'Generated Moose models and pipelines.',
+            'This file was automatically generated from database metadata.',
+            '',
+            f'Each table\'s model and OlapTable live in a module of their own in {package},',
+            'imported the first time one of them is looked up here. load_all() imports',
+            'all of them, for Moose to collect the infrastructure map.',
+            '"""',
+            '',
+            'import importlib',
+            '',
+            'from app.utils.table_layout import Projection, SkipIndex, TableLayout',
+            '',
+            '# OlapTable and model class names -> module defining them',
+            'TABLE_MODULES = {',
+        ]
         for table in tables:
-            olap_table_code = self._generate_olap_table_code(table)
-            lines.extend(olap_table_code)
-
-        return '\n'.join(lines)
+            module = f'{package}.{self._to_snake_case(table.table_name)}'
+            lines.append(f'    "{self._to_snake_case(table.table_name)}": "{module}",')
+            lines.append(f'    "{self._to_pascal_case(table.table_name)}": "{module}",')
+        lines.extend([
+            '}',
+            '',
+            '__all__ = list(TABLE_MODULES)',
+            '',
+            '',
+            'def __getattr__(name):',
+            '    module_name = TABLE_MODULES.get(name)',
+            '    if module_name is None:',
+            '        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")',
+            '    return getattr(importlib.import_module(module_name), name)',
+            '',
+            '',
+            'def load_all():',
+            '    """Import every table module, registering all OlapTables with Moose."""',
+            '    for module_name in sorted(set(TABLE_MODULES.values())):',
+            '        importlib.import_module(module_name)',
+            '',
+        ])
+        lines.extend(self._generate_table_layouts_code(layouts))
+        return '\n'.join(lines) + '\n'
     
     def _generate_model_code(self, table: TableMetadata) -> List[str]:
         """Generate Python model code for a single table."""
@@ -304,43 +498,299 @@ class MooseModelGenerator:
                 '',
             ])
         
-        # Generate field definitions
-        for field in table.fields:
+        if base_class == 'BaseModel':
+            # Columns are named after the aliases, so inserted rows must be too
+            lines.append('    model_config = ConfigDict(serialize_by_alias=True)')
+            lines.append('')
+        
+        # Generate field definitions, primary key columns first in key order
+        # (ClickHouse needs the PRIMARY KEY to be a prefix of the ORDER BY)
+        for field in self._ordered_fields(table):
             field_def = self._generate_field_definition(field, table)
             lines.append(field_def)
         
+        if self.config.include_cdc_columns:
+            lines.extend(self._generate_cdc_field_definitions())
+            if self._is_hash_synced(table):
+                lines.extend(self._generate_chunk_field_definition())
+        
+        return lines
+
+    def _is_hash_synced(self, table: TableMetadata) -> bool:
+        """Whether the object is synced by chunk checksums instead of triggers."""
+        return table.object_type == 'VIEW' or table.table_name in self.config.hash_sync_tables
+
+    def _generate_chunk_field_definition(self) -> List[str]:
+        """Generate the field holding the chunk id rows were loaded with."""
+        lines = []
+        if self.config.include_field_comments:
+            lines.append('    # CDC: chunk of the SAP HANA object the row was synced with')
+        lines.append(f'    cdc_chunk: str = Field(alias="{CDC_CHUNK_COLUMN}", default="")')
+        return lines
+    
+    def _generate_cdc_field_definitions(self) -> List[str]:
+        """Generate the CDC version and delete marker fields."""
+        lines = []
+        if self.config.include_field_comments:
+            lines.append('    # CDC: SAP HANA CHANGE_ID of the row (0 for initial load rows)')
+        lines.append(
+            f'    cdc_version: Annotated[int, "uint64"] = Field(alias="{CDC_VERSION_COLUMN}", default=0)'
+        )
+        if self.config.include_field_comments:
+            lines.append('    # CDC: 1 if the row was deleted in SAP HANA')
+        lines.append(
+            f'    cdc_is_deleted: Annotated[int, "uint8"] = Field(alias="{CDC_IS_DELETED_COLUMN}", default=0)'
+        )
         return lines
     
-    def _generate_olap_table_code(self, table: TableMetadata) -> List[str]:
+    def _generate_olap_table_code(self, table: TableMetadata, layout: Optional[TableLayout] = None) -> List[str]:
         """Generate OlapTable code for a single table."""
+        layout = layout or TableLayout()
         class_name = self._to_pascal_case(table.table_name)
         variable_name = self._to_snake_case(table.table_name)
         
-        if self._has_primary_key(table):
-            # Table has primary key, use simple OlapTable creation
-            lines = [
-                f'{variable_name} = OlapTable[{class_name}]("{table.table_name}")',
-            ]
-        else:
-            # Table has no primary key, use OlapTableConfig with orderByFields
-            order_fields = self._get_order_by_fields(table)
-            order_fields_str = ', '.join(f'"{field}"' for field in order_fields)
-            
-            lines = [
-                f'{variable_name} = OlapTable[{class_name}]("{table.table_name}", OlapConfig(',
-                f'    order_by_fields=[{order_fields_str}]',
-                '))',
-            ]
+        # Sorted by the SAP HANA primary key, or by a few picked fields without one
+        order_fields = self._get_order_by_fields(table)
+        order_fields_str = ', '.join(f'"{field}"' for field in order_fields)
+        config_lines = [f'    order_by_fields=[{order_fields_str}]']
+        replacing = self._has_primary_key(table) and self.config.include_cdc_columns
+        if replacing:
+            # Rows of the same key collapse to the latest version, deletes included
+            config_lines.append(
+                f'    engine=ReplacingMergeTreeEngine(ver="{CDC_VERSION_COLUMN}", is_deleted="{CDC_IS_DELETED_COLUMN}")'
+            )
+        if layout.partition_by:
+            config_lines.append(f'    partition_by={layout.partition_by!r}')
         
+        settings = {}
+        if self.config.insert_deduplication_window > 0:
+            # Retried inserts carry the same insert_deduplication_token
+            settings['non_replicated_deduplication_window'] = str(self.config.insert_deduplication_window)
+        if replacing and layout.projections:
+            # ReplacingMergeTree rejects projections unless merges rebuild them
+            settings['deduplicate_merge_projection_mode'] = 'rebuild'
+        if settings:
+            settings_str = ', '.join(f'"{name}": "{value}"' for name, value in settings.items())
+            config_lines.append(f'    settings={{{settings_str}}}')
+        
+        return [
+            f'{variable_name} = OlapTable[{class_name}]("{table.table_name}", OlapConfig(',
+            ',\n'.join(config_lines),
+            '))',
+        ]
+    
+    def _get_table_layout(self, table: TableMetadata) -> TableLayout:
+        """Get the partition key, skipping indexes and projections of a table."""
+        layout = TableLayout()
+        if self.config.derive_table_layouts:
+            layout = derive_table_layout(
+                table,
+                self._get_order_by_fields(table),
+                partition_min_rows=self.config.partition_min_rows,
+                include_projections=self.config.derive_projections,
+            )
+        override = self.config.table_layout_overrides.get(table.table_name)
+        if override is not None:
+            layout = apply_overrides(layout, override)
+        return layout
+    
+    def _generate_table_layouts_code(self, layouts: Dict[str, TableLayout]) -> List[str]:
+        """Generate the TABLE_LAYOUTS mapping of the indexes and projections to add to each table."""
+        lines = [
+            '',
+            '# Skipping indexes and projections, added by the initial load (Moose',
+            '# creates the tables without them)',
+            'TABLE_LAYOUTS = {',
+        ]
+        for table_name, layout in layouts.items():
+            if layout.indexes or layout.projections:
+                lines.append(f'    "{table_name}": TableLayout(')
+                if layout.indexes:
+                    lines.append('        indexes=[')
+                    lines.extend(f'            {index!r},' for index in layout.indexes)
+                    lines.append('        ],')
+                if layout.projections:
+                    lines.append('        projections=[')
+                    lines.extend(f'            {projection!r},' for projection in layout.projections)
+                    lines.append('        ],')
+                lines.append('    ),')
+        lines.append('}')
         return lines
     
+    def _generate_views_code(self, tables: List[TableMetadata]) -> str:
+        """Generate the complete Python code for all views."""
+        self._order_by_fields = {}
+        # Only ReplacingMergeTree tables collapse to one row per key
+        current_tables = [
+            table for table in tables
+            if self._has_primary_key(table) and self.config.include_cdc_columns
+        ]
+        lines = [
+            '"""',
+            'Generated current-state views.',
+            'This file was automatically generated from database metadata.',
+            '"""',
+            '',
+            'from moose_lib import SqlResource, View',
+        ]
+        if current_tables:
+            table_variables = ', '.join(self._to_snake_case(table.table_name) for table in current_tables)
+            lines.append(f'from app.ingest.cdc import {table_variables}')
+        lines.append('')
+        
+        for table in current_tables:
+            variable_name = self._to_snake_case(table.table_name)
+            current_name = f'{variable_name}_current'
+            if self._is_hash_synced(table):
+                current_select = self._current_state_select(table)
+                current_source = variable_name
+            else:
+                state_name = current_state_table_name(table.table_name)
+                current_select = self._current_state_view_select(table)
+                current_source = f'{variable_name}_current_state'
+                lines.extend([
+                    '',
+                    f'# Latest version of each {table.table_name} row, kept by a materialized view',
+                    f'{current_source} = SqlResource(',
+                    f'    "{state_name}",',
+                    '    [',
+                    *[f'        {statement!r},' for statement in self._current_state_setup(table)],
+                    '    ],',
+                    '    [',
+                    *[f'        {statement!r},' for statement in self._current_state_teardown(table)],
+                    '    ],',
+                    f'    pulls_data_from=[{variable_name}],',
+                    ')',
+                ])
+            lines.extend([
+                '',
+                f'# {table.table_name} as of the latest change of each row, deleted rows left out',
+                f'{current_name} = View(',
+                f'    "{current_name}",',
+                f'    {current_select!r},',
+                f'    [{current_source}],',
+                ')',
+            ])
+            for aggregate in self.config.aggregate_views.get(table.table_name, []):
+                lines.extend([
+                    '',
+                    f'{aggregate["name"]} = View(',
+                    f'    "{aggregate["name"]}",',
+                    f'    {self._aggregate_select(current_name, aggregate)!r},',
+                    f'    [{current_name}],',
+                    ')',
+                ])
+        
+        return '\n'.join(lines) + '\n'
+    
+    def _current_state_setup(self, table: TableMetadata) -> List[str]:
+        """Statements creating, filling and maintaining a table's current-state table."""
+        state_table = quote_column(current_state_table_name(table.table_name))
+        state_view = quote_column(f'{current_state_table_name(table.table_name)}_mv')
+        key_columns = ', '.join(quote_column(field.name) for field in table.get_primary_key_fields())
+        states = self._current_state_aggregate_select(table)
+        return [
+            # EMPTY AS SELECT gives the columns the exact AggregateFunction types of the states
+            f'CREATE TABLE IF NOT EXISTS {state_table} ENGINE = AggregatingMergeTree '
+            f'ORDER BY ({key_columns}) EMPTY AS {states}',
+            f'CREATE MATERIALIZED VIEW IF NOT EXISTS {state_view} TO {state_table} AS {states}',
+            # Rows loaded before the view existed; states of rows inserted since merge the same way
+            f'INSERT INTO {state_table} {states}',
+        ]
+
+    def _current_state_teardown(self, table: TableMetadata) -> List[str]:
+        """Statements dropping a table's current-state table and its materialized view."""
+        state_table = quote_column(current_state_table_name(table.table_name))
+        state_view = quote_column(f'{current_state_table_name(table.table_name)}_mv')
+        return [f'DROP VIEW IF EXISTS {state_view}', f'DROP TABLE IF EXISTS {state_table}']
+
+    def _current_state_aggregate_select(self, table: TableMetadata) -> str:
+        """SELECT statement turning a table's rows into per-key argMax states."""
+        key_columns = [quote_column(field.name) for field in table.get_primary_key_fields()]
+        states = [
+            f'argMaxState({quote_column(field.name)}, {CDC_VERSION_COLUMN}) AS {quote_column(field.name)}'
+            for field in table.fields if not field.is_primary_key
+        ]
+        states.append(f'argMaxState({CDC_IS_DELETED_COLUMN}, {CDC_VERSION_COLUMN}) AS {CDC_IS_DELETED_COLUMN}')
+        states.append(f'maxState({CDC_VERSION_COLUMN}) AS {CDC_VERSION_COLUMN}')
+        return (
+            f'SELECT {", ".join(key_columns + states)} FROM {quote_column(table.table_name)} '
+            f'GROUP BY {", ".join(key_columns)} {_COLUMN_NAMES_OVER_ALIASES}'
+        )
+
+    def _current_state_view_select(self, table: TableMetadata) -> str:
+        """SELECT statement of a current-state view finalizing the argMax states."""
+        state_table = quote_column(current_state_table_name(table.table_name))
+        key_columns = [quote_column(field.name) for field in table.get_primary_key_fields()]
+        values = [
+            f'argMaxMerge({quote_column(field.name)}) AS {quote_column(field.name)}'
+            for field in table.fields if not field.is_primary_key
+        ]
+        values.append(f'maxMerge({CDC_VERSION_COLUMN}) AS {CDC_VERSION_COLUMN}')
+        return (
+            f'SELECT {", ".join(key_columns + values)} FROM {state_table} '
+            f'GROUP BY {", ".join(key_columns)} HAVING argMaxMerge({CDC_IS_DELETED_COLUMN}) = 0 '
+            f'{_COLUMN_NAMES_OVER_ALIASES}'
+        )
+
+    def _current_state_select(self, table: TableMetadata) -> str:
+        """SELECT statement of the current-state view of an object synced by chunk checksums."""
+        columns = [quote_column(field.name) for field in self._ordered_fields(table)]
+        columns.append(CDC_VERSION_COLUMN)
+        # FINAL keeps the latest version of each key, merged or not
+        statement = (
+            f'SELECT {", ".join(columns)} FROM {quote_column(table.table_name)} FINAL '
+            f'WHERE {CDC_IS_DELETED_COLUMN} = 0'
+        )
+        layout = self._get_table_layout(table)
+        if layout.partition_by and self._partitioned_within_key(table, layout.partition_by):
+            # Rows of a key never move between partitions, so each partition
+            # can be deduplicated on its own
+            statement += ' SETTINGS do_not_merge_across_partitions_select_final = 1'
+        return statement
+    
+    def _partitioned_within_key(self, table: TableMetadata, partition_by: str) -> bool:
+        """Check if a partition key only uses ORDER BY columns."""
+        order_fields = set(self._get_order_by_fields(table))
+        partition_columns = [
+            field.name for field in table.fields
+            if re.search(rf'(?<![\w/]){re.escape(field.name)}(?![\w/])', partition_by)
+        ]
+        return bool(partition_columns) and all(name in order_fields for name in partition_columns)
+    
+    def _aggregate_select(self, current_name: str, aggregate: Dict[str, Any]) -> str:
+        """SELECT statement of an aggregate view over a current-state view."""
+        group_by = [quote_column(column) for column in aggregate.get('group_by', [])]
+        measures = [f'{expression} AS {alias}' for alias, expression in aggregate['measures'].items()]
+        statement = f'SELECT {", ".join(group_by + measures)} FROM {current_name}'
+        if group_by:
+            statement += f' GROUP BY {", ".join(group_by)}'
+        return statement
+    
     def _has_primary_key(self, table: TableMetadata) -> bool:
         """Check if table has any primary key fields."""
         return any(field.is_primary_key for field in table.fields)
     
+    def _ordered_fields(self, table: TableMetadata) -> List[FieldMetadata]:
+        """Table fields with the primary key fields first, in primary key order."""
+        pk_fields = table.get_primary_key_fields()
+        return pk_fields + [field for field in table.fields if not field.is_primary_key]
+    
     def _get_order_by_fields(self, table: TableMetadata) -> List[str]:
-        """Get list of field names to use for ordering when no primary key exists."""
-        # Use the first few fields as order by fields
+        """Get list of field names to use for ordering."""
+        # Asked for every field of a table, so computed once per table
+        order_fields = self._order_by_fields.get(table.table_name)
+        if order_fields is None:
+            order_fields = self._order_by_fields[table.table_name] = self._compute_order_by_fields(table)
+        return order_fields
+    
+    def _compute_order_by_fields(self, table: TableMetadata) -> List[str]:
+        """Pick the ORDER BY fields of a table."""
+        if self._has_primary_key(table):
+            # The primary key identifies a row; ReplacingMergeTree deduplicates by it
+            return [field.name for field in table.get_primary_key_fields()]
+        
+        # Without a primary key, use the first few fields as order by fields
         # Prioritize fields that might be good for ordering (timestamps, IDs, etc.)
         order_fields = []
         
@@ -363,6 +813,9 @@ class MooseModelGenerator:
     def _generate_field_definition(self, field: FieldMetadata, table: TableMetadata) -> str:
         """Generate a single field definition for a model."""
         python_type = self._map_data_type(field.data_type)
+        normalized_type = field.data_type.upper().split('(')[0]
+        if self.config.use_sap_hana_validators and field.name in self.config.numc_columns.get(table.table_name, ()):
+            python_type = f'sap_numc({field.length})' if field.length else 'SapNumc'
         
         # Generate field name by replacing non-alphanumeric characters with underscores
         field_name = self._sanitize_field_name(field.name)
@@ -370,21 +823,43 @@ class MooseModelGenerator:
         # Check if field name needs an alias (contains non-alphanumeric characters) or starts with a non-alphanumeric character
         needs_alias = not field.name.replace('_', '').isalnum() or not field.name[0].isalnum()
         
+        # ClickHouse column type details (Decimal precision, LowCardinality, DateTime64)
+        python_type, field_constraints = self._apply_physical_type(field, normalized_type, python_type)
+        
+        # Determine field characteristics
+        is_primary_key = field.is_primary_key or (
+            not self._has_primary_key(table)
+            and field.name.lower() in self.config.primary_key_field_names
+        )
+        is_order_by_field = self._is_order_by_field(field, table)
+        
         # Handle primary key fields
-        if field.is_primary_key or field.name.lower() in self.config.primary_key_field_names:
+        if is_primary_key:
             python_type = f'Key[{python_type}]'
         
         # Handle timestamp fields - only override if not using SAP HANA validators
         if self._is_timestamp_field(field) and not self.config.use_sap_hana_validators:
             python_type = 'datetime'
         
+        # Handle optional fields
+        # Primary key and order-by fields are never optional. Other fields are
+        # optional if nullable in the database or force_all_fields_nullable is
+        # set; NOT NULL fields default to their SAP initial value where it has
+        # a ClickHouse equivalent and are optional otherwise.
+        initial_value = None
+        if is_primary_key or is_order_by_field:
+            should_be_optional = False
+        elif field.is_nullable or self.config.force_all_fields_nullable:
+            should_be_optional = True
+        elif self.config.use_sap_initial_values:
+            initial_value = self.SAP_INITIAL_VALUES.get(normalized_type)
+            should_be_optional = initial_value is None
+        else:
+            should_be_optional = False
+        
         # Build field definition
         field_parts = []
         
-        # Determine field characteristics
-        is_primary_key = field.is_primary_key or field.name.lower() in self.config.primary_key_field_names
-        is_order_by_field = self._is_order_by_field(field, table)
-        
         # Add field comment if enabled
         if self.config.include_field_comments:
             comment_parts = []
@@ -396,44 +871,82 @@ class MooseModelGenerator:
                 comment_parts.append("Order by field")
             if field.is_nullable:
                 comment_parts.append("Nullable")
-            elif self.config.force_all_fields_nullable and not field.is_primary_key and not is_order_by_field:
+            elif self.config.force_all_fields_nullable and should_be_optional:
                 comment_parts.append("Forced nullable")
+            elif initial_value is not None:
+                comment_parts.append("SAP initial value default")
+            elif should_be_optional:
+                comment_parts.append("Nullable for SAP initial value")
             
             if comment_parts:
                 comment = " | ".join(comment_parts)
                 field_parts.append(f'    # {comment}')
         
-        # Handle optional fields
-        # Make field optional if:
-        # 1. It's marked as nullable in the database, OR
-        # 2. force_all_fields_nullable is True AND it's not a primary key
-        # BUT NEVER make primary key fields or order-by fields optional
-        should_be_optional = (
-            not is_primary_key and 
-            not is_order_by_field and (
-                field.is_nullable or 
-                self.config.force_all_fields_nullable
-            )
-        )
-        
+        default_value = initial_value
         if should_be_optional:
             python_type = f'Optional[{python_type}]'
             default_value = self._get_default_value(field)
-            
-            if needs_alias:
-                field_def = f'{field_name}: {python_type} = Field(alias="{field.name}", default={default_value})'
-            else:
-                field_def = f'{field_name}: {python_type} = {default_value}'
+        
+        field_args = []
+        if needs_alias:
+            field_args.append(f'alias="{field.name}"')
+        if default_value is not None:
+            field_args.append(f'default={default_value}')
+        field_args.extend(field_constraints)
+        
+        if needs_alias or field_constraints:
+            field_def = f'{field_name}: {python_type} = Field({", ".join(field_args)})'
+        elif default_value is not None:
+            field_def = f'{field_name}: {python_type} = {default_value}'
         else:
-            if needs_alias:
-                field_def = f'{field_name}: {python_type} = Field(alias="{field.name}")'
-            else:
-                field_def = f'{field_name}: {python_type}'
+            field_def = f'{field_name}: {python_type}'
         
         field_parts.append(f'    {field_def}')
         
         return '\n'.join(field_parts)
     
+    def _apply_physical_type(
+        self, field: FieldMetadata, normalized_type: str, python_type: str
+    ) -> Tuple[str, List[str]]:
+        """
+        Refine a field's type to the ClickHouse column type its SAP HANA metadata allows.
+        
+        Returns:
+            Tuple of (python type, extra ``Field`` arguments)
+        """
+        if not self.config.use_sap_hana_validators:
+            if self._is_low_cardinality(field, normalized_type):
+                return f'Annotated[{python_type}, "LowCardinality"]', []
+            return python_type, []
+        
+        if (
+            self.config.exact_decimal_types
+            and normalized_type in ('DECIMAL', 'NUMERIC')
+            and field.length
+            and field.scale is not None
+        ):
+            # Floating-point DECIMALs (no scale) keep the clamped SapDecimal
+            return 'SapFixedDecimal', [f'max_digits={field.length}', f'decimal_places={field.scale}']
+        
+        if normalized_type == 'TIMESTAMP' and self.config.timestamp_precision is not None:
+            return (
+                f'Annotated[{python_type}, ClickhousePrecision(precision={self.config.timestamp_precision})]',
+                [],
+            )
+        
+        if self._is_low_cardinality(field, normalized_type):
+            return f'Annotated[{python_type}, "LowCardinality"]', []
+        
+        return python_type, []
+    
+    def _is_low_cardinality(self, field: FieldMetadata, normalized_type: str) -> bool:
+        """Check if a field is a short SAP code column stored as LowCardinality(String)."""
+        return (
+            normalized_type in self.LOW_CARDINALITY_TYPES
+            and field.length is not None
+            and 0 < field.length <= self.config.low_cardinality_max_length
+        )
+    
     def _map_data_type(self, hana_type: str) -> str:
         """Map SAP HANA data type to Python type or SAP HANA annotated type."""
         # Normalize the type name
@@ -544,3 +1057,20 @@ def generate_moose_models(
     generator = MooseModelGenerator(config)
     generator.generate_models(tables, output_path)
 
+
+def generate_moose_views(
+    tables: List[TableMetadata],
+    output_path: str,
+    config: Optional[MooseModelConfig] = None
+) -> None:
+    """
+    Convenience function to generate the current-state and aggregate views.
+    
+    Args:
+        tables: List of TableMetadata objects
+        output_path: Path to write the generated Python file
+        config: Optional configuration, the same as for the models
+    """
+    generator = MooseModelGenerator(config)
+    generator.generate_views(tables, output_path)
+
@@ -0,0 +1,207 @@
+"""
+Key range checksums of replicated tables in ClickHouse.
+
+A table is reconciled with SAP HANA by key range: the rows whose primary key
+hash starts with the same hex prefix. Both sides summarize a range by its row
+count and the sums of two slices of its row hashes, which don't depend on row
+order. The ClickHouse key hash reproduces the one SAP HANA computes (see
+sap_hana_cdc.chunk_hashes.hash_expression) from the values' text, so keys of
+character, integer and date columns hash the same on both sides. A row hash
+covers the key hash and the other columns' values, as the canonical text of
+their ValueKind that both sides render alike (see model_value_columns).
+"""
+
+import types
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Annotated, Any, Dict, List, Optional, Sequence, Tuple, Type, Union, get_args, get_origin
+
+from moose_lib import Key
+from pydantic import BaseModel, BeforeValidator
+
+from sap_hana_cdc import ChunkHash, ValueColumn, ValueKind
+from sap_hana_cdc.chunk_hashes import HASH_COLUMN_GROUP_SIZE, ROW_HASH_SLICES
+
+from app.utils.moose_model_generator import CDC_CHUNK_COLUMN, CDC_IS_DELETED_COLUMN, CDC_VERSION_COLUMN
+from app.utils.sap_hana_validators import (
+    validate_sap_alphanum,
+    validate_sap_numc,
+    validate_sap_nvarchar,
+    validate_sap_shorttext,
+    validate_sap_varchar,
+)
+from app.utils.table_layout import quote_column
+
+_CDC_COLUMNS = {CDC_VERSION_COLUMN, CDC_IS_DELETED_COLUMN, CDC_CHUNK_COLUMN}
+# Validators of the character types; other str fields hold base64 binary or LOB data
+_TEXT_VALIDATORS = {
+    validate_sap_varchar, validate_sap_nvarchar, validate_sap_alphanum, validate_sap_numc, validate_sap_shorttext,
+}
+
+
+def _hash_of(values: Sequence[str]) -> str:
+    """ClickHouse expression of the uppercase hex SHA-256 SAP HANA computes for some texts."""
+    group_hashes = []
+    for start in range(0, len(values), HASH_COLUMN_GROUP_SIZE):
+        text = ", char(31), ".join(
+            f"ifNull({value}, char(30))" for value in values[start:start + HASH_COLUMN_GROUP_SIZE]
+        )
+        # concat() needs two arguments, even for a single value
+        group_hashes.append(f"hex(SHA256(concat({text}, '')))")
+    if len(group_hashes) == 1:
+        return group_hashes[0]
+    return f"hex(SHA256(concat({', '.join(group_hashes)})))"
+
+
+def key_hash_expression(key_columns: List[str]) -> str:
+    """ClickHouse expression of the uppercase hex SHA-256 SAP HANA computes for a row's key."""
+    return _hash_of([f"toString({quote_column(column)})" for column in key_columns])
+
+
+def canonical_value_expression(column: ValueColumn) -> str:
+    """
+    ClickHouse expression of a column's canonical text, as sap_hana_cdc.chunk_hashes.canonical_value.
+
+    The generated columns store SAP's initial values either as they are or as
+    NULL (use_sap_initial_values), so both render as NULL.
+    """
+    name = quote_column(column.name)
+    if column.kind == ValueKind.TEXT:
+        return f"nullIf(toString({name}), '')"
+    if column.kind == ValueKind.INTEGER:
+        return f"toString(nullIf({name}, 0))"
+    if column.kind == ValueKind.DECIMAL:
+        return f"toDecimalString(nullIf({name}, 0), {int(column.scale)})"
+    if column.kind == ValueKind.DATE:
+        return f"toString({name})"
+    if column.kind == ValueKind.TIMESTAMP:
+        # Naive SAP HANA timestamps are stored as UTC
+        return f"formatDateTime({name}, '%Y-%m-%d %H:%i:%S', 'UTC')"
+    if column.kind == ValueKind.BOOLEAN:
+        return f"toString(toUInt8({name}))"
+    raise ValueError(f"Unknown value kind of column {column.name}: {column.kind}")
+
+
+def _field_type(field_info: Any) -> Tuple[Any, List[Any]]:
+    """A field's type without Optional, Key and Annotated wrappers, and the metadata of those."""
+    annotation, metadata = field_info.annotation, list(field_info.metadata)
+    while True:
+        if get_origin(annotation) is Annotated:
+            annotation, *extra = get_args(annotation)
+            metadata.extend(extra)
+        elif get_origin(annotation) in (Union, types.UnionType):
+            annotation = next(arg for arg in get_args(annotation) if arg is not type(None))
+        elif get_origin(annotation) is Key:
+            annotation = get_args(annotation)[0]
+        else:
+            return annotation, metadata
+
+
+def _value_kind(field_info: Any) -> Optional[Tuple[ValueKind, int]]:
+    """Kind and scale a field's values are hashed as, None if they can't be compared."""
+    annotation, metadata = _field_type(field_info)
+    if annotation is bool:
+        return ValueKind.BOOLEAN, 0
+    if annotation is int:
+        return ValueKind.INTEGER, 0
+    if annotation is Decimal:
+        # Decimals without a scale are clamped to Decimal(10, 0) in ClickHouse
+        scale = next((m.decimal_places for m in metadata if getattr(m, "decimal_places", None) is not None), None)
+        return (ValueKind.DECIMAL, scale) if scale is not None else None
+    if annotation is datetime:
+        return ValueKind.TIMESTAMP, 0
+    if annotation is date:
+        return ValueKind.DATE, 0
+    # sap_numc(length) validates with a partial of validate_sap_numc
+    validators = {getattr(m.func, "func", m.func) for m in metadata if isinstance(m, BeforeValidator)}
+    if annotation is str and validators <= _TEXT_VALIDATORS:
+        return ValueKind.TEXT, 0
+    return None
+
+
+def model_value_columns(model_type: Type[BaseModel], key_columns: List[str]) -> List[ValueColumn]:
+    """
+    Non-key columns of a generated model whose values key range checksums cover.
+
+    Floating-point, TIME, binary and LOB columns, and decimals ClickHouse
+    stores clamped, are left out: their values don't render as the same text
+    on both sides, or the replica doesn't store them exactly.
+    """
+    columns = []
+    for field_name, field_info in model_type.model_fields.items():
+        name = field_info.alias or field_name
+        if name in key_columns or name in _CDC_COLUMNS:
+            continue
+        kind = _value_kind(field_info)
+        if kind is not None:
+            columns.append(ValueColumn(name, *kind))
+    return columns
+
+
+def _slice_sum(start: int) -> str:
+    """Sum of the 32-bit big-endian values of 8 hex digits of the row hashes."""
+    return f"sum(reinterpretAsUInt32(reverse(unhex(substring(_row, {start}, 8)))))"
+
+
+def key_range_hashes_query(
+    table_name: str,
+    key_columns: List[str],
+    prefix_length: int,
+    narrowed: bool = False,
+    value_columns: Sequence[ValueColumn] = (),
+) -> str:
+    """
+    Query of the row counts and row hash sums of a table's current rows by key range.
+
+    Args:
+        table_name: ClickHouse table name
+        key_columns: SAP HANA primary key columns
+        prefix_length: Hex digits of the key hash prefix identifying a range
+        narrowed: Only the ranges within the parent_prefixes parameter (Array(String))
+        value_columns: Non-key columns whose values the row hashes cover
+    """
+    parent_condition = (
+        f"WHERE has({{parent_prefixes:Array(String)}}, substring(_key, 1, {prefix_length - 1}))"
+        if narrowed else ""
+    )
+    value_list = "".join(f", {quote_column(column.name)}" for column in value_columns)
+    row_hash = _hash_of(["_key", *(canonical_value_expression(column) for column in value_columns)])
+    # FINAL collapses each key to its latest version, so deleted rows drop out
+    return (
+        f"SELECT substring(_key, 1, {prefix_length}) AS prefix, count(), "
+        f"{_slice_sum(ROW_HASH_SLICES[0])}, {_slice_sum(ROW_HASH_SLICES[1])} "
+        f"FROM (SELECT _key, {row_hash} AS _row "
+        f"FROM (SELECT {key_hash_expression(key_columns)} AS _key{value_list} "
+        f"FROM {table_name} FINAL WHERE {CDC_IS_DELETED_COLUMN} = 0) "
+        f"{parent_condition}) "
+        f"GROUP BY prefix ORDER BY prefix"
+    )
+
+
+def key_range_delete_statement(table_name: str, key_columns: List[str], prefix_length: int) -> str:
+    """Lightweight DELETE of the rows of the key ranges in the prefixes parameter (Array(String))."""
+    return (
+        f"DELETE FROM {table_name} "
+        f"WHERE has({{prefixes:Array(String)}}, substring({key_hash_expression(key_columns)}, 1, {prefix_length}))"
+    )
+
+
+def mismatched_ranges(source: List[ChunkHash], replica: List[ChunkHash]) -> Dict[str, int]:
+    """
+    Key ranges whose row count or checksum differ between SAP HANA and ClickHouse.
+
+    Returns:
+        The ranges' prefixes, with the larger of their two row counts
+    """
+    source_ranges = {key_range.chunk_id: key_range for key_range in source}
+    replica_ranges = {key_range.chunk_id: key_range for key_range in replica}
+    mismatched = {}
+    for prefix in sorted(source_ranges.keys() | replica_ranges.keys()):
+        source_range: Optional[ChunkHash] = source_ranges.get(prefix)
+        replica_range: Optional[ChunkHash] = replica_ranges.get(prefix)
+        if source_range != replica_range:
+            mismatched[prefix] = max(
+                source_range.row_count if source_range else 0,
+                replica_range.row_count if replica_range else 0,
+            )
+    return mismatched
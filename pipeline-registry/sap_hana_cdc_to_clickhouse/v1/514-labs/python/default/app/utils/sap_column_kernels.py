@@ -0,0 +1,201 @@
+"""
+Column-at-a-time SAP HANA type conversion.
+
+The validators in ``sap_hana_validators`` convert one value at a time, and for
+every value they re-dispatch on its type and go through string handling (e.g.
+``validate_sap_decimal`` stringifies and splits each Decimal). The kernels in
+this module convert a whole column (a list of values of one SAP type) in one
+call:
+
+- Dispatch happens once per column and the common value types are handled
+  inline with C-implemented parsers (``date.fromisoformat``, ``bytes.hex``,
+  dict lookups for booleans).
+- Values the scalar validator would return unchanged are passed through.
+- Anything unusual is handed to the scalar validator, so every kernel returns
+  exactly what mapping the validator over the column would, and raises the
+  same errors.
+
+``SapRowConverter.convert_columns`` runs them over the fields of a snapshot
+page or CDC batch before the rows are converted one by one. Run
+tests/benchmarks/bench_sap_column_kernels.py to benchmark them against the
+scalar validators.
+
+NumPy and pyarrow aren't dependencies of this pipeline, and the rows end up as
+Python objects for the insert anyway, so the kernels are plain Python.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from . import sap_hana_validators as v
+
+ColumnKernel = Callable[[Sequence[Any]], List[Any]]
+
+
+# ============================================================================
+# DATETIME KERNELS
+# ============================================================================
+
+def convert_date_column(values: Sequence[Any]) -> List[Optional[date]]:
+    """Convert a DATE column; same results as ``validate_sap_date``."""
+    result = []
+    append = result.append
+    fromisoformat = date.fromisoformat
+    validate = v.validate_sap_date
+    for value in values:
+        value_type = type(value)
+        if value is None or value_type is date or value_type is datetime:
+            # validate_sap_date returns dates (and datetimes, which are dates) as-is
+            append(value)
+        elif value_type is str and len(value) == 10 and value[4] == '-' and value[7] == '-':
+            try:
+                append(fromisoformat(value))
+            except ValueError:
+                append(validate(value))
+        elif value_type is str and value == v.SAP_INITIAL_DATE:
+            append(None)
+        else:
+            append(validate(value))
+    return result
+
+
+def convert_timestamp_column(
+    values: Sequence[Any], validate: Callable[[Any], Any] = v.validate_sap_timestamp
+) -> List[Optional[datetime]]:
+    """Convert a TIMESTAMP or SECONDDATE column; same results as ``validate``."""
+    result = []
+    append = result.append
+    for value in values:
+        if value is None or type(value) is datetime:
+            append(value)
+        else:
+            append(validate(value))
+    return result
+
+
+# ============================================================================
+# NUMERIC KERNELS
+# ============================================================================
+
+def convert_decimal_column(
+    values: Sequence[Any],
+    max_digits: int = 10,
+    validate: Callable[[Any], Any] = v.validate_sap_decimal,
+) -> List[Optional[Decimal]]:
+    """
+    Convert a DECIMAL column, clamping values to ``max_digits`` digits.
+
+    Same results as ``validate`` (``validate_sap_decimal`` for 10 digits,
+    ``validate_sap_smalldecimal`` for 8): Decimals that already fit are passed
+    through after a single digit count, the rest are clamped by the validator.
+    """
+    result = []
+    append = result.append
+    for value in values:
+        if value is None:
+            append(None)
+        elif type(value) is Decimal:
+            # Same digit count as the validator: every character but the decimal point
+            decimal_str = str(value)
+            if len(decimal_str) - ('.' in decimal_str) <= max_digits:
+                append(value)
+            else:
+                append(validate(value))
+        else:
+            append(validate(value))
+    return result
+
+
+_BOOLEAN_STRINGS = {
+    'true': True, '1': True, 'yes': True, 'on': True,
+    'false': False, '0': False, 'no': False, 'off': False,
+}
+
+
+def convert_boolean_column(values: Sequence[Any]) -> List[Optional[bool]]:
+    """Convert a BOOLEAN column; same results as ``validate_sap_boolean``."""
+    result = []
+    append = result.append
+    validate = v.validate_sap_boolean
+    for value in values:
+        value_type = type(value)
+        if value is None or value_type is bool:
+            append(value)
+        elif value_type is int or value_type is float:
+            append(bool(value))
+        elif value_type is str:
+            converted = _BOOLEAN_STRINGS.get(value.lower())
+            append(validate(value) if converted is None else converted)
+        else:
+            append(validate(value))
+    return result
+
+
+# ============================================================================
+# STRING AND BINARY KERNELS
+# ============================================================================
+
+def convert_numc_column(values: Sequence[Any], length: Optional[int] = None) -> List[Optional[str]]:
+    """Convert a NUMC column; same results as ``validate_sap_numc``."""
+    result = []
+    append = result.append
+    validate = v.validate_sap_numc
+    for value in values:
+        if value is None:
+            append(None)
+        elif (
+            type(value) is str
+            and value.isascii()
+            and value.isdigit()
+            and (length is None or len(value) == length)
+        ):
+            append(value)
+        else:
+            append(validate(value, length))
+    return result
+
+
+def convert_varbinary_column(values: Sequence[Any]) -> List[Optional[str]]:
+    """Convert a VARBINARY column to uppercase hex; same results as ``validate_sap_varbinary``."""
+    result = []
+    append = result.append
+    validate = v.validate_sap_varbinary
+    for value in values:
+        value_type = type(value)
+        if value_type is bytes or value_type is memoryview:
+            append(value.hex().upper())
+        elif value is None:
+            append(None)
+        else:
+            append(validate(value))
+    return result
+
+
+# ============================================================================
+# LOOKUP
+# ============================================================================
+
+_COLUMN_KERNELS: Dict[Callable[[Any], Any], ColumnKernel] = {
+    v.validate_sap_date: convert_date_column,
+    v.validate_sap_seconddate: partial(convert_timestamp_column, validate=v.validate_sap_seconddate),
+    v.validate_sap_timestamp: convert_timestamp_column,
+    v.validate_sap_smalldecimal: partial(convert_decimal_column, max_digits=8, validate=v.validate_sap_smalldecimal),
+    v.validate_sap_decimal: convert_decimal_column,
+    v.validate_sap_boolean: convert_boolean_column,
+    v.validate_sap_numc: convert_numc_column,
+    v.validate_sap_varbinary: convert_varbinary_column,
+}
+
+
+def get_column_kernel(validator: Optional[Callable[[Any], Any]]) -> Optional[ColumnKernel]:
+    """
+    Get the column kernel matching a scalar validator, or None if there isn't one.
+
+    Also takes the validators of ``sap_numc(length)``, ``validate_sap_numc``
+    with a length.
+    """
+    if isinstance(validator, partial) and validator.func is v.validate_sap_numc and not validator.args:
+        return partial(convert_numc_column, **validator.keywords)
+    return _COLUMN_KERNELS.get(validator)
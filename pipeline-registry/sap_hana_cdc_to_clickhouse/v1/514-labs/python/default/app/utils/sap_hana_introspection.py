@@ -5,8 +5,10 @@ This module provides functionality to extract table metadata from SAP HANA datab
 using hdbcli connections, including field names, types, and primary key information.
 """
 
-from typing import List, Dict, Any, Optional, Union
-from dataclasses import dataclass
+from typing import Callable, List, Dict, Any, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field as dataclass_field, replace
+import hashlib
 import logging
 
 try:
@@ -16,6 +18,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Object names per IN-list of the bulk introspection queries
+BULK_CHUNK_SIZE = 1000
+
 
 @dataclass
 class FieldMetadata:
@@ -28,6 +33,8 @@ class FieldMetadata:
     length: Optional[int] = None
     scale: Optional[int] = None
     default_value: Optional[str] = None
+    # 1-based position in the primary key, None for other columns
+    primary_key_position: Optional[int] = None
 
 
 @dataclass
@@ -38,14 +45,21 @@ class TableMetadata:
     schema_name: str
     fields: List[FieldMetadata]
     object_type: str = 'TABLE'  # 'TABLE' or 'VIEW'
+    # Row count from M_TABLES, None for views or if it couldn't be read
+    record_count: Optional[int] = None
+    # First level partitioning of the table ('RANGE', 'HASH', 'ROUNDROBIN'), None if unpartitioned
+    partition_type: Optional[str] = None
+    partition_columns: List[str] = dataclass_field(default_factory=list)
 
     def get_field_names(self) -> List[str]:
         """Get list of field names."""
         return [field.name for field in self.fields]
     
     def get_primary_key_fields(self) -> List[FieldMetadata]:
-        """Get list of primary key fields."""
-        return [field for field in self.fields if field.is_primary_key]
+        """Get list of primary key fields, in primary key order."""
+        pk_fields = [field for field in self.fields if field.is_primary_key]
+        # Without positions the column order is kept (sort is stable)
+        return sorted(pk_fields, key=lambda field: field.primary_key_position or 0)
     
     def get_field_by_name(self, name: str) -> Optional[FieldMetadata]:
         """Get field metadata by name."""
@@ -54,6 +68,48 @@ class TableMetadata:
                 return field
         return None
 
+    def with_columns(self, columns: Optional[List[str]]) -> 'TableMetadata':
+        """
+        The table restricted to a column allow-list.
+
+        Args:
+            columns: Columns to keep; primary key columns are always kept. None keeps all.
+
+        Returns:
+            A copy with only the kept fields, in table order
+        """
+        if columns is None:
+            return self
+        kept = set(columns)
+        return replace(self, fields=[
+            field for field in self.fields if field.name in kept or field.is_primary_key
+        ])
+
+    def fingerprint(self) -> str:
+        """
+        Fingerprint of the table's columns and primary key.
+
+        Row counts and partitioning aren't part of it: they change without
+        the schema changing.
+        """
+        digest = hashlib.sha1()
+        for field in self.fields:
+            digest.update(repr((
+                field.name, field.data_type, field.length, field.scale,
+                field.is_nullable, field.default_value, field.primary_key_position,
+            )).encode('utf-8'))
+        return digest.hexdigest()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON serializable dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TableMetadata':
+        """Create from a dictionary written by to_dict."""
+        fields = [FieldMetadata(**field) for field in data['fields']]
+        return cls(**{**data, 'fields': fields})
+
 
 class HanaIntrospector:
     """Generator for database table metadata from SAP HANA databases."""
@@ -113,6 +169,242 @@ class HanaIntrospector:
         
         return metadata_list
     
+    def get_bulk_table_metadata(
+        self,
+        table_names: List[str],
+        schema_name: Optional[str] = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+        connection_factory: Optional[Callable[[], hdb.Connection]] = None,
+        max_workers: int = 1,
+    ) -> List[TableMetadata]:
+        """
+        Get metadata for many tables and views with set-based queries.
+
+        Instead of three to four queries per object, each chunk of names is
+        read with one query on TABLE_COLUMNS, VIEW_COLUMNS, CONSTRAINTS,
+        M_TABLES and PARTITIONED_TABLES each. Objects with columns in
+        TABLE_COLUMNS are tables, those in VIEW_COLUMNS views.
+
+        Args:
+            table_names: Table and view names
+            schema_name: Optional schema name. If None, uses current schema
+            chunk_size: Names per IN-list
+            connection_factory: Opens an additional connection. With
+                max_workers > 1, the chunks are spread over this connection
+                and max_workers - 1 connections opened with it, which are
+                closed afterwards.
+            max_workers: Connections to read chunks on concurrently
+
+        Returns:
+            List of TableMetadata objects, in the order of table_names
+
+        Raises:
+            ValueError: If an object doesn't exist
+        """
+        if not table_names:
+            return []
+        actual_schema = schema_name or self._get_current_schema()
+        unique_names = list(dict.fromkeys(table_names))
+        chunks = [unique_names[i:i + chunk_size] for i in range(0, len(unique_names), chunk_size)]
+
+        workers = min(max_workers, len(chunks)) if connection_factory is not None else 1
+        if workers > 1:
+            # Every connection reads its share of the chunks in turn
+            shares = [chunks[i::workers] for i in range(workers)]
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hana-introspection") as executor:
+                results = list(executor.map(
+                    lambda share: self._read_chunks_on_new_connection(connection_factory, share, actual_schema),
+                    shares[1:],
+                ))
+                results.append(self._read_chunks(self.connection, shares[0], actual_schema))
+        else:
+            results = [self._read_chunks(self.connection, chunks, actual_schema)]
+
+        metadata_by_name = {}
+        for result in results:
+            metadata_by_name.update(result)
+
+        missing = [name for name in unique_names if name not in metadata_by_name]
+        if missing:
+            raise ValueError(f"Objects not found in schema '{actual_schema}': {', '.join(missing)}")
+        return [metadata_by_name[name] for name in table_names]
+
+    def _read_chunks_on_new_connection(
+        self, connection_factory: Callable[[], hdb.Connection], chunks: List[List[str]], schema_name: str
+    ) -> Dict[str, TableMetadata]:
+        """Read chunks of object metadata on a connection of their own."""
+        connection = connection_factory()
+        try:
+            return self._read_chunks(connection, chunks, schema_name)
+        finally:
+            connection.close()
+
+    def _read_chunks(
+        self, connection: hdb.Connection, chunks: List[List[str]], schema_name: str
+    ) -> Dict[str, TableMetadata]:
+        """Read the metadata of chunks of objects, by object name."""
+        metadata_by_name = {}
+        cursor = connection.cursor()
+        try:
+            for chunk in chunks:
+                metadata_by_name.update(self._read_chunk(cursor, chunk, schema_name))
+        finally:
+            cursor.close()
+        return metadata_by_name
+
+    def _read_chunk(self, cursor, names: List[str], schema_name: str) -> Dict[str, TableMetadata]:
+        """Read the metadata of one chunk of objects with set-based queries."""
+        in_list = ', '.join('?' for _ in names)
+        parameters = (schema_name, *names)
+
+        cursor.execute(f"""
+            SELECT TABLE_NAME, COLUMN_NAME
+            FROM SYS.CONSTRAINTS
+            WHERE SCHEMA_NAME = ? AND TABLE_NAME IN ({in_list}) AND IS_PRIMARY_KEY = 'TRUE'
+            ORDER BY TABLE_NAME, POSITION
+        """, parameters)
+        pk_positions: Dict[str, Dict[str, int]] = {}
+        for table_name, column_name in cursor.fetchall():
+            positions = pk_positions.setdefault(table_name, {})
+            positions[column_name] = len(positions) + 1
+
+        objects: Dict[str, Tuple[str, List[FieldMetadata]]] = {}
+        for object_type, columns_table, name_column in (
+            ('TABLE', 'TABLE_COLUMNS', 'TABLE_NAME'),
+            ('VIEW', 'VIEW_COLUMNS', 'VIEW_NAME'),
+        ):
+            cursor.execute(f"""
+                SELECT {name_column}, COLUMN_NAME, DATA_TYPE_NAME, LENGTH, SCALE, IS_NULLABLE, DEFAULT_VALUE
+                FROM {columns_table}
+                WHERE SCHEMA_NAME = ? AND {name_column} IN ({in_list})
+                ORDER BY {name_column}, POSITION
+            """, parameters)
+            for object_name, column_name, data_type, length, scale, is_nullable, default_value in cursor.fetchall():
+                positions = pk_positions.get(object_name, {})
+                _, fields = objects.setdefault(object_name, (object_type, []))
+                fields.append(FieldMetadata(
+                    name=column_name,
+                    data_type=data_type,
+                    is_primary_key=column_name in positions,
+                    is_nullable=is_nullable == 'TRUE',
+                    length=length,
+                    scale=scale,
+                    default_value=default_value,
+                    primary_key_position=positions.get(column_name),
+                ))
+
+        table_names = [name for name, (object_type, _) in objects.items() if object_type == 'TABLE']
+        storage = self._get_tables_storage(cursor, schema_name, table_names) if table_names else {}
+
+        metadata_by_name = {}
+        for object_name, (object_type, fields) in objects.items():
+            record_count, partition_type, partition_columns = storage.get(object_name, (None, None, []))
+            metadata_by_name[object_name] = TableMetadata(
+                table_name=object_name,
+                schema_name=schema_name,
+                fields=fields,
+                object_type=object_type,
+                record_count=record_count,
+                partition_type=partition_type,
+                partition_columns=partition_columns,
+            )
+        return metadata_by_name
+
+    def _get_tables_storage(
+        self, cursor, schema_name: str, table_names: List[str]
+    ) -> Dict[str, Tuple[Optional[int], Optional[str], List[str]]]:
+        """Row counts and partitioning of several tables, as _get_table_storage reads them."""
+        in_list = ', '.join('?' for _ in table_names)
+        parameters = (schema_name, *table_names)
+        record_counts: Dict[str, int] = {}
+        partitioning: Dict[str, Tuple[str, List[str]]] = {}
+        try:
+            cursor.execute(f"""
+                SELECT TABLE_NAME, SUM(RECORD_COUNT) FROM M_TABLES
+                WHERE SCHEMA_NAME = ? AND TABLE_NAME IN ({in_list})
+                GROUP BY TABLE_NAME
+            """, parameters)
+            record_counts = {
+                table_name: int(count) for table_name, count in cursor.fetchall() if count is not None
+            }
+
+            cursor.execute(f"""
+                SELECT TABLE_NAME, LEVEL_1_TYPE, LEVEL_1_EXPRESSION FROM PARTITIONED_TABLES
+                WHERE SCHEMA_NAME = ? AND TABLE_NAME IN ({in_list})
+            """, parameters)
+            partitioning = {
+                table_name: (partition_type, _partition_columns(expression))
+                for table_name, partition_type, expression in cursor.fetchall()
+            }
+        except Exception as e:
+            logger.warning(f"Could not read storage metadata of tables in {schema_name}: {e}")
+
+        return {
+            table_name: (record_counts.get(table_name), *partitioning.get(table_name, (None, [])))
+            for table_name in table_names
+        }
+
+    def get_schema_fingerprints(self, table_names: List[str], schema_name: Optional[str] = None) -> Dict[str, str]:
+        """
+        Get the schema fingerprints of tables, as TableMetadata.fingerprint computes them.
+
+        Reads the columns and primary keys of the whole schema in two queries,
+        rather than introspecting table by table.
+
+        Args:
+            table_names: Tables to fingerprint
+            schema_name: Optional schema name. If None, uses current schema
+
+        Returns:
+            Fingerprint by table name. Objects that aren't tables (views) or
+            don't exist are left out.
+        """
+        actual_schema = schema_name or self._get_current_schema()
+        wanted = set(table_names)
+        fields_by_table: Dict[str, List[FieldMetadata]] = {}
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT TABLE_NAME, COLUMN_NAME
+                FROM SYS.CONSTRAINTS
+                WHERE SCHEMA_NAME = ? AND IS_PRIMARY_KEY = 'TRUE'
+                ORDER BY TABLE_NAME, POSITION
+            """, (actual_schema,))
+            pk_positions: Dict[str, Dict[str, int]] = {}
+            for table_name, column_name in cursor.fetchall():
+                if table_name in wanted:
+                    positions = pk_positions.setdefault(table_name, {})
+                    positions[column_name] = len(positions) + 1
+
+            cursor.execute("""
+                SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE_NAME, LENGTH, SCALE, IS_NULLABLE, DEFAULT_VALUE
+                FROM TABLE_COLUMNS
+                WHERE SCHEMA_NAME = ?
+                ORDER BY TABLE_NAME, POSITION
+            """, (actual_schema,))
+            for table_name, column_name, data_type, length, scale, is_nullable, default_value in cursor.fetchall():
+                if table_name not in wanted:
+                    continue
+                positions = pk_positions.get(table_name, {})
+                fields_by_table.setdefault(table_name, []).append(FieldMetadata(
+                    name=column_name,
+                    data_type=data_type,
+                    is_primary_key=column_name in positions,
+                    is_nullable=is_nullable == 'TRUE',
+                    length=length,
+                    scale=scale,
+                    default_value=default_value,
+                    primary_key_position=positions.get(column_name),
+                ))
+        finally:
+            cursor.close()
+
+        return {
+            table_name: TableMetadata(table_name, actual_schema, fields).fingerprint()
+            for table_name, fields in fields_by_table.items()
+        }
+
     def _get_single_table_metadata(self, table_name: str, schema_name: Optional[str] = None) -> TableMetadata:
         """Get metadata for a single table."""
         # Determine the full table name with schema
@@ -161,7 +453,7 @@ class HanaIntrospector:
             
             # Get primary key columns
             cursor.execute(pk_query, (actual_schema, table_name))
-            pk_columns = {row[0] for row in cursor.fetchall()}
+            pk_positions = {row[0]: i for i, row in enumerate(cursor.fetchall(), start=1)}
 
             # Detect object type (TABLE or VIEW)
             object_type = self._get_object_type(actual_schema, table_name)
@@ -174,19 +466,27 @@ class HanaIntrospector:
                 field = FieldMetadata(
                     name=col[0],                    # COLUMN_NAME
                     data_type=col[1],              # DATA_TYPE_NAME
-                    is_primary_key=col[0] in pk_columns,
+                    is_primary_key=col[0] in pk_positions,
                     is_nullable=col[4] == 'TRUE',  # IS_NULLABLE
                     length=col[2] if col[2] is not None else None,      # LENGTH
                     scale=col[3] if col[3] is not None else None,        # SCALE
-                    default_value=col[5] if col[5] is not None else None # DEFAULT_VALUE
+                    default_value=col[5] if col[5] is not None else None, # DEFAULT_VALUE
+                    primary_key_position=pk_positions.get(col[0]),
                 )
                 fields.append(field)
 
+            record_count, partition_type, partition_columns = None, None, []
+            if object_type == 'TABLE':
+                record_count, partition_type, partition_columns = self._get_table_storage(actual_schema, table_name)
+
             return TableMetadata(
                 table_name=table_name,
                 schema_name=actual_schema,
                 fields=fields,
-                object_type=object_type
+                object_type=object_type,
+                record_count=record_count,
+                partition_type=partition_type,
+                partition_columns=partition_columns,
             )
             
         finally:
@@ -238,6 +538,45 @@ class HanaIntrospector:
         finally:
             cursor.close()
 
+    def _get_table_storage(self, schema_name: str, table_name: str) -> Tuple[Optional[int], Optional[str], List[str]]:
+        """
+        Get a table's row count and partitioning.
+
+        Both only guide the layout of the ClickHouse table, so if the
+        monitoring views can't be read (missing privileges) they are left unset.
+
+        Args:
+            schema_name: Schema name
+            table_name: Table name
+
+        Returns:
+            Row count, first level partition type and partition columns
+        """
+        record_count, partition_type, partition_columns = None, None, []
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT SUM(RECORD_COUNT) FROM M_TABLES
+                WHERE SCHEMA_NAME = ? AND TABLE_NAME = ?
+            """, (schema_name, table_name))
+            row = cursor.fetchone()
+            if row and row[0] is not None:
+                record_count = int(row[0])
+
+            cursor.execute("""
+                SELECT LEVEL_1_TYPE, LEVEL_1_EXPRESSION FROM PARTITIONED_TABLES
+                WHERE SCHEMA_NAME = ? AND TABLE_NAME = ?
+            """, (schema_name, table_name))
+            row = cursor.fetchone()
+            if row:
+                partition_type = row[0]
+                partition_columns = _partition_columns(row[1])
+        except Exception as e:
+            logger.warning(f"Could not read storage metadata of {schema_name}.{table_name}: {e}")
+        finally:
+            cursor.close()
+        return record_count, partition_type, partition_columns
+
     def _get_views(self, schema_name: str) -> List[str]:
         """
         Get all views in a schema.
@@ -310,11 +649,19 @@ class HanaIntrospector:
             cursor.close()
 
 
+def _partition_columns(expression: Optional[str]) -> List[str]:
+    """Column names of a PARTITIONED_TABLES level expression, e.g. '"GJAHR","BUKRS"'."""
+    return [column.strip().strip('"') for column in (expression or '').split(',') if column.strip()]
+
+
 def introspect_hana_database(
     connection: hdb.Connection,
     table_names: Optional[List[str]] = None,
     schema_name: Optional[str] = None,
-    include_views: bool = True
+    include_views: bool = True,
+    bulk: bool = False,
+    connection_factory: Optional[Callable[[], hdb.Connection]] = None,
+    max_workers: int = 1,
 ) -> List[TableMetadata]:
     """
     Convenience function to generate table and view metadata.
@@ -324,15 +671,25 @@ def introspect_hana_database(
         table_names: List of table/view names to get metadata for. If None, discovers all tables (and views if include_views=True)
         schema_name: Optional schema name
         include_views: Whether to include views when auto-discovering objects (only applies when table_names is None)
+        bulk: Read the metadata with set-based queries (see HanaIntrospector.get_bulk_table_metadata)
+        connection_factory: With bulk, opens the additional connections for max_workers
+        max_workers: With bulk, connections to read on concurrently
 
     Returns:
         List of TableMetadata objects
     """
     introspector = HanaIntrospector(connection)
 
+    def get_metadata(object_names: List[str]) -> List[TableMetadata]:
+        if bulk:
+            return introspector.get_bulk_table_metadata(
+                object_names, schema_name, connection_factory=connection_factory, max_workers=max_workers
+            )
+        return introspector.get_table_metadata(object_names, schema_name)
+
     # If specific table names provided, introspect those
     if table_names is not None:
-        return introspector.get_table_metadata(table_names, schema_name)
+        return get_metadata(table_names)
 
     # Otherwise, discover all tables and optionally views
     if schema_name is None:
@@ -348,5 +705,5 @@ def introspect_hana_database(
             logger.info(f"Found {len(view_names)} views in schema {schema_name}")
             object_names.extend(view_names)
 
-    return introspector.get_table_metadata(object_names, schema_name)
+    return get_metadata(object_names)
 
@@ -9,21 +9,38 @@ instead of casting everything to strings.
 import base64
 import logging
 from datetime import datetime, date, time, timedelta
-from decimal import Decimal
-from typing import Any, Union, Annotated, get_args, get_origin
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache, partial
+from typing import Any, Dict, Optional, Union, Annotated, get_args, get_origin
 from pydantic import GetCoreSchemaHandler, GetJsonSchemaHandler, BeforeValidator
 from pydantic_core import core_schema
 from pydantic.json_schema import JsonSchemaValue
 
 logger = logging.getLogger(__name__)
 
+# Initial value of an SAP date stored as text (YYYYMMDD); it means "no date"
+SAP_INITIAL_DATE = '00000000'
+
+# Entries per memoized conversion. SAP data repeats the same dates and amounts
+# constantly, so the expensive conversions (date parsing, decimal precision
+# limiting) are cached by their input string. Strings are exact keys:
+# Decimal('1.0') and Decimal('1.00') compare equal but print differently, so
+# they never share an entry.
+CONVERSION_CACHE_SIZE = 4096
+
 
 # ============================================================================
 # DATETIME TYPES VALIDATORS
 # ============================================================================
 
 def validate_sap_date(value: Any) -> date:
-    """Validate and convert SAP HANA DATE type."""
+    """
+    Validate and convert SAP HANA DATE type.
+
+    Besides ISO dates, accepts the YYYYMMDD text of ABAP dates (DATS), which
+    SAP stores as NVARCHAR(8), and reads their initial value '00000000' as
+    no date (None), the same way the generated ClickHouse columns store it.
+    """
     if value is None:
         return None
     
@@ -34,19 +51,29 @@ def validate_sap_date(value: Any) -> date:
         return value.date()
     
     if isinstance(value, str):
-        try:
-            # Try parsing common date formats
-            if 'T' in value:
-                return datetime.fromisoformat(value).date()
-            else:
-                return datetime.strptime(value, '%Y-%m-%d').date()
-        except ValueError:
-            logger.warning(f"Failed to parse date string: {value}")
-            raise ValueError(f"Invalid date format: {value}")
+        return _parse_sap_date_string(value)
     
     raise ValueError(f"Cannot convert {type(value)} to date")
 
 
+@lru_cache(maxsize=CONVERSION_CACHE_SIZE, typed=True)
+def _parse_sap_date_string(value: str) -> date:
+    # SAP's initial date (DATS columns stored as text)
+    if value == SAP_INITIAL_DATE:
+        return None
+    try:
+        # Try parsing common date formats
+        if 'T' in value:
+            return datetime.fromisoformat(value).date()
+        elif len(value) == 8 and value.isdigit():
+            return datetime.strptime(value, '%Y%m%d').date()
+        else:
+            return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        logger.warning(f"Failed to parse date string: {value}")
+        raise ValueError(f"Invalid date format: {value}")
+
+
 def validate_sap_time(value: Any) -> time:
     """Validate and convert SAP HANA TIME type."""
     if value is None:
@@ -191,36 +218,46 @@ def validate_sap_smalldecimal(value: Any) -> Decimal:
     
     # If precision is too high, round to fit ClickHouse limits
     if total_digits > 8:
-        # Calculate how many decimal places to keep
-        if '.' in decimal_str:
-            integer_part, decimal_part = decimal_str.split('.')
-            integer_digits = len(integer_part)
-            max_decimal_places = max(0, 8 - integer_digits)
-            
-            # Round to the maximum allowed decimal places
-            if max_decimal_places > 0:
-                decimal_val = decimal_val.quantize(Decimal('0.' + '0' * max_decimal_places))
-            else:
-                # No decimal places allowed, round to nearest integer
-                decimal_val = decimal_val.quantize(Decimal('1'))
-        else:
-            # If it's a whole number with too many digits, truncate
-            decimal_val = Decimal(str(decimal_val)[:8])
+        decimal_val = _limit_sap_smalldecimal(decimal_str)
+    
+    return decimal_val
+
+
+@lru_cache(maxsize=CONVERSION_CACHE_SIZE, typed=True)
+def _limit_sap_smalldecimal(decimal_str: str) -> Decimal:
+    """Round or truncate a SMALLDECIMAL (given as its string) to 8 digits."""
+    decimal_val = Decimal(decimal_str)
+
+    # Calculate how many decimal places to keep
+    if '.' in decimal_str:
+        integer_part, decimal_part = decimal_str.split('.')
+        integer_digits = len(integer_part)
+        max_decimal_places = max(0, 8 - integer_digits)
         
-        # Double-check that we didn't create a number with too many digits due to rounding
-        final_str = str(decimal_val)
-        final_digits = len(final_str.replace('.', ''))
-        if final_digits > 8:
-            # If rounding created more digits, truncate to 8 digits
-            if '.' in final_str:
-                integer_part, decimal_part = final_str.split('.')
-                if len(integer_part) >= 8:
-                    decimal_val = Decimal(integer_part[:8])
-                else:
-                    max_decimal = 8 - len(integer_part)
-                    decimal_val = Decimal(integer_part + '.' + decimal_part[:max_decimal])
+        # Round to the maximum allowed decimal places
+        if max_decimal_places > 0:
+            decimal_val = decimal_val.quantize(Decimal('0.' + '0' * max_decimal_places))
+        else:
+            # No decimal places allowed, round to nearest integer
+            decimal_val = decimal_val.quantize(Decimal('1'))
+    else:
+        # If it's a whole number with too many digits, truncate
+        decimal_val = Decimal(decimal_str[:8])
+    
+    # Double-check that we didn't create a number with too many digits due to rounding
+    final_str = str(decimal_val)
+    final_digits = len(final_str.replace('.', ''))
+    if final_digits > 8:
+        # If rounding created more digits, truncate to 8 digits
+        if '.' in final_str:
+            integer_part, decimal_part = final_str.split('.')
+            if len(integer_part) >= 8:
+                decimal_val = Decimal(integer_part[:8])
             else:
-                decimal_val = Decimal(final_str[:8])
+                max_decimal = 8 - len(integer_part)
+                decimal_val = Decimal(integer_part + '.' + decimal_part[:max_decimal])
+        else:
+            decimal_val = Decimal(final_str[:8])
     
     return decimal_val
 
@@ -250,42 +287,50 @@ def validate_sap_decimal(value: Any) -> Decimal:
     else:
         total_digits = len(decimal_str)
     
-    # Debug logging
-    if total_digits > 10:
-        logger.warning(f"SAP Decimal validator: Input {decimal_val} has {total_digits} digits, limiting to 10")
-    
     # If precision is too high, round to fit ClickHouse limits
     if total_digits > 10:
-        # Calculate how many decimal places to keep
-        if '.' in decimal_str:
-            integer_part, decimal_part = decimal_str.split('.')
-            integer_digits = len(integer_part)
-            max_decimal_places = max(0, 10 - integer_digits)
-            
-            # Round to the maximum allowed decimal places
-            if max_decimal_places > 0:
-                decimal_val = decimal_val.quantize(Decimal('0.' + '0' * max_decimal_places))
-            else:
-                # No decimal places allowed, round to nearest integer
-                decimal_val = decimal_val.quantize(Decimal('1'))
-        else:
-            # If it's a whole number with too many digits, truncate
-            decimal_val = Decimal(str(decimal_val)[:10])
+        decimal_val = _limit_sap_decimal(decimal_str)
+
+    return decimal_val
+
+
+@lru_cache(maxsize=CONVERSION_CACHE_SIZE, typed=True)
+def _limit_sap_decimal(decimal_str: str) -> Decimal:
+    """Round or truncate a DECIMAL (given as its string) to 10 digits."""
+    decimal_val = Decimal(decimal_str)
+    total_digits = len(decimal_str.replace('.', ''))
+    logger.warning(f"SAP Decimal validator: Input {decimal_val} has {total_digits} digits, limiting to 10")
+    
+    # Calculate how many decimal places to keep
+    if '.' in decimal_str:
+        integer_part, decimal_part = decimal_str.split('.')
+        integer_digits = len(integer_part)
+        max_decimal_places = max(0, 10 - integer_digits)
         
-        # Double-check that we didn't create a number with too many digits due to rounding
-        final_str = str(decimal_val)
-        final_digits = len(final_str.replace('.', ''))
-        if final_digits > 10:
-            # If rounding created more digits, truncate to 10 digits
-            if '.' in final_str:
-                integer_part, decimal_part = final_str.split('.')
-                if len(integer_part) >= 10:
-                    decimal_val = Decimal(integer_part[:10])
-                else:
-                    max_decimal = 10 - len(integer_part)
-                    decimal_val = Decimal(integer_part + '.' + decimal_part[:max_decimal])
+        # Round to the maximum allowed decimal places
+        if max_decimal_places > 0:
+            decimal_val = decimal_val.quantize(Decimal('0.' + '0' * max_decimal_places))
+        else:
+            # No decimal places allowed, round to nearest integer
+            decimal_val = decimal_val.quantize(Decimal('1'))
+    else:
+        # If it's a whole number with too many digits, truncate
+        decimal_val = Decimal(decimal_str[:10])
+    
+    # Double-check that we didn't create a number with too many digits due to rounding
+    final_str = str(decimal_val)
+    final_digits = len(final_str.replace('.', ''))
+    if final_digits > 10:
+        # If rounding created more digits, truncate to 10 digits
+        if '.' in final_str:
+            integer_part, decimal_part = final_str.split('.')
+            if len(integer_part) >= 10:
+                decimal_val = Decimal(integer_part[:10])
             else:
-                decimal_val = Decimal(final_str[:10])
+                max_decimal = 10 - len(integer_part)
+                decimal_val = Decimal(integer_part + '.' + decimal_part[:max_decimal])
+        else:
+            decimal_val = Decimal(final_str[:10])
     
     # Debug logging for final result
     final_str = str(decimal_val)
@@ -296,6 +341,26 @@ def validate_sap_decimal(value: Any) -> Decimal:
     return decimal_val
 
 
+def validate_sap_fixed_decimal(value: Any) -> Decimal:
+    """
+    Validate and convert SAP HANA DECIMAL(p, s) for a ClickHouse Decimal(p, s) column.
+
+    Unlike ``validate_sap_decimal`` the value isn't clamped to 10 digits: the
+    column is generated with the table's own precision and scale, so every
+    value SAP HANA returns fits.
+    """
+    if value is None:
+        return None
+
+    if isinstance(value, Decimal):
+        return value
+
+    try:
+        return Decimal(str(value))
+    except (ValueError, TypeError, InvalidOperation):
+        raise ValueError(f"Cannot convert {type(value)} to DECIMAL")
+
+
 def validate_sap_timestamp_decimal(value: Any) -> Decimal:
     """
     Validate and convert SAP HANA timestamp stored as DECIMAL.
@@ -486,6 +551,36 @@ def validate_sap_alphanum(value: Any) -> str:
     return str_val
 
 
+def validate_sap_numc(value: Any, length: Optional[int] = None) -> str:
+    """
+    Validate and convert SAP NUMC (numeric text such as document numbers).
+
+    NUMC values are digit-only strings that keep their leading zeros. With a
+    length, shorter values are zero-padded to it, as SAP does.
+    """
+    if value is None:
+        return None
+    
+    if isinstance(value, int) and not isinstance(value, bool):
+        if value < 0:
+            raise ValueError(f"NUMC value {value} is negative")
+        str_val = str(value)
+    elif isinstance(value, str):
+        str_val = value.strip()
+    else:
+        raise ValueError(f"Cannot convert {type(value)} to NUMC")
+    
+    if str_val and not (str_val.isascii() and str_val.isdigit()):
+        raise ValueError(f"NUMC value '{value}' contains non-digit characters")
+    
+    if length is not None:
+        if len(str_val) > length:
+            raise ValueError(f"NUMC value '{value}' is longer than {length} digits")
+        str_val = str_val.zfill(length)
+    
+    return str_val
+
+
 def validate_sap_shorttext(value: Any) -> str:
     """Validate and convert SAP HANA SHORTTEXT type."""
     if value is None:
@@ -498,49 +593,27 @@ def validate_sap_shorttext(value: Any) -> str:
 # BINARY TYPES VALIDATORS
 # ============================================================================
 
-def validate_sap_varbinary(value: Any) -> str:
-    """Validate and convert SAP HANA VARBINARY type to base64 string."""
-    if value is None:
-        return None
+def _binary_data(value: Any) -> Optional[bytes]:
+    """The bytes of a binary value as the driver returns it, None for anything else."""
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    
+    if isinstance(value, memoryview):
+        return value.tobytes()
     
     # Handle memory buffer objects
     if hasattr(value, '__class__') and 'memory' in str(value.__class__):
-        try:
-            if hasattr(value, 'tobytes'):
-                binary_data = value.tobytes()
-            elif hasattr(value, 'read'):
-                binary_data = value.read()
-            else:
-                binary_data = str(value).encode('utf-8')
-            return base64.b64encode(binary_data).decode('utf-8')
-        except Exception as e:
-            logger.warning(f"Failed to convert memory buffer to base64: {e}")
-            return str(value)
-    
-    # Handle bytes objects
-    if isinstance(value, bytes):
-        try:
-            return base64.b64encode(value).decode('utf-8')
-        except Exception as e:
-            logger.warning(f"Failed to convert bytes to base64: {e}")
-            return str(value)
-    
-    # Handle bytearray objects
-    if isinstance(value, bytearray):
-        try:
-            return base64.b64encode(value).decode('utf-8')
-        except Exception as e:
-            logger.warning(f"Failed to convert bytearray to base64: {e}")
-            return str(value)
-    
-    # Handle memoryview objects
-    if isinstance(value, memoryview):
-        try:
-            return base64.b64encode(value.tobytes()).decode('utf-8')
-        except Exception as e:
-            logger.warning(f"Failed to convert memoryview to base64: {e}")
-            return str(value)
+        if hasattr(value, 'tobytes'):
+            return value.tobytes()
+        if hasattr(value, 'read'):
+            return value.read()
+        return str(value).encode('utf-8')
     
+    return None
+
+
+def _binary_text(value: Any) -> str:
+    """Text of a value that isn't binary data."""
     # Handle string representations of memory buffers
     if isinstance(value, str) and value.startswith('<memory at 0x') and value.endswith('>'):
         logger.warning(f"Found memory buffer string representation: {value}")
@@ -550,6 +623,26 @@ def validate_sap_varbinary(value: Any) -> str:
     return str(value)
 
 
+def validate_sap_varbinary(value: Any) -> str:
+    """
+    Validate and convert SAP HANA VARBINARY type to an uppercase hex string.
+
+    Hex is how SAP HANA itself renders binary values (BINTOHEX), e.g. the
+    RAW16 GUIDs of SAP tables.
+    """
+    if value is None:
+        return None
+    
+    try:
+        binary_data = _binary_data(value)
+    except Exception as e:
+        logger.warning(f"Failed to read binary value: {e}")
+        return str(value)
+    if binary_data is None:
+        return _binary_text(value)
+    return binary_data.hex().upper()
+
+
 # ============================================================================
 # LARGE OBJECT TYPES VALIDATORS
 # ============================================================================
@@ -559,7 +652,14 @@ def validate_sap_blob(value: Any) -> str:
     if value is None:
         return None
     
-    return validate_sap_varbinary(value)  # Same logic as VARBINARY
+    try:
+        binary_data = _binary_data(value)
+    except Exception as e:
+        logger.warning(f"Failed to convert BLOB to base64: {e}")
+        return str(value)
+    if binary_data is None:
+        return _binary_text(value)
+    return base64.b64encode(binary_data).decode('utf-8')
 
 
 def validate_sap_clob(value: Any) -> str:
@@ -697,6 +797,7 @@ SapInteger = Annotated[int, BeforeValidator(validate_sap_integer)]
 SapBigInt = Annotated[int, BeforeValidator(validate_sap_bigint)]
 SapSmallDecimal = Annotated[Decimal, BeforeValidator(validate_sap_smalldecimal)]
 SapDecimal = Annotated[Decimal, BeforeValidator(validate_sap_decimal)]
+SapFixedDecimal = Annotated[Decimal, BeforeValidator(validate_sap_fixed_decimal)]
 SapTimestampDecimal = Annotated[Decimal, BeforeValidator(validate_sap_timestamp_decimal)]
 SapReal = Annotated[float, BeforeValidator(validate_sap_real)]
 SapDouble = Annotated[float, BeforeValidator(validate_sap_double)]
@@ -708,6 +809,15 @@ SapBoolean = Annotated[bool, BeforeValidator(validate_sap_boolean)]
 SapVarchar = Annotated[str, BeforeValidator(validate_sap_varchar)]
 SapNvarchar = Annotated[str, BeforeValidator(validate_sap_nvarchar)]
 SapAlphanum = Annotated[str, BeforeValidator(validate_sap_alphanum)]
+SapNumc = Annotated[str, BeforeValidator(validate_sap_numc)]
+
+
+@lru_cache(maxsize=None)
+def sap_numc(length: int):
+    """SapNumc of a column's length, zero-padding shorter values (e.g. sap_numc(10) for EBELN)."""
+    return Annotated[str, BeforeValidator(partial(validate_sap_numc, length=length))]
+
+
 SapShortText = Annotated[str, BeforeValidator(validate_sap_shorttext)]
 
 # Binary types
@@ -734,102 +844,134 @@ SapHanaValue = Annotated[Any, BeforeValidator(validate_sap_hana_value_comprehens
 # UTILITY FUNCTIONS
 # ============================================================================
 
+_SAP_HANA_VALIDATORS = {
+    # Datetime types
+    'DATE': validate_sap_date,
+    'TIME': validate_sap_time,
+    'SECONDDATE': validate_sap_seconddate,
+    'TIMESTAMP': validate_sap_timestamp,
+    
+    # Numeric types
+    'TINYINT': validate_sap_tinyint,
+    'SMALLINT': validate_sap_smallint,
+    'INTEGER': validate_sap_integer,
+    'BIGINT': validate_sap_bigint,
+    'SMALLDECIMAL': validate_sap_smalldecimal,
+    'DECIMAL': validate_sap_decimal,
+    'TIMESTAMP_DECIMAL': validate_sap_timestamp_decimal,
+    'REAL': validate_sap_real,
+    'DOUBLE': validate_sap_double,
+    
+    # Boolean type
+    'BOOLEAN': validate_sap_boolean,
+    
+    # Character string types
+    'VARCHAR': validate_sap_varchar,
+    'NVARCHAR': validate_sap_nvarchar,
+    'ALPHANUM': validate_sap_alphanum,
+    'NUMC': validate_sap_numc,
+    'SHORTTEXT': validate_sap_shorttext,
+    
+    # Binary types
+    'VARBINARY': validate_sap_varbinary,
+    
+    # Large Object types
+    'BLOB': validate_sap_blob,
+    'CLOB': validate_sap_clob,
+    'NCLOB': validate_sap_nclob,
+    'TEXT': validate_sap_text,
+    
+    # Multi-valued types
+    'ARRAY': validate_sap_array,
+    
+    # Spatial types
+    'ST_GEOMETRY': validate_sap_st_geometry,
+    'ST_POINT': validate_sap_st_point,
+}
+
+
 def get_sap_hana_validator(sap_type: str):
     """Get the appropriate validator function for a SAP HANA data type."""
-    validators = {
-        # Datetime types
-        'DATE': validate_sap_date,
-        'TIME': validate_sap_time,
-        'SECONDDATE': validate_sap_seconddate,
-        'TIMESTAMP': validate_sap_timestamp,
-        
-        # Numeric types
-        'TINYINT': validate_sap_tinyint,
-        'SMALLINT': validate_sap_smallint,
-        'INTEGER': validate_sap_integer,
-        'BIGINT': validate_sap_bigint,
-        'SMALLDECIMAL': validate_sap_smalldecimal,
-        'DECIMAL': validate_sap_decimal,
-        'TIMESTAMP_DECIMAL': validate_sap_timestamp_decimal,
-        'REAL': validate_sap_real,
-        'DOUBLE': validate_sap_double,
-        
-        # Boolean type
-        'BOOLEAN': validate_sap_boolean,
-        
-        # Character string types
-        'VARCHAR': validate_sap_varchar,
-        'NVARCHAR': validate_sap_nvarchar,
-        'ALPHANUM': validate_sap_alphanum,
-        'SHORTTEXT': validate_sap_shorttext,
-        
-        # Binary types
-        'VARBINARY': validate_sap_varbinary,
-        
-        # Large Object types
-        'BLOB': validate_sap_blob,
-        'CLOB': validate_sap_clob,
-        'NCLOB': validate_sap_nclob,
-        'TEXT': validate_sap_text,
-        
-        # Multi-valued types
-        'ARRAY': validate_sap_array,
-        
-        # Spatial types
-        'ST_GEOMETRY': validate_sap_st_geometry,
-        'ST_POINT': validate_sap_st_point,
-    }
-    
-    return validators.get(sap_type.upper())
+    return _SAP_HANA_VALIDATORS.get(sap_type.upper())
+
+
+_SAP_HANA_ANNOTATED_TYPES = {
+    # Datetime types
+    'DATE': SapDate,
+    'TIME': SapTime,
+    'SECONDDATE': SapSecondDate,
+    'TIMESTAMP': SapTimestamp,
+    
+    # Numeric types
+    'TINYINT': SapTinyInt,
+    'SMALLINT': SapSmallInt,
+    'INTEGER': SapInteger,
+    'BIGINT': SapBigInt,
+    'SMALLDECIMAL': SapSmallDecimal,
+    'DECIMAL': SapDecimal,
+    'TIMESTAMP_DECIMAL': SapTimestampDecimal,
+    'REAL': SapReal,
+    'DOUBLE': SapDouble,
+    
+    # Boolean type
+    'BOOLEAN': SapBoolean,
+    
+    # Character string types
+    'VARCHAR': SapVarchar,
+    'NVARCHAR': SapNvarchar,
+    'ALPHANUM': SapAlphanum,
+    'NUMC': SapNumc,
+    'SHORTTEXT': SapShortText,
+    
+    # Binary types
+    'VARBINARY': SapVarbinary,
+    
+    # Large Object types
+    'BLOB': SapBlob,
+    'CLOB': SapClob,
+    'NCLOB': SapNclob,
+    'TEXT': SapText,
+    
+    # Multi-valued types
+    'ARRAY': SapArray,
+    
+    # Spatial types
+    'ST_GEOMETRY': SapStGeometry,
+    'ST_POINT': SapStPoint,
+}
 
 
 def get_sap_hana_annotated_type(sap_type: str):
     """Get the appropriate annotated type for a SAP HANA data type."""
-    annotated_types = {
-        # Datetime types
-        'DATE': SapDate,
-        'TIME': SapTime,
-        'SECONDDATE': SapSecondDate,
-        'TIMESTAMP': SapTimestamp,
-        
-        # Numeric types
-        'TINYINT': SapTinyInt,
-        'SMALLINT': SapSmallInt,
-        'INTEGER': SapInteger,
-        'BIGINT': SapBigInt,
-        'SMALLDECIMAL': SapSmallDecimal,
-        'DECIMAL': SapDecimal,
-        'TIMESTAMP_DECIMAL': SapTimestampDecimal,
-        'REAL': SapReal,
-        'DOUBLE': SapDouble,
-        
-        # Boolean type
-        'BOOLEAN': SapBoolean,
-        
-        # Character string types
-        'VARCHAR': SapVarchar,
-        'NVARCHAR': SapNvarchar,
-        'ALPHANUM': SapAlphanum,
-        'SHORTTEXT': SapShortText,
-        
-        # Binary types
-        'VARBINARY': SapVarbinary,
-        
-        # Large Object types
-        'BLOB': SapBlob,
-        'CLOB': SapClob,
-        'NCLOB': SapNclob,
-        'TEXT': SapText,
-        
-        # Multi-valued types
-        'ARRAY': SapArray,
-        
-        # Spatial types
-        'ST_GEOMETRY': SapStGeometry,
-        'ST_POINT': SapStPoint,
-    }
-    
-    return annotated_types.get(sap_type.upper())
+    return _SAP_HANA_ANNOTATED_TYPES.get(sap_type.upper())
+
+
+_MEMOIZED_CONVERSIONS = {
+    'DATE': _parse_sap_date_string,
+    'SMALLDECIMAL': _limit_sap_smalldecimal,
+    'DECIMAL': _limit_sap_decimal,
+}
+
+
+def get_conversion_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Get hit/miss counters of the memoized conversions, keyed by SAP HANA type."""
+    stats = {}
+    for sap_type, conversion in _MEMOIZED_CONVERSIONS.items():
+        info = conversion.cache_info()
+        lookups = info.hits + info.misses
+        stats[sap_type] = {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'hit_rate': info.hits / lookups if lookups else 0.0,
+        }
+    return stats
+
+
+def clear_conversion_caches() -> None:
+    """Empty the memoized conversions and reset their counters."""
+    for conversion in _MEMOIZED_CONVERSIONS.values():
+        conversion.cache_clear()
 
 
 def validate_sap_hana_value(value: Any, sap_type: str) -> Any:
@@ -40,6 +40,8 @@ class SapHanaBaseModel(BaseModel):
         use_enum_values = True
         # Validate assignment
         validate_assignment = True
+        # Dump fields under their aliases, which are the ClickHouse column names
+        serialize_by_alias = True
     
     @classmethod
     def __init_subclass__(cls, **kwargs):
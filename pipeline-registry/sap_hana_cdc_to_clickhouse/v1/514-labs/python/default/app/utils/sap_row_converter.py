@@ -0,0 +1,414 @@
+"""
+Precompiled SAP HANA row converters.
+
+Building a model with ``model_class(**row)`` runs every SAP HANA validator and
+full Pydantic validation for each row. This module compiles, once per model
+class, a converter function for the whole row:
+
+- Each field gets a converter built from the ``BeforeValidator`` on its ``Sap*``
+  annotated type. Values that a validator would return unchanged (a ``str`` for
+  NVARCHAR, a ``date`` for DATE, a short ``Decimal`` for DECIMAL, ...) are
+  recognised up front and skip the validator entirely.
+- Values whose type doesn't match the field type after validation fall back to
+  Pydantic's own coercion for that type, so results match ``model_class(**row)``.
+  Fields with constraints, such as the ``max_digits`` and ``decimal_places`` of
+  a ``SapFixedDecimal``, always go through Pydantic to have them checked.
+- The row loop is generated as straight-line code and the instance is built
+  the way ``model_construct`` does it, without re-running validation.
+- For a page of rows, ``convert_columns`` first converts the fields of the
+  types with a column kernel (see ``sap_column_kernels``) one column at a time,
+  so the row loop finds their values already converted.
+
+Run tests/benchmarks/bench_sap_row_converter.py to benchmark it against
+per-row model construction.
+"""
+
+import base64
+import logging
+import types
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import (
+    Any, Annotated, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Type, Union, get_args, get_origin,
+)
+
+from pydantic import BaseModel, BeforeValidator, TypeAdapter
+
+from . import sap_hana_validators as v
+from .sap_column_kernels import ColumnKernel, get_column_kernel
+
+logger = logging.getLogger(__name__)
+
+try:
+    from typing import TypeAliasType
+except ImportError:  # Python < 3.12
+    TypeAliasType = None
+
+
+# ============================================================================
+# VALIDATOR FAST PATHS
+# ============================================================================
+
+def _identity_if(value_type: type, validator: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """Skip ``validator`` for values of exactly ``value_type``, which it returns unchanged."""
+    def convert(value: Any) -> Any:
+        if type(value) is value_type:
+            return value
+        return validator(value)
+    return convert
+
+
+def _int_in_range(low: Optional[int], high: Optional[int], validator: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def convert(value: Any) -> Any:
+        if type(value) is int and (low is None or low <= value <= high):
+            return value
+        return validator(value)
+    return convert
+
+
+def _decimal_within(max_digits: int, validator: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """Skip the precision clamping when the value already fits (same digit count as the validator)."""
+    def convert(value: Any) -> Any:
+        if type(value) is Decimal:
+            decimal_str = str(value)
+            total_digits = len(decimal_str) - 1 if '.' in decimal_str else len(decimal_str)
+            if total_digits <= max_digits:
+                return value
+        return validator(value)
+    return convert
+
+
+def _base64_bytes(validator: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def convert(value: Any) -> Any:
+        if type(value) is bytes:
+            return base64.b64encode(value).decode('utf-8')
+        return validator(value)
+    return convert
+
+
+def _hex_bytes(validator: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def convert(value: Any) -> Any:
+        if type(value) is bytes:
+            return value.hex().upper()
+        return validator(value)
+    return convert
+
+
+def _real(value: Any) -> Any:
+    if type(value) is float and abs(value) <= 3.4028235e38:
+        return value
+    return v.validate_sap_real(value)
+
+
+# Validators that return values of the field's own type unchanged, with an
+# optional extra condition on ``value`` (inlined into the generated converter)
+_PASSTHROUGH: Dict[Callable[[Any], Any], Tuple[type, Optional[str]]] = {
+    v.validate_sap_varchar: (str, None),
+    v.validate_sap_nvarchar: (str, None),
+    v.validate_sap_shorttext: (str, None),
+    v.validate_sap_clob: (str, None),
+    v.validate_sap_nclob: (str, None),
+    v.validate_sap_text: (str, None),
+    v.validate_sap_date: (date, None),
+    v.validate_sap_time: (time, None),
+    v.validate_sap_seconddate: (datetime, None),
+    v.validate_sap_timestamp: (datetime, None),
+    v.validate_sap_smallint: (int, "-32768 <= value <= 32767"),
+    v.validate_sap_integer: (int, "-2147483648 <= value <= 2147483647"),
+    v.validate_sap_bigint: (int, None),
+    # Within the validator's precision limit (the length bounds the digit count)
+    v.validate_sap_smalldecimal: (Decimal, "len(str(value)) <= 8"),
+    v.validate_sap_decimal: (Decimal, "len(str(value)) <= 10"),
+    v.validate_sap_double: (float, None),
+    v.validate_sap_boolean: (bool, None),
+}
+
+_FAST_PATHS: Dict[Callable[[Any], Any], Callable[[Any], Any]] = {
+    v.validate_sap_date: _identity_if(date, v.validate_sap_date),
+    v.validate_sap_time: _identity_if(time, v.validate_sap_time),
+    v.validate_sap_seconddate: _identity_if(datetime, v.validate_sap_seconddate),
+    v.validate_sap_timestamp: _identity_if(datetime, v.validate_sap_timestamp),
+    v.validate_sap_smallint: _int_in_range(-32768, 32767, v.validate_sap_smallint),
+    v.validate_sap_integer: _int_in_range(-2147483648, 2147483647, v.validate_sap_integer),
+    v.validate_sap_bigint: _int_in_range(None, None, v.validate_sap_bigint),
+    v.validate_sap_smalldecimal: _decimal_within(8, v.validate_sap_smalldecimal),
+    v.validate_sap_decimal: _decimal_within(10, v.validate_sap_decimal),
+    v.validate_sap_fixed_decimal: _identity_if(Decimal, v.validate_sap_fixed_decimal),
+    v.validate_sap_real: _real,
+    v.validate_sap_double: _identity_if(float, v.validate_sap_double),
+    v.validate_sap_boolean: _identity_if(bool, v.validate_sap_boolean),
+    v.validate_sap_varchar: _identity_if(str, v.validate_sap_varchar),
+    v.validate_sap_nvarchar: _identity_if(str, v.validate_sap_nvarchar),
+    v.validate_sap_shorttext: _identity_if(str, v.validate_sap_shorttext),
+    v.validate_sap_clob: _identity_if(str, v.validate_sap_clob),
+    v.validate_sap_nclob: _identity_if(str, v.validate_sap_nclob),
+    v.validate_sap_text: _identity_if(str, v.validate_sap_text),
+    v.validate_sap_varbinary: _hex_bytes(v.validate_sap_varbinary),
+    v.validate_sap_blob: _base64_bytes(v.validate_sap_blob),
+}
+
+
+# ============================================================================
+# FIELD AND ROW CONVERTERS
+# ============================================================================
+
+def _unwrap_annotation(annotation: Any) -> Tuple[Optional[type], Tuple[Callable[[Any], Any], ...], bool]:
+    """Reduce a field annotation to (target type, before validators, nullable).
+
+    Handles ``Optional[...]``, ``Annotated[..., BeforeValidator(...)]`` and type
+    aliases such as moose's ``Key[...]``. Returns ``None`` as the target type for
+    anything else.
+    """
+    validators: List[Callable[[Any], Any]] = []
+    nullable = False
+    while True:
+        origin = get_origin(annotation)
+        if origin is Union or origin is types.UnionType:
+            args = [arg for arg in get_args(annotation) if arg is not type(None)]
+            if len(args) != 1:
+                return None, (), nullable
+            nullable = nullable or len(args) < len(get_args(annotation))
+            annotation = args[0]
+        elif origin is Annotated:
+            # Pydantic applies before validators from the innermost (last) outwards
+            validators = [
+                m.func for m in reversed(annotation.__metadata__) if isinstance(m, BeforeValidator)
+            ] + validators
+            annotation = get_args(annotation)[0]
+        elif TypeAliasType is not None and isinstance(origin, TypeAliasType):
+            annotation = get_args(annotation)[0]
+        elif TypeAliasType is not None and isinstance(annotation, TypeAliasType):
+            annotation = annotation.__value__
+        elif origin is None and isinstance(annotation, type):
+            return annotation, tuple(validators), nullable
+        else:
+            return None, (), nullable
+
+
+def _field_annotation(field_info: Any) -> Tuple[Any, Tuple[Any, ...]]:
+    """Split a field into (annotation with its before validators, other constraints).
+
+    Pydantic moves the metadata of a top-level ``Annotated`` type to
+    ``FieldInfo.metadata``, e.g. for ``amount: SapFixedDecimal = Field(max_digits=15)``
+    both the validator and ``max_digits`` end up there. Plain strings, such as
+    moose's ``"LowCardinality"``, mean nothing to Pydantic and are left out.
+    """
+    validators = [m for m in field_info.metadata if isinstance(m, BeforeValidator)]
+    constraints = tuple(m for m in field_info.metadata if not isinstance(m, (BeforeValidator, str)))
+    annotation = field_info.annotation
+    if validators:
+        annotation = Annotated[(annotation, *validators)]
+    return annotation, constraints
+
+
+def compile_field_converter(
+    field_name: str, annotation: Any, constraints: Sequence[Any] = ()
+) -> Tuple[Callable[[Any], Any], bool, Optional[Tuple[type, Optional[str]]]]:
+    """Build the converter for one field's non-missing value.
+
+    Args:
+        field_name: Field name, for error messages
+        annotation: Field annotation
+        constraints: ``Field`` constraints (``FieldInfo.metadata``), e.g. ``max_digits``
+
+    Returns:
+        Tuple of (converter, nullable, passthrough). When passthrough is a
+        (type, condition) pair, values of exactly that type that meet the
+        condition can be used as-is without calling the converter.
+    """
+    target_type, validators, nullable = _unwrap_annotation(annotation)
+
+    if target_type is None:
+        # Not a shape we can compile (e.g. a multi-type Union); let Pydantic handle it
+        return TypeAdapter(annotation).validate_python, nullable, None
+
+    steps = [_FAST_PATHS.get(validator, validator) for validator in validators]
+    if constraints:
+        # Values of the right type must still be checked against the constraints
+        check = TypeAdapter(Annotated[(target_type, *constraints)]).validate_python
+
+        def convert_checked(value: Any) -> Any:
+            if value is None and nullable:
+                return None
+            for step in steps:
+                value = step(value)
+            if value is None:
+                if nullable:
+                    return None
+                raise ValueError(f"Field {field_name} is not nullable")
+            return check(value)
+
+        return convert_checked, nullable, None
+
+    coerce = TypeAdapter(target_type).validate_python
+    passthrough = None
+    if not validators:
+        passthrough = (target_type, None)
+    elif len(validators) == 1 and _PASSTHROUGH.get(validators[0], (None,))[0] is target_type:
+        passthrough = _PASSTHROUGH[validators[0]]
+
+    def convert(value: Any) -> Any:
+        if value is None and nullable:
+            return None
+        for step in steps:
+            value = step(value)
+        if type(value) is target_type:
+            return value
+        if value is None:
+            if nullable:
+                return None
+            raise ValueError(f"Field {field_name} is not nullable")
+        return coerce(value)
+
+    return convert, nullable, passthrough
+
+
+_MISSING = object()
+
+
+class SapRowConverter:
+    """Converts HANA rows (column name -> value) into instances of one model class."""
+
+    def __init__(self, model_class: Type[BaseModel]):
+        self.model_class = model_class
+        self.column_names = {
+            name: field_info.alias or name for name, field_info in model_class.model_fields.items()
+        }
+        self.column_kernels = self._column_kernels()
+        self.convert = self._compile()
+
+    def _column_kernels(self) -> Dict[str, ColumnKernel]:
+        """Column kernels of the fields whose only validator has one, by column name."""
+        kernels = {}
+        for name, field_info in self.model_class.model_fields.items():
+            annotation, constraints = _field_annotation(field_info)
+            _, validators, _ = _unwrap_annotation(annotation)
+            kernel = get_column_kernel(validators[0]) if len(validators) == 1 and not constraints else None
+            if kernel is not None:
+                kernels[self.column_names[name]] = kernel
+        return kernels
+
+    def _compile(self) -> Callable[[Mapping[str, Any]], Tuple[Dict[str, Any], bool, bool]]:
+        """Generate ``convert(row) -> (values, all_present, coerced)`` as straight-line code."""
+        namespace: Dict[str, Any] = {"_MISSING": _MISSING, "ValueError": ValueError}
+        lines = [
+            "def convert(row):",
+            "    get = row.get",
+            "    values = {}",
+            "    all_present = True",
+            "    coerced = False",
+        ]
+
+        for i, (name, field_info) in enumerate(self.model_class.model_fields.items()):
+            annotation, constraints = _field_annotation(field_info)
+            converter, nullable, passthrough = compile_field_converter(name, annotation, constraints)
+            namespace[f"_c{i}"] = converter
+            namespace[f"_f{i}"] = field_info
+            column = self.column_names[name]
+            lines.append(f"    value = get({column!r}, _MISSING)")
+            lines.append("    if value is _MISSING:")
+            if field_info.is_required():
+                lines.append(f"        raise ValueError('Missing required column ' + {column!r})")
+            else:
+                lines.append("        all_present = False")
+                lines.append(f"        values[{name!r}] = _f{i}.get_default(call_default_factory=True)")
+            # The common cases are decided inline, without a call
+            if nullable:
+                lines.append("    elif value is None:")
+                lines.append(f"        values[{name!r}] = None")
+            if passthrough is not None:
+                passthrough_type, condition = passthrough
+                namespace[f"_t{i}"] = passthrough_type
+                guard = f" and {condition}" if condition else ""
+                lines.append(f"    elif type(value) is _t{i}{guard}:")
+                lines.append(f"        values[{name!r}] = value")
+            lines.append("    else:")
+            lines.append("        try:")
+            lines.append(f"            converted = _c{i}(value)")
+            lines.append("        except ValueError as e:")
+            lines.append(f"            raise ValueError('Invalid value for column ' + {column!r} + ': ' + str(e)) from e")
+            lines.append("        if converted is not value:")
+            lines.append("            coerced = True")
+            lines.append(f"        values[{name!r}] = converted")
+
+        lines.append("    return values, all_present, coerced")
+        exec("\n".join(lines), namespace)
+        return namespace["convert"]
+
+    def __call__(self, row: Mapping[str, Any]) -> BaseModel:
+        """Convert a row into a model instance without re-running validation.
+
+        Raises:
+            ValueError: If a required column is missing or a value can't be converted
+        """
+        values, all_present, _ = self.convert(row)
+        return self._build(row, values, all_present)
+
+    def convert_row(self, row: Mapping[str, Any]) -> Tuple[BaseModel, bool]:
+        """Convert a row, also reporting whether any value had to be coerced.
+
+        Returns:
+            Tuple of (model instance, coerced). ``coerced`` is True when at least
+            one value differs from the one in the row (e.g. a DECIMAL was clamped
+            or an int was turned into a string).
+
+        Raises:
+            ValueError: If a required column is missing or a value can't be converted
+        """
+        values, all_present, coerced = self.convert(row)
+        return self._build(row, values, all_present), coerced
+
+    def convert_columns(self, rows: Sequence[Mapping[str, Any]]) -> List[Tuple[Mapping[str, Any], bool]]:
+        """Convert the columns of a page of rows that have a column kernel, one column at a time.
+
+        Returns:
+            Each row with those columns converted, and whether any of its values
+            changed. Rows with a changed value are copies; the others are the
+            rows given. A column its kernel can't convert is left as it is, for
+            ``convert_row`` to reject the rows it fails on.
+        """
+        converted_rows = list(rows)
+        coerced = [False] * len(converted_rows)
+        for column, kernel in self.column_kernels.items():
+            values = [row.get(column) for row in converted_rows]
+            try:
+                converted = kernel(values)
+            except Exception:
+                continue
+            for i, (value, converted_value) in enumerate(zip(values, converted)):
+                # Missing values come back as the None they were read as
+                if converted_value is not value:
+                    if not coerced[i]:
+                        converted_rows[i] = dict(converted_rows[i])
+                        coerced[i] = True
+                    converted_rows[i][column] = converted_value
+        return list(zip(converted_rows, coerced))
+
+    def construct(self, row: Mapping[str, Any]) -> BaseModel:
+        """Build an instance from the row as-is, trusting its values (``model_construct``)."""
+        return self.model_class.model_construct(**row)
+
+    def _build(self, row: Mapping[str, Any], values: Dict[str, Any], all_present: bool) -> BaseModel:
+        fields_set = set(values) if all_present else {n for n, c in self.column_names.items() if c in row}
+        if self.model_class.__private_attributes__:
+            return self.model_class.model_construct(_fields_set=fields_set, **values)
+
+        # Same state model_construct leaves behind, minus its per-field bookkeeping
+        instance = self.model_class.__new__(self.model_class)
+        object.__setattr__(instance, "__dict__", values)
+        object.__setattr__(instance, "__pydantic_fields_set__", fields_set)
+        object.__setattr__(instance, "__pydantic_extra__", None)
+        object.__setattr__(instance, "__pydantic_private__", None)
+        return instance
+
+
+_ROW_CONVERTERS: Dict[type, SapRowConverter] = {}
+
+
+def get_row_converter(model_class: Type[BaseModel]) -> SapRowConverter:
+    """Get the compiled converter for a model class, compiling it on first use."""
+    converter = _ROW_CONVERTERS.get(model_class)
+    if converter is None:
+        converter = SapRowConverter(model_class)
+        _ROW_CONVERTERS[model_class] = converter
+    return converter
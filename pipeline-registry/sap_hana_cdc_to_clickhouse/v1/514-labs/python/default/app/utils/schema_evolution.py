@@ -0,0 +1,132 @@
+"""
+Columns added to SAP HANA tables after their initial load.
+
+When a column is added to a monitored table, ``init_cdc.py --evolve-schema``
+refreshes the table's CDC triggers and regenerates its model, so ClickHouse
+gets the column and new changes carry it. Rows that already were in
+ClickHouse don't have the values of the new column; they're recorded here as
+a pending backfill next to the models module, and the CDC workflow copies
+only the rows whose value of a new column isn't the value ClickHouse filled
+in for the existing rows.
+"""
+
+import json
+import logging
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .moose_model_generator import MooseModelGenerator
+from .sap_hana_introspection import FieldMetadata, TableMetadata
+
+logger = logging.getLogger(__name__)
+
+BACKFILLS_VERSION = 1
+
+
+def added_columns(old: TableMetadata, new: TableMetadata) -> List[FieldMetadata]:
+    """
+    Columns of a table that weren't in its earlier metadata.
+
+    Args:
+        old: Metadata the table's model was generated from before
+        new: Metadata of the table now
+
+    Returns:
+        The new fields, in table order
+    """
+    old_names = {field.name for field in old.fields}
+    return [field for field in new.fields if field.name not in old_names]
+
+
+def backfill_condition(fields: List[FieldMetadata]) -> str:
+    """
+    SQL condition matching the rows that have a value in at least one of the fields.
+
+    A column added in ClickHouse holds NULL, or the SAP initial value ('' or 0)
+    the model defaults it to, in the rows loaded before; rows holding the same
+    in SAP HANA need no backfill.
+    """
+    conditions = []
+    for field in fields:
+        column = f'"{field.name}"'
+        condition = f'{column} IS NOT NULL'
+        initial_value = MooseModelGenerator.SAP_INITIAL_VALUES.get(field.data_type.upper())
+        if not field.is_nullable and initial_value is not None:
+            # The initial values are Python literals: "" becomes ''
+            sql_value = "''" if initial_value == '""' else initial_value
+            condition += f' AND {column} <> {sql_value}'
+        conditions.append(f'({condition})')
+    return ' OR '.join(conditions)
+
+
+class PendingBackfills:
+    """Columns still to be backfilled by table name, kept in a JSON file."""
+
+    def __init__(self, path: str, tables: Optional[Dict[str, List[FieldMetadata]]] = None):
+        """
+        Initialize the pending backfills.
+
+        Args:
+            path: JSON file the backfills are saved to
+            tables: Fields to backfill by table name
+        """
+        self.path = Path(path)
+        self.tables: Dict[str, List[FieldMetadata]] = tables or {}
+
+    @classmethod
+    def for_models(cls, model_path: str) -> 'PendingBackfills':
+        """Backfills of a generated models module, e.g. app/ingest/cdc.py -> app/ingest/cdc.backfills.json."""
+        return cls.load(str(Path(model_path).with_suffix('.backfills.json')))
+
+    @classmethod
+    def load(cls, path: str) -> 'PendingBackfills':
+        """
+        Read the pending backfills.
+
+        Args:
+            path: JSON file to read; a missing file means nothing is pending
+
+        Returns:
+            PendingBackfills instance
+        """
+        backfills_path = Path(path)
+        if not backfills_path.exists():
+            return cls(path)
+        with open(backfills_path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != BACKFILLS_VERSION:
+            logger.warning(f"Ignoring backfills {path} of version {data.get('version')}")
+            return cls(path)
+        tables = {
+            table_name: [FieldMetadata(**field) for field in fields]
+            for table_name, fields in data['tables'].items()
+        }
+        return cls(path, tables)
+
+    def save(self) -> None:
+        """Write the pending backfills, tables in name order."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'version': BACKFILLS_VERSION,
+            'tables': {
+                table_name: [asdict(field) for field in self.tables[table_name]]
+                for table_name in sorted(self.tables)
+            },
+        }
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+            f.write('\n')
+
+    def add(self, table_name: str, fields: List[FieldMetadata]) -> None:
+        """Record columns to backfill, after those of the table already pending."""
+        pending = self.tables.setdefault(table_name, [])
+        pending_names = {field.name for field in pending}
+        for field in fields:
+            if field.name not in pending_names:
+                pending.append(field)
+                pending_names.add(field.name)
+
+    def remove(self, table_name: str) -> None:
+        """Forget the table's backfill once it has run."""
+        self.tables.pop(table_name, None)
@@ -0,0 +1,107 @@
+"""
+Record of the tables the Moose models were generated from.
+
+``init_cdc.py --generate-models`` keeps the metadata and schema fingerprint of
+every generated table next to the models module. On the next run only the
+tables whose fingerprint changed (or that are new) are introspected again;
+the models of the others are regenerated from the recorded metadata.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .sap_hana_introspection import TableMetadata
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+class SchemaManifest:
+    """Table metadata and schema fingerprints by table name, kept in a JSON file."""
+
+    def __init__(self, path: str, tables: Optional[Dict[str, TableMetadata]] = None):
+        """
+        Initialize the manifest.
+
+        Args:
+            path: JSON file the manifest is saved to
+            tables: Recorded table metadata by table name
+        """
+        self.path = Path(path)
+        self.tables: Dict[str, TableMetadata] = tables or {}
+
+    @classmethod
+    def for_models(cls, model_path: str) -> 'SchemaManifest':
+        """Manifest of a generated models module, e.g. app/ingest/cdc.py -> app/ingest/cdc.schema.json."""
+        return cls.load(str(Path(model_path).with_suffix('.schema.json')))
+
+    @classmethod
+    def load(cls, path: str) -> 'SchemaManifest':
+        """
+        Read a manifest.
+
+        A missing file, or one written by another manifest version, gives an
+        empty manifest, so every table is introspected again.
+
+        Args:
+            path: JSON file to read
+
+        Returns:
+            SchemaManifest instance
+        """
+        manifest_path = Path(path)
+        if not manifest_path.exists():
+            return cls(path)
+        with open(manifest_path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != MANIFEST_VERSION:
+            logger.info(f"Ignoring schema manifest {path} of version {data.get('version')}")
+            return cls(path)
+        tables = {
+            table_name: TableMetadata.from_dict(table)
+            for table_name, table in data['tables'].items()
+        }
+        return cls(path, tables)
+
+    def save(self) -> None:
+        """Write the manifest, tables in name order so it diffs well."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'version': MANIFEST_VERSION,
+            'tables': {
+                table_name: self.tables[table_name].to_dict()
+                for table_name in sorted(self.tables)
+            },
+        }
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+            f.write('\n')
+
+    def changed_tables(self, table_names: List[str], fingerprints: Dict[str, str]) -> List[str]:
+        """
+        Tables that must be introspected again.
+
+        Args:
+            table_names: Requested tables
+            fingerprints: Current fingerprints by table name. Tables without
+                one (views, or tables that couldn't be fingerprinted) always
+                count as changed.
+
+        Returns:
+            The requested tables that are new or whose fingerprint differs, in request order
+        """
+        changed = []
+        for table_name in table_names:
+            recorded = self.tables.get(table_name)
+            fingerprint = fingerprints.get(table_name)
+            if recorded is None or fingerprint is None or recorded.fingerprint() != fingerprint:
+                changed.append(table_name)
+        return changed
+
+    def update(self, tables: List[TableMetadata]) -> None:
+        """Record freshly introspected tables, replacing their previous metadata."""
+        for table in tables:
+            self.tables[table.table_name] = table
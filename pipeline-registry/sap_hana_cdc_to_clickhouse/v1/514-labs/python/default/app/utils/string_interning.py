@@ -0,0 +1,65 @@
+"""
+Per-batch interning of repeated strings in SAP HANA rows.
+
+The database driver returns a new string for every cell, so a snapshot page of
+100,000 rows holds 100,000 copies of the same client or currency code. Making
+equal strings of low-cardinality columns share one object keeps large batches
+and the models built from them smaller.
+
+Run tests/benchmarks/bench_string_interning.py to measure the memory saved.
+"""
+
+import logging
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# A text column is interned when its first INTERN_SAMPLE_ROWS values hold at
+# most INTERN_MAX_SAMPLE_DISTINCT distinct strings (MANDT, BUKRS, WAERS, ...)
+INTERN_SAMPLE_ROWS = 256
+INTERN_MAX_SAMPLE_DISTINCT = 32
+# Interning of a column stops once it has seen this many distinct strings
+INTERN_MAX_DISTINCT = 4096
+
+
+def intern_low_cardinality_strings(rows: List[Dict[str, Any]]) -> List[str]:
+    """
+    Make equal strings in low-cardinality text columns share one object, in place.
+
+    The intern table only lives for this call, unlike ``sys.intern``. Batches
+    smaller than the sample are left alone.
+
+    Args:
+        rows: Row dictionaries with column names as keys
+
+    Returns:
+        Names of the columns that were interned
+    """
+    if len(rows) < INTERN_SAMPLE_ROWS:
+        return []
+
+    sample = rows[:INTERN_SAMPLE_ROWS]
+    columns = []
+    for column in sample[0]:
+        distinct = set()
+        for row in sample:
+            value = row.get(column)
+            if value is None:
+                continue
+            if type(value) is not str or len(distinct) > INTERN_MAX_SAMPLE_DISTINCT:
+                break
+            distinct.add(value)
+        else:
+            if distinct and len(distinct) <= INTERN_MAX_SAMPLE_DISTINCT:
+                columns.append(column)
+
+    for column in columns:
+        strings: Dict[str, str] = {}
+        setdefault = strings.setdefault
+        for row in rows:
+            value = row.get(column)
+            if type(value) is str:
+                row[column] = setdefault(value, value)
+                if len(strings) > INTERN_MAX_DISTINCT:
+                    break
+    return columns
@@ -0,0 +1,280 @@
+"""
+Physical layout of the generated ClickHouse tables: partition key, data
+skipping indexes and projections.
+
+Moose creates each table from its ``OlapConfig``, which can carry the
+partition key but not indexes or projections. The generator therefore writes
+the partition key into the ``OlapConfig`` and the rest into a ``TABLE_LAYOUTS``
+mapping in the generated module, which ``apply_table_layout`` adds with
+``ALTER TABLE`` before a table is first loaded.
+
+Layouts are derived from the SAP HANA metadata (see ``derive_table_layout``)
+and can be overridden per table with a JSON file:
+
+    {
+        "BSEG": {
+            "partition_by": "assumeNotNull(GJAHR)",
+            "indexes": [
+                {"name": "idx_hkont", "expression": "HKONT", "type": "bloom_filter(0.01)", "granularity": 4}
+            ],
+            "projections": [{"name": "by_hkont", "order_by": ["HKONT", "BUDAT"]}]
+        },
+        "T001": {"partition_by": null}
+    }
+
+Keys left out of an override keep the derived value.
+"""
+
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .sap_hana_introspection import FieldMetadata, TableMetadata
+
+logger = logging.getLogger(__name__)
+
+# Fiscal year columns of SAP's large document tables (BSEG, BKPF, ACDOCA, MSEG, ...)
+FISCAL_YEAR_COLUMNS = ('GJAHR', 'RYEAR', 'MJAHR', 'LFGJA')
+
+# Date columns documents are usually filtered by, in order of preference
+DOCUMENT_DATE_COLUMNS = ('BUDAT', 'BLDAT', 'BEDAT', 'CPUDT', 'ERDAT', 'ERSDA', 'AEDAT')
+
+# Document number and master data columns that are looked up by value
+LOOKUP_COLUMNS = (
+    'BELNR', 'EBELN', 'VBELN', 'MBLNR', 'AUFNR', 'AWKEY', 'XBLNR',
+    'MATNR', 'KUNNR', 'LIFNR', 'HKONT', 'RACCT',
+)
+
+# Columns a second sort order is most often needed for, in order of preference
+PROJECTION_COLUMNS = ('MATNR', 'HKONT', 'RACCT', 'KUNNR', 'LIFNR')
+
+# Leading ORDER BY columns a lookup column may take part in before it's worth
+# an index of its own (the client plus one more)
+INDEXED_ORDER_BY_PREFIX = 2
+
+_PLAIN_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+@dataclass
+class SkipIndex:
+    """A ClickHouse data skipping index."""
+
+    name: str
+    expression: str
+    type: str
+    granularity: int = 4
+
+    def to_sql(self) -> str:
+        return f"INDEX {self.name} {self.expression} TYPE {self.type} GRANULARITY {self.granularity}"
+
+
+@dataclass
+class Projection:
+    """A ClickHouse projection storing the table's rows in another sort order."""
+
+    name: str
+    order_by: List[str]
+
+    def to_sql(self) -> str:
+        columns = ', '.join(quote_column(column) for column in self.order_by)
+        return f"PROJECTION {self.name} (SELECT * ORDER BY ({columns}))"
+
+
+@dataclass
+class TableLayout:
+    """Partition key, skipping indexes and projections of one table."""
+
+    partition_by: Optional[str] = None
+    indexes: List[SkipIndex] = field(default_factory=list)
+    projections: List[Projection] = field(default_factory=list)
+
+
+def quote_column(name: str) -> str:
+    """Quote a SAP HANA column name for ClickHouse SQL if it isn't a plain identifier (e.g. /BIC/ZQTY)."""
+    if _PLAIN_IDENTIFIER.match(name):
+        return name
+    return f"`{name}`"
+
+
+def derive_table_layout(
+    table: TableMetadata,
+    order_by_fields: List[str],
+    partition_min_rows: int = 10_000_000,
+    include_projections: bool = False,
+) -> TableLayout:
+    """
+    Derive a table's layout from its SAP HANA metadata.
+
+    - Tables with at least ``partition_min_rows`` rows (or an unknown count) are
+      partitioned by year: by SAP HANA's own range partitioning column if it is
+      a year or date, otherwise by the fiscal year column or a document date.
+    - Document number and master data columns outside the leading ORDER BY
+      columns get a bloom filter index; document dates a minmax index.
+    - With ``include_projections``, partitioned tables get one projection
+      ordered by the first material, account, customer or vendor column that
+      isn't part of the key. Projections store the rows a second time, so they
+      are only derived on request.
+
+    Args:
+        table: Table metadata
+        order_by_fields: The table's ORDER BY columns
+        partition_min_rows: Smallest table that is partitioned
+        include_projections: Derive a projection for large tables
+
+    Returns:
+        The derived TableLayout
+    """
+    layout = TableLayout()
+    fields_by_name = {f.name: f for f in table.fields}
+
+    large = table.record_count is None or table.record_count >= partition_min_rows
+    if large:
+        layout.partition_by = _derive_partition_by(table, fields_by_name)
+
+    ordered_prefix = set(order_by_fields[:INDEXED_ORDER_BY_PREFIX])
+    for name in LOOKUP_COLUMNS:
+        if name in fields_by_name and name not in ordered_prefix:
+            layout.indexes.append(SkipIndex(
+                name=f"idx_{name.lower()}",
+                expression=quote_column(name),
+                type="bloom_filter(0.01)",
+            ))
+    for name in DOCUMENT_DATE_COLUMNS:
+        if name in fields_by_name and name not in ordered_prefix:
+            layout.indexes.append(SkipIndex(
+                name=f"idx_{name.lower()}",
+                expression=quote_column(name),
+                type="minmax",
+                granularity=1,
+            ))
+
+    if include_projections and layout.partition_by is not None:
+        key_columns = set(order_by_fields)
+        for name in PROJECTION_COLUMNS:
+            if name in fields_by_name and name not in key_columns:
+                layout.projections.append(Projection(name=f"by_{name.lower()}", order_by=[name]))
+                break
+
+    return layout
+
+
+def _derive_partition_by(table: TableMetadata, fields_by_name: Dict[str, FieldMetadata]) -> Optional[str]:
+    """PARTITION BY expression by year, or None if the table has no suitable column."""
+    candidates = []
+    if table.partition_type == 'RANGE':
+        # SAP HANA's own range partitioning says how the data is accessed
+        candidates.extend(table.partition_columns)
+    candidates.extend(FISCAL_YEAR_COLUMNS)
+    candidates.extend(DOCUMENT_DATE_COLUMNS)
+
+    for name in candidates:
+        field_metadata = fields_by_name.get(name)
+        if field_metadata is not None:
+            expression = _year_expression(field_metadata)
+            if expression is not None:
+                return expression
+    return None
+
+
+def _year_expression(field_metadata: FieldMetadata) -> Optional[str]:
+    """Expression giving the year of a column, or None if the column doesn't hold one."""
+    # The generated column may be Nullable, which a partition key can't be
+    column = f"assumeNotNull({quote_column(field_metadata.name)})"
+    data_type = field_metadata.data_type.upper().split('(')[0]
+    if field_metadata.name in FISCAL_YEAR_COLUMNS:
+        return column
+    if data_type in ('DATE', 'SECONDDATE', 'TIMESTAMP'):
+        return f"toYear({column})"
+    if data_type in ('NVARCHAR', 'VARCHAR', 'CHAR', 'NCHAR') and field_metadata.length == 8:
+        # DATS column (YYYYMMDD)
+        return f"substring({column}, 1, 4)"
+    return None
+
+
+def load_table_layout_overrides(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Read per-table layout overrides from a JSON file.
+
+    Args:
+        path: JSON file mapping SAP HANA table names to layout overrides
+
+    Returns:
+        Overrides by table name
+
+    Raises:
+        ValueError: If the file isn't a JSON object of objects
+    """
+    with open(Path(path), encoding='utf-8') as f:
+        overrides = json.load(f)
+    if not isinstance(overrides, dict) or not all(isinstance(o, dict) for o in overrides.values()):
+        raise ValueError(f"{path} must map table names to layout objects")
+    return overrides
+
+
+def apply_overrides(layout: TableLayout, override: Dict[str, Any]) -> TableLayout:
+    """
+    Replace the parts of a layout given in an override.
+
+    Args:
+        layout: Derived layout
+        override: ``partition_by``, ``indexes`` and/or ``projections`` as in the override file
+
+    Returns:
+        New TableLayout
+    """
+    return TableLayout(
+        partition_by=override.get('partition_by', layout.partition_by),
+        indexes=[SkipIndex(**index) for index in override['indexes']]
+        if 'indexes' in override else layout.indexes,
+        projections=[Projection(**projection) for projection in override['projections']]
+        if 'projections' in override else layout.projections,
+    )
+
+
+def table_layout_statements(table_name: str, layout: TableLayout) -> List[str]:
+    """
+    ALTER TABLE statements adding a layout's indexes and projections.
+
+    Each index and projection is added if it doesn't exist yet and then
+    materialized, which builds it for rows already in the table.
+
+    Args:
+        table_name: ClickHouse table name
+        layout: The table's layout
+
+    Returns:
+        SQL statements, in the order they must run
+    """
+    table = f"`{table_name}`"
+    statements = []
+    for index in layout.indexes:
+        statements.append(f"ALTER TABLE {table} ADD {index.to_sql().replace('INDEX', 'INDEX IF NOT EXISTS', 1)}")
+        statements.append(f"ALTER TABLE {table} MATERIALIZE INDEX {index.name}")
+    for projection in layout.projections:
+        statements.append(
+            f"ALTER TABLE {table} ADD {projection.to_sql().replace('PROJECTION', 'PROJECTION IF NOT EXISTS', 1)}"
+        )
+        statements.append(f"ALTER TABLE {table} MATERIALIZE PROJECTION {projection.name}")
+    return statements
+
+
+def apply_table_layout(olap_table: Any, layout: TableLayout) -> None:
+    """
+    Add a layout's indexes and projections to an OlapTable's ClickHouse table.
+
+    The layout only speeds up queries, so a statement that fails is logged and
+    the remaining ones still run.
+
+    Args:
+        olap_table: The OlapTable instance
+        layout: The table's layout
+    """
+    client = olap_table._get_memoized_client()
+    for statement in table_layout_statements(olap_table._generate_table_name(), layout):
+        try:
+            client.command(statement)
+        except Exception as e:
+            logger.warning(f"Failed to apply table layout ({statement}): {e}")
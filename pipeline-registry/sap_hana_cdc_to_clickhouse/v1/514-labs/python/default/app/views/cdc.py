@@ -0,0 +1,13 @@
+"""
+SAP HANA CDC Views
+
+This file will be populated when you run:
+  python init_cdc.py --generate-models --tables TABLE1,TABLE2
+
+It holds a current-state view per table with a primary key (each row as of
+its latest change, deleted rows left out), which finalizes the argMax states
+a materialized view keeps in an AggregatingMergeTree table, plus any
+aggregate views given with --aggregate-views.
+"""
+
+# Views will be generated here by init_cdc.py --generate-models
@@ -2,6 +2,7 @@ import re
 import sys
 import os
 from pathlib import Path
+from typing import Optional
 from moose_lib import Task, TaskConfig, Workflow, WorkflowConfig, OlapTable, InsertOptions, Key, TaskContext
 from dotenv import load_dotenv
 
@@ -15,45 +16,190 @@ if str(_connector_path) not in sys.path:
 
 from app.ingest import cdc as cdc_module
 from sap_hana_cdc import SAPHanaCDCConnector, SAPHanaCDCConfig, TableStatus
-from app.workflows.lib.changes_inserter import BatchChangeInserter
+from app.workflows.lib.changes_inserter import BatchChangeInserter, InsertResult
+from app.workflows.lib.insert_buffer import InsertBuffer
+from app.utils.table_layout import apply_table_layout
+from app.utils.moose_model_generator import CDC_CHUNK_COLUMN
+from app.utils.schema_evolution import PendingBackfills, backfill_condition
 
 load_dotenv()
 sap_config = SAPHanaCDCConfig.from_env(prefix="SAP_HANA_")
 
+# The connector is kept for the lifetime of the worker process so the reader's
+# in-memory watermarks survive between scheduled runs.
+_connector: Optional[SAPHanaCDCConnector] = None
+
 def get_connector() -> SAPHanaCDCConnector:
-    return SAPHanaCDCConnector.build_from_config(sap_config)
+    global _connector
+    if _connector is None:
+        _connector = SAPHanaCDCConnector.build_from_config(sap_config)
+    else:
+        _connector.refresh_connection()
+    return _connector
+
+# The inserter also lives as long as the worker process, so the tables that fell
+# back to strict validation and the validation stats carry over between runs.
+_inserter: Optional[BatchChangeInserter] = None
+
+def get_inserter() -> BatchChangeInserter:
+    global _inserter
+    if _inserter is None:
+        _inserter = BatchChangeInserter.from_env()
+    return _inserter
+
+# Like the connector, the insert buffer lives as long as the worker process so
+# small batches can be coalesced across scheduled runs.
+_insert_buffer: Optional[InsertBuffer] = None
+
+def get_insert_buffer() -> InsertBuffer:
+    global _insert_buffer
+    if _insert_buffer is None:
+        _insert_buffer = InsertBuffer.from_env(get_inserter())
+    return _insert_buffer
+
+# The fetch procedure checkpoints each batch as it fetches the next one, so it
+# can't hold changes back in the buffer until they are inserted
+if sap_config.use_fetch_procedure and get_insert_buffer().enabled:
+    raise ValueError(
+        "SAP_HANA_USE_FETCH_PROCEDURE can't be combined with the SAP_HANA_CDC_BUFFER_* settings"
+    )
 
 # It's important to synchronize the new tables first, otherwise the destination tables will be incomplete
 def initial_load_task(ctx: TaskContext[None]) -> None:
     connector = get_connector()
-    inserter = BatchChangeInserter()
+    inserter = get_inserter()
     client_status = connector.get_client_status()
     for table_status in client_status:
         if table_status.status == TableStatus.NEW:
+            if _is_hash_synced(connector, inserter, table_status.table_name):
+                # The hash_sync workflow loads it chunk by chunk
+                continue
             # Detect if object is a view for logging
             is_view = connector.is_view(table_status.table_name)
             object_type = "view" if is_view else "table"
             print(f"Initial loading {object_type}: {table_status.table_name}")
+            _apply_table_layout(table_status.table_name)
             chunk_size = 100000
             offset = 0
             while True:
                 rows = connector.get_all_table_rows(table_status.table_name, page_size=chunk_size, offset=offset)
                 if not rows:
                     break
-                inserter.insert_table_data(table_status.table_name, rows)
+                inserter.insert_table_data(table_status.table_name, rows, offset=offset)
                 offset += len(rows)
-            connector.infrastructure.set_table_status_active(table_status.table_name)
+            connector.set_table_status_active(table_status.table_name)
+    _backfill_added_columns(connector, inserter, client_status)
+    _report_validation_stats(inserter)
 
 
+def _backfill_added_columns(connector, inserter, client_status) -> None:
+    # Columns added in SAP HANA after a table's initial load (init_cdc.py --evolve-schema)
+    backfills = PendingBackfills.for_models(cdc_module.__file__)
+    active_tables = {
+        table_status.table_name for table_status in client_status if table_status.status == TableStatus.ACTIVE
+    }
+    for table_name, fields in list(backfills.tables.items()):
+        columns = [field.name for field in fields]
+        if not inserter.has_columns(table_name, columns):
+            print(f"Backfill of {table_name} waits for its model to have columns {columns}")
+            continue
+        # Tables loaded in full since the columns were added already have them
+        if table_name in active_tables:
+            print(f"Backfilling columns {columns} of {table_name}")
+            # Changes captured after this CHANGE_ID replace the backfilled rows, older ones don't
+            version = connector.get_max_change_id()
+            where = backfill_condition(fields)
+            chunk_size = 100000
+            offset = 0
+            while True:
+                rows = connector.get_all_table_rows(table_name, page_size=chunk_size, offset=offset, where=where)
+                if not rows:
+                    break
+                inserter.insert_table_data(table_name, rows, offset=offset, version=version)
+                offset += len(rows)
+        backfills.remove(table_name)
+        backfills.save()
+
+def _is_hash_synced(connector: SAPHanaCDCConnector, inserter: BatchChangeInserter, table_name: str) -> bool:
+    # Models generated before hash sync have no chunk column and are loaded in full
+    return connector.is_hash_synced(table_name) and inserter.has_columns(table_name, [CDC_CHUNK_COLUMN])
+
+def _apply_table_layout(table_name: str) -> None:
+    # Skipping indexes and projections Moose couldn't create with the table
+    layout = getattr(cdc_module, "TABLE_LAYOUTS", {}).get(table_name)
+    olap_table = getattr(cdc_module, table_name.lower(), None)
+    if layout is not None and olap_table is not None:
+        apply_table_layout(olap_table, layout)
+
+def _report_failed_tables(result: InsertResult) -> None:
+    for table_name, error in result.failed.items():
+        print(f"Failed to insert changes for {table_name}, will retry after backoff: {error}")
+
+def _report_validation_stats(inserter: BatchChangeInserter) -> None:
+    for table_name, stats in inserter.validation_stats.items():
+        if stats.rejected or stats.coerced or stats.dead_lettered:
+            print(
+                f"Validation for {table_name} ({inserter.get_validation_policy(table_name)}): "
+                f"{stats.rejected} rows rejected, {stats.coerced} coerced, "
+                f"{stats.validated} validated, {stats.trusted} trusted, "
+                f"{stats.dead_lettered} dead-lettered"
+            )
+
+# Upper bound on batches per run when fetching through the CDC_FETCH_CHANGES
+# procedure, where each call also checkpoints the batch fetched before it.
+MAX_CHAINED_BATCHES = 10
+
 def sync_changes_task(ctx: TaskContext[None]) -> None:
     connector = get_connector()
-    batch = connector.get_changes()
+    _sync_changes(connector)
+    # With group commit the last batches' checkpoint may still be pending, and
+    # idle polls don't call update_client_status to write it once it's due
+    connector.flush_checkpoint_if_due()
 
-    if batch:
+def _sync_changes(connector: SAPHanaCDCConnector) -> None:
+    if not sap_config.use_fetch_procedure:
+        batch = connector.get_changes()
+        insert_buffer = get_insert_buffer()
+        if insert_buffer.enabled:
+            if batch:
+                print(f"Batch: {batch}")
+                # Poll past the batch now, checkpoint it once it has been inserted
+                connector.mark_read(batch)
+                insert_buffer.add(batch)
+            result = insert_buffer.flush(connector)
+            _report_failed_tables(result)
+            _report_validation_stats(insert_buffer.inserter)
+            return
+        if batch:
+            print(f"Batch: {batch}")
+            inserter = get_inserter()
+            result = inserter.insert(batch.changes)
+            # Tables that failed keep their watermark and back off; the rest move on
+            connector.update_client_status(batch, failed_tables=result.failed)
+            _report_failed_tables(result)
+            _report_validation_stats(inserter)
+        return
+
+    inserter = get_inserter()
+    previous = None
+    for _ in range(MAX_CHAINED_BATCHES):
+        batch = connector.get_changes_and_checkpoint(previous)
+        if not batch:
+            break
         print(f"Batch: {batch}")
-        inserter = BatchChangeInserter()
-        inserter.insert(batch.changes)
-        connector.update_client_status(batch)
+        result = inserter.insert(batch.changes)
+        if not result.all_succeeded:
+            # Checkpoint the tables that made it and pick the failed ones up next run
+            connector.update_client_status(batch, failed_tables=result.failed)
+            _report_failed_tables(result)
+            _report_validation_stats(inserter)
+            return
+        previous = batch
+    else:
+        # Out of budget for this run; don't leave the last batch unacknowledged
+        connector.update_client_status(previous)
+
+    _report_validation_stats(inserter)
 
 sync_changes_task_instance = Task[None, None](
     name="sync_changes",
@@ -0,0 +1,4 @@
+"""Workflow library utilities."""
+from .changes_inserter import BatchChangeInserter
+
+__all__ = ["BatchChangeInserter"]
@@ -0,0 +1,1063 @@
+"""Batch change inserter for CDC to ClickHouse pipeline."""
+import hashlib
+import importlib
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import StrEnum, auto
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from collections import defaultdict
+
+from moose_lib import OlapTable, InsertOptions
+from clickhouse_connect.driver.exceptions import ClickHouseError, DataError, OperationalError
+from moose_lib.utilities.sql import quote_identifier
+from pydantic import BaseModel
+from tenacity import (
+    retry,
+    stop_after_attempt,
+    wait_exponential,
+    retry_if_exception,
+)
+
+from sap_hana_cdc import ChangeEvent, ChunkHash, TriggerType, ValueColumn
+from app.utils.moose_model_generator import (
+    CDC_CHUNK_COLUMN,
+    CDC_IS_DELETED_COLUMN,
+    CDC_VERSION_COLUMN,
+    current_state_table_name,
+)
+from app.utils.reconciliation import key_range_delete_statement, key_range_hashes_query, model_value_columns
+from app.utils.string_interning import intern_low_cardinality_strings
+from app.utils.sap_row_converter import get_row_converter
+from .columnar_loader import ColumnarLoader
+from .dead_letters import DeadLetter, DeadLetterQueue
+
+logger = logging.getLogger(__name__)
+
+# Generated registry resolving table names to their OlapTables
+MODELS_MODULE = "app.ingest.cdc"
+
+# One row in this many is validated under ValidationPolicy.SAMPLED
+DEFAULT_VALIDATION_SAMPLE_RATE = 100
+
+# Rows one insert may dead-letter before the whole table insert fails instead
+DEFAULT_MAX_DEAD_LETTER_ROWS = 100
+
+# Chunk ids (or key ranges) per DELETE of the rows of an object reloaded in parts
+CHUNK_IDS_PER_DELETE = 1000
+
+# ClickHouse error codes caused by the values of a row (parse errors, type
+# mismatches, out of range values, NULL into a non-Nullable column). Retrying
+# the same rows can't succeed, so failing inserts are split instead.
+_ROW_ERROR_CODES = {6, 26, 27, 32, 38, 41, 53, 69, 70, 72, 117, 131, 321, 349, 407}
+
+_ERROR_CODE = re.compile(r"\bCode: (\d+)")
+
+
+class ValidationPolicy(StrEnum):
+    """How rows are validated before they're inserted.
+
+    - FULL: every row goes through the SAP HANA type conversions.
+    - SAMPLED: one row in N is converted; the rest are built as-is with
+      ``model_construct``. If a sampled row is rejected or needs coercion, the
+      table falls back to FULL (starting with the batch that exposed it).
+    - TRUSTED: every row is built as-is with ``model_construct``.
+    """
+    FULL = auto()
+    SAMPLED = auto()
+    TRUSTED = auto()
+
+
+@dataclass
+class ValidationStats:
+    """Row counters for one table."""
+
+    validated: int = 0
+    trusted: int = 0
+    coerced: int = 0
+    rejected: int = 0
+    # Rows written to the dead-letter file, rejected ones included
+    dead_lettered: int = 0
+
+
+@dataclass
+class InsertResult:
+    """Outcome of inserting a batch of changes, per SAP HANA source table."""
+
+    succeeded: List[str] = field(default_factory=list)
+    failed: Dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def all_succeeded(self) -> bool:
+        return not self.failed
+
+
+class BatchChangeInserter:
+    """
+    Handles insertion of CDC changes into ClickHouse via Moose OlapTables.
+
+    Features:
+    - Groups changes by table for batch processing
+    - Converts rows with a converter compiled once per table
+    - Configurable validation policy per table, with rejected/coerced counters
+    - Handles INSERT/UPDATE/DELETE operations, filling the CDC version and
+      delete marker columns of models that have them
+    - Retry logic with exponential backoff; inserts carry a deduplication
+      token (unless turned off), so retried and replayed inserts are dropped
+      by ClickHouse
+    - Inserts ClickHouse rejects for their values are split until the failing
+      rows are isolated; those rows, and rows that fail conversion, go to a
+      dead-letter file with their CHANGE_IDs
+    - Per-table results, so one failing table doesn't block the others
+    - Optional concurrent insertion of the tables in a batch
+    - Optional columnar insert path, falling back to OlapTable.insert
+    """
+
+    def __init__(
+        self,
+        validation_policy: ValidationPolicy = ValidationPolicy.FULL,
+        validation_sample_rate: int = DEFAULT_VALIDATION_SAMPLE_RATE,
+        table_validation_policies: Optional[Dict[str, ValidationPolicy]] = None,
+        max_concurrent_tables: int = 1,
+        columnar_insert: bool = False,
+        deduplicate_inserts: bool = True,
+        dead_letters: Optional[DeadLetterQueue] = None,
+        max_dead_letter_rows: int = DEFAULT_MAX_DEAD_LETTER_ROWS,
+    ):
+        """
+        Initialize the inserter.
+
+        Args:
+            validation_policy: Default validation policy for all tables
+            validation_sample_rate: Validate one row in this many under SAMPLED
+            table_validation_policies: Per-table overrides, keyed by SAP HANA table name
+            max_concurrent_tables: How many tables of a batch to insert at once
+                (1 inserts them one after another)
+            columnar_insert: Send models to ClickHouse column-wise (see
+                ``ColumnarLoader``) instead of through ``OlapTable.insert``
+            deduplicate_inserts: Tag each insert with an ``insert_deduplication_token``
+                derived from the CHANGE_IDs or snapshot rows it covers
+            dead_letters: Where to write rows that fail conversion or are rejected
+                by ClickHouse. Without it failing inserts aren't split and rejected
+                rows are only logged.
+            max_dead_letter_rows: Rows one insert may dead-letter; beyond that the
+                table's insert fails as a whole (0 never splits inserts)
+        """
+        self._olap_table_cache: Dict[str, OlapTable] = {}
+        self._row_converter_cache: Dict[str, Any] = {}
+        self._cdc_columns_cache: Dict[str, bool] = {}
+        self.validation_policy = ValidationPolicy(validation_policy)
+        self.validation_sample_rate = max(1, validation_sample_rate)
+        self.table_validation_policies = {
+            self._normalize_table_name(table_name): ValidationPolicy(policy)
+            for table_name, policy in (table_validation_policies or {}).items()
+        }
+        self.validation_stats: Dict[str, ValidationStats] = defaultdict(ValidationStats)
+        # Tables whose sampled validation failed; they stay on FULL from then on
+        self._strict_tables: Set[str] = set()
+        self.max_concurrent_tables = max(1, max_concurrent_tables)
+        self._columnar_loader = ColumnarLoader() if columnar_insert else None
+        self.deduplicate_inserts = deduplicate_inserts
+        self.dead_letters = dead_letters
+        self.max_dead_letter_rows = max_dead_letter_rows
+        # CHANGE_IDs per table that were inserted by a failed insert's parts;
+        # skipped when the changes are replayed, until the table's insert succeeds
+        self._inserted_before_failure: Dict[str, Set[str]] = {}
+
+    @classmethod
+    def from_env(cls, prefix: str = "SAP_HANA_CDC_") -> "BatchChangeInserter":
+        """
+        Create an inserter from environment variables.
+
+        Reads ``{prefix}VALIDATION_POLICY`` (full, sampled or trusted),
+        ``{prefix}VALIDATION_SAMPLE_RATE``, ``{prefix}TABLE_VALIDATION_POLICIES``
+        (comma-separated ``TABLE=policy`` pairs, e.g. ``EKKO=trusted,MARA=full``)
+        ``{prefix}INSERT_CONCURRENCY``, ``{prefix}COLUMNAR_INSERT`` and
+        ``{prefix}DEDUPLICATE_INSERTS`` (true/false), ``{prefix}DEAD_LETTER_PATH``
+        (empty to turn dead-lettering off) and ``{prefix}DEAD_LETTER_MAX_ROWS``.
+
+        Args:
+            prefix: Environment variable prefix
+
+        Returns:
+            BatchChangeInserter instance
+        """
+        table_policies = {}
+        for entry in os.getenv(f"{prefix}TABLE_VALIDATION_POLICIES", "").split(","):
+            if entry.strip():
+                table_name, _, policy = entry.partition("=")
+                table_policies[table_name.strip()] = ValidationPolicy(policy.strip().lower())
+
+        return cls(
+            validation_policy=ValidationPolicy(
+                os.getenv(f"{prefix}VALIDATION_POLICY", ValidationPolicy.FULL).lower()
+            ),
+            validation_sample_rate=int(
+                os.getenv(f"{prefix}VALIDATION_SAMPLE_RATE", str(DEFAULT_VALIDATION_SAMPLE_RATE))
+            ),
+            table_validation_policies=table_policies,
+            max_concurrent_tables=int(os.getenv(f"{prefix}INSERT_CONCURRENCY", "1")),
+            columnar_insert=os.getenv(f"{prefix}COLUMNAR_INSERT", "false").lower() in ("1", "true", "yes"),
+            deduplicate_inserts=os.getenv(f"{prefix}DEDUPLICATE_INSERTS", "true").lower() in ("1", "true", "yes"),
+            dead_letters=DeadLetterQueue.from_env(prefix),
+            max_dead_letter_rows=int(
+                os.getenv(f"{prefix}DEAD_LETTER_MAX_ROWS", str(DEFAULT_MAX_DEAD_LETTER_ROWS))
+            ),
+        )
+
+    def insert_table_data(
+        self,
+        table_name: str,
+        rows: List[Dict[str, Any]],
+        offset: Optional[int] = None,
+        version: Optional[int] = None,
+    ) -> None:
+        """
+        Insert initial load data into ClickHouse.
+
+        Args:
+            table_name: SAP HANA table name (e.g., "EKKO")
+            rows: List of row dictionaries with column names as keys
+            offset: Position of the first row in the table's snapshot. Pages
+                with an offset are inserted with a deduplication token, so a
+                restarted initial load doesn't insert them twice.
+            version: CDC version to insert the rows with, for tables with the
+                CDC columns. Rows read again while changes are being captured
+                (e.g. a backfill) must not replace changes newer than the read;
+                initial load rows keep version 0.
+
+        Raises:
+            Exception: If insertion fails after retries
+        """
+        if not rows:
+            logger.info(f"No rows to insert for table {table_name}")
+            return
+
+        normalized_table_name = self._normalize_table_name(table_name)
+        logger.info(f"Inserting {len(rows)} rows into {normalized_table_name}")
+
+        try:
+            olap_table = self._get_olap_table(normalized_table_name)
+            if olap_table is None:
+                error_msg = f"OlapTable not found for {normalized_table_name}"
+                logger.error(error_msg)
+                raise ValueError(error_msg)
+
+            if version is not None and self._has_cdc_columns(normalized_table_name, olap_table):
+                rows = [{**row, CDC_VERSION_COLUMN: version} for row in rows]
+
+            # Convert rows to Pydantic models
+            models, source_rows = self._to_models(
+                normalized_table_name, olap_table, [(row, None) for row in rows]
+            )
+
+            if models:
+                dedup_token = None
+                if self.deduplicate_inserts and offset is not None:
+                    dedup_token = _snapshot_dedup_token(normalized_table_name, rows, offset)
+                inserted = self._insert_isolating_failures(
+                    normalized_table_name,
+                    olap_table,
+                    models,
+                    source_rows,
+                    dedup_token=dedup_token,
+                )
+                logger.info(
+                    f"Successfully inserted {inserted} rows into {normalized_table_name}"
+                )
+        except Exception as e:
+            logger.error(f"Error inserting data into {normalized_table_name}: {e}")
+            raise
+
+    def insert(self, changes: List[ChangeEvent]) -> InsertResult:
+        """
+        Insert CDC changes into ClickHouse.
+
+        Groups changes by table for batch processing.
+        Handles INSERT/UPDATE/DELETE operations appropriately.
+        A table that fails after retries is reported in the result and the
+        remaining tables are still inserted. With ``max_concurrent_tables`` > 1
+        up to that many tables are inserted at once; the changes of one table
+        are always inserted together, in batch order.
+
+        Args:
+            changes: List of ChangeEvent objects from SAP HANA CDC
+
+        Returns:
+            InsertResult with the source table names that succeeded and failed
+        """
+        result = InsertResult()
+        if not changes:
+            logger.info("No changes to insert")
+            return result
+
+        # Group changes by table
+        changes_by_table = defaultdict(list)
+        source_table_names: Dict[str, str] = {}
+        for change in changes:
+            table_name = self._normalize_table_name(change.table_name)
+            changes_by_table[table_name].append(change)
+            source_table_names.setdefault(table_name, change.table_name)
+
+        logger.info(
+            f"Processing {len(changes)} changes across {len(changes_by_table)} tables"
+        )
+
+        # Process each table's changes
+        tables = list(changes_by_table.items())
+        if self.max_concurrent_tables > 1 and len(tables) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_concurrent_tables, len(tables)),
+                thread_name_prefix="cdc-insert",
+            ) as executor:
+                errors = list(executor.map(lambda table: self._try_insert_table_changes(*table), tables))
+        else:
+            errors = [self._try_insert_table_changes(*table) for table in tables]
+
+        for (table_name, _), error in zip(tables, errors):
+            source_table_name = source_table_names[table_name]
+            if error is None:
+                result.succeeded.append(source_table_name)
+            else:
+                result.failed[source_table_name] = error
+
+        return result
+
+    def _try_insert_table_changes(
+        self, table_name: str, changes: List[ChangeEvent]
+    ) -> Optional[Exception]:
+        """
+        Insert changes for a specific table, returning the error instead of raising it.
+
+        Args:
+            table_name: Normalized table name
+            changes: List of changes for this table
+
+        Returns:
+            The exception if the insert failed, otherwise None
+        """
+        try:
+            self._insert_table_changes(table_name, changes)
+            return None
+        except Exception as e:
+            logger.error(f"Error inserting changes for {table_name}: {e}")
+            return e
+
+    def _insert_table_changes(
+        self, table_name: str, changes: List[ChangeEvent]
+    ) -> None:
+        """
+        Insert changes for a specific table.
+
+        Args:
+            table_name: Normalized table name
+            changes: List of changes for this table
+        """
+        olap_table = self._get_olap_table(table_name)
+        if olap_table is None:
+            error_msg = f"OlapTable not found for {table_name}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        already_inserted = self._inserted_before_failure.get(table_name)
+        if already_inserted:
+            changes = [change for change in changes if change.event_id not in already_inserted]
+
+        has_cdc_columns = self._has_cdc_columns(table_name, olap_table)
+
+        # Determine which values to use based on trigger type
+        rows = []
+        for change in changes:
+            if change.trigger_type == TriggerType.INSERT:
+                # For INSERT, use new_values
+                row_data = _row_values(change.new_values)
+            elif change.trigger_type == TriggerType.UPDATE:
+                # For UPDATE, use new_values (ClickHouse will handle versioning)
+                row_data = _row_values(change.new_values)
+            elif change.trigger_type == TriggerType.DELETE:
+                # For DELETE, use old_values with is_deleted flag
+                # ReplacingMergeTree will handle this
+                row_data = _row_values(change.old_values)
+            else:
+                logger.warning(f"Unknown trigger type: {change.trigger_type}")
+                continue
+
+            if row_data:
+                if has_cdc_columns:
+                    # The CHANGE_ID orders the versions of a row; a DELETE is the
+                    # old row marked deleted, so the ReplacingMergeTree drops it
+                    row_data = {
+                        **row_data,
+                        CDC_VERSION_COLUMN: int(change.event_id),
+                        CDC_IS_DELETED_COLUMN: int(change.trigger_type == TriggerType.DELETE),
+                    }
+                rows.append((row_data, change.event_id))
+
+        # Convert changes to models
+        models, source_rows = self._to_models(table_name, olap_table, rows)
+
+        if models:
+            dedup_token = None
+            if self.deduplicate_inserts:
+                dedup_token = _cdc_dedup_token(table_name, changes)
+            inserted = self._insert_isolating_failures(
+                table_name,
+                olap_table,
+                models,
+                source_rows,
+                dedup_token=dedup_token,
+            )
+            logger.info(f"Successfully inserted {inserted} changes into {table_name}")
+        self._inserted_before_failure.pop(table_name, None)
+
+    def _insert_isolating_failures(
+        self,
+        normalized_table_name: str,
+        olap_table: OlapTable,
+        models: List[Any],
+        source_rows: List[Tuple[Dict[str, Any], Optional[str]]],
+        dedup_token: Optional[str] = None,
+    ) -> int:
+        """
+        Insert models, isolating the rows ClickHouse rejects.
+
+        If the insert fails because of the values of some rows, it is split in
+        halves and each half inserted again, recursively, until the failing
+        rows are inserted alone. Those rows are dead-lettered and the rest are
+        loaded. Each part gets its own deduplication token derived from the
+        batch's, so replaying the batch splits and deduplicates it the same way.
+        If the isolation fails, the CHANGE_IDs of the parts already inserted
+        are recorded so that replaying the changes doesn't insert them again.
+
+        Args:
+            normalized_table_name: Lowercase table name
+            olap_table: The OlapTable instance
+            models: Model instances to insert
+            source_rows: (row, CHANGE_ID) each model was built from
+            dedup_token: Deduplication token of the whole insert
+
+        Returns:
+            Number of rows inserted
+
+        Raises:
+            Exception: If the insert fails for another reason, or more than
+                ``max_dead_letter_rows`` rows are rejected
+        """
+        try:
+            self._insert_with_retry(olap_table, models, dedup_token=dedup_token)
+            return len(models)
+        except Exception as e:
+            if self.dead_letters is None or self.max_dead_letter_rows <= 0 or not _is_row_error(e):
+                raise
+            logger.warning(
+                f"Insert into {normalized_table_name} rejected, isolating the failing rows: {e}"
+            )
+            error = e
+
+        letters: List[DeadLetter] = []
+        inserted: List[Optional[str]] = []
+        try:
+            self._bisect_insert(
+                normalized_table_name,
+                olap_table,
+                models,
+                source_rows,
+                dedup_token,
+                error,
+                letters,
+                inserted,
+            )
+        except Exception:
+            # The whole batch is replayed; its parts that made it in must not be inserted twice
+            self._inserted_before_failure.setdefault(normalized_table_name, set()).update(
+                change_id for change_id in inserted if change_id is not None
+            )
+            raise
+        self._dead_letter(normalized_table_name, letters)
+        return len(models) - len(letters)
+
+    def _bisect_insert(
+        self,
+        normalized_table_name: str,
+        olap_table: OlapTable,
+        models: List[Any],
+        source_rows: List[Tuple[Dict[str, Any], Optional[str]]],
+        dedup_token: Optional[str],
+        error: Exception,
+        letters: List[DeadLetter],
+        inserted: List[Optional[str]],
+    ) -> None:
+        """
+        Insert the halves of a rejected insert.
+
+        Rows that fail alone are collected in ``letters``, the CHANGE_IDs of the
+        rows inserted in ``inserted``.
+        """
+        if len(models) == 1:
+            row, change_id = source_rows[0]
+            letters.append(DeadLetter(normalized_table_name, change_id, "insert", str(error), row))
+            if len(letters) > self.max_dead_letter_rows:
+                raise error
+            return
+
+        middle = len(models) // 2
+        for start, end in ((0, middle), (middle, len(models))):
+            part_token = f"{dedup_token}:{start}-{end}" if dedup_token else None
+            try:
+                self._insert_with_retry(
+                    olap_table, models[start:end], dedup_token=part_token
+                )
+                inserted.extend(change_id for _, change_id in source_rows[start:end])
+            except Exception as e:
+                if not _is_row_error(e):
+                    raise
+                self._bisect_insert(
+                    normalized_table_name,
+                    olap_table,
+                    models[start:end],
+                    source_rows[start:end],
+                    part_token,
+                    e,
+                    letters,
+                    inserted,
+                )
+
+    def _dead_letter(self, normalized_table_name: str, letters: List[DeadLetter]) -> None:
+        """Write dead letters and count them in the table's stats."""
+        if self.dead_letters is None or not letters:
+            return
+        self.dead_letters.add(letters)
+        self.validation_stats[normalized_table_name].dead_lettered += len(letters)
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=30),
+        # Rejected rows fail the same way every time; they're isolated instead
+        retry=retry_if_exception(lambda e: not _is_row_error(e)),
+        reraise=True,
+    )
+    def _insert_with_retry(
+        self,
+        olap_table: OlapTable,
+        models: List[Any],
+        dedup_token: Optional[str] = None,
+    ) -> None:
+        """
+        Insert models into OlapTable with retry logic.
+
+        Uses the columnar loader when enabled and the table supports it. With a
+        deduplication token, models are otherwise inserted as JSON rows with
+        the token as a setting, which ``OlapTable.insert`` can't pass. Every
+        attempt sends the same token, so ClickHouse drops the insert if an
+        earlier attempt (or an earlier run) already wrote it. ``OlapTable.insert``
+        is the fallback.
+
+        The models were validated when they were built (see ``_to_models``):
+        under FULL each one by the table's row converter, which applies the
+        model's validators and constraints. Moose doesn't validate them again;
+        its validation would return the instances unchanged anyway.
+
+        Args:
+            olap_table: The OlapTable instance
+            models: List of Pydantic model instances
+            dedup_token: ``insert_deduplication_token`` for the insert
+
+        Raises:
+            Exception: If all retry attempts fail, or right away if ClickHouse
+                rejected the values of some rows
+        """
+        settings = {"insert_deduplication_token": dedup_token} if dedup_token else None
+        try:
+            if self._columnar_loader is not None and self._columnar_loader.insert(
+                olap_table, models, settings=settings
+            ):
+                return
+            if settings and _insert_json_each_row(olap_table, models, settings):
+                return
+            olap_table.insert(models, options=InsertOptions(validate=False))
+        except Exception as e:
+            logger.warning(f"Insert failed, will retry: {e}")
+            raise
+
+    def get_validation_policy(self, table_name: str) -> ValidationPolicy:
+        """
+        Get the validation policy in effect for a table.
+
+        Args:
+            table_name: SAP HANA or normalized table name
+
+        Returns:
+            The table's override if set, otherwise the default policy. A SAMPLED
+            table whose sampled validation has failed reports FULL.
+        """
+        normalized_table_name = self._normalize_table_name(table_name)
+        if normalized_table_name in self._strict_tables:
+            return ValidationPolicy.FULL
+        return self.table_validation_policies.get(normalized_table_name, self.validation_policy)
+
+    def _to_models(
+        self,
+        normalized_table_name: str,
+        olap_table: OlapTable,
+        rows: List[Tuple[Dict[str, Any], str]],
+    ) -> Tuple[List[Any], List[Tuple[Dict[str, Any], Optional[str]]]]:
+        """
+        Convert rows to models under the table's validation policy.
+
+        Rows that fail conversion are logged, counted as rejected, dead-lettered
+        and skipped. Repeated strings in low-cardinality columns are interned
+        first, so the models of a large batch share them. Under FULL validation
+        the columns of the SAP types with a column kernel are converted a whole
+        column at a time before the rows are.
+
+        Args:
+            normalized_table_name: Lowercase table name
+            olap_table: The OlapTable instance
+            rows: (row dict, CHANGE_ID or None for initial load rows) pairs
+
+        Returns:
+            List of model instances, and the (row, CHANGE_ID) pair each was built from
+        """
+        intern_low_cardinality_strings([row for row, _ in rows])
+        converter = self._get_row_converter(normalized_table_name, olap_table)
+        stats = self.validation_stats[normalized_table_name]
+        policy = self.get_validation_policy(normalized_table_name)
+
+        if policy == ValidationPolicy.TRUSTED:
+            stats.trusted += len(rows)
+            return [converter.construct(row) for row, _ in rows], rows
+
+        if policy == ValidationPolicy.SAMPLED:
+            models = self._to_models_sampled(normalized_table_name, converter, rows)
+            if models is not None:
+                return models, rows
+
+        models = []
+        source_rows = []
+        letters = []
+        converted_columns = converter.convert_columns([row for row, _ in rows])
+        for (row, change_id), (converted_row, converted) in zip(rows, converted_columns):
+            try:
+                model_instance, coerced = converter.convert_row(converted_row)
+            except Exception as e:
+                logger.warning(f"Failed to convert {_describe_row(change_id)} to model: {e}")
+                stats.rejected += 1
+                letters.append(DeadLetter(normalized_table_name, change_id, "conversion", str(e), row))
+                continue
+            stats.validated += 1
+            if coerced or converted:
+                stats.coerced += 1
+            models.append(model_instance)
+            source_rows.append((row, change_id))
+        self._dead_letter(normalized_table_name, letters)
+        return models, source_rows
+
+    def _to_models_sampled(
+        self,
+        normalized_table_name: str,
+        converter: Any,
+        rows: List[Tuple[Dict[str, Any], str]],
+    ) -> Optional[List[Any]]:
+        """
+        Convert one row in ``validation_sample_rate`` and trust the rest.
+
+        Returns:
+            List of model instances, or None if a sampled row was rejected or
+            coerced, in which case the table is switched to FULL validation
+        """
+        models = []
+        sampled = 0
+        for i, (row, change_id) in enumerate(rows):
+            if i % self.validation_sample_rate:
+                models.append(converter.construct(row))
+                continue
+
+            try:
+                model_instance, coerced = converter.convert_row(row)
+            except Exception as e:
+                reason = f"{_describe_row(change_id)} was rejected: {e}"
+            else:
+                if not coerced:
+                    models.append(model_instance)
+                    sampled += 1
+                    continue
+                reason = f"{_describe_row(change_id)} needed type coercion"
+
+            logger.warning(
+                f"Sampled validation failed for {normalized_table_name} ({reason}); "
+                f"switching to full validation"
+            )
+            self._strict_tables.add(normalized_table_name)
+            return None
+
+        stats = self.validation_stats[normalized_table_name]
+        stats.validated += sampled
+        stats.trusted += len(models) - sampled
+        return models
+
+    def _get_row_converter(self, normalized_table_name: str, olap_table: OlapTable) -> Any:
+        """
+        Get the row -> model converter for a table, building it once.
+
+        Pydantic models get a precompiled SapRowConverter, which applies the same
+        SAP HANA type conversions without per-row model validation. Anything else
+        is called with the row as keyword arguments.
+
+        Args:
+            normalized_table_name: Lowercase table name
+            olap_table: The OlapTable instance
+
+        Returns:
+            Converter with ``convert_columns(rows)``, ``convert_row(row) -> (model, coerced)``
+            and ``construct(row)``
+        """
+        converter = self._row_converter_cache.get(normalized_table_name)
+        if converter is None:
+            model_class = self._get_model_class(olap_table)
+            if isinstance(model_class, type) and issubclass(model_class, BaseModel):
+                converter = get_row_converter(model_class)
+            else:
+                converter = _CallModelConverter(model_class)
+            self._row_converter_cache[normalized_table_name] = converter
+        return converter
+
+    def delete_chunks(self, table_name: str, chunk_ids: List[str], include_unchunked: bool = False) -> None:
+        """
+        Delete the rows an object synced by chunk checksums was loaded with for some chunks.
+
+        Args:
+            table_name: SAP HANA table or view name
+            chunk_ids: Ids of the chunks whose rows are deleted
+            include_unchunked: Also delete rows loaded without a chunk id (by
+                a full initial load)
+
+        Raises:
+            ValueError: If the table has no OlapTable
+            RuntimeError: If this moose_lib's OlapTable lacks the internals used
+        """
+        normalized_table_name = self._normalize_table_name(table_name)
+        olap_table = self._get_olap_table(normalized_table_name)
+        if olap_table is None:
+            raise ValueError(f"OlapTable not found for {normalized_table_name}")
+        chunk_ids = list(chunk_ids) + ([""] if include_unchunked else [])
+        client, clickhouse_table_name = _olap_table_client(olap_table)
+        for start in range(0, len(chunk_ids), CHUNK_IDS_PER_DELETE):
+            # Lightweight delete: the rows are hidden right away and purged by merges
+            client.command(
+                f"DELETE FROM {clickhouse_table_name} "
+                f"WHERE has({{chunk_ids:Array(String)}}, {CDC_CHUNK_COLUMN})",
+                parameters={"chunk_ids": chunk_ids[start:start + CHUNK_IDS_PER_DELETE]},
+            )
+        logger.info(f"Deleted the rows of {len(chunk_ids)} chunks from {normalized_table_name}")
+
+    def get_key_range_hashes(
+        self,
+        table_name: str,
+        key_columns: List[str],
+        prefix_length: int,
+        parent_prefixes: Optional[List[str]] = None,
+        value_columns: Sequence[ValueColumn] = (),
+    ) -> List[ChunkHash]:
+        """
+        Get the row counts and checksums of a table's key ranges in ClickHouse.
+
+        Ranges match the ones SAP HANA reports for the table (see
+        SAPHanaCDCConnector.get_key_range_hashes); only current, not deleted
+        rows count.
+
+        Args:
+            table_name: SAP HANA table name
+            key_columns: The table's SAP HANA primary key columns
+            prefix_length: Hex digits of the key hash prefix identifying a range
+            parent_prefixes: Only the ranges within these shorter prefixes, all if None
+            value_columns: Non-key columns whose values the checksums cover (see get_value_columns)
+
+        Returns:
+            Non-empty ranges in prefix order, with the prefix as chunk id
+
+        Raises:
+            ValueError: If the table has no OlapTable
+            RuntimeError: If this moose_lib's OlapTable lacks the internals used
+        """
+        normalized_table_name = self._normalize_table_name(table_name)
+        olap_table = self._get_olap_table(normalized_table_name)
+        if olap_table is None:
+            raise ValueError(f"OlapTable not found for {normalized_table_name}")
+        client, clickhouse_table_name = _olap_table_client(olap_table)
+        query = key_range_hashes_query(
+            clickhouse_table_name,
+            key_columns,
+            prefix_length,
+            narrowed=parent_prefixes is not None,
+            value_columns=value_columns,
+        )
+        result = client.query(
+            query, parameters={"parent_prefixes": list(parent_prefixes or [])}
+        )
+        return [
+            ChunkHash(chunk_id=prefix, row_count=int(rows), checksum=f"{int(sum1):x}-{int(sum2):x}")
+            for prefix, rows, sum1, sum2 in result.result_rows
+        ]
+
+    def delete_key_ranges(self, table_name: str, key_columns: List[str], prefixes: List[str]) -> None:
+        """
+        Delete the rows of some key ranges of a table, before they're loaded again.
+
+        The rows are also deleted from the table's current-state table, if it
+        has one: its materialized view only sees inserts.
+
+        Args:
+            table_name: SAP HANA table name
+            key_columns: The table's SAP HANA primary key columns
+            prefixes: Key hash prefixes of the ranges, all of the same length
+
+        Raises:
+            ValueError: If the table has no OlapTable
+            RuntimeError: If this moose_lib's OlapTable lacks the internals used
+        """
+        if not prefixes:
+            return
+        normalized_table_name = self._normalize_table_name(table_name)
+        olap_table = self._get_olap_table(normalized_table_name)
+        if olap_table is None:
+            raise ValueError(f"OlapTable not found for {normalized_table_name}")
+        client, clickhouse_table_name = _olap_table_client(olap_table)
+        statements = [key_range_delete_statement(clickhouse_table_name, key_columns, len(prefixes[0]))]
+        state_table_name = quote_identifier(current_state_table_name(clickhouse_table_name))
+        if client.command(f"EXISTS TABLE {state_table_name}"):
+            statements.append(key_range_delete_statement(state_table_name, key_columns, len(prefixes[0])))
+        for statement in statements:
+            for start in range(0, len(prefixes), CHUNK_IDS_PER_DELETE):
+                client.command(statement, parameters={"prefixes": prefixes[start:start + CHUNK_IDS_PER_DELETE]})
+        logger.info(f"Deleted the rows of {len(prefixes)} key ranges from {normalized_table_name}")
+
+    def get_value_columns(self, table_name: str, key_columns: List[str]) -> List[ValueColumn]:
+        """
+        Get the non-key columns of a table that key range checksums compare.
+
+        Both SAP HANA and ClickHouse hash their values as the canonical text
+        of the type the table's model stores them as (see
+        app.utils.reconciliation.model_value_columns).
+        """
+        olap_table = self._get_olap_table(self._normalize_table_name(table_name))
+        if olap_table is None:
+            return []
+        model_class = self._get_model_class(olap_table)
+        if not (isinstance(model_class, type) and issubclass(model_class, BaseModel)):
+            return []
+        return model_value_columns(model_class, key_columns)
+
+    def has_columns(self, table_name: str, column_names: List[str]) -> bool:
+        """
+        Whether the table's model has all the given SAP HANA columns.
+
+        A column added in SAP HANA is only loaded once the model has been
+        regenerated with it and the worker has picked the new model up.
+        """
+        olap_table = self._get_olap_table(self._normalize_table_name(table_name))
+        if olap_table is None:
+            return False
+        model_class = self._get_model_class(olap_table)
+        if not (isinstance(model_class, type) and issubclass(model_class, BaseModel)):
+            return False
+        model_columns = {
+            field_info.alias or field_name
+            for field_name, field_info in model_class.model_fields.items()
+        }
+        return set(column_names) <= model_columns
+
+    def _has_cdc_columns(self, normalized_table_name: str, olap_table: OlapTable) -> bool:
+        """Whether the table's model has the CDC version and delete marker columns."""
+        has_cdc_columns = self._cdc_columns_cache.get(normalized_table_name)
+        if has_cdc_columns is None:
+            model_class = self._get_model_class(olap_table)
+            has_cdc_columns = False
+            if isinstance(model_class, type) and issubclass(model_class, BaseModel):
+                column_names = {
+                    field_info.alias or field_name
+                    for field_name, field_info in model_class.model_fields.items()
+                }
+                has_cdc_columns = {CDC_VERSION_COLUMN, CDC_IS_DELETED_COLUMN} <= column_names
+            self._cdc_columns_cache[normalized_table_name] = has_cdc_columns
+        return has_cdc_columns
+
+    def _get_model_class(self, olap_table: OlapTable) -> Any:
+        """Get the model class an OlapTable was parameterized with."""
+        model_type = getattr(olap_table, "model_type", None)
+        if isinstance(model_type, type):
+            return model_type
+        return olap_table.__class__.__orig_bases__[0].__args__[0]
+
+    def _normalize_table_name(self, table_name: str) -> str:
+        """
+        Normalize SAP HANA table name to lowercase for OlapTable lookup.
+
+        SAP HANA uses uppercase table names (e.g., "EKKO")
+        Moose uses lowercase variable names (e.g., "ekko")
+
+        Args:
+            table_name: SAP HANA table name
+
+        Returns:
+            Normalized table name (lowercase, underscores preserved)
+        """
+        return table_name.lower()
+
+    def _get_olap_table(self, normalized_table_name: str) -> OlapTable:
+        """
+        Get OlapTable instance for a given table name.
+
+        Looks the table up in the generated models module, app.ingest.cdc, a
+        registry that imports a table's module on first lookup, so only the
+        models of tables that see changes are built.
+
+        Args:
+            normalized_table_name: Lowercase table name
+
+        Returns:
+            OlapTable instance or None if not found
+        """
+        # Check cache first
+        if normalized_table_name in self._olap_table_cache:
+            return self._olap_table_cache[normalized_table_name]
+
+        try:
+            cdc_module = importlib.import_module(MODELS_MODULE)
+
+            # Get the OlapTable instance from the module
+            if hasattr(cdc_module, normalized_table_name):
+                olap_table = getattr(cdc_module, normalized_table_name)
+                self._olap_table_cache[normalized_table_name] = olap_table
+                logger.debug(f"Found OlapTable for {normalized_table_name}")
+                return olap_table
+            else:
+                logger.error(
+                    f"OlapTable '{normalized_table_name}' not found in cdc module"
+                )
+                return None
+        except Exception as e:
+            logger.error(f"Error getting OlapTable for {normalized_table_name}: {e}")
+            return None
+
+
+class _CallModelConverter:
+    """Converter for model classes that aren't Pydantic models: calls them with the row."""
+
+    def __init__(self, model_class: Any):
+        self.model_class = model_class
+
+    def convert_columns(self, rows: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], bool]]:
+        return [(row, False) for row in rows]
+
+    def convert_row(self, row: Dict[str, Any]) -> Tuple[Any, bool]:
+        return self.model_class(**row), False
+
+    def construct(self, row: Dict[str, Any]) -> Any:
+        return self.model_class(**row)
+
+
+def _row_values(values: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """The row of a change's old or new values, which SAP HANA's FOR JSON wraps in a one-element array."""
+    return values[0] if values else {}
+
+
+def _describe_row(change_id: Optional[str]) -> str:
+    return f"change (event_id={change_id})" if change_id is not None else "row"
+
+
+def _is_row_error(error: BaseException) -> bool:
+    """
+    Whether an insert failed because of the values of its rows.
+
+    ClickHouse errors are told apart by their error code; Moose wraps them in a
+    ValueError. Client-side conversion errors count as row errors, connection
+    errors and anything without a known row error code don't.
+    """
+    if isinstance(error, ValueError) and isinstance(error.__context__, ClickHouseError):
+        error = error.__context__
+    if isinstance(error, OperationalError):
+        return False
+    match = _ERROR_CODE.search(str(error))
+    if match:
+        return int(match.group(1)) in _ROW_ERROR_CODES
+    if isinstance(error, ClickHouseError):
+        return isinstance(error, DataError)
+    return isinstance(error, (TypeError, ValueError, OverflowError))
+
+
+def _cdc_dedup_token(table_name: str, changes: List[ChangeEvent]) -> str:
+    """Deduplication token for the changes of one table: their CHANGE_ID range and count."""
+    change_ids = [int(change.event_id) for change in changes]
+    return f"{table_name}:cdc:{min(change_ids)}-{max(change_ids)}:{len(change_ids)}"
+
+
+def _snapshot_dedup_token(table_name: str, rows: List[Dict[str, Any]], offset: int) -> str:
+    """
+    Deduplication token for a snapshot page: its row range, plus a digest of its
+    first and last rows so a reload of changed source data isn't dropped.
+    """
+    digest = hashlib.sha1(repr((rows[0], rows[-1])).encode()).hexdigest()[:16]
+    return f"{table_name}:snapshot:{offset}-{offset + len(rows)}:{digest}"
+
+
+# OlapTable internals _insert_json_each_row relies on; they aren't part of
+# moose_lib's public API, so each table is checked for them before use
+_OLAP_TABLE_INSERT_INTERNALS = (
+    "_map_to_clickhouse_record",
+    "_to_json_each_row",
+    "_get_memoized_client",
+    "_generate_table_name",
+)
+
+
+# OlapTable internals used to run statements it has no method for
+_OLAP_TABLE_CLIENT_INTERNALS = ("_get_memoized_client", "_generate_table_name")
+
+
+def _missing_internals(olap_table: OlapTable, names: Tuple[str, ...]) -> List[str]:
+    return [name for name in names if not hasattr(olap_table, name)]
+
+
+def _olap_table_client(olap_table: OlapTable) -> Tuple[Any, str]:
+    """
+    The ClickHouse client and table name of an OlapTable.
+
+    Raises:
+        RuntimeError: If this moose_lib version's OlapTable lacks the internals used
+    """
+    missing = _missing_internals(olap_table, _OLAP_TABLE_CLIENT_INTERNALS)
+    if missing:
+        raise RuntimeError(f"Can't query the table directly: this moose_lib's OlapTable has no {missing}")
+    return olap_table._get_memoized_client(), olap_table._generate_table_name()
+
+
+def _insert_json_each_row(olap_table: OlapTable, models: List[Any], settings: Dict[str, Any]) -> bool:
+    """
+    Insert models the way ``OlapTable.insert`` does, with extra ClickHouse settings.
+
+    ``OlapTable.insert`` has no way to pass settings. Moose doesn't validate the
+    models. Inserts are synchronous, as async inserts ignore the token unless
+    the server has async_insert_deduplicate on.
+
+    Returns:
+        True if the models were inserted, False if this moose_lib version's
+        OlapTable lacks the internals used and nothing was inserted
+    """
+    missing = _missing_internals(olap_table, _OLAP_TABLE_INSERT_INTERNALS)
+    if missing:
+        logger.warning(f"Inserting without a deduplication token: this moose_lib's OlapTable has no {missing}")
+        return False
+    records = [olap_table._map_to_clickhouse_record(model.model_dump()) for model in models]
+    olap_table._get_memoized_client().command(
+        f"INSERT INTO {quote_identifier(olap_table._generate_table_name())} FORMAT JSONEachRow",
+        data=olap_table._to_json_each_row(records),
+        settings={
+            "date_time_input_format": "best_effort",
+            "async_insert": 0,
+            "wait_end_of_query": 1,
+            **settings,
+        },
+    )
+    return True
@@ -0,0 +1,174 @@
+"""Columnar ClickHouse loader for the generated OlapTables."""
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from clickhouse_connect.driver.exceptions import DataError, ProgrammingError
+from moose_lib import OlapTable
+from moose_lib.data_models import _to_columns
+
+logger = logging.getLogger(__name__)
+
+# ClickHouse type families each Moose column type may be stored as (sizes and
+# parameters dropped, so Int64 -> Int, Date32 -> Date, DateTime64(3) -> DateTime).
+# Columns of any other type (Json, Array, Map, Nested, enums) aren't loaded
+# column-wise.
+_COMPATIBLE_TYPES = {
+    "String": {"String", "FixedString"},
+    "Boolean": {"Bool"},
+    "Int": {"Int", "UInt"},
+    "Float": {"Float"},
+    "Decimal": {"Decimal"},
+    "Date": {"Date"},
+    "DateTime": {"DateTime"},
+    "UUID": {"UUID"},
+    "IPv4": {"IPv4"},
+    "IPv6": {"IPv6"},
+}
+
+_WRAPPER_TYPE = re.compile(r"^(?:Nullable|LowCardinality)\((.*)\)$")
+
+
+@dataclass
+class ColumnarLayout:
+    """How to turn a list of models into columns for one table."""
+
+    column_names: List[str]
+    field_names: List[str]
+    # clickhouse-connect InsertContext, reused for every insert into the table
+    insert_context: Any
+
+
+class ColumnarLoader:
+    """
+    Inserts model instances into ClickHouse one column at a time.
+
+    ``OlapTable.insert`` dumps every model to a dict, walks the schema for each
+    record and serializes it as a JSON row. This loader instead hands one list
+    per column to clickhouse-connect, which sends them in ClickHouse's Native
+    format.
+
+    The columns and their types come from the generated model (the same
+    columns Moose creates the table with). They are checked once per table
+    against the table in ClickHouse. Tables with columns this loader doesn't
+    handle, or whose ClickHouse schema doesn't match the model, are reported
+    as unsupported so the caller can fall back to ``OlapTable.insert``.
+    """
+
+    def __init__(self):
+        # Table name -> layout, or None if the table can't be loaded column-wise
+        self._layouts: Dict[str, Optional[ColumnarLayout]] = {}
+
+    def insert(
+        self,
+        olap_table: OlapTable,
+        models: List[Any],
+        settings: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Insert models into the OlapTable's ClickHouse table.
+
+        Args:
+            olap_table: The OlapTable instance
+            models: Model instances of the table's model class
+            settings: Extra ClickHouse settings for this insert
+
+        Returns:
+            True if the models were inserted, False if the table isn't supported
+            and nothing was inserted
+
+        Raises:
+            Exception: If the insert itself fails
+        """
+        layout = self._get_layout(olap_table)
+        if layout is None:
+            return False
+
+        if models:
+            columns = [
+                [model.__dict__.get(field_name) for model in models]
+                for field_name in layout.field_names
+            ]
+            context_settings = layout.insert_context.settings
+            layout.insert_context.data = columns
+            if settings:
+                layout.insert_context.settings = {**context_settings, **settings}
+            try:
+                olap_table._get_memoized_client().insert(context=layout.insert_context)
+            finally:
+                layout.insert_context.data = None
+                layout.insert_context.settings = context_settings
+        return True
+
+    def _get_layout(self, olap_table: OlapTable) -> Optional[ColumnarLayout]:
+        """Get the column layout of a table, building and checking it on first use."""
+        table_name = olap_table._generate_table_name()
+        if table_name in self._layouts:
+            return self._layouts[table_name]
+
+        layout = None
+        try:
+            layout = self._build_layout(olap_table, table_name)
+        except (ProgrammingError, DataError) as e:
+            # Raised for columns the table doesn't have; connection errors propagate
+            logger.warning(f"Columnar insert not possible for {table_name}: {e}")
+
+        if layout is None:
+            logger.info(f"Using OlapTable.insert for {table_name}")
+        self._layouts[table_name] = layout
+        return layout
+
+    def _build_layout(self, olap_table: OlapTable, table_name: str) -> Optional[ColumnarLayout]:
+        model_class = olap_table.model_type
+        field_by_column = {
+            field_info.alias or field_name: field_name
+            for field_name, field_info in model_class.model_fields.items()
+        }
+
+        column_names = []
+        model_types = []
+        for column in _to_columns(model_class):
+            if not isinstance(column.data_type, str) or _model_family(column.data_type) not in _COMPATIBLE_TYPES:
+                logger.info(f"{table_name}.{column.name} has type {column.data_type}, not loaded column-wise")
+                return None
+            column_names.append(column.name)
+            model_types.append(column.data_type)
+
+        # Column types are read from ClickHouse once and kept in the context
+        insert_context = olap_table._get_memoized_client().create_insert_context(
+            table=table_name,
+            column_names=column_names,
+            column_oriented=True,
+        )
+
+        for column_name, model_type, column_type in zip(
+            column_names, model_types, insert_context.column_types
+        ):
+            if _table_family(column_type.name) not in _COMPATIBLE_TYPES[_model_family(model_type)]:
+                logger.warning(
+                    f"{table_name}.{column_name} is {column_type.name} in ClickHouse "
+                    f"but {model_type} in the model"
+                )
+                return None
+
+        return ColumnarLayout(
+            column_names=column_names,
+            field_names=[field_by_column[name] for name in column_names],
+            insert_context=insert_context,
+        )
+
+
+def _model_family(model_type: str) -> str:
+    """Moose type name without size or parameters, e.g. Decimal(10, 2) -> Decimal, UInt16 -> Int."""
+    family = model_type.split("(", 1)[0].rstrip("0123456789")
+    return "Int" if family == "UInt" else family
+
+
+def _table_family(type_name: str) -> str:
+    """ClickHouse type name without wrappers, size or parameters, e.g. Nullable(Date32) -> Date."""
+    match = _WRAPPER_TYPE.match(type_name)
+    while match:
+        type_name = match.group(1)
+        match = _WRAPPER_TYPE.match(type_name)
+    return type_name.split("(", 1)[0].rstrip("0123456789")
@@ -0,0 +1,82 @@
+"""Dead-letter file for rows the CDC pipeline can't load."""
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEAD_LETTER_PATH = "dead_letters/sap_hana_cdc.jsonl"
+
+
+@dataclass
+class DeadLetter:
+    """A source row that was dropped, and why."""
+
+    table_name: str
+    # CHANGE_ID of the change the row came from; None for initial load rows
+    change_id: Optional[str]
+    # "conversion" if the row couldn't be turned into a model, "insert" if
+    # ClickHouse rejected it
+    stage: str
+    error: str
+    row: Dict[str, Any]
+
+
+class DeadLetterQueue:
+    """
+    Appends dead letters to a local JSON Lines file.
+
+    Each line holds one DeadLetter plus the time it was written. Values that
+    aren't JSON types (Decimal, datetime, bytes) are written as strings. The
+    file is only appended to; replaying or clearing it is left to the operator.
+    """
+
+    def __init__(self, path: str = DEFAULT_DEAD_LETTER_PATH):
+        """
+        Initialize the queue.
+
+        Args:
+            path: JSON Lines file to append to, created with its directory on first use
+        """
+        self.path = Path(path)
+        # Tables may be inserted from several threads
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, prefix: str = "SAP_HANA_CDC_") -> Optional["DeadLetterQueue"]:
+        """
+        Create a queue from ``{prefix}DEAD_LETTER_PATH``.
+
+        Args:
+            prefix: Environment variable prefix
+
+        Returns:
+            DeadLetterQueue instance, or None if the variable is set to an empty string
+        """
+        path = os.getenv(f"{prefix}DEAD_LETTER_PATH", DEFAULT_DEAD_LETTER_PATH)
+        return cls(path) if path else None
+
+    def add(self, letters: List[DeadLetter]) -> None:
+        """
+        Append dead letters to the file.
+
+        Args:
+            letters: Dead letters to write
+        """
+        if not letters:
+            return
+        failed_at = datetime.now(timezone.utc).isoformat()
+        lines = "".join(
+            json.dumps({**asdict(letter), "failed_at": failed_at}, default=str) + "\n"
+            for letter in letters
+        )
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(lines)
+        logger.warning(f"Wrote {len(letters)} dead letters for {letters[0].table_name} to {self.path}")
@@ -0,0 +1,168 @@
+"""Coalescing buffer in front of BatchChangeInserter."""
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from sap_hana_cdc import BatchChange, ChangeEvent
+
+from .changes_inserter import BatchChangeInserter, InsertResult
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TableBuffer:
+    """Changes of one table waiting to be inserted."""
+
+    changes: List[ChangeEvent] = field(default_factory=list)
+    # Rough size of the buffered row values, see _estimate_size
+    size_bytes: int = 0
+    # Monotonic time the oldest buffered change was added
+    first_added_at: float = 0.0
+
+
+class InsertBuffer:
+    """
+    Accumulates CDC changes per table and inserts them in fewer, larger batches.
+
+    Small CDC batches spread over many tables otherwise become many small
+    ClickHouse inserts, each creating a part to be merged. A table's changes are
+    inserted once it has ``max_rows`` changes, ``max_bytes`` of row data, or its
+    oldest change has waited ``max_latency_seconds``. A threshold of 0 is not
+    applied; with all thresholds at 0 every batch is inserted right away.
+
+    Buffered changes are never checkpointed in SAP HANA. Batches are added with
+    the connector's ``mark_read`` so polling continues after them, and a table's
+    changes are checkpointed with ``update_client_status`` only after they have
+    been inserted. Changes lost with the process are read again from the last
+    checkpoint.
+    """
+
+    def __init__(
+        self,
+        inserter: BatchChangeInserter,
+        max_rows: int = 0,
+        max_bytes: int = 0,
+        max_latency_seconds: float = 0.0,
+    ):
+        """
+        Initialize the buffer.
+
+        Args:
+            inserter: Inserter the buffered changes are handed to
+            max_rows: Insert a table once it has this many changes
+            max_bytes: Insert a table once its changes hold about this many bytes
+            max_latency_seconds: Insert a table once its oldest change is this old
+        """
+        self.inserter = inserter
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.max_latency_seconds = max_latency_seconds
+        self._tables: Dict[str, TableBuffer] = {}
+
+    @classmethod
+    def from_env(
+        cls, inserter: BatchChangeInserter, prefix: str = "SAP_HANA_CDC_"
+    ) -> "InsertBuffer":
+        """
+        Create a buffer from environment variables.
+
+        Reads ``{prefix}BUFFER_MAX_ROWS``, ``{prefix}BUFFER_MAX_BYTES`` and
+        ``{prefix}BUFFER_MAX_LATENCY_SECONDS``.
+
+        Args:
+            inserter: Inserter the buffered changes are handed to
+            prefix: Environment variable prefix
+
+        Returns:
+            InsertBuffer instance
+        """
+        return cls(
+            inserter,
+            max_rows=int(os.getenv(f"{prefix}BUFFER_MAX_ROWS", "0")),
+            max_bytes=int(os.getenv(f"{prefix}BUFFER_MAX_BYTES", "0")),
+            max_latency_seconds=float(os.getenv(f"{prefix}BUFFER_MAX_LATENCY_SECONDS", "0")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether changes are held back at all."""
+        return self.max_rows > 0 or self.max_bytes > 0 or self.max_latency_seconds > 0
+
+    @property
+    def buffered_changes(self) -> int:
+        return sum(len(table.changes) for table in self._tables.values())
+
+    def add(self, batch: BatchChange) -> None:
+        """
+        Buffer the changes of a batch.
+
+        The caller must have passed the batch to the connector's ``mark_read``.
+
+        Args:
+            batch: BatchChange returned by get_changes
+        """
+        now = time.monotonic()
+        for change in batch.changes:
+            table = self._tables.get(change.table_name)
+            if table is None:
+                table = self._tables[change.table_name] = TableBuffer(first_added_at=now)
+            table.changes.append(change)
+            table.size_bytes += _estimate_size(change)
+
+    def due_tables(self, now: Optional[float] = None) -> List[str]:
+        """Names of the buffered tables that reached a threshold."""
+        if not self.enabled:
+            return list(self._tables)
+        now = time.monotonic() if now is None else now
+        return [
+            table_name
+            for table_name, table in self._tables.items()
+            if (self.max_rows > 0 and len(table.changes) >= self.max_rows)
+            or (self.max_bytes > 0 and table.size_bytes >= self.max_bytes)
+            or (
+                self.max_latency_seconds > 0
+                and now - table.first_added_at >= self.max_latency_seconds
+            )
+        ]
+
+    def flush(self, connector: Any, force: bool = False) -> InsertResult:
+        """
+        Insert the tables that are due, then checkpoint them.
+
+        Failed tables are reported to the connector as failed, which rewinds
+        them to their last checkpoint and backs them off; their changes are
+        dropped from the buffer and read again.
+
+        Args:
+            connector: SAPHanaCDCConnector the changes were read with
+            force: Insert every buffered table, due or not
+
+        Returns:
+            InsertResult of the inserted tables
+        """
+        table_names = list(self._tables) if force else self.due_tables()
+        if not table_names:
+            return InsertResult()
+
+        changes = [
+            change
+            for table_name in table_names
+            for change in self._tables.pop(table_name).changes
+        ]
+        logger.info(f"Flushing {len(changes)} buffered changes for {len(table_names)} tables")
+        result = self.inserter.insert(changes)
+        connector.update_client_status(BatchChange(changes=changes), failed_tables=result.failed)
+        return result
+
+
+def _estimate_size(change: ChangeEvent) -> int:
+    """Approximate the bytes of a change's row values (text and binary lengths, 8 for anything else)."""
+    size = 0
+    for values in (change.new_values, change.old_values):
+        for row in values or ():
+            for value in row.values():
+                size += len(value) if isinstance(value, (str, bytes)) else 8
+    return size
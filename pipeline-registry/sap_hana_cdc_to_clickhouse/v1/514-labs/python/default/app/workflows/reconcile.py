@@ -0,0 +1,176 @@
+"""
+SAP HANA Reconciliation Workflow.
+
+Verifies that the replicated tables match SAP HANA without exporting them.
+Both sides compute row counts and checksums per primary key range; ranges
+that differ are split and compared again until they're small enough, and
+only those ranges are reloaded from SAP HANA. It runs a few times a day,
+one table at a time, alongside the cdc and prune_database workflows.
+"""
+
+import logging
+import os
+import sys
+from itertools import groupby
+from pathlib import Path
+from typing import List
+from moose_lib import Task, TaskConfig, Workflow, WorkflowConfig, TaskContext
+from dotenv import load_dotenv
+
+# Add the current directory to Python path to resolve app imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+# Add bundled sap-hana-cdc connector to Python path
+_connector_path = Path(__file__).parent.parent / "sap-hana-cdc" / "src"
+if str(_connector_path) not in sys.path:
+    sys.path.insert(0, str(_connector_path))
+
+from sap_hana_cdc import SAPHanaCDCConnector, SAPHanaCDCConfig, TableStatus
+from app.utils.moose_model_generator import CDC_IS_DELETED_COLUMN, CDC_VERSION_COLUMN
+from app.utils.reconciliation import mismatched_ranges
+from app.workflows.lib.changes_inserter import BatchChangeInserter, CHUNK_IDS_PER_DELETE
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+sap_config = SAPHanaCDCConfig.from_env(prefix="SAP_HANA_")
+
+# Mismatching key ranges of at most this many rows are reloaded instead of split further
+RECONCILE_RANGE_ROWS = int(os.getenv("SAP_HANA_CDC_RECONCILE_RANGE_ROWS", "10000"))
+# While the CDC workflow is further behind than this, ranges differ only
+# because of changes still to be loaded, so the run is skipped
+RECONCILE_MAX_CHANGE_LAG = int(os.getenv("SAP_HANA_CDC_RECONCILE_MAX_CHANGE_LAG", "10000"))
+# Ranges are compared 256 at a time first, then split 16 ways per level
+INITIAL_PREFIX_LENGTH = 2
+# Key range checksums sum the key hash digits after the 16th
+MAX_PREFIX_LENGTH = 16
+# Rows read from SAP HANA per page
+PAGE_SIZE = 100000
+
+
+def get_connector() -> SAPHanaCDCConnector:
+    """Get SAP HANA CDC connector instance."""
+    return SAPHanaCDCConnector.build_from_config(sap_config)
+
+
+def find_mismatched_ranges(
+    connector: SAPHanaCDCConnector, inserter: BatchChangeInserter, table_name: str, key_columns: List[str]
+) -> List[str]:
+    """
+    Narrow down the key ranges in which a table differs between SAP HANA and ClickHouse.
+
+    Args:
+        connector: SAP HANA CDC connector
+        inserter: Inserter of the rows into ClickHouse
+        table_name: SAP HANA table name
+        key_columns: The table's primary key columns
+
+    Returns:
+        Key hash prefixes of the differing ranges, shortest first
+    """
+    differing = []
+    # Checksums cover the other columns' values too, so updates lost in ClickHouse show
+    value_columns = inserter.get_value_columns(table_name, key_columns)
+    prefix_length, parent_prefixes = INITIAL_PREFIX_LENGTH, None
+    while True:
+        mismatched = mismatched_ranges(
+            connector.get_key_range_hashes(table_name, prefix_length, parent_prefixes, value_columns),
+            inserter.get_key_range_hashes(table_name, key_columns, prefix_length, parent_prefixes, value_columns),
+        )
+        differing.extend(prefix for prefix, rows in mismatched.items() if rows <= RECONCILE_RANGE_ROWS)
+        parent_prefixes = [prefix for prefix, rows in mismatched.items() if rows > RECONCILE_RANGE_ROWS]
+        if not parent_prefixes:
+            return differing
+        if prefix_length == MAX_PREFIX_LENGTH:
+            return differing + parent_prefixes
+        prefix_length += 1
+
+
+def resync_ranges(
+    connector: SAPHanaCDCConnector,
+    inserter: BatchChangeInserter,
+    table_name: str,
+    key_columns: List[str],
+    prefixes: List[str],
+) -> None:
+    """
+    Reload some key ranges of a table from SAP HANA.
+
+    The ranges' rows are deleted from ClickHouse first, then read from SAP
+    HANA with the CHANGE_ID current before the read as their version, so
+    changes the CDC workflow loads meanwhile still win over the reloaded rows.
+    """
+    ranges_by_length = [list(group) for _, group in groupby(sorted(prefixes, key=len), key=len)]
+    for same_length in ranges_by_length:
+        inserter.delete_key_ranges(table_name, key_columns, same_length)
+    version = connector.get_max_change_id()
+    for same_length in ranges_by_length:
+        for start in range(0, len(same_length), CHUNK_IDS_PER_DELETE):
+            batch = same_length[start:start + CHUNK_IDS_PER_DELETE]
+            offset = 0
+            while True:
+                rows = connector.get_key_range_rows(table_name, batch, page_size=PAGE_SIZE, offset=offset)
+                if not rows:
+                    break
+                inserter.insert_table_data(table_name, rows, version=version)
+                offset += len(rows)
+
+
+def reconcile_table(connector: SAPHanaCDCConnector, inserter: BatchChangeInserter, table_name: str) -> int:
+    """
+    Reconcile a replicated table with SAP HANA.
+
+    Returns:
+        Number of key ranges reloaded
+    """
+    key_columns = connector.get_primary_key_columns(table_name)
+    if not key_columns:
+        logger.info(f"Skipping {table_name}: no primary key to reconcile by")
+        return 0
+    prefixes = find_mismatched_ranges(connector, inserter, table_name, key_columns)
+    if prefixes:
+        print(f"Reloading {len(prefixes)} key ranges of {table_name} that differ from SAP HANA")
+        resync_ranges(connector, inserter, table_name, key_columns, prefixes)
+    else:
+        logger.info(f"{table_name} matches SAP HANA")
+    return len(prefixes)
+
+
+def reconcile_task(ctx: TaskContext[None]) -> None:
+    connector = get_connector()
+    inserter = BatchChangeInserter.from_env()
+    pending_changes = connector.get_status(sap_config.client_id).get("pending_changes") or 0
+    if pending_changes > RECONCILE_MAX_CHANGE_LAG:
+        print(f"Skipping reconciliation: the CDC workflow is {pending_changes} changes behind")
+        return
+    for table_status in connector.get_client_status():
+        table_name = table_status.table_name
+        # New tables aren't loaded yet; hash-synced objects are compared on every hash_sync run
+        if table_status.status != TableStatus.ACTIVE or connector.is_hash_synced(table_name):
+            continue
+        if not inserter.has_columns(table_name, [CDC_VERSION_COLUMN, CDC_IS_DELETED_COLUMN]):
+            logger.info(f"Skipping {table_name}: its model has no CDC columns to tell its current rows")
+            continue
+        reconcile_table(connector, inserter, table_name)
+
+reconcile_task_instance = Task[None, None](
+    name="reconcile",
+    config=TaskConfig(
+        run=reconcile_task,
+        retries=1,
+        timeout="4h"
+    )
+)
+
+reconcile_workflow = Workflow(
+    name="reconcile",
+    config=WorkflowConfig(
+        starting_task=reconcile_task_instance,
+        retries=1,
+        timeout="6h",
+        schedule=os.getenv("SAP_HANA_CDC_RECONCILE_SCHEDULE", "@every 6h")
+    )
+)
+
+if __name__ == "__main__":
+    reconcile_task(None)
@@ -1,4 +1,5 @@
 import argparse
+import json
 import logging
 import sys
 from pathlib import Path
@@ -9,11 +10,16 @@ _connector_path = Path(__file__).parent / "app" / "sap-hana-cdc" / "src"
 if str(_connector_path) not in sys.path:
     sys.path.insert(0, str(_connector_path))
 
-from app.utils.sap_hana_introspection import introspect_hana_database
-from app.utils.moose_model_generator import generate_moose_models, MooseModelConfig
+from app.utils.sap_hana_introspection import HanaIntrospector, introspect_hana_database
+from app.utils.schema_manifest import SchemaManifest
+from app.utils.schema_evolution import PendingBackfills, added_columns
+from app.utils.moose_model_generator import generate_moose_models, generate_moose_views, MooseModelConfig
+from app.utils.table_layout import load_table_layout_overrides
 from sap_hana_cdc import SAPHanaCDCConfig, SAPHanaCDCConnector
+from sap_hana_cdc.connection_manager import ConnectionPool
 
 MODEL_PATH = "app/ingest/cdc.py"
+VIEWS_PATH = "app/views/cdc.py"
 
 logging.basicConfig(
     level=logging.INFO,
@@ -26,6 +32,13 @@ parser = argparse.ArgumentParser(description="SAP HANA CDC Moose Pipeline Utilit
 # You can add more arguments to 'init' if needed, e.g. output path, schema, etc.
 parser.add_argument("--tables", type=str, default=None, help="Specific tables to introspect (comma separated)")
 parser.add_argument("--tables-from-file", type=str, default=None, help="File containing tables to introspect (default: all)")
+parser.add_argument("--table-layouts", type=str, default=None, help="JSON file overriding the derived partition keys, skipping indexes and projections per table")
+parser.add_argument("--aggregate-views", type=str, default=None, help="JSON file of aggregate views to generate over the current-state views, by table")
+parser.add_argument("--numc-columns", type=str, default=None, help="JSON file of the ABAP NUMC columns of each table, stored by SAP HANA as NVARCHAR")
+parser.add_argument("--regenerate-all", action="store_true", default=False, help="Introspect every table again and drop models of tables not in --tables")
+parser.add_argument("--introspection-workers", type=int, default=1, help="SAP HANA connections to read table metadata on concurrently")
+parser.add_argument("--evolve-schema", action="store_true", default=False, help="Refresh the CDC triggers of tables whose columns changed, regenerate their models and backfill added columns")
+parser.add_argument("--derive-projections", action="store_true", default=False, help="Add a projection with a second sort order to large tables")
 
 # New, clearer flag names
 parser.add_argument("--init-all", action="store_true", default=False, help="Generate models and create database triggers (does both --generate-models and --create-database-triggers)")
@@ -80,22 +93,85 @@ if args.init_all:
     args.generate_models = True
     args.create_database_triggers = True
 
+# Columns added or dropped since the CDC triggers were created
+drifted_columns = {}
+if args.evolve_schema:
+    logger.info("Checking the CDC triggers for column changes...")
+    for drift in connector.detect_trigger_drift(table_names):
+        drifted_columns[drift.table_name] = drift.added_columns
+        # Replaced in place, so changes keep being captured meanwhile
+        connector.refresh_table_triggers(drift.table_name)
+        print(f"✅ Refreshed CDC triggers of {drift.table_name} (added {drift.added_columns}, removed {drift.removed_columns}).")
+    args.generate_models = True
+
 # Generate Moose models
 if args.generate_models:
     logger.info("Generating Moose models from SAP HANA table schemas...")
-    tables_metadata = introspect_hana_database(
+    # Only tables that are new or whose schema changed since the last run are introspected
+    manifest = SchemaManifest.for_models(MODEL_PATH)
+    if args.regenerate_all:
+        manifest.tables = {}
+    fingerprints = HanaIntrospector(connector.connection).get_schema_fingerprints(table_names, config.source_schema)
+    changed_tables = manifest.changed_tables(table_names, fingerprints)
+    logger.info(f"{len(table_names) - len(changed_tables)} tables unchanged, introspecting {len(changed_tables)}")
+    introspected_tables = introspect_hana_database(
         connector.connection,
-        table_names,
+        changed_tables,
         config.source_schema,
-        include_views=True
+        include_views=True,
+        bulk=True,
+        connection_factory=lambda: ConnectionPool(config).get_connection(),
+        max_workers=args.introspection_workers,
     )
-
+    # Rows loaded before a column was added get its values from a backfill
+    # instead of a reload of the table
+    backfills = PendingBackfills.for_models(MODEL_PATH)
+    new_fields = {}
+    for table in introspected_tables:
+        previous = manifest.tables.get(table.table_name)
+        if previous is not None:
+            allowed_columns = config.get_table_filter(table.table_name).columns
+            new_fields[table.table_name] = added_columns(
+                previous.with_columns(allowed_columns), table.with_columns(allowed_columns)
+            )
+    manifest.update(introspected_tables)
+    # Columns newly allowed by a table's column allow-list only show in its triggers
+    for table_name, columns in drifted_columns.items():
+        if table_name in manifest.tables:
+            new_fields.setdefault(table_name, []).extend(
+                manifest.tables[table_name].get_field_by_name(column) for column in columns
+            )
+    for table_name, fields in new_fields.items():
+        if fields:
+            backfills.add(table_name, fields)
+            print(f"Columns {[field.name for field in fields]} of {table_name} will be backfilled by the CDC workflow.")
+    # Tables generated by earlier runs are kept; models only have the columns
+    # the tables' column allow-lists (SAP_HANA_TABLE_FILTERS_FILE) keep
+    tables_metadata = [
+        manifest.tables[name].with_columns(config.get_table_filter(name).columns)
+        for name in sorted(manifest.tables)
+    ]
+
+    # NOT NULL columns get SAP initial value defaults instead of Nullable types
     model_config = MooseModelConfig(
-        force_all_fields_nullable=True
+        derive_projections=args.derive_projections,
+        table_layout_overrides=load_table_layout_overrides(args.table_layouts) if args.table_layouts else None,
+        # Views and these tables get a chunk column for the hash_sync workflow
+        hash_sync_tables=set(config.hash_sync_tables),
     )
+    if args.aggregate_views:
+        with open(args.aggregate_views, "r") as f:
+            model_config.aggregate_views = json.load(f)
+    if args.numc_columns:
+        with open(args.numc_columns, "r") as f:
+            model_config.numc_columns = json.load(f)
 
     generate_moose_models(tables_metadata, MODEL_PATH, model_config)
     print(f"✅ Generated Moose models for {len(tables_metadata)} tables/views in '{MODEL_PATH}'.")
+    generate_moose_views(tables_metadata, VIEWS_PATH, model_config)
+    print(f"✅ Generated current-state views in '{VIEWS_PATH}'.")
+    manifest.save()
+    backfills.save()
 
 # Create or recreate CDC infrastructure
 if args.recreate_cdc_tables:
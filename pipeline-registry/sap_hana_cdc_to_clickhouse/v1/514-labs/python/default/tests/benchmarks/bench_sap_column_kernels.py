@@ -0,0 +1,49 @@
+"""
+Values/sec of the SAP HANA scalar validators against the column kernels.
+
+Run from the pipeline directory:
+
+    python -m tests.benchmarks.bench_sap_column_kernels
+"""
+import random
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+from app.utils import sap_hana_validators as v
+from app.utils.sap_column_kernels import get_column_kernel
+
+
+def main(num_values: int = 100_000) -> None:
+    samples = {
+        "DATE": lambda: random.choice([f"2024-01-{random.randint(1, 28):02d}", "00000000", None]),
+        "TIMESTAMP": lambda: datetime(2024, 1, 1, random.randint(0, 23), random.randint(0, 59)),
+        "DECIMAL": lambda: Decimal(random.randint(0, 10**8)) / 100,
+        "BOOLEAN": lambda: random.choice([True, False, 0, 1, "true", "false"]),
+        "NUMC": lambda: f"{random.randint(0, 10**6):010d}",
+        "VARBINARY": lambda: random.randbytes(16),
+    }
+
+    print(f"{num_values} values per column")
+    for sap_type, sample in samples.items():
+        values = [sample() for _ in range(num_values)]
+        validator = v.get_sap_hana_validator(sap_type)
+        kernel = get_column_kernel(validator)
+
+        v.clear_conversion_caches()
+        start = time.perf_counter()
+        expected = [validator(value) for value in values]
+        scalar_rate = num_values / (time.perf_counter() - start)
+
+        v.clear_conversion_caches()
+        start = time.perf_counter()
+        converted = kernel(values)
+        kernel_rate = num_values / (time.perf_counter() - start)
+
+        assert converted == expected
+        print(f"  {sap_type:<10} scalar: {scalar_rate:12.0f}/sec  kernel: {kernel_rate:12.0f}/sec "
+              f"({kernel_rate / scalar_rate:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
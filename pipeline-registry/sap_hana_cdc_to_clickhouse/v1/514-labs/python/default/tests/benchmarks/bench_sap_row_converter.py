@@ -0,0 +1,56 @@
+"""
+Rows/sec of model_class(**row) against the compiled SAP HANA row converter.
+
+Run from the pipeline directory:
+
+    python -m tests.benchmarks.bench_sap_row_converter
+"""
+import random
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+
+from app.utils import sap_hana_validators as v
+from app.utils.sap_pydantic_model import SapHanaBaseModel
+from app.utils.sap_row_converter import get_row_converter
+
+
+def main(num_columns: int = 200, num_rows: int = 2000) -> None:
+    column_types = ["NVARCHAR", "DECIMAL", "DATE", "TIMESTAMP", "INTEGER", "DOUBLE", "BOOLEAN", "VARBINARY"]
+    samples = {
+        "NVARCHAR": lambda: f"VALUE{random.randint(0, 99999)}",
+        "DECIMAL": lambda: Decimal(random.randint(0, 10**8)) / 100,
+        "DATE": lambda: date(2024, 1, random.randint(1, 28)),
+        "TIMESTAMP": lambda: datetime(2024, 1, 1, random.randint(0, 23), random.randint(0, 59)),
+        "INTEGER": lambda: random.randint(0, 10**6),
+        "DOUBLE": lambda: random.random() * 1000,
+        "BOOLEAN": lambda: random.random() > 0.5,
+        "VARBINARY": lambda: random.randbytes(16),
+    }
+
+    columns = {f"COL{i:03d}": column_types[i % len(column_types)] for i in range(num_columns)}
+    annotations = {name: Optional[v.get_sap_hana_annotated_type(sap_type)] for name, sap_type in columns.items()}
+    model_class = type("Benchmark", (SapHanaBaseModel,), {
+        "__annotations__": annotations,
+        **{name: None for name in columns},
+    })
+    rows = [{name: samples[sap_type]() for name, sap_type in columns.items()} for _ in range(num_rows)]
+
+    start = time.perf_counter()
+    expected = [model_class(**row) for row in rows]
+    pydantic_rate = num_rows / (time.perf_counter() - start)
+
+    converter = get_row_converter(model_class)
+    start = time.perf_counter()
+    converted = [converter(row) for row in rows]
+    converter_rate = num_rows / (time.perf_counter() - start)
+
+    assert [m.model_dump() for m in converted] == [m.model_dump() for m in expected]
+    print(f"{num_columns} columns, {num_rows} rows")
+    print(f"  model_class(**row):  {pydantic_rate:10.0f} rows/sec")
+    print(f"  compiled converter:  {converter_rate:10.0f} rows/sec ({converter_rate / pydantic_rate:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Memory held by a snapshot page before and after interning its repeated strings.
+
+Run from the pipeline directory:
+
+    python -m tests.benchmarks.bench_string_interning
+"""
+import gc
+import random
+import tracemalloc
+
+from app.utils.string_interning import intern_low_cardinality_strings
+
+
+def main(num_rows: int = 100000) -> None:
+    codes = {
+        'MANDT': ['100', '200'],
+        'BUKRS': [f"{i:04d}" for i in range(1000, 1020)],
+        'WAERS': ['EUR', 'USD', 'GBP', 'CHF'],
+        'BSTYP': ['F', 'K', 'L'],
+    }
+    tracemalloc.start()
+    # ''.join gives every cell its own string object, like the driver does
+    rows = [{column: ''.join(random.choice(values)) for column, values in codes.items()}
+            for _ in range(num_rows)]
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    columns = intern_low_cardinality_strings(rows)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(
+        f"Interned {columns} over {num_rows} rows: "
+        f"{before / 2**20:.1f} MiB -> {after / 2**20:.1f} MiB"
+    )
+
+
+if __name__ == "__main__":
+    main()
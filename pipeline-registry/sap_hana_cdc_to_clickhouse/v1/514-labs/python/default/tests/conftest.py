@@ -14,6 +14,11 @@ if str(_connector_path) not in sys.path:
 from sap_hana_cdc import ChangeEvent, BatchChange, TriggerType
 
 
+def pytest_configure(config):
+    """Configure pytest with custom markers."""
+    config.addinivalue_line("markers", "unit: Unit tests (fast, no external dependencies)")
+
+
 @pytest.fixture
 def mock_olap_table():
     """Create a mock OlapTable for testing."""
@@ -35,7 +40,7 @@ def sample_pipeline_change_events() -> List[ChangeEvent]:
             table_name="EKKO",
             full_table_name="SAPHANADB.EKKO",
             old_values=None,
-            new_values={"EBELN": "1000000001", "BUKRS": "1000", "LIFNR": "VENDOR1"},
+            new_values=[{"EBELN": "1000000001", "BUKRS": "1000", "LIFNR": "VENDOR1"}],
         ),
         ChangeEvent(
             event_id="2",
@@ -45,8 +50,8 @@ def sample_pipeline_change_events() -> List[ChangeEvent]:
             schema_name="SAPHANADB",
             table_name="EKKO",
             full_table_name="SAPHANADB.EKKO",
-            old_values={"EBELN": "1000000001", "BUKRS": "1000", "LIFNR": "VENDOR1"},
-            new_values={"EBELN": "1000000001", "BUKRS": "1000", "LIFNR": "VENDOR2"},
+            old_values=[{"EBELN": "1000000001", "BUKRS": "1000", "LIFNR": "VENDOR1"}],
+            new_values=[{"EBELN": "1000000001", "BUKRS": "1000", "LIFNR": "VENDOR2"}],
         ),
     ]
 
@@ -1,17 +1,43 @@
 """Unit tests for BatchChangeInserter."""
+import json
 import pytest
 import sys
+import threading
 from pathlib import Path
 from unittest.mock import Mock, MagicMock, patch
 from datetime import datetime
+from decimal import Decimal
+from typing import Annotated, Optional
+
+from clickhouse_connect.driver.exceptions import DatabaseError, OperationalError
+from moose_lib import Key
+from pydantic import Field
 
 # Add bundled sap-hana-cdc connector to Python path
 _connector_path = Path(__file__).parent.parent.parent / "app" / "sap-hana-cdc" / "src"
 if str(_connector_path) not in sys.path:
     sys.path.insert(0, str(_connector_path))
 
-from app.workflows.lib.changes_inserter import BatchChangeInserter
-from sap_hana_cdc import ChangeEvent, TriggerType
+from app.workflows.lib.changes_inserter import BatchChangeInserter, ValidationPolicy, _is_row_error
+from app.workflows.lib.dead_letters import DeadLetterQueue
+from app.utils.sap_hana_validators import SapDecimal, SapNvarchar
+from app.utils.sap_pydantic_model import SapHanaBaseModel
+from sap_hana_cdc import ChangeEvent, ChunkHash, TriggerType, ValueColumn, ValueKind
+
+
+def _patch_models_module(module):
+    """Stand in for the generated registry the inserter looks OlapTables up in."""
+    return patch.dict(sys.modules, {"app.ingest.cdc": module})
+
+
+class Ekko(SapHanaBaseModel):
+    ebeln: Key[SapNvarchar] = Field(alias="EBELN")
+    netwr: Optional[SapDecimal] = Field(default=None, alias="NETWR")
+
+
+class EkkoWithCdcColumns(Ekko):
+    cdc_version: Annotated[int, "uint64"] = Field(alias="_version", default=0)
+    cdc_is_deleted: Annotated[int, "uint8"] = Field(alias="_is_deleted", default=0)
 
 
 @pytest.mark.unit
@@ -42,8 +68,7 @@ class TestBatchChangeInserter:
         # Should not raise an error
         inserter.insert_table_data("EKKO", [])
 
-    @patch("app.ingest.cdc")
-    def test_insert_table_data_success(self, mock_cdc_module):
+    def test_insert_table_data_success(self):
         """Test successful table data insertion."""
         # Setup mock OlapTable
         mock_table = MagicMock()
@@ -55,8 +80,6 @@ class TestBatchChangeInserter:
         mock_table.__class__.__orig_bases__ = [Mock()]
         mock_table.__class__.__orig_bases__[0].__args__ = [mock_model_class]
 
-        mock_cdc_module.ekko = mock_table
-
         inserter = BatchChangeInserter()
         rows = [
             {"EBELN": "1000000001", "BUKRS": "1000"},
@@ -75,8 +98,7 @@ class TestBatchChangeInserter:
         # Should not raise an error
         inserter.insert([])
 
-    @patch("app.ingest.cdc")
-    def test_insert_groups_by_table(self, mock_cdc_module):
+    def test_insert_groups_by_table(self):
         """Test that insert groups changes by table."""
         mock_table1 = MagicMock()
         mock_table2 = MagicMock()
@@ -89,7 +111,8 @@ class TestBatchChangeInserter:
         mock_table2.__class__.__orig_bases__ = [Mock()]
         mock_table2.__class__.__orig_bases__[0].__args__ = [mock_model_class2]
 
-        inserter = BatchChangeInserter()
+        # Without tokens the mock tables are inserted through OlapTable.insert
+        inserter = BatchChangeInserter(deduplicate_inserts=False)
 
         changes = [
             ChangeEvent(
@@ -100,7 +123,7 @@ class TestBatchChangeInserter:
                 schema_name="SAPHANADB",
                 table_name="EKKO",
                 full_table_name="SAPHANADB.EKKO",
-                new_values={"EBELN": "1000000001"},
+                new_values=[{"EBELN": "1000000001"}],
             ),
             ChangeEvent(
                 event_id="2",
@@ -110,7 +133,7 @@ class TestBatchChangeInserter:
                 schema_name="SAPHANADB",
                 table_name="EKPO",
                 full_table_name="SAPHANADB.EKPO",
-                new_values={"EBELN": "1000000001", "EBELP": "00010"},
+                new_values=[{"EBELN": "1000000001", "EBELP": "00010"}],
             ),
             ChangeEvent(
                 event_id="3",
@@ -120,7 +143,7 @@ class TestBatchChangeInserter:
                 schema_name="SAPHANADB",
                 table_name="EKKO",
                 full_table_name="SAPHANADB.EKKO",
-                new_values={"EBELN": "1000000002"},
+                new_values=[{"EBELN": "1000000002"}],
             ),
         ]
 
@@ -138,6 +161,79 @@ class TestBatchChangeInserter:
         assert mock_table1.insert.called
         assert mock_table2.insert.called
 
+    def test_insert_reports_per_table_results(self):
+        """Test that a failing table doesn't stop the other tables."""
+        good_table = MagicMock()
+        good_table.__class__.__orig_bases__ = [Mock()]
+        good_table.__class__.__orig_bases__[0].__args__ = [Mock()]
+
+        inserter = BatchChangeInserter()
+
+        changes = [
+            ChangeEvent(
+                event_id=str(i),
+                event_timestamp=datetime.now(),
+                trigger_type=TriggerType.INSERT,
+                transaction_id=f"txn_{i}",
+                schema_name="SAPHANADB",
+                table_name=table_name,
+                full_table_name=f"SAPHANADB.{table_name}",
+                new_values=[{"EBELN": "1000000001"}],
+            )
+            for i, table_name in enumerate(["EKKO", "EKPO"], start=1)
+        ]
+
+        def get_table_mock(table_name):
+            return good_table if table_name == "ekpo" else None
+
+        with patch.object(inserter, "_get_olap_table", side_effect=get_table_mock), \
+                patch.object(inserter, "_insert_with_retry") as insert_with_retry:
+            result = inserter.insert(changes)
+
+        assert result.succeeded == ["EKPO"]
+        assert list(result.failed) == ["EKKO"]
+        assert not result.all_succeeded
+        assert insert_with_retry.call_args[0][0] is good_table
+
+    def test_insert_tables_concurrently(self):
+        """Test tables are inserted concurrently and results keep batch order."""
+        inserter = BatchChangeInserter(max_concurrent_tables=3)
+        changes = [
+            ChangeEvent(
+                event_id=str(i),
+                event_timestamp=datetime.now(),
+                trigger_type=TriggerType.INSERT,
+                transaction_id=f"txn_{i}",
+                schema_name="SAPHANADB",
+                table_name=table_name,
+                full_table_name=f"SAPHANADB.{table_name}",
+                new_values=[{"EBELN": "1000000001"}],
+            )
+            for i, table_name in enumerate(["EKKO", "EKPO", "EKKO", "MARA"], start=1)
+        ]
+        # Every table waits for the others, so this only passes if they run at once
+        barrier = threading.Barrier(3, timeout=5)
+        inserted = {}
+
+        def insert_table_changes(table_name, table_changes):
+            barrier.wait()
+            if table_name == "ekpo":
+                raise RuntimeError("ClickHouse unavailable")
+            inserted[table_name] = [change.event_id for change in table_changes]
+
+        with patch.object(inserter, "_insert_table_changes", side_effect=insert_table_changes):
+            result = inserter.insert(changes)
+
+        assert result.succeeded == ["EKKO", "MARA"]
+        assert list(result.failed) == ["EKPO"]
+        assert inserted == {"ekko": ["1", "3"], "mara": ["4"]}
+
+    def test_from_env_insert_concurrency(self, monkeypatch):
+        """Test reading the insert concurrency from the environment."""
+        monkeypatch.setenv("SAP_HANA_CDC_INSERT_CONCURRENCY", "8")
+
+        assert BatchChangeInserter.from_env().max_concurrent_tables == 8
+
     def test_insert_handles_insert_event(self):
         """Test that INSERT events use new_values."""
         inserter = BatchChangeInserter()
@@ -158,7 +254,7 @@ class TestBatchChangeInserter:
                 schema_name="SAPHANADB",
                 table_name="EKKO",
                 full_table_name="SAPHANADB.EKKO",
-                new_values={"EBELN": "1000000001", "BUKRS": "1000"},
+                new_values=[{"EBELN": "1000000001", "BUKRS": "1000"}],
             )
         ]
 
@@ -188,8 +284,8 @@ class TestBatchChangeInserter:
                 schema_name="SAPHANADB",
                 table_name="EKKO",
                 full_table_name="SAPHANADB.EKKO",
-                old_values={"EBELN": "1000000001", "BUKRS": "1000"},
-                new_values={"EBELN": "1000000001", "BUKRS": "2000"},
+                old_values=[{"EBELN": "1000000001", "BUKRS": "1000"}],
+                new_values=[{"EBELN": "1000000001", "BUKRS": "2000"}],
             )
         ]
 
@@ -219,7 +315,7 @@ class TestBatchChangeInserter:
                 schema_name="SAPHANADB",
                 table_name="EKKO",
                 full_table_name="SAPHANADB.EKKO",
-                old_values={"EBELN": "1000000001", "BUKRS": "1000"},
+                old_values=[{"EBELN": "1000000001", "BUKRS": "1000"}],
             )
         ]
 
@@ -231,10 +327,8 @@ class TestBatchChangeInserter:
 
     def test_get_olap_table_caches_result(self):
         """Test that _get_olap_table caches results."""
-        with patch("app.ingest.cdc") as mock_module:
-            mock_table = Mock()
-            mock_module.ekko = mock_table
-
+        mock_table = Mock()
+        with _patch_models_module(Mock(ekko=mock_table)):
             inserter = BatchChangeInserter()
 
             # First call should access module
@@ -255,7 +349,7 @@ class TestBatchChangeInserter:
         # This ensures hasattr() returns False for any attribute
         mock_module = Mock(spec=[])
 
-        with patch("app.ingest.cdc", mock_module):
+        with _patch_models_module(mock_module):
             inserter = BatchChangeInserter()
             table = inserter._get_olap_table("missing_table")
             assert table is None
@@ -288,3 +382,512 @@ class TestBatchChangeInserter:
 
         # Should have been called 3 times
         assert mock_table.insert.call_count == 3
+
+
+@pytest.mark.unit
+class TestValidationPolicy:
+    """Test validation policies and their counters."""
+
+    def _insert_rows(self, inserter, rows):
+        table = MagicMock(model_type=Ekko)
+        with patch.object(inserter, "_get_olap_table", return_value=table), \
+                patch.object(inserter, "_insert_with_retry") as insert_with_retry:
+            inserter.insert_table_data("EKKO", rows)
+        return insert_with_retry.call_args
+
+    def test_full_counts_rejected_and_coerced(self):
+        """Test FULL validation converts every row and counts the outcomes."""
+        inserter = BatchChangeInserter()
+        rows = [
+            {"EBELN": "1000000001", "NETWR": Decimal("1.50")},
+            {"EBELN": 1000000002, "NETWR": "2.50"},
+            {"NETWR": Decimal("3.50")},  # missing key column
+        ]
+
+        call = self._insert_rows(inserter, rows)
+
+        models = call[0][1]
+        assert [m.ebeln for m in models] == ["1000000001", "1000000002"]
+        assert models[1].netwr == Decimal("2.50")
+        stats = inserter.validation_stats["ekko"]
+        assert (stats.validated, stats.trusted, stats.coerced, stats.rejected) == (2, 0, 1, 1)
+
+    def test_full_counts_column_conversions_as_coerced(self):
+        """Test values changed by the column kernels count their rows as coerced."""
+        inserter = BatchChangeInserter()
+        rows = [
+            {"EBELN": "1000000001", "NETWR": Decimal("12345678901.23")},
+            {"EBELN": "1000000002", "NETWR": Decimal("2.50")},
+        ]
+
+        call = self._insert_rows(inserter, rows)
+
+        assert [m.netwr for m in call[0][1]] == [Decimal("1234567890"), Decimal("2.50")]
+        assert rows[0]["NETWR"] == Decimal("12345678901.23")
+        stats = inserter.validation_stats["ekko"]
+        assert (stats.validated, stats.coerced, stats.rejected) == (2, 1, 0)
+
+    def test_trusted_uses_model_construct(self):
+        """Test TRUSTED builds models from the rows as-is."""
+        inserter = BatchChangeInserter(validation_policy=ValidationPolicy.TRUSTED)
+
+        call = self._insert_rows(inserter, [{"EBELN": 1000000001}])
+
+        assert call[0][1][0].ebeln == 1000000001
+        assert inserter.validation_stats["ekko"].trusted == 1
+
+    def test_sampled_validates_one_in_n(self):
+        """Test SAMPLED converts one row in N and trusts the others."""
+        inserter = BatchChangeInserter(
+            validation_policy=ValidationPolicy.SAMPLED, validation_sample_rate=2
+        )
+        rows = [{"EBELN": f"100000000{i}"} for i in range(5)]
+
+        call = self._insert_rows(inserter, rows)
+
+        assert len(call[0][1]) == 5
+        stats = inserter.validation_stats["ekko"]
+        assert (stats.validated, stats.trusted) == (3, 2)
+        assert inserter.get_validation_policy("EKKO") == ValidationPolicy.SAMPLED
+
+    def test_sampled_falls_back_to_full_on_coercion(self):
+        """Test a coerced sampled row switches the table to FULL for the whole batch."""
+        inserter = BatchChangeInserter(
+            validation_policy=ValidationPolicy.SAMPLED, validation_sample_rate=2
+        )
+        rows = [{"EBELN": "1000000001"}, {"EBELN": 1000000002}, {"EBELN": 1000000003}]
+
+        call = self._insert_rows(inserter, rows)
+
+        assert [m.ebeln for m in call[0][1]] == ["1000000001", "1000000002", "1000000003"]
+        stats = inserter.validation_stats["ekko"]
+        assert (stats.validated, stats.trusted, stats.coerced) == (3, 0, 2)
+        assert inserter.get_validation_policy("EKKO") == ValidationPolicy.FULL
+
+    def test_table_override(self):
+        """Test per-table policies override the default."""
+        inserter = BatchChangeInserter(
+            validation_policy=ValidationPolicy.SAMPLED,
+            table_validation_policies={"EKKO": ValidationPolicy.TRUSTED},
+        )
+
+        assert inserter.get_validation_policy("EKKO") == ValidationPolicy.TRUSTED
+        assert inserter.get_validation_policy("EKPO") == ValidationPolicy.SAMPLED
+
+    def test_from_env(self, monkeypatch):
+        """Test reading the validation settings from the environment."""
+        monkeypatch.setenv("SAP_HANA_CDC_VALIDATION_POLICY", "sampled")
+        monkeypatch.setenv("SAP_HANA_CDC_VALIDATION_SAMPLE_RATE", "10")
+        monkeypatch.setenv("SAP_HANA_CDC_TABLE_VALIDATION_POLICIES", "EKKO=trusted, MARA=FULL")
+
+        inserter = BatchChangeInserter.from_env()
+
+        assert inserter.validation_policy == ValidationPolicy.SAMPLED
+        assert inserter.validation_sample_rate == 10
+        assert inserter.table_validation_policies == {
+            "ekko": ValidationPolicy.TRUSTED,
+            "mara": ValidationPolicy.FULL,
+        }
+
+
+@pytest.mark.unit
+class TestCdcColumns:
+    """Test the CDC version and delete marker columns are filled."""
+
+    def _change(self, event_id, trigger_type, values):
+        return ChangeEvent(
+            event_id=event_id,
+            event_timestamp=datetime.now(),
+            trigger_type=trigger_type,
+            transaction_id=f"txn_{event_id}",
+            schema_name="SAPHANADB",
+            table_name="EKKO",
+            full_table_name="SAPHANADB.EKKO",
+            old_values=[values] if trigger_type == TriggerType.DELETE else None,
+            new_values=None if trigger_type == TriggerType.DELETE else [values],
+        )
+
+    def _insert_changes(self, model_class, changes):
+        inserter = BatchChangeInserter()
+        table = MagicMock(model_type=model_class)
+        with patch.object(inserter, "_get_olap_table", return_value=table), \
+                patch.object(inserter, "_insert_with_retry") as insert_with_retry:
+            result = inserter.insert(changes)
+        assert result.all_succeeded
+        return insert_with_retry.call_args[0][1]
+
+    def test_version_and_delete_marker(self):
+        """Test each row carries its CHANGE_ID, and DELETEs are marked deleted."""
+        models = self._insert_changes(EkkoWithCdcColumns, [
+            self._change("11", TriggerType.INSERT, {"EBELN": "1000000001"}),
+            self._change("12", TriggerType.UPDATE, {"EBELN": "1000000001", "NETWR": "2.50"}),
+            self._change("13", TriggerType.DELETE, {"EBELN": "1000000001", "NETWR": "2.50"}),
+        ])
+
+        assert [(m.cdc_version, m.cdc_is_deleted) for m in models] == [(11, 0), (12, 0), (13, 1)]
+        assert models[2].model_dump()["_is_deleted"] == 1
+
+    def test_snapshot_rows_default_to_version_zero(self):
+        """Test initial load rows get version 0 and are not deleted."""
+        inserter = BatchChangeInserter()
+        table = MagicMock(model_type=EkkoWithCdcColumns)
+        with patch.object(inserter, "_get_olap_table", return_value=table), \
+                patch.object(inserter, "_insert_with_retry") as insert_with_retry:
+            inserter.insert_table_data("EKKO", [{"EBELN": "1000000001"}])
+
+        model = insert_with_retry.call_args[0][1][0]
+        assert (model.cdc_version, model.cdc_is_deleted) == (0, 0)
+
+    def test_backfill_rows_get_the_given_version(self):
+        """Test rows read again while changes are captured carry the version they were read at."""
+        inserter = BatchChangeInserter()
+        table = MagicMock(model_type=EkkoWithCdcColumns)
+        with patch.object(inserter, "_get_olap_table", return_value=table), \
+                patch.object(inserter, "_insert_with_retry") as insert_with_retry:
+            inserter.insert_table_data("EKKO", [{"EBELN": "1000000001"}], version=42)
+
+        model = insert_with_retry.call_args[0][1][0]
+        assert (model.cdc_version, model.cdc_is_deleted) == (42, 0)
+
+    def test_has_columns(self):
+        """Test a table's model is checked for the SAP HANA columns."""
+        inserter = BatchChangeInserter()
+        table = MagicMock(model_type=Ekko)
+        with patch.object(inserter, "_get_olap_table", return_value=table):
+            assert inserter.has_columns("EKKO", ["NETWR"])
+            assert not inserter.has_columns("EKKO", ["NETWR", "ZZREGION"])
+
+    def test_delete_chunks(self):
+        """Test a changed chunk's rows are deleted by chunk id, in batches."""
+        inserter = BatchChangeInserter()
+        table = MagicMock(model_type=Ekko)
+        table._generate_table_name.return_value = "ZV_ORDERS"
+        client = table._get_memoized_client.return_value
+        with patch.object(inserter, "_get_olap_table", return_value=table), \
+                patch("app.workflows.lib.changes_inserter.CHUNK_IDS_PER_DELETE", 2):
+            inserter.delete_chunks("ZV_ORDERS", ["0A", "3F"], include_unchunked=True)
+
+        assert [c.kwargs["parameters"]["chunk_ids"] for c in client.command.call_args_list] == [["0A", "3F"], [""]]
+        assert client.command.call_args[0][0] == (
+            "DELETE FROM ZV_ORDERS WHERE has({chunk_ids:Array(String)}, _chunk)"
+        )
+
+    def test_get_key_range_hashes(self):
+        """Test key range checksums are read from ClickHouse within the parent ranges."""
+        inserter = BatchChangeInserter()
+        table = MagicMock(model_type=EkkoWithCdcColumns)
+        table._generate_table_name.return_value = "EKKO"
+        client = table._get_memoized_client.return_value
+        client.query.return_value.result_rows = [("3F0", 12, 4096, 255)]
+        with patch.object(inserter, "_get_olap_table", return_value=table):
+            ranges = inserter.get_key_range_hashes("EKKO", ["EBELN"], 3, ["3F"])
+
+        assert ranges == [ChunkHash(chunk_id="3F0", row_count=12, checksum="1000-ff")]
+        assert client.query.call_args.kwargs["parameters"] == {"parent_prefixes": ["3F"]}
+
+    def test_get_value_columns(self):
+        """Test the checksums compare the non-key columns of the table's model."""
+        inserter = BatchChangeInserter()
+        table = MagicMock(model_type=EkkoWithCdcColumns)
+
+        with patch.object(inserter, "_get_olap_table", return_value=table):
+            assert inserter.get_value_columns("EKKO", ["EBELN"]) == []
+            assert inserter.get_value_columns("EKKO", []) == [ValueColumn("EBELN", ValueKind.TEXT)]
+
+    def test_models_without_cdc_columns_unchanged(self):
+        """Test tables generated without the CDC columns still load."""
+        models = self._insert_changes(Ekko, [
+            self._change("11", TriggerType.DELETE, {"EBELN": "1000000001"}),
+        ])
+
+        assert models[0].model_dump() == {"EBELN": "1000000001", "NETWR": None}
+
+
+@pytest.mark.unit
+class TestDeduplicationTokens:
+    """Test inserts carry deterministic deduplication tokens."""
+
+    def _change(self, event_id):
+        return ChangeEvent(
+            event_id=str(event_id),
+            event_timestamp=datetime.now(),
+            trigger_type=TriggerType.INSERT,
+            transaction_id=f"txn_{event_id}",
+            schema_name="SAPHANADB",
+            table_name="EKKO",
+            full_table_name="SAPHANADB.EKKO",
+            new_values=[{"EBELN": f"10000000{event_id:02d}"}],
+        )
+
+    def _dedup_token(self, inserter, insert):
+        table = MagicMock(model_type=Ekko)
+        with patch.object(inserter, "_get_olap_table", return_value=table), \
+                patch.object(inserter, "_insert_with_retry") as insert_with_retry:
+            insert(inserter)
+        return insert_with_retry.call_args[1]["dedup_token"]
+
+    def test_cdc_token_from_change_id_range(self):
+        """Test the token of a CDC insert is its CHANGE_ID range and count."""
+        changes = [self._change(12), self._change(11), self._change(15)]
+
+        token = self._dedup_token(BatchChangeInserter(deduplicate_inserts=True), lambda i: i.insert(changes))
+
+        assert token == "ekko:cdc:11-15:3"
+
+    def test_snapshot_token_is_deterministic(self):
+        """Test the same snapshot page gets the same token, and its offset range."""
+        rows = [{"EBELN": "1000000001"}, {"EBELN": "1000000002"}]
+        tokens = [
+            self._dedup_token(
+                BatchChangeInserter(deduplicate_inserts=True),
+                lambda i: i.insert_table_data("EKKO", rows, offset=100),
+            )
+            for _ in range(2)
+        ]
+
+        assert tokens[0] == tokens[1]
+        assert tokens[0].startswith("ekko:snapshot:100-102:")
+
+    def test_snapshot_without_offset_has_no_token(self):
+        """Test pages without an offset are inserted without a token."""
+        token = self._dedup_token(
+            BatchChangeInserter(deduplicate_inserts=True),
+            lambda i: i.insert_table_data("EKKO", [{"EBELN": "1000000001"}]),
+        )
+
+        assert token is None
+
+    def test_disabled(self):
+        """Test no token is passed with deduplicate_inserts off."""
+        token = self._dedup_token(
+            BatchChangeInserter(deduplicate_inserts=False), lambda i: i.insert([self._change(1)])
+        )
+
+        assert token is None
+
+    def test_token_sent_as_insert_setting(self):
+        """Test a token is sent with a synchronous insert instead of OlapTable.insert."""
+        table = MagicMock()
+        table._generate_table_name.return_value = "EKKO"
+        table._map_to_clickhouse_record.side_effect = lambda record: record
+        table._to_json_each_row.return_value = b'{"EBELN":"1000000001","NETWR":null}\n'
+        client = table._get_memoized_client.return_value
+
+        BatchChangeInserter(deduplicate_inserts=True)._insert_with_retry(
+            table, [Ekko(EBELN="1000000001")], dedup_token="EKKO:cdc:1-1:1"
+        )
+
+        table.insert.assert_not_called()
+        table._map_to_clickhouse_record.assert_called_once_with({"EBELN": "1000000001", "NETWR": None})
+        query = client.command.call_args[0][0]
+        settings = client.command.call_args[1]["settings"]
+        assert query == "INSERT INTO `EKKO` FORMAT JSONEachRow"
+        assert settings["insert_deduplication_token"] == "EKKO:cdc:1-1:1"
+        assert settings["async_insert"] == 0
+
+    def test_full_validation_inserts_carry_the_token(self):
+        """Test tables under FULL validation, the default, are inserted with a token too."""
+        inserter = BatchChangeInserter()
+        table = MagicMock(model_type=Ekko)
+        table._generate_table_name.return_value = "EKKO"
+        table._map_to_clickhouse_record.side_effect = lambda record: record
+        client = table._get_memoized_client.return_value
+
+        with patch.object(inserter, "_get_olap_table", return_value=table):
+            assert inserter.insert([self._change(1)]).all_succeeded
+
+        table.insert.assert_not_called()
+        assert client.command.call_args[1]["settings"]["insert_deduplication_token"] == "ekko:cdc:1-1:1"
+
+    def test_statements_need_olap_table_internals(self):
+        """Test statements OlapTable has no method for fail clearly without its internals."""
+        inserter = BatchChangeInserter()
+        table = MagicMock(spec=["insert"])
+
+        with patch.object(inserter, "_get_olap_table", return_value=table):
+            with pytest.raises(RuntimeError, match="_get_memoized_client"):
+                inserter.delete_chunks("EKKO", ["1"])
+            with pytest.raises(RuntimeError, match="_get_memoized_client"):
+                inserter.get_key_range_hashes("EKKO", ["EBELN"], 2)
+            with pytest.raises(RuntimeError, match="_get_memoized_client"):
+                inserter.delete_key_ranges("EKKO", ["EBELN"], ["0a"])
+
+    def test_key_range_deletes_reach_the_current_state_table(self):
+        """Test rows deleted before a reload also leave the materialized current state."""
+        inserter = BatchChangeInserter()
+        table = MagicMock()
+        table._generate_table_name.return_value = "EKKO"
+        client = table._get_memoized_client.return_value
+        client.command.return_value = 1
+
+        with patch.object(inserter, "_get_olap_table", return_value=table):
+            inserter.delete_key_ranges("EKKO", ["EBELN"], ["0a"])
+
+        statements = [call[0][0] for call in client.command.call_args_list]
+        assert statements[0] == "EXISTS TABLE `EKKO_current_state`"
+        assert statements[1].startswith("DELETE FROM EKKO WHERE")
+        assert statements[2].startswith("DELETE FROM `EKKO_current_state` WHERE")
+
+    def test_falls_back_without_olap_table_internals(self):
+        """Test an OlapTable without the internals the token insert uses is inserted normally."""
+        table = MagicMock(spec=["insert"])
+
+        BatchChangeInserter(deduplicate_inserts=True)._insert_with_retry(
+            table, [Ekko(EBELN="1000000001")], dedup_token="EKKO:cdc:1-1:1"
+        )
+
+        table.insert.assert_called_once()
+
+    def test_from_env(self, monkeypatch):
+        """Test deduplication is on by default and can be turned off."""
+        assert BatchChangeInserter.from_env().deduplicate_inserts
+
+        monkeypatch.setenv("SAP_HANA_CDC_DEDUPLICATE_INSERTS", "false")
+        assert not BatchChangeInserter.from_env().deduplicate_inserts
+
+
+@pytest.mark.unit
+class TestDeadLetters:
+    """Test rejected rows are isolated and dead-lettered."""
+
+    def _change(self, event_id, ebeln):
+        return ChangeEvent(
+            event_id=str(event_id),
+            event_timestamp=datetime.now(),
+            trigger_type=TriggerType.INSERT,
+            transaction_id=f"txn_{event_id}",
+            schema_name="SAPHANADB",
+            table_name="EKKO",
+            full_table_name="SAPHANADB.EKKO",
+            new_values=[{"EBELN": ebeln}],
+        )
+
+    def _inserter(self, tmp_path, **kwargs):
+        return BatchChangeInserter(
+            deduplicate_inserts=False,
+            dead_letters=DeadLetterQueue(str(tmp_path / "dead_letters.jsonl")),
+            **kwargs,
+        )
+
+    def _dead_letters(self, tmp_path):
+        with open(tmp_path / "dead_letters.jsonl") as f:
+            return [json.loads(line) for line in f]
+
+    def _table_rejecting(self, bad_values, inserted):
+        def insert(models, options=None):
+            if any(m.ebeln in bad_values for m in models):
+                raise DatabaseError("Code: 27. DB::Exception: Cannot parse input")
+            inserted.extend(m.ebeln for m in models)
+        table = MagicMock(model_type=Ekko)
+        table.insert.side_effect = insert
+        return table
+
+    def test_rejected_rows_are_isolated(self, tmp_path):
+        """Test a rejected insert is split until the bad rows are alone, and the rest load."""
+        inserter = self._inserter(tmp_path)
+        inserted = []
+        table = self._table_rejecting({"BAD1", "BAD2"}, inserted)
+        changes = [
+            self._change(i, "BAD1" if i == 3 else "BAD2" if i == 6 else f"10000000{i:02d}")
+            for i in range(1, 9)
+        ]
+
+        with patch.object(inserter, "_get_olap_table", return_value=table):
+            result = inserter.insert(changes)
+
+        assert result.all_succeeded
+        assert sorted(inserted) == [f"10000000{i:02d}" for i in (1, 2, 4, 5, 7, 8)]
+        letters = self._dead_letters(tmp_path)
+        assert [(d["change_id"], d["stage"], d["row"]) for d in letters] == [
+            ("3", "insert", {"EBELN": "BAD1"}),
+            ("6", "insert", {"EBELN": "BAD2"}),
+        ]
+        assert inserter.validation_stats["ekko"].dead_lettered == 2
+
+    def test_too_many_rejected_rows_fail_the_table(self, tmp_path):
+        """Test the table fails as a whole once more than max_dead_letter_rows are rejected."""
+        inserter = self._inserter(tmp_path, max_dead_letter_rows=1)
+        table = self._table_rejecting({"BAD1", "BAD2"}, [])
+        changes = [self._change(1, "BAD1"), self._change(2, "BAD2")]
+
+        with patch.object(inserter, "_get_olap_table", return_value=table):
+            result = inserter.insert(changes)
+
+        assert list(result.failed) == ["EKKO"]
+        assert not (tmp_path / "dead_letters.jsonl").exists()
+
+    def test_parts_inserted_before_too_many_rejections_are_not_replayed(self, tmp_path):
+        """Test replaying a table that failed mid-isolation skips the rows already inserted."""
+        inserter = self._inserter(tmp_path, max_dead_letter_rows=1)
+        inserted = []
+        table = self._table_rejecting({"BAD1", "BAD2"}, inserted)
+        changes = [
+            self._change(1, "BAD1"),
+            self._change(2, "1000000002"),
+            self._change(3, "BAD2"),
+            self._change(4, "1000000004"),
+        ]
+
+        with patch.object(inserter, "_get_olap_table", return_value=table):
+            assert list(inserter.insert(changes).failed) == ["EKKO"]
+            assert inserted == ["1000000002"]
+
+            # The rejected values were fixed on the ClickHouse side; the batch is replayed
+            table.insert.side_effect = lambda models, options=None: inserted.extend(m.ebeln for m in models)
+            assert inserter.insert(changes).all_succeeded
+            inserter.insert([self._change(2, "1000000002")])
+
+        assert inserted == ["1000000002", "BAD1", "BAD2", "1000000004", "1000000002"]
+
+    def test_connection_errors_are_not_split(self, tmp_path):
+        """Test an insert failing for other reasons fails the table without splitting it."""
+        inserter = self._inserter(tmp_path)
+        table = MagicMock(model_type=Ekko)
+        with patch.object(inserter, "_get_olap_table", return_value=table), \
+                patch.object(
+                    inserter, "_insert_with_retry", side_effect=OperationalError("connection refused")
+                ) as insert_with_retry:
+            result = inserter.insert([self._change(1, "1000000001"), self._change(2, "1000000002")])
+
+        assert list(result.failed) == ["EKKO"]
+        insert_with_retry.assert_called_once()
+
+    def test_conversion_failures_are_dead_lettered(self, tmp_path):
+        """Test rows that can't be converted are written with their CHANGE_ID."""
+        inserter = self._inserter(tmp_path)
+        table = MagicMock(model_type=Ekko)
+        change = self._change(7, "1000000007")
+        change.new_values = [{"NETWR": "1.00"}]  # missing key column
+
+        with patch.object(inserter, "_get_olap_table", return_value=table):
+            inserter.insert([change, self._change(8, "1000000008")])
+
+        [letter] = self._dead_letters(tmp_path)
+        assert (letter["table_name"], letter["change_id"], letter["stage"]) == ("ekko", "7", "conversion")
+        stats = inserter.validation_stats["ekko"]
+        assert (stats.rejected, stats.dead_lettered) == (1, 1)
+
+    @pytest.mark.parametrize("error, is_row_error", [
+        (DatabaseError("Code: 53. DB::Exception: Type mismatch"), True),
+        (DatabaseError("Code: 241. DB::Exception: Memory limit exceeded"), False),
+        (OperationalError("connection refused"), False),
+        (TypeError("unsupported operand"), True),
+        (Exception("Failure"), False),
+    ])
+    def test_is_row_error(self, error, is_row_error):
+        """Test which insert errors are blamed on the rows."""
+        assert _is_row_error(error) is is_row_error
+
+    def test_is_row_error_unwraps_moose_errors(self):
+        """Test the ClickHouse error Moose wraps in a ValueError decides."""
+        for cause, is_row_error in [
+            (DatabaseError("Code: 27. DB::Exception: Cannot parse input"), True),
+            (OperationalError("connection refused"), False),
+        ]:
+            try:
+                try:
+                    raise cause
+                except DatabaseError as e:
+                    raise ValueError(f"Insert failed: {e}")
+            except ValueError as wrapped:
+                assert _is_row_error(wrapped) is is_row_error
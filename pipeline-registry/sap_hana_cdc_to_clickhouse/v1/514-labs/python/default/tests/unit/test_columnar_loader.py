@@ -0,0 +1,125 @@
+"""Unit tests for the columnar ClickHouse loader."""
+import pytest
+from decimal import Decimal
+from typing import Any, Dict, Optional
+from unittest.mock import MagicMock
+
+from moose_lib import Key
+from pydantic import Field
+
+from app.utils.sap_hana_validators import SapDecimal, SapNvarchar
+from app.utils.sap_pydantic_model import SapHanaBaseModel
+from app.workflows.lib.changes_inserter import BatchChangeInserter
+from app.workflows.lib.columnar_loader import ColumnarLoader
+
+
+class Ekko(SapHanaBaseModel):
+    ebeln: Key[SapNvarchar] = Field(alias="EBELN")
+    netwr: Optional[SapDecimal] = Field(default=None, alias="NETWR")
+
+
+class EkkoWithJson(SapHanaBaseModel):
+    ebeln: Key[SapNvarchar] = Field(alias="EBELN")
+    extra: Optional[Dict[str, Any]] = Field(default=None, alias="EXTRA")
+
+
+def _olap_table(model_class, column_types):
+    """Mock OlapTable whose client reports the given ClickHouse column types."""
+    client = MagicMock()
+    context = MagicMock()
+    context.column_types = [MagicMock() for _ in column_types]
+    for column_type, name in zip(context.column_types, column_types):
+        column_type.name = name
+    client.create_insert_context.return_value = context
+    olap_table = MagicMock(model_type=model_class)
+    olap_table._generate_table_name.return_value = "ekko"
+    olap_table._get_memoized_client.return_value = client
+    return olap_table, client, context
+
+
+@pytest.mark.unit
+class TestColumnarLoader:
+    """Test ColumnarLoader builds columns and falls back when it can't."""
+
+    def test_insert_sends_columns(self):
+        """Test models are sent as one list per column through the insert context."""
+        olap_table, client, context = _olap_table(
+            Ekko, ["String", "Nullable(Decimal(10, 0))"]
+        )
+        sent = []
+        client.insert.side_effect = lambda context: sent.append(context.data)
+        models = [Ekko(EBELN="4500000001", NETWR=Decimal("12")), Ekko(EBELN="4500000002")]
+
+        assert ColumnarLoader().insert(olap_table, models) is True
+
+        client.create_insert_context.assert_called_once_with(
+            table="ekko", column_names=["EBELN", "NETWR"], column_oriented=True
+        )
+        assert sent == [[["4500000001", "4500000002"], [Decimal("12"), None]]]
+        assert context.data is None
+
+    def test_layout_is_built_once_per_table(self):
+        """Test the ClickHouse column types are read on the first insert only."""
+        olap_table, client, _ = _olap_table(Ekko, ["String", "Decimal(10, 0)"])
+        loader = ColumnarLoader()
+
+        loader.insert(olap_table, [Ekko(EBELN="1")])
+        loader.insert(olap_table, [Ekko(EBELN="2")])
+
+        client.create_insert_context.assert_called_once()
+        assert client.insert.call_count == 2
+
+    def test_insert_settings_apply_to_one_insert(self):
+        """Test extra settings are sent with the insert and then removed from the context."""
+        olap_table, client, context = _olap_table(Ekko, ["String", "Decimal(10, 0)"])
+        context.settings = {"async_insert": 0}
+        sent = []
+        client.insert.side_effect = lambda context: sent.append(dict(context.settings))
+
+        ColumnarLoader().insert(
+            olap_table, [Ekko(EBELN="1")], settings={"insert_deduplication_token": "t"}
+        )
+
+        assert sent == [{"async_insert": 0, "insert_deduplication_token": "t"}]
+        assert context.settings == {"async_insert": 0}
+
+    @pytest.mark.parametrize("column_types", [
+        ["String", "Float64"],
+        ["Date", "Decimal(10, 0)"],
+    ])
+    def test_type_mismatch_falls_back(self, column_types):
+        """Test a table whose ClickHouse types differ from the model isn't loaded."""
+        olap_table, client, _ = _olap_table(Ekko, column_types)
+
+        assert ColumnarLoader().insert(olap_table, [Ekko(EBELN="1")]) is False
+        client.insert.assert_not_called()
+
+    def test_unsupported_model_type_falls_back(self):
+        """Test a model with a Json column is left to OlapTable.insert."""
+        olap_table, client, _ = _olap_table(EkkoWithJson, ["String", "JSON"])
+
+        assert ColumnarLoader().insert(olap_table, [EkkoWithJson(EBELN="1")]) is False
+        client.create_insert_context.assert_not_called()
+        client.insert.assert_not_called()
+
+
+@pytest.mark.unit
+class TestColumnarInsertOption:
+    """Test BatchChangeInserter uses the columnar loader when enabled."""
+
+    def test_falls_back_to_olap_table_insert(self):
+        olap_table, _, _ = _olap_table(Ekko, ["String", "Float64"])
+        inserter = BatchChangeInserter(columnar_insert=True)
+
+        inserter._insert_with_retry(olap_table, [Ekko(EBELN="1")])
+
+        olap_table.insert.assert_called_once()
+
+    def test_columnar_insert_skips_olap_table_insert(self):
+        olap_table, client, _ = _olap_table(Ekko, ["String", "Decimal(10, 0)"])
+        inserter = BatchChangeInserter(columnar_insert=True)
+
+        inserter._insert_with_retry(olap_table, [Ekko(EBELN="1")])
+
+        client.insert.assert_called_once()
+        olap_table.insert.assert_not_called()
@@ -0,0 +1,124 @@
+"""Unit tests for InsertBuffer."""
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from sap_hana_cdc import BatchChange, ChangeEvent, TriggerType
+
+from app.workflows.lib.changes_inserter import InsertResult
+from app.workflows.lib.insert_buffer import InsertBuffer
+
+
+def _change(event_id, table_name="EKKO"):
+    return ChangeEvent(
+        event_id=str(event_id),
+        event_timestamp=datetime(2024, 1, 1, 12, 0, 0),
+        trigger_type=TriggerType.INSERT,
+        transaction_id=f"txn_{event_id}",
+        schema_name="SAPHANADB",
+        table_name=table_name,
+        full_table_name=f"SAPHANADB.{table_name}",
+        new_values=[{"EBELN": f"45000000{event_id:02d}"}],
+    )
+
+
+def _inserter(failed=None):
+    inserter = MagicMock()
+    inserter.insert.side_effect = lambda changes: InsertResult(
+        succeeded=sorted({c.table_name for c in changes} - set(failed or {})),
+        failed=dict(failed or {}),
+    )
+    return inserter
+
+
+@pytest.mark.unit
+class TestInsertBuffer:
+    """Test InsertBuffer coalesces changes and checkpoints after inserting."""
+
+    def test_holds_changes_below_thresholds(self):
+        """Test nothing is inserted or checkpointed until a threshold is reached."""
+        inserter = _inserter()
+        connector = MagicMock()
+        buffer = InsertBuffer(inserter, max_rows=3)
+
+        buffer.add(BatchChange(changes=[_change(1), _change(2)]))
+        buffer.flush(connector)
+
+        inserter.insert.assert_not_called()
+        connector.update_client_status.assert_not_called()
+        assert buffer.buffered_changes == 2
+
+    def test_flushes_table_at_row_threshold(self):
+        """Test a table is inserted and then checkpointed once it has max_rows changes."""
+        inserter = _inserter()
+        connector = MagicMock()
+        buffer = InsertBuffer(inserter, max_rows=3)
+
+        buffer.add(BatchChange(changes=[_change(1), _change(2), _change(3, "MARA")]))
+        buffer.add(BatchChange(changes=[_change(4)]))
+        result = buffer.flush(connector)
+
+        flushed = inserter.insert.call_args[0][0]
+        assert [c.event_id for c in flushed] == ["1", "2", "4"]
+        checkpointed = connector.update_client_status.call_args[0][0]
+        assert checkpointed.changes == flushed
+        assert result.succeeded == ["EKKO"]
+        # MARA stays buffered
+        assert buffer.due_tables() == []
+        assert buffer.buffered_changes == 1
+
+    def test_flushes_table_at_byte_threshold(self):
+        """Test a table is due once its row values reach max_bytes."""
+        buffer = InsertBuffer(_inserter(), max_bytes=20)
+
+        buffer.add(BatchChange(changes=[_change(1)]))
+        assert buffer.due_tables() == []
+
+        buffer.add(BatchChange(changes=[_change(2)]))
+        assert buffer.due_tables() == ["EKKO"]
+
+    def test_flushes_table_at_latency_threshold(self):
+        """Test a table is due once its oldest change has waited max_latency_seconds."""
+        buffer = InsertBuffer(_inserter(), max_latency_seconds=5)
+
+        with patch("app.workflows.lib.insert_buffer.time.monotonic", return_value=100.0):
+            buffer.add(BatchChange(changes=[_change(1)]))
+
+        assert buffer.due_tables(now=104.0) == []
+        assert buffer.due_tables(now=105.0) == ["EKKO"]
+
+    def test_failed_tables_reported_to_connector(self):
+        """Test a failed table is passed as failed and dropped from the buffer."""
+        error = RuntimeError("insert failed")
+        connector = MagicMock()
+        buffer = InsertBuffer(_inserter(failed={"EKKO": error}), max_rows=1)
+
+        buffer.add(BatchChange(changes=[_change(1)]))
+        buffer.flush(connector)
+
+        assert connector.update_client_status.call_args[1]["failed_tables"] == {"EKKO": error}
+        assert buffer.buffered_changes == 0
+
+    def test_force_flushes_everything(self):
+        """Test force inserts tables below their thresholds."""
+        inserter = _inserter()
+        buffer = InsertBuffer(inserter, max_rows=100)
+
+        buffer.add(BatchChange(changes=[_change(1), _change(2, "MARA")]))
+        buffer.flush(MagicMock(), force=True)
+
+        assert len(inserter.insert.call_args[0][0]) == 2
+        assert buffer.buffered_changes == 0
+
+    def test_from_env(self, monkeypatch):
+        """Test thresholds are read from the environment and default to off."""
+        assert not InsertBuffer.from_env(_inserter()).enabled
+
+        monkeypatch.setenv("SAP_HANA_CDC_BUFFER_MAX_ROWS", "5000")
+        monkeypatch.setenv("SAP_HANA_CDC_BUFFER_MAX_LATENCY_SECONDS", "30")
+        buffer = InsertBuffer.from_env(_inserter())
+
+        assert buffer.enabled
+        assert buffer.max_rows == 5000
+        assert buffer.max_bytes == 0
+        assert buffer.max_latency_seconds == 30.0
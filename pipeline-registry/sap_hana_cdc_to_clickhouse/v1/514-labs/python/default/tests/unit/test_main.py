@@ -0,0 +1,48 @@
+"""Unit tests for the Moose entry point, app.main."""
+import importlib
+import sys
+import types
+
+import pytest
+
+import app.ingest
+from app.utils.moose_model_generator import MooseModelConfig, MooseModelGenerator
+from app.utils.sap_hana_introspection import FieldMetadata, TableMetadata
+
+
+@pytest.fixture
+def generated_models(tmp_path, monkeypatch):
+    """Generate a models registry and make app.main import it as app.ingest.cdc."""
+    package = tmp_path / "main_models"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    mard = TableMetadata(
+        "MARD", "SAPHANADB", [FieldMetadata("MATNR", "NVARCHAR", True, False, length=40, primary_key_position=1)]
+    )
+    MooseModelGenerator(MooseModelConfig(tables_package="main_models.tables")).generate_models(
+        [mard], str(package / "cdc.py")
+    )
+    registry = importlib.import_module("main_models.cdc")
+    monkeypatch.setitem(sys.modules, "app.ingest.cdc", registry)
+    monkeypatch.setattr(app.ingest, "cdc", registry, raising=False)
+    monkeypatch.delitem(sys.modules, "app.main", raising=False)
+    return registry
+
+
+@pytest.mark.unit
+def test_importing_main_leaves_table_modules_unloaded(generated_models):
+    """Test that workers importing app.main don't build the models of every table."""
+    importlib.import_module("app.main")
+
+    assert "main_models.tables.mard" not in sys.modules
+
+
+@pytest.mark.unit
+def test_collecting_infra_map_loads_all_table_modules(generated_models, monkeypatch):
+    """Test that Moose sees every table when it collects the infrastructure map."""
+    monkeypatch.setitem(sys.modules, "moose_lib.dmv2_serializer", types.ModuleType("moose_lib.dmv2_serializer"))
+
+    importlib.import_module("app.main")
+
+    assert "main_models.tables.mard" in sys.modules
@@ -0,0 +1,275 @@
+"""Unit tests for MooseModelGenerator."""
+import importlib
+import sys
+import pytest
+from decimal import Decimal
+
+from moose_lib.data_models import _to_columns
+
+from app.utils.moose_model_generator import MooseModelConfig, MooseModelGenerator
+from app.utils.sap_hana_introspection import FieldMetadata, TableMetadata
+from app.utils.sap_row_converter import get_row_converter
+
+
+def _ekko():
+    return TableMetadata(
+        table_name="EKKO",
+        schema_name="SAPHANADB",
+        fields=[
+            FieldMetadata("MANDT", "NVARCHAR", True, False, length=3, primary_key_position=1),
+            FieldMetadata("BUKRS", "NVARCHAR", False, False, length=4),
+            FieldMetadata("EBELN", "NVARCHAR", True, False, length=10, primary_key_position=2),
+            FieldMetadata("NETWR", "DECIMAL", False, False, length=15, scale=2),
+            FieldMetadata("BEDAT", "DATE", False, False),
+            FieldMetadata("CHANGED_AT", "TIMESTAMP", False, True),
+            FieldMetadata("/BIC/ZQTY", "DECIMAL", False, True, length=13, scale=3),
+        ],
+    )
+
+
+def _generate(tables, config=None):
+    """Generate the table modules and the registry and execute them in one namespace."""
+    registry_code, module_codes = MooseModelGenerator(config)._generate_modules(tables)
+    namespace = {}
+    for code in module_codes.values():
+        exec(code, namespace)
+    registry = {}
+    exec(registry_code, registry)
+    namespace["TABLE_LAYOUTS"] = registry["TABLE_LAYOUTS"]
+    return namespace
+
+
+def _columns(model_class):
+    return {column.name: column for column in _to_columns(model_class)}
+
+
+@pytest.mark.unit
+class TestPhysicalSchema:
+    """Test the ClickHouse column types derived from SAP HANA metadata."""
+
+    def test_column_types(self):
+        """Test exact decimals, LowCardinality codes and DateTime64 timestamps."""
+        columns = _columns(_generate([_ekko()])["Ekko"])
+
+        assert columns["NETWR"].data_type == "Decimal(15, 2)"
+        assert columns["/BIC/ZQTY"].data_type == "Decimal(13, 3)"
+        assert columns["CHANGED_AT"].data_type == "DateTime(6)"
+        assert ("LowCardinality", True) in columns["MANDT"].annotations
+        assert ("LowCardinality", True) in columns["BUKRS"].annotations
+        assert columns["EBELN"].annotations == []
+
+    def test_not_null_columns_default_to_sap_initial_values(self):
+        """Test NOT NULL codes and amounts are non-nullable, NOT NULL dates stay nullable."""
+        model_class = _generate([_ekko()])["Ekko"]
+        columns = _columns(model_class)
+
+        assert columns["BUKRS"].required and columns["NETWR"].required
+        assert not columns["BEDAT"].required
+        assert not columns["CHANGED_AT"].required
+        model = model_class(MANDT="100", EBELN="4500000001")
+        assert (model.BUKRS, model.NETWR) == ("", 0)
+
+    def test_order_by_primary_key(self):
+        """Test tables are ordered by their primary key, key columns first."""
+        namespace = _generate([_ekko()])
+
+        assert namespace["ekko"].config.order_by_fields == ["MANDT", "EBELN"]
+        assert list(_columns(namespace["Ekko"]))[:2] == ["MANDT", "EBELN"]
+        assert [name for name, c in _columns(namespace["Ekko"]).items() if c.primary_key] == ["MANDT", "EBELN"]
+
+    def test_exact_decimals_are_not_clamped(self):
+        """Test values wider than 10 digits are converted without losing digits."""
+        converter = get_row_converter(_generate([_ekko()])["Ekko"])
+
+        model, _ = converter.convert_row({
+            "MANDT": "100",
+            "BUKRS": "1000",
+            "EBELN": "4500000001",
+            "NETWR": Decimal("1234567890123.45"),
+            "BEDAT": None,
+            "CHANGED_AT": None,
+            "/BIC/ZQTY": "1.5",
+        })
+
+        assert model.NETWR == Decimal("1234567890123.45")
+        assert model.BIC_ZQTY == Decimal("1.5")
+
+    def test_numc_columns_are_zero_padded(self):
+        """Test configured NUMC columns are checked and padded to their length."""
+        config = MooseModelConfig(numc_columns={"EKKO": ["EBELN"]})
+        _, module_codes = MooseModelGenerator(config)._generate_modules([_ekko()])
+        model_class = _generate([_ekko()], config)["Ekko"]
+
+        model, _ = get_row_converter(model_class).convert_row({
+            "MANDT": "100",
+            "BUKRS": "1000",
+            "EBELN": "45",
+            "NETWR": Decimal("1.00"),
+            "BEDAT": None,
+            "CHANGED_AT": None,
+            "/BIC/ZQTY": None,
+        })
+
+        assert "sap_numc(10)" in "".join(module_codes.values())
+        assert model.EBELN == "0000000045"
+        assert _columns(model_class)["EBELN"].data_type == "String"
+
+    def test_options_off(self):
+        """Test the physical schema options can be turned off."""
+        config = MooseModelConfig(
+            exact_decimal_types=False,
+            low_cardinality_max_length=0,
+            timestamp_precision=None,
+            use_sap_initial_values=False,
+            force_all_fields_nullable=True,
+        )
+        columns = _columns(_generate([_ekko()], config)["Ekko"])
+
+        assert columns["NETWR"].data_type == "Decimal(10, 0)"
+        assert columns["CHANGED_AT"].data_type == "DateTime"
+        assert columns["BUKRS"].annotations == []
+        assert not columns["BUKRS"].required
+
+    def test_chunk_column_for_hash_synced_objects(self):
+        """Test views and hash-synced tables get the chunk column, trigger-synced tables don't."""
+        view = TableMetadata("ZV_ORDERS", "SAPHANADB", _ekko().fields, object_type="VIEW")
+        lips = TableMetadata("LIPS", "SAPHANADB", _ekko().fields)
+        namespace = _generate([_ekko(), view, lips], MooseModelConfig(hash_sync_tables={"LIPS"}))
+
+        assert "_chunk" not in _columns(namespace["Ekko"])
+        assert _columns(namespace["ZvOrders"])["_chunk"].data_type == "String"
+        assert _columns(namespace["Lips"])["_chunk"].data_type == "String"
+
+
+@pytest.mark.unit
+class TestTableLayouts:
+    """Test the partition keys and TABLE_LAYOUTS written to the generated module."""
+
+    def test_partition_key_and_layouts(self):
+        ekko = _ekko()
+        ekko.record_count = 50_000_000
+        config = MooseModelConfig(
+            derive_projections=True,
+            table_layout_overrides={"EKKO": {"projections": [{"name": "by_bukrs", "order_by": ["BUKRS"]}]}},
+        )
+        namespace = _generate([ekko], config)
+
+        olap_config = namespace["ekko"].config
+        assert olap_config.partition_by == "toYear(assumeNotNull(BEDAT))"
+        assert olap_config.settings["deduplicate_merge_projection_mode"] == "rebuild"
+        layout = namespace["TABLE_LAYOUTS"]["EKKO"]
+        assert [index.name for index in layout.indexes] == ["idx_bedat"]
+        assert [projection.name for projection in layout.projections] == ["by_bukrs"]
+
+    def test_layouts_off(self):
+        """Test small tables and disabled derivation get no layout."""
+        namespace = _generate([_ekko()], MooseModelConfig(derive_table_layouts=False))
+
+        assert namespace["ekko"].config.partition_by is None
+        assert namespace["TABLE_LAYOUTS"] == {}
+
+
+@pytest.mark.unit
+class TestViews:
+    """Test the generated current-state and aggregate views."""
+
+    def test_current_state_view(self):
+        """Test the view finalizes the materialized latest version of each key and leaves out deletes."""
+        code = MooseModelGenerator()._generate_views_code([_ekko()])
+
+        compile(code, "views.py", "exec")
+        assert "from app.ingest.cdc import ekko" in code
+        assert (
+            "SELECT MANDT, EBELN, argMaxMerge(BUKRS) AS BUKRS, argMaxMerge(NETWR) AS NETWR, "
+            "argMaxMerge(BEDAT) AS BEDAT, argMaxMerge(CHANGED_AT) AS CHANGED_AT, "
+            "argMaxMerge(`/BIC/ZQTY`) AS `/BIC/ZQTY`, maxMerge(_version) AS _version "
+            "FROM EKKO_current_state GROUP BY MANDT, EBELN HAVING argMaxMerge(_is_deleted) = 0"
+        ) in code
+        assert "FINAL" not in code
+
+    def test_current_state_table(self):
+        """Test the current-state table is created, filled by a materialized view and backfilled."""
+        create, materialized_view, backfill = MooseModelGenerator()._current_state_setup(_ekko())
+
+        states = (
+            "SELECT MANDT, EBELN, argMaxState(BUKRS, _version) AS BUKRS, argMaxState(NETWR, _version) AS NETWR, "
+            "argMaxState(BEDAT, _version) AS BEDAT, argMaxState(CHANGED_AT, _version) AS CHANGED_AT, "
+            "argMaxState(`/BIC/ZQTY`, _version) AS `/BIC/ZQTY`, argMaxState(_is_deleted, _version) AS _is_deleted, "
+            "maxState(_version) AS _version FROM EKKO GROUP BY MANDT, EBELN SETTINGS prefer_column_name_to_alias = 1"
+        )
+        assert create == (
+            "CREATE TABLE IF NOT EXISTS EKKO_current_state ENGINE = AggregatingMergeTree "
+            f"ORDER BY (MANDT, EBELN) EMPTY AS {states}"
+        )
+        assert materialized_view == (
+            f"CREATE MATERIALIZED VIEW IF NOT EXISTS EKKO_current_state_mv TO EKKO_current_state AS {states}"
+        )
+        assert backfill == f"INSERT INTO EKKO_current_state {states}"
+
+    def test_hash_synced_objects_keep_final_view(self):
+        """Test objects whose chunks are replaced by deletes aren't materialized."""
+        code = MooseModelGenerator(MooseModelConfig(hash_sync_tables=["EKKO"]))._generate_views_code([_ekko()])
+
+        assert "FROM EKKO FINAL WHERE _is_deleted = 0" in code
+        assert "SqlResource(" not in code
+
+    def test_partitions_deduplicated_separately_when_key_holds_partition_column(self):
+        ekko = _ekko()
+        generator = MooseModelGenerator(MooseModelConfig(
+            table_layout_overrides={"EKKO": {"partition_by": "substring(assumeNotNull(EBELN), 1, 2)"}},
+        ))
+        assert generator._current_state_select(ekko).endswith(
+            " SETTINGS do_not_merge_across_partitions_select_final = 1"
+        )
+
+        generator.config.table_layout_overrides["EKKO"]["partition_by"] = "toYear(assumeNotNull(BEDAT))"
+        assert "SETTINGS" not in generator._current_state_select(ekko)
+
+    def test_aggregate_views_and_tables_without_key(self):
+        """Test aggregate views read the current-state view; tables without a key get no views."""
+        keyless = TableMetadata("ZLOG", "SAPHANADB", [FieldMetadata("MSG", "NVARCHAR", False, True, length=80)])
+        config = MooseModelConfig(aggregate_views={"EKKO": [
+            {"name": "ekko_by_bukrs", "group_by": ["BUKRS"], "measures": {"net_value": "sum(NETWR)", "orders": "count()"}},
+        ]})
+
+        code = MooseModelGenerator(config)._generate_views_code([_ekko(), keyless])
+
+        assert "SELECT BUKRS, sum(NETWR) AS net_value, count() AS orders FROM ekko_current GROUP BY BUKRS" in code
+        assert "zlog" not in code
+
+
+@pytest.mark.unit
+def test_order_by_fields_computed_once_per_table(monkeypatch):
+    """Test wide tables don't recompute their ORDER BY fields for every field."""
+    generator = MooseModelGenerator()
+    calls = []
+    compute = generator._compute_order_by_fields
+    monkeypatch.setattr(generator, "_compute_order_by_fields", lambda table: calls.append(table) or compute(table))
+
+    generator._generate_modules([_ekko()])
+
+    assert len(calls) == 1
+
+
+@pytest.mark.unit
+def test_table_modules_are_imported_lazily(tmp_path, monkeypatch):
+    """Test the registry imports a table's module only when the table is looked up."""
+    package = tmp_path / "lazy_models"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "tables").mkdir()
+    (package / "tables" / "zstale.py").write_text("")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    ekpo = TableMetadata("EKPO", "SAPHANADB", [FieldMetadata("EBELP", "NVARCHAR", True, False, length=5)])
+
+    MooseModelGenerator(MooseModelConfig(tables_package="lazy_models.tables")).generate_models(
+        [_ekko(), ekpo], str(package / "cdc.py")
+    )
+    registry = importlib.import_module("lazy_models.cdc")
+
+    assert sorted(p.name for p in (package / "tables").iterdir()) == ["__init__.py", "ekko.py", "ekpo.py"]
+    assert "lazy_models.tables.ekko" not in sys.modules
+    assert registry.ekko.model_type is registry.Ekko
+    assert "lazy_models.tables.ekko" in sys.modules
+    assert "lazy_models.tables.ekpo" not in sys.modules
+    assert not hasattr(registry, "zstale")
@@ -0,0 +1,118 @@
+"""Unit tests for the ClickHouse side of key range reconciliation."""
+from typing import Annotated, Optional
+
+import pytest
+from moose_lib import Key
+from pydantic import Field
+
+from sap_hana_cdc import ChunkHash, ValueColumn, ValueKind
+
+from app.utils.reconciliation import (
+    canonical_value_expression,
+    key_hash_expression,
+    key_range_delete_statement,
+    key_range_hashes_query,
+    mismatched_ranges,
+    model_value_columns,
+)
+from app.utils.sap_hana_validators import (
+    SapBlob,
+    SapBoolean,
+    SapDate,
+    SapDecimal,
+    SapFixedDecimal,
+    SapInteger,
+    SapNvarchar,
+    SapReal,
+    SapTimestamp,
+    SapVarbinary,
+)
+from app.utils.sap_pydantic_model import SapHanaBaseModel
+
+
+class Ekpo(SapHanaBaseModel):
+    ebeln: Key[SapNvarchar] = Field(alias="EBELN")
+    ebelp: Key[SapInteger] = Field(alias="EBELP")
+    bukrs: Annotated[SapNvarchar, "LowCardinality"] = Field(alias="BUKRS", default="")
+    menge: SapInteger = Field(alias="MENGE", default=0)
+    netwr: Optional[SapFixedDecimal] = Field(alias="NETWR", default=None, max_digits=15, decimal_places=2)
+    brtwr: Optional[SapDecimal] = Field(alias="BRTWR", default=None)
+    aedat: Optional[SapDate] = Field(alias="AEDAT", default=None)
+    changed_at: Optional[SapTimestamp] = Field(alias="CHANGED_AT", default=None)
+    loekz: Optional[SapBoolean] = Field(alias="LOEKZ", default=None)
+    effwr: Optional[SapReal] = Field(alias="EFFWR", default=None)
+    guid: Optional[SapVarbinary] = Field(alias="GUID", default=None)
+    attachment: Optional[SapBlob] = Field(alias="ATTACHMENT", default=None)
+    cdc_version: Annotated[int, "uint64"] = Field(alias="_version", default=0)
+    cdc_is_deleted: Annotated[int, "uint8"] = Field(alias="_is_deleted", default=0)
+
+
+@pytest.mark.unit
+class TestKeyRangeHashes:
+    """Test the key range checksums computed in ClickHouse."""
+
+    def test_key_hash_expression(self):
+        """Test the key text matches SAP HANA's: NULL as char(30), columns joined by char(31)."""
+        assert key_hash_expression(["MANDT", "/BIC/ZKEY"]) == (
+            "hex(SHA256(concat(ifNull(toString(MANDT), char(30)), char(31), "
+            "ifNull(toString(`/BIC/ZKEY`), char(30)), '')))"
+        )
+        assert key_hash_expression([f"K{i}" for i in range(20)]).count("SHA256") == 3
+
+    def test_key_range_hashes_query(self):
+        top = key_range_hashes_query("EKKO", ["MANDT", "EBELN"], 2)
+        narrowed = key_range_hashes_query("EKKO", ["MANDT", "EBELN"], 3, narrowed=True)
+
+        assert "FROM EKKO FINAL WHERE _is_deleted = 0" in top
+        assert "parent_prefixes" not in top
+        assert "substring(_row, 1, 8)" in top and "substring(_row, 9, 8)" in top
+        assert "WHERE has({parent_prefixes:Array(String)}, substring(_key, 1, 2))" in narrowed
+        assert "substring(_key, 1, 3) AS prefix" in narrowed
+
+    def test_key_range_hashes_cover_values(self):
+        """Test row hashes cover the key hash and the value columns' canonical text, as SAP HANA's."""
+        query = key_range_hashes_query(
+            "EKKO", ["EBELN"], 2,
+            value_columns=[ValueColumn("BUKRS", ValueKind.TEXT), ValueColumn("NETWR", ValueKind.DECIMAL, 2)],
+        )
+
+        assert "AS _key, BUKRS, NETWR FROM EKKO FINAL" in query
+        assert (
+            "hex(SHA256(concat(ifNull(_key, char(30)), char(31), ifNull(nullIf(toString(BUKRS), ''), char(30)), "
+            "char(31), ifNull(toDecimalString(nullIf(NETWR, 0), 2), char(30)), ''))) AS _row"
+        ) in query
+        assert "substring(_row, 1, 8)" in query and "substring(_row, 9, 8)" in query
+
+    def test_canonical_value_expression(self):
+        """Test values render as SAP HANA renders them, initial values as NULL."""
+        assert canonical_value_expression(ValueColumn("MENGE", ValueKind.INTEGER)) == "toString(nullIf(MENGE, 0))"
+        assert canonical_value_expression(ValueColumn("AEDAT", ValueKind.DATE)) == "toString(AEDAT)"
+        assert canonical_value_expression(ValueColumn("CHANGED_AT", ValueKind.TIMESTAMP)) == (
+            "formatDateTime(CHANGED_AT, '%Y-%m-%d %H:%i:%S', 'UTC')"
+        )
+        assert canonical_value_expression(ValueColumn("LOEKZ", ValueKind.BOOLEAN)) == "toString(toUInt8(LOEKZ))"
+
+    def test_model_value_columns(self):
+        """Test the kind of each non-key column follows the type the model stores it as."""
+        assert model_value_columns(Ekpo, ["EBELN", "EBELP"]) == [
+            ValueColumn("BUKRS", ValueKind.TEXT),
+            ValueColumn("MENGE", ValueKind.INTEGER),
+            ValueColumn("NETWR", ValueKind.DECIMAL, 2),
+            ValueColumn("AEDAT", ValueKind.DATE),
+            ValueColumn("CHANGED_AT", ValueKind.TIMESTAMP),
+            ValueColumn("LOEKZ", ValueKind.BOOLEAN),
+        ]
+
+    def test_key_range_delete_statement(self):
+        statement = key_range_delete_statement("EKKO", ["EBELN"], 4)
+
+        assert statement.startswith("DELETE FROM EKKO WHERE has({prefixes:Array(String)}, substring(hex(SHA256(")
+        assert statement.endswith(", 1, 4))")
+
+    def test_mismatched_ranges(self):
+        """Test ranges missing on either side or differing are reported with their larger row count."""
+        source = [ChunkHash("0A", 10, "a-b"), ChunkHash("3F", 12, "c-d"), ChunkHash("7E", 5, "e-f")]
+        replica = [ChunkHash("0A", 10, "a-b"), ChunkHash("3F", 11, "c-0"), ChunkHash("C4", 2, "1-2")]
+
+        assert mismatched_ranges(source, replica) == {"3F": 12, "7E": 5, "C4": 2}
+        assert mismatched_ranges(source, source) == {}
@@ -0,0 +1,124 @@
+"""Unit tests for the column-at-a-time SAP type conversion kernels."""
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+
+from moose_lib import Key
+from pydantic import Field
+
+from app.utils import sap_hana_validators as v
+from app.utils.sap_column_kernels import get_column_kernel
+from app.utils.sap_pydantic_model import SapHanaBaseModel
+from app.utils.sap_row_converter import get_row_converter
+
+
+COLUMNS = {
+    "DATE": [None, date(2024, 1, 31), datetime(2024, 1, 31, 8, 0), "2024-01-31",
+             "2024-01-31T08:00:00", "20240131", "00000000"],
+    "TIMESTAMP": [None, datetime(2024, 1, 31, 8, 0), "2024-01-31 08:00:00", "2024-01-31T08:00:00.123"],
+    "SECONDDATE": [None, datetime(2024, 1, 31, 8, 0), "2024-01-31 08:00:00"],
+    "DECIMAL": [None, Decimal("1234.56"), Decimal("-123456789.5"), Decimal("12345678901.23"),
+                Decimal("99999999999"), 42, 1.5, "7.25"],
+    "SMALLDECIMAL": [None, Decimal("1234.56"), Decimal("123456789.12"), 42],
+    "BOOLEAN": [None, True, False, 0, 1, 2.5, "TRUE", "off", "Yes"],
+    "NUMC": [None, "0000012345", " 42 ", 42, ""],
+    "VARBINARY": [None, b"\x00\x01\xff", bytearray(b"\x02"), memoryview(b"\x03"), "text"],
+}
+
+
+class Ekko(SapHanaBaseModel):
+    ebeln: Key[v.sap_numc(10)] = Field(alias="EBELN")
+    aedat: Optional[v.SapDate] = Field(default=None, alias="AEDAT")
+    loekz: Optional[v.SapBoolean] = Field(default=None, alias="LOEKZ")
+    netwr: Optional[v.SapDecimal] = Field(default=None, alias="NETWR")
+    guid: Optional[v.SapVarbinary] = Field(default=None, alias="GUID")
+
+
+@pytest.mark.unit
+class TestSapColumnKernels:
+    """Test kernels return the same results as the scalar validators."""
+
+    @pytest.mark.parametrize("sap_type", sorted(COLUMNS))
+    def test_matches_scalar_validator(self, sap_type):
+        """Test converting a column matches validating each value."""
+        validator = v.get_sap_hana_validator(sap_type)
+        values = COLUMNS[sap_type]
+
+        assert get_column_kernel(validator)(values) == [validator(value) for value in values]
+
+    @pytest.mark.parametrize("validator,value", [
+        (v.validate_sap_date, "2024-02-30"),
+        (v.validate_sap_date, "31.01.2024"),
+        (v.validate_sap_timestamp, "31.01.2024 08:00"),
+        (v.validate_sap_boolean, "maybe"),
+        (v.validate_sap_numc, "12A"),
+    ])
+    def test_raises_like_scalar_validator(self, validator, value):
+        """Test invalid values raise the scalar validator's error."""
+        with pytest.raises(ValueError) as scalar_error:
+            validator(value)
+        with pytest.raises(ValueError) as kernel_error:
+            get_column_kernel(validator)([value])
+
+        assert str(kernel_error.value) == str(scalar_error.value)
+
+    def test_varbinary_is_uppercase_hex(self):
+        """Test binary values convert to the hex SAP HANA shows them as."""
+        assert get_column_kernel(v.validate_sap_varbinary)([b"\x00\xab"]) == ["00AB"]
+
+    def test_numc_of_a_length_pads_like_its_validator(self):
+        """Test the kernel of sap_numc(10) zero-pads values to the column length."""
+        validator = v.sap_numc(10).__metadata__[0].func
+        values = ["42", 7, "0000000001", None]
+
+        assert get_column_kernel(validator)(values) == [validator(value) for value in values]
+        assert get_column_kernel(validator)(values)[:2] == ["0000000042", "0000000007"]
+
+    def test_types_without_a_kernel(self):
+        """Test types the row converter already passes through have no kernel."""
+        assert get_column_kernel(v.validate_sap_nvarchar) is None
+        assert get_column_kernel(None) is None
+
+
+@pytest.mark.unit
+class TestConvertColumns:
+    """Test a page of rows is converted column by column before row by row."""
+
+    def test_page_converts_like_its_rows(self):
+        """Test rows converted through the column kernels match the rows converted one by one."""
+        rows = [
+            {"EBELN": "4500000001", "AEDAT": "2024-01-31", "LOEKZ": True, "NETWR": Decimal("12.50"),
+             "GUID": b"\x00\xab"},
+            {"EBELN": 4500000002, "AEDAT": "00000000", "LOEKZ": "false", "NETWR": Decimal("12345678901.23")},
+            {"EBELN": "45", "AEDAT": date(2024, 2, 1)},
+        ]
+        converter = get_row_converter(Ekko)
+
+        converted = [converter(row) for row, _ in converter.convert_columns(rows)]
+
+        assert converted == [converter(row) for row in rows]
+        assert converted[0].guid == "00AB" and converted[1].aedat is None
+
+    def test_changed_rows_are_copies(self):
+        """Test rows with converted values are copied and reported, the others kept as they are."""
+        unchanged = {"EBELN": "4500000001", "AEDAT": date(2024, 1, 31)}
+        changed = {"EBELN": "4500000002", "AEDAT": "20240131"}
+
+        result = get_row_converter(Ekko).convert_columns([unchanged, changed])
+
+        assert result[0] == (unchanged, False) and result[0][0] is unchanged
+        assert result[1] == ({"EBELN": "4500000002", "AEDAT": date(2024, 1, 31)}, True)
+        assert changed["AEDAT"] == "20240131"
+
+    def test_column_a_kernel_rejects_is_left_for_the_rows(self):
+        """Test an invalid value leaves its column unconverted, so only its row is rejected."""
+        rows = [{"EBELN": "4500000001", "AEDAT": "20240131"}, {"EBELN": "4500000002", "AEDAT": "31.01.2024"}]
+        converter = get_row_converter(Ekko)
+
+        (first, _), (second, _) = converter.convert_columns(rows)
+
+        assert first["AEDAT"] == "20240131"
+        assert converter(first).aedat == date(2024, 1, 31)
+        with pytest.raises(ValueError, match="AEDAT"):
+            converter(second)
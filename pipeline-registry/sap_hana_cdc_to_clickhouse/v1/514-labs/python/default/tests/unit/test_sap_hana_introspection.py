@@ -0,0 +1,109 @@
+"""Unit tests for the bulk SAP HANA introspection."""
+import re
+import threading
+import pytest
+from unittest.mock import MagicMock
+
+from app.utils.sap_hana_introspection import FieldMetadata, HanaIntrospector, TableMetadata
+
+CONSTRAINTS = [("EKKO", "MANDT"), ("EKKO", "EBELN")]
+TABLE_COLUMNS = [
+    ("EKKO", "MANDT", "NVARCHAR", 3, None, "FALSE", None),
+    ("EKKO", "EBELN", "NVARCHAR", 10, None, "FALSE", None),
+    ("EKPO", "EBELP", "NVARCHAR", 5, None, "FALSE", None),
+]
+VIEW_COLUMNS = [("ZV_ORDERS", "EBELN", "NVARCHAR", 10, None, "TRUE", None)]
+M_TABLES = [("EKKO", 12_000_000)]
+PARTITIONED_TABLES = [("EKKO", "RANGE", '"GJAHR"')]
+
+
+class FakeCursor:
+    """Cursor answering the bulk queries from the rows above, filtered by the IN-list."""
+
+    def __init__(self, queries):
+        self.queries = queries
+        self._rows = []
+
+    def execute(self, query, parameters=()):
+        self.queries.append((threading.current_thread().name, query, parameters))
+        source = re.search(r"FROM (\w+\.)?(\w+)", query).group(2)
+        names = set(parameters[1:])
+        rows = {
+            "CONSTRAINTS": CONSTRAINTS,
+            "TABLE_COLUMNS": TABLE_COLUMNS,
+            "VIEW_COLUMNS": VIEW_COLUMNS,
+            "M_TABLES": M_TABLES,
+            "PARTITIONED_TABLES": PARTITIONED_TABLES,
+        }[source]
+        self._rows = [row for row in rows if row[0] in names]
+
+    def fetchall(self):
+        return self._rows
+
+    def close(self):
+        pass
+
+
+def _connection(queries):
+    connection = MagicMock()
+    connection.cursor.side_effect = lambda: FakeCursor(queries)
+    return connection
+
+
+def _introspector(queries):
+    introspector = HanaIntrospector.__new__(HanaIntrospector)
+    introspector.connection = _connection(queries)
+    return introspector
+
+
+@pytest.mark.unit
+class TestBulkIntrospection:
+    """Test metadata read with set-based queries."""
+
+    def test_tables_and_views(self):
+        queries = []
+
+        tables = _introspector(queries).get_bulk_table_metadata(["ZV_ORDERS", "EKKO"], "SAPHANADB")
+
+        assert tables == [
+            TableMetadata(
+                "ZV_ORDERS", "SAPHANADB",
+                [FieldMetadata("EBELN", "NVARCHAR", False, True, length=10)],
+                object_type="VIEW",
+            ),
+            TableMetadata(
+                "EKKO", "SAPHANADB",
+                [
+                    FieldMetadata("MANDT", "NVARCHAR", True, False, length=3, primary_key_position=1),
+                    FieldMetadata("EBELN", "NVARCHAR", True, False, length=10, primary_key_position=2),
+                ],
+                record_count=12_000_000,
+                partition_type="RANGE",
+                partition_columns=["GJAHR"],
+            ),
+        ]
+        # Constraints, table columns, view columns, row counts and partitioning
+        assert len(queries) == 5
+
+    def test_chunks_spread_over_connections(self):
+        queries = []
+        factory_connections = []
+
+        def connection_factory():
+            connection = _connection(queries)
+            factory_connections.append(connection)
+            return connection
+
+        tables = _introspector(queries).get_bulk_table_metadata(
+            ["EKKO", "EKPO", "ZV_ORDERS"], "SAPHANADB",
+            chunk_size=1, connection_factory=connection_factory, max_workers=2,
+        )
+
+        assert [table.table_name for table in tables] == ["EKKO", "EKPO", "ZV_ORDERS"]
+        assert len(factory_connections) == 1
+        factory_connections[0].close.assert_called_once()
+        assert len({thread for thread, _, _ in queries}) == 2
+
+    def test_missing_objects(self):
+        with pytest.raises(ValueError, match="ZMISSING"):
+            _introspector([]).get_bulk_table_metadata(["EKKO", "ZMISSING"], "SAPHANADB")
@@ -0,0 +1,94 @@
+"""Unit tests for the memoized SAP HANA scalar conversions."""
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from app.utils import sap_hana_validators as v
+
+
+@pytest.mark.unit
+class TestValidateSapDate:
+    """Test conversion of SAP HANA dates and ABAP dates stored as text."""
+
+    def setup_method(self):
+        v.clear_conversion_caches()
+
+    @pytest.mark.parametrize("value", ["2024-01-31", "2024-01-31T08:00:00", "20240131"])
+    def test_accepts_iso_and_abap_dates(self, value):
+        """Test ISO dates and ABAP YYYYMMDD text convert to the same date."""
+        assert v.validate_sap_date(value) == date(2024, 1, 31)
+
+    def test_initial_abap_date_is_no_date(self):
+        """Test SAP's initial date '00000000' reads as None."""
+        assert v.validate_sap_date(v.SAP_INITIAL_DATE) is None
+
+    @pytest.mark.parametrize("value", ["20241332", "2024013", "31.01.2024"])
+    def test_rejects_invalid_dates(self, value):
+        """Test impossible or unknown date text is rejected."""
+        with pytest.raises(ValueError, match="Invalid date format"):
+            v.validate_sap_date(value)
+
+
+@pytest.mark.unit
+class TestConversionCaches:
+    """Test memoization of the expensive scalar conversions."""
+
+    def setup_method(self):
+        v.clear_conversion_caches()
+
+    def test_repeated_dates_hit_the_cache(self):
+        """Test repeated date strings are parsed once and counted as hits."""
+        for _ in range(3):
+            assert v.validate_sap_date("2024-01-31") == date(2024, 1, 31)
+            assert v.validate_sap_date("00000000") is None
+
+        stats = v.get_conversion_cache_stats()["DATE"]
+        assert (stats["hits"], stats["misses"], stats["size"]) == (4, 2, 2)
+        assert stats["hit_rate"] == pytest.approx(4 / 6)
+
+    def test_invalid_dates_are_not_cached(self):
+        """Test parse errors are raised every time."""
+        for _ in range(2):
+            with pytest.raises(ValueError, match="Invalid date format"):
+                v.validate_sap_date("31.01.2024")
+
+        assert v.get_conversion_cache_stats()["DATE"]["size"] == 0
+
+    def test_decimals_that_print_differently_dont_share_entries(self):
+        """Test equal decimals with different exponents are limited separately."""
+        assert str(v.validate_sap_decimal(Decimal("123456789.10"))) == "123456789.1"
+        assert str(v.validate_sap_decimal(Decimal("123456789.100"))) == "123456789.1"
+        assert str(v.validate_sap_decimal(Decimal("12345678900"))) == "1234567890"
+
+        assert v.get_conversion_cache_stats()["DECIMAL"]["misses"] == 3
+
+    def test_decimals_that_fit_skip_the_cache(self):
+        """Test values within the precision limit never reach the cache."""
+        value = Decimal("1234.56")
+
+        assert v.validate_sap_decimal(value) is value
+        assert v.get_conversion_cache_stats()["DECIMAL"]["misses"] == 0
+
+
+@pytest.mark.unit
+class TestBinaryAndNumc:
+    """Test binary values and ABAP NUMC text convert the way SAP shows them."""
+
+    def test_varbinary_is_uppercase_hex(self):
+        """Test VARBINARY converts to the hex SAP HANA's BINTOHEX returns."""
+        assert v.validate_sap_varbinary(b"\x00\xab\xff") == "00ABFF"
+        assert v.validate_sap_varbinary(memoryview(b"\x01")) == "01"
+
+    def test_blob_stays_base64(self):
+        """Test BLOB values keep their base64 text."""
+        assert v.validate_sap_blob(b"\x00\xab\xff") == "AKv/"
+
+    def test_numc_of_a_length_is_zero_padded(self):
+        """Test sap_numc(length) pads digits to the column length and rejects other text."""
+        numc = v.sap_numc(10).__metadata__[0].func
+
+        assert numc("42") == "0000000042"
+        assert numc(7) == "0000000007"
+        with pytest.raises(ValueError):
+            numc("12A")
+        assert v.sap_numc(10) is v.sap_numc(10)
@@ -0,0 +1,100 @@
+"""Unit tests for the precompiled SAP HANA row converter."""
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+
+from moose_lib import Key
+from pydantic import Field
+
+from app.utils.sap_hana_validators import (
+    SapBigInt,
+    SapDate,
+    SapDecimal,
+    SapFixedDecimal,
+    SapNvarchar,
+    SapTimestamp,
+    SapVarbinary,
+)
+from app.utils.sap_pydantic_model import SapHanaBaseModel
+from app.utils.sap_row_converter import get_row_converter
+
+
+class Ekko(SapHanaBaseModel):
+    ebeln: Key[SapNvarchar] = Field(alias="EBELN")
+    aedat: Optional[SapDate] = Field(default=None, alias="AEDAT")
+    netwr: Optional[SapDecimal] = Field(default=None, alias="NETWR")
+    changed_at: Optional[SapTimestamp] = Field(default=None, alias="CHANGED_AT")
+    counter: Optional[SapBigInt] = Field(default=None, alias="COUNTER")
+    raw: Optional[SapVarbinary] = Field(default=None, alias="RAW")
+
+
+class Ekpo(SapHanaBaseModel):
+    ebelp: SapNvarchar = Field(default="", alias="EBELP")
+    netpr: SapFixedDecimal = Field(default=Decimal("0"), alias="NETPR", max_digits=5, decimal_places=2)
+    menge: Optional[SapFixedDecimal] = Field(default=None, alias="MENGE", max_digits=5, decimal_places=2)
+
+
+@pytest.mark.unit
+class TestSapRowConverter:
+    """Test SapRowConverter matches per-row model construction."""
+
+    @pytest.mark.parametrize("row", [
+        {
+            "EBELN": "4500000001",
+            "AEDAT": date(2024, 1, 31),
+            "NETWR": Decimal("1234.56"),
+            "CHANGED_AT": datetime(2024, 1, 31, 12, 30),
+            "COUNTER": 7,
+            "RAW": b"\x00\x01",
+        },
+        # Values that need SAP type conversion
+        {
+            "EBELN": 4500000002,
+            "AEDAT": "2024-01-31",
+            "NETWR": "12345678901.23",
+            "CHANGED_AT": "2024-01-31 12:30:00",
+            "COUNTER": "42",
+            "RAW": None,
+        },
+        # Optional columns missing from the row
+        {"EBELN": "4500000003"},
+    ])
+    def test_matches_model_construction(self, row):
+        """Test converted instances dump the same as model_class(**row)."""
+        converted = get_row_converter(Ekko)(row)
+
+        assert isinstance(converted, Ekko)
+        assert converted.model_dump() == Ekko(**row).model_dump()
+
+    def test_missing_required_column_raises(self):
+        """Test a missing required column raises ValueError."""
+        with pytest.raises(ValueError, match="EBELN"):
+            get_row_converter(Ekko)({"AEDAT": date(2024, 1, 31)})
+
+    def test_converter_is_cached_per_model(self):
+        """Test the converter is compiled once per model class."""
+        assert get_row_converter(Ekko) is get_row_converter(Ekko)
+
+    @pytest.mark.parametrize("value", [
+        Decimal("123.45"),
+        Decimal("-999.99"),
+        Decimal("1234.5"),
+        Decimal("1.234"),
+        Decimal("12345678"),
+        "12.3",
+        "12.345",
+        12,
+        1.5,
+        "not a number",
+    ])
+    def test_fixed_decimal_matches_validation(self, value):
+        """Test SapFixedDecimal values are checked against max_digits and decimal_places like model_class(**row)."""
+        row = {"EBELP": 10, "NETPR": value, "MENGE": value}
+        try:
+            expected = Ekpo(**row).model_dump()
+        except ValueError:
+            with pytest.raises(ValueError):
+                get_row_converter(Ekpo)(row)
+        else:
+            assert get_row_converter(Ekpo)(row).model_dump() == expected
@@ -0,0 +1,47 @@
+"""Unit tests for backfilling columns added to SAP HANA tables."""
+import pytest
+
+from app.utils.sap_hana_introspection import FieldMetadata, TableMetadata
+from app.utils.schema_evolution import PendingBackfills, added_columns, backfill_condition
+
+MANDT = FieldMetadata("MANDT", "NVARCHAR", True, False, length=3, primary_key_position=1)
+EBELN = FieldMetadata("EBELN", "NVARCHAR", True, False, length=10, primary_key_position=2)
+ZZREGION = FieldMetadata("ZZREGION", "NVARCHAR", False, False, length=3, default_value="")
+ZZSCORE = FieldMetadata("ZZSCORE", "DECIMAL", False, True, length=15, scale=2)
+
+
+@pytest.mark.unit
+class TestAddedColumns:
+    """Test the added columns and the rows that need them backfilled."""
+
+    def test_added_columns(self):
+        old = TableMetadata("EKKO", "SAPHANADB", [MANDT, EBELN])
+        new = TableMetadata("EKKO", "SAPHANADB", [MANDT, EBELN, ZZREGION, ZZSCORE])
+
+        assert added_columns(old, new) == [ZZREGION, ZZSCORE]
+        assert added_columns(new, old) == []
+        assert added_columns(old, new.with_columns(["ZZSCORE"])) == [ZZSCORE]
+
+    def test_backfill_condition(self):
+        assert backfill_condition([ZZREGION, ZZSCORE]) == (
+            """("ZZREGION" IS NOT NULL AND "ZZREGION" <> '') OR ("ZZSCORE" IS NOT NULL)"""
+        )
+
+
+@pytest.mark.unit
+class TestPendingBackfills:
+    """Test pending backfills are merged, saved and loaded."""
+
+    def test_save_and_load(self, tmp_path):
+        backfills = PendingBackfills.for_models(str(tmp_path / "cdc.py"))
+        assert backfills.tables == {}
+        backfills.add("EKKO", [ZZREGION])
+        backfills.add("EKKO", [ZZREGION, ZZSCORE, ZZSCORE])
+        backfills.add("EKPO", [ZZSCORE])
+        backfills.remove("EKPO")
+        backfills.save()
+
+        loaded = PendingBackfills.for_models(str(tmp_path / "cdc.py"))
+
+        assert (tmp_path / "cdc.backfills.json").exists()
+        assert loaded.tables == {"EKKO": [ZZREGION, ZZSCORE]}
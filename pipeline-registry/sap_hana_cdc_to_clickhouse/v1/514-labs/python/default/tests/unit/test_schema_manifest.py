@@ -0,0 +1,85 @@
+"""Unit tests for schema fingerprints and the schema manifest."""
+import pytest
+from unittest.mock import MagicMock
+
+from app.utils.sap_hana_introspection import FieldMetadata, HanaIntrospector, TableMetadata
+from app.utils.schema_manifest import SchemaManifest
+
+
+def _ekko(length=10):
+    return TableMetadata(
+        table_name="EKKO",
+        schema_name="SAPHANADB",
+        fields=[
+            FieldMetadata("MANDT", "NVARCHAR", True, False, length=3, primary_key_position=1),
+            FieldMetadata("EBELN", "NVARCHAR", True, False, length=length, primary_key_position=2),
+            FieldMetadata("NETWR", "DECIMAL", False, True, length=15, scale=2),
+        ],
+        record_count=1000,
+    )
+
+
+def _introspector(constraint_rows, column_rows):
+    """Introspector whose connection returns the given primary key and column rows."""
+    introspector = HanaIntrospector.__new__(HanaIntrospector)
+    introspector.connection = MagicMock()
+    introspector.connection.cursor.return_value.fetchall.side_effect = [constraint_rows, column_rows]
+    return introspector
+
+
+@pytest.mark.unit
+class TestSchemaFingerprints:
+    """Test fingerprints read in bulk match those of introspected tables."""
+
+    def test_bulk_fingerprints_match_table_metadata(self):
+        introspector = _introspector(
+            [("EKKO", "MANDT"), ("EKKO", "EBELN"), ("EKPO", "MANDT")],
+            [
+                ("EKKO", "MANDT", "NVARCHAR", 3, None, "FALSE", None),
+                ("EKKO", "EBELN", "NVARCHAR", 10, None, "FALSE", None),
+                ("EKKO", "NETWR", "DECIMAL", 15, 2, "TRUE", None),
+                ("EKPO", "MANDT", "NVARCHAR", 3, None, "FALSE", None),
+            ],
+        )
+
+        fingerprints = introspector.get_schema_fingerprints(["EKKO", "ZVIEW"], "SAPHANADB")
+
+        assert fingerprints == {"EKKO": _ekko().fingerprint()}
+
+    def test_fingerprint_ignores_row_count(self):
+        changed_count = _ekko()
+        changed_count.record_count = 5000
+
+        assert changed_count.fingerprint() == _ekko().fingerprint()
+        assert _ekko(length=12).fingerprint() != _ekko().fingerprint()
+
+
+@pytest.mark.unit
+class TestSchemaManifest:
+    """Test the manifest records tables and finds changed ones."""
+
+    def test_changed_tables(self, tmp_path):
+        manifest = SchemaManifest(str(tmp_path / "cdc.schema.json"), {"EKKO": _ekko()})
+        fingerprints = {"EKKO": _ekko().fingerprint(), "EKPO": "abc"}
+
+        assert manifest.changed_tables(["EKKO", "EKPO", "ZVIEW"], fingerprints) == ["EKPO", "ZVIEW"]
+        fingerprints["EKKO"] = _ekko(length=12).fingerprint()
+        assert manifest.changed_tables(["EKKO"], fingerprints) == ["EKKO"]
+
+    def test_save_and_load(self, tmp_path):
+        manifest = SchemaManifest.for_models(str(tmp_path / "cdc.py"))
+        assert manifest.tables == {}
+        manifest.update([_ekko()])
+        manifest.save()
+
+        loaded = SchemaManifest.for_models(str(tmp_path / "cdc.py"))
+
+        assert (tmp_path / "cdc.schema.json").exists()
+        assert loaded.tables == {"EKKO": _ekko()}
+
+    def test_with_columns_keeps_primary_key(self):
+        table = _ekko()
+
+        assert table.with_columns(["NETWR"]).get_field_names() == ["MANDT", "EBELN", "NETWR"]
+        assert table.with_columns(["EBELN"]).get_field_names() == ["MANDT", "EBELN"]
+        assert table.with_columns(None) is table
@@ -0,0 +1,24 @@
+"""Unit tests for per-batch interning of repeated strings."""
+import pytest
+from decimal import Decimal
+
+from app.utils.string_interning import INTERN_SAMPLE_ROWS, intern_low_cardinality_strings
+
+
+@pytest.mark.unit
+class TestInternLowCardinalityStrings:
+    """Test per-batch interning of repeated strings."""
+
+    def test_interns_low_cardinality_columns(self):
+        """Test repeated codes share one object and unique values are left alone."""
+        rows = [
+            {"MANDT": "".join("100"), "EBELN": f"{4500000000 + i}", "NETWR": Decimal(i)}
+            for i in range(INTERN_SAMPLE_ROWS)
+        ]
+
+        assert intern_low_cardinality_strings(rows) == ["MANDT"]
+        assert all(row["MANDT"] is rows[0]["MANDT"] for row in rows)
+
+    def test_skips_small_batches(self):
+        """Test batches smaller than the sample aren't inspected."""
+        assert intern_low_cardinality_strings([{"MANDT": "100"}]) == []
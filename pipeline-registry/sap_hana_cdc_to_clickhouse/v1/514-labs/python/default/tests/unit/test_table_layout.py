@@ -0,0 +1,124 @@
+"""Unit tests for the derived ClickHouse table layouts."""
+import json
+import pytest
+from unittest.mock import MagicMock
+
+from app.utils.sap_hana_introspection import FieldMetadata, TableMetadata
+from app.utils.table_layout import (
+    Projection,
+    SkipIndex,
+    TableLayout,
+    apply_overrides,
+    apply_table_layout,
+    derive_table_layout,
+    load_table_layout_overrides,
+)
+
+BSEG_KEY = ["MANDT", "BUKRS", "BELNR", "GJAHR", "BUZEI"]
+
+
+def _bseg(record_count=500_000_000, partition_type=None, partition_columns=None):
+    return TableMetadata(
+        table_name="BSEG",
+        schema_name="SAPHANADB",
+        fields=[
+            FieldMetadata("MANDT", "NVARCHAR", True, False, length=3, primary_key_position=1),
+            FieldMetadata("BUKRS", "NVARCHAR", True, False, length=4, primary_key_position=2),
+            FieldMetadata("BELNR", "NVARCHAR", True, False, length=10, primary_key_position=3),
+            FieldMetadata("GJAHR", "NVARCHAR", True, False, length=4, primary_key_position=4),
+            FieldMetadata("BUZEI", "NVARCHAR", True, False, length=3, primary_key_position=5),
+            FieldMetadata("BUDAT", "NVARCHAR", False, False, length=8),
+            FieldMetadata("HKONT", "NVARCHAR", False, False, length=10),
+            FieldMetadata("MATNR", "NVARCHAR", False, False, length=40),
+            FieldMetadata("DMBTR", "DECIMAL", False, False, length=13, scale=2),
+        ],
+        record_count=record_count,
+        partition_type=partition_type,
+        partition_columns=partition_columns or [],
+    )
+
+
+@pytest.mark.unit
+class TestDeriveTableLayout:
+    """Test layouts derived from SAP HANA metadata."""
+
+    def test_large_table_partitioned_by_fiscal_year(self):
+        layout = derive_table_layout(_bseg(), BSEG_KEY)
+
+        assert layout.partition_by == "assumeNotNull(GJAHR)"
+
+    def test_hana_range_partitioning_is_preferred(self):
+        """Test the column SAP HANA range partitions the table by comes first."""
+        layout = derive_table_layout(_bseg(partition_type="RANGE", partition_columns=["BUDAT"]), BSEG_KEY)
+
+        assert layout.partition_by == "substring(assumeNotNull(BUDAT), 1, 4)"
+
+    def test_small_table_not_partitioned(self):
+        layout = derive_table_layout(_bseg(record_count=1000), BSEG_KEY)
+
+        assert layout.partition_by is None
+
+    def test_indexes_skip_leading_key_columns(self):
+        """Test lookup columns get bloom filters and dates minmax, except the leading key columns."""
+        layout = derive_table_layout(_bseg(), BSEG_KEY)
+
+        assert layout.indexes == [
+            SkipIndex("idx_belnr", "BELNR", "bloom_filter(0.01)"),
+            SkipIndex("idx_matnr", "MATNR", "bloom_filter(0.01)"),
+            SkipIndex("idx_hkont", "HKONT", "bloom_filter(0.01)"),
+            SkipIndex("idx_budat", "BUDAT", "minmax", granularity=1),
+        ]
+        assert layout.projections == []
+
+    def test_projections_on_request(self):
+        layout = derive_table_layout(_bseg(), BSEG_KEY, include_projections=True)
+
+        assert layout.projections == [Projection("by_matnr", ["MATNR"])]
+
+
+@pytest.mark.unit
+class TestTableLayoutOverrides:
+    """Test override files and applying layouts."""
+
+    def test_override_replaces_given_keys(self, tmp_path):
+        path = tmp_path / "layouts.json"
+        path.write_text(json.dumps({
+            "BSEG": {
+                "partition_by": None,
+                "projections": [{"name": "by_hkont", "order_by": ["HKONT", "BUDAT"]}],
+            },
+        }))
+        derived = derive_table_layout(_bseg(), BSEG_KEY)
+
+        layout = apply_overrides(derived, load_table_layout_overrides(str(path))["BSEG"])
+
+        assert layout.partition_by is None
+        assert layout.indexes == derived.indexes
+        assert layout.projections == [Projection("by_hkont", ["HKONT", "BUDAT"])]
+
+    def test_invalid_override_file(self, tmp_path):
+        path = tmp_path / "layouts.json"
+        path.write_text(json.dumps({"BSEG": "GJAHR"}))
+
+        with pytest.raises(ValueError):
+            load_table_layout_overrides(str(path))
+
+    def test_apply_table_layout_continues_after_failure(self):
+        """Test each index and projection is added and materialized, failures only logged."""
+        olap_table = MagicMock()
+        olap_table._generate_table_name.return_value = "bseg"
+        client = olap_table._get_memoized_client.return_value
+        client.command.side_effect = [Exception("Code: 44. ILLEGAL_COLUMN"), None, None, None]
+        layout = TableLayout(
+            indexes=[SkipIndex("idx_matnr", "MATNR", "bloom_filter(0.01)")],
+            projections=[Projection("by_hkont", ["HKONT", "/BIC/ZKEY"])],
+        )
+
+        apply_table_layout(olap_table, layout)
+
+        assert [call.args[0] for call in client.command.call_args_list] == [
+            "ALTER TABLE `bseg` ADD INDEX IF NOT EXISTS idx_matnr MATNR TYPE bloom_filter(0.01) GRANULARITY 4",
+            "ALTER TABLE `bseg` MATERIALIZE INDEX idx_matnr",
+            "ALTER TABLE `bseg` ADD PROJECTION IF NOT EXISTS by_hkont (SELECT * ORDER BY (HKONT, `/BIC/ZKEY`))",
+            "ALTER TABLE `bseg` MATERIALIZE PROJECTION by_hkont",
+        ]